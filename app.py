@@ -1,12 +1,30 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import joinedload, selectinload
 from datetime import datetime, date
 import pandas as pd
 import os
+import time
 from werkzeug.utils import secure_filename
 from logger_config import setup_logger
+from src.utils.sequences import next_value, reserve_values, max_kod_numarasi
+from src.utils.pagination import apply_list_filters, keyset_paginate, get_per_page
+from src.utils.cascade import enable_sqlite_foreign_keys, delete_musteri, delete_teslimat, format_silinenler
+from src.utils.customer_summary import register_ozet_listeners, get_musteri_ozet, rebuild_musteri_ozet
+from src.utils.rollups import register_rollup_listeners, rebuild_gunluk_ozet, check_gunluk_ozet
+from src.utils.query_cache import query_cache, create_backend, register_cache_listeners
+from src.utils.bulk_import import read_workbook, plan_import, apply_import
+from src.utils.export import EXPORT_BICIMLERI, export_stream
+from src.utils.report_excel import write_musteri_excel
+from src.utils.jobs import job_queue, TAMAMLANDI
+from src.utils.report_cache import report_cache
+from src.utils.perf import perf_monitor
+from src.utils.slow_query import slow_query_log
+from src.utils.metrics import metrics
+from src.utils.profiler import request_profiler
 from dotenv import load_dotenv
 from functools import wraps
+import click
 
 # Environment variables yükle
 load_dotenv()
@@ -18,6 +36,35 @@ app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'sisyphos_ajans_2025')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URI', 'sqlite:///ajans.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = os.getenv('SQLALCHEMY_TRACK_MODIFICATIONS', 'False') == 'True'
 app.config['UPLOAD_FOLDER'] = os.getenv('UPLOAD_FOLDER', 'uploads')
+# Bu kadar satırı aşan müşteri Excel raporları write-only modunda yazılır
+app.config['RAPOR_WRITE_ONLY_SATIR'] = int(os.getenv('RAPOR_WRITE_ONLY_SATIR', '20000'))
+# Arka plan rapor kuyruğu: süreç başına işçi thread'i ve tüm süreçlerde eşzamanlı iş sınırı
+app.config['RAPOR_ISCI_SAYISI'] = int(os.getenv('RAPOR_ISCI_SAYISI', '2'))
+app.config['RAPOR_ESZAMANLI_LIMIT'] = int(os.getenv('RAPOR_ESZAMANLI_LIMIT', '2'))
+app.config['RAPOR_IS_ZAMAN_ASIMI'] = int(os.getenv('RAPOR_IS_ZAMAN_ASIMI', '600'))
+# Bitmiş rapor işlerinin rapor_isi tablosunda tutulacağı gün (0: silinmez)
+app.config['RAPOR_IS_SAKLAMA_GUN'] = int(os.getenv('RAPOR_IS_SAKLAMA_GUN', '7'))
+# Rapor önbelleği (UPLOAD_FOLDER/rapor_onbellek) boyut ve yaş sınırı
+app.config['RAPOR_ONBELLEK_MAKS_MB'] = int(os.getenv('RAPOR_ONBELLEK_MAKS_MB', '500'))
+app.config['RAPOR_ONBELLEK_MAKS_GUN'] = int(os.getenv('RAPOR_ONBELLEK_MAKS_GUN', '30'))
+# Toplu dönem raporları: süreç havuzu boyutu (0: çekirdek sayısı)
+app.config['TOPLU_RAPOR_ISCI_SAYISI'] = int(os.getenv('TOPLU_RAPOR_ISCI_SAYISI', '0'))
+# İstek performans ölçümü (/_perf): kapalıyken dinleyici bağlanmaz
+app.config['PERF_ENABLED'] = os.getenv('PERF_ENABLED', 'False') == 'True'
+app.config['PERF_KAPASITE'] = int(os.getenv('PERF_KAPASITE', '500'))
+app.config['PERF_SERVER_TIMING'] = os.getenv('PERF_SERVER_TIMING', 'False') == 'True'
+# Yavaş sorgu günlüğü (/_perf/slow): SLOW_QUERY_MS'yi aşan cümleler ayrı log dosyasına
+app.config['SLOW_QUERY_ENABLED'] = os.getenv('SLOW_QUERY_ENABLED', 'False') == 'True'
+app.config['SLOW_QUERY_MS'] = float(os.getenv('SLOW_QUERY_MS', '200'))
+app.config['SLOW_QUERY_LOG'] = os.getenv('SLOW_QUERY_LOG', 'logs/slow_queries.log')
+# İstek profilleyici (/_profil): X-Profile başlığı veya PROFILE_SAMPLE_RATE oranında istekler
+app.config['PROFILE_ENABLED'] = os.getenv('PROFILE_ENABLED', 'False') == 'True'
+app.config['PROFILE_SAMPLE_RATE'] = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+app.config['PROFILE_MODE'] = os.getenv('PROFILE_MODE', 'cprofile')  # cprofile | sampling
+app.config['PROFILE_DIR'] = os.getenv('PROFILE_DIR', os.path.join(app.config['UPLOAD_FOLDER'], 'profiller'))
+app.config['PROFILE_MAX_FILES'] = int(os.getenv('PROFILE_MAX_FILES', '50'))
+# Prometheus /metrics (çok worker'da PROMETHEUS_MULTIPROC_DIR ortam değişkeni gerekir)
+app.config['METRICS_ENABLED'] = os.getenv('METRICS_ENABLED', 'False') == 'True'
 
 # PythonAnywhere için mutlak yollar
 if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite:////'):
@@ -37,9 +84,25 @@ if not os.path.isabs(app.config['UPLOAD_FOLDER']):
 
 db = SQLAlchemy(app)
 
+# SQLite'ta ON DELETE CASCADE için foreign key zorlaması her bağlantıda açılır
+with app.app_context():
+    enable_sqlite_foreign_keys(db.engine)
+
 # Logger'ı kur
 logger = setup_logger(app)
 
+# İstek başına SQL sayısı/süresi, render süresi ve yanıt boyutu (PERF_ENABLED)
+with app.app_context():
+    perf_monitor.configure(app, db.engine, etkin=app.config['PERF_ENABLED'],
+                           kapasite=app.config['PERF_KAPASITE'],
+                           server_timing=app.config['PERF_SERVER_TIMING'])
+    slow_query_log.configure(db.engine, etkin=app.config['SLOW_QUERY_ENABLED'],
+                             esik_ms=app.config['SLOW_QUERY_MS'], log_dosyasi=app.config['SLOW_QUERY_LOG'])
+    metrics.configure(app, db, etkin=app.config['METRICS_ENABLED'])
+    request_profiler.configure(app, etkin=app.config['PROFILE_ENABLED'], klasor=app.config['PROFILE_DIR'],
+                               oran=app.config['PROFILE_SAMPLE_RATE'], maks_dosya=app.config['PROFILE_MAX_FILES'],
+                               mod=app.config['PROFILE_MODE'])
+
 # Giriş ayarları
 LOGIN_PASSWORD = 'AeB1254.k'
 SECURITY_ANSWER = 'taş2025.yukarı'
@@ -83,7 +146,7 @@ class IsGunlugu(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     is_kodu = db.Column(db.String(30), unique=True)  # MST001-IS001, MST001-IS002
     tarih = db.Column(db.Date, nullable=False)
-    musteri_id = db.Column(db.Integer, db.ForeignKey('musteri.id'))
+    musteri_id = db.Column(db.Integer, db.ForeignKey('musteri.id', ondelete='CASCADE'))
     proje = db.Column(db.String(100))
     aktivite_turu = db.Column(db.String(50))
     aciklama = db.Column(db.Text)
@@ -94,10 +157,19 @@ class IsGunlugu(db.Model):
     revizyon_sayisi = db.Column(db.Integer, default=0)  # Kaç revizyon yapıldı
     ne_yapildi = db.Column(db.Text)  # Revizyon yoksa iş için ne yapıldığı
 
+    musteri = db.relationship('Musteri')
+
+    __table_args__ = (
+        db.Index('ix_is_gunlugu_musteri_tarih', 'musteri_id', 'tarih'),
+        db.Index('ix_is_gunlugu_musteri_durum', 'musteri_id', 'durum'),
+        db.Index('ix_is_gunlugu_tarih', 'tarih'),
+    )
+
 class Teslimat(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    musteri_id = db.Column(db.Integer, db.ForeignKey('musteri.id'))
-    is_gunlugu_id = db.Column(db.Integer, db.ForeignKey('is_gunlugu.id'), nullable=False)  # ZORUNLU - Her teslimat bir işten gelir
+    teslimat_kodu = db.Column(db.String(30), unique=True)  # TSLMST001001, TSLMST001002
+    musteri_id = db.Column(db.Integer, db.ForeignKey('musteri.id', ondelete='CASCADE'))
+    is_gunlugu_id = db.Column(db.Integer, db.ForeignKey('is_gunlugu.id', ondelete='CASCADE'), nullable=False)  # ZORUNLU - Her teslimat bir işten gelir
     aktivite_turu = db.Column(db.String(50))
     proje = db.Column(db.String(100))
     teslim_turu = db.Column(db.String(50))  # Sosyal Medya / Konvensiyonel / Diğer
@@ -117,11 +189,21 @@ class Teslimat(db.Model):
     yorum = db.Column(db.Integer, nullable=True)
     paylasim = db.Column(db.Integer, nullable=True)
 
+    musteri = db.relationship('Musteri')
+    is_gunlugu = db.relationship('IsGunlugu')
+
+    __table_args__ = (
+        db.Index('ix_teslimat_musteri_teslim_tarihi', 'musteri_id', 'teslim_tarihi'),
+        db.Index('ix_teslimat_is_gunlugu', 'is_gunlugu_id'),
+        db.Index('ix_teslimat_durum', 'durum'),
+        db.Index('ix_teslimat_teslim_tarihi', 'teslim_tarihi'),
+    )
+
 class SosyalMedya(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     tarih = db.Column(db.Date, nullable=False)
-    musteri_id = db.Column(db.Integer, db.ForeignKey('musteri.id'))
-    is_gunlugu_id = db.Column(db.Integer, db.ForeignKey('is_gunlugu.id'), nullable=True)  # İş ile ilişki
+    musteri_id = db.Column(db.Integer, db.ForeignKey('musteri.id', ondelete='CASCADE'))
+    is_gunlugu_id = db.Column(db.Integer, db.ForeignKey('is_gunlugu.id', ondelete='CASCADE'), nullable=True)  # İş ile ilişki
     platform = db.Column(db.String(50))
     icerik_basligi = db.Column(db.String(100))
     gonderi_turu = db.Column(db.String(20))
@@ -132,11 +214,20 @@ class SosyalMedya(db.Model):
     paylasim = db.Column(db.Integer)
     durum = db.Column(db.String(20))
 
+    musteri = db.relationship('Musteri')
+    is_gunlugu = db.relationship('IsGunlugu')
+
+    __table_args__ = (
+        db.Index('ix_sosyal_medya_musteri_tarih', 'musteri_id', 'tarih'),
+        db.Index('ix_sosyal_medya_is_gunlugu', 'is_gunlugu_id'),
+        db.Index('ix_sosyal_medya_tarih', 'tarih'),
+    )
+
 class Revizyon(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     tarih = db.Column(db.Date, nullable=False)
-    musteri_id = db.Column(db.Integer, db.ForeignKey('musteri.id'))
-    is_gunlugu_id = db.Column(db.Integer, db.ForeignKey('is_gunlugu.id'), nullable=True)  # İş ile ilişki
+    musteri_id = db.Column(db.Integer, db.ForeignKey('musteri.id', ondelete='CASCADE'))
+    is_gunlugu_id = db.Column(db.Integer, db.ForeignKey('is_gunlugu.id', ondelete='CASCADE'), nullable=True)  # İş ile ilişki
     revizyon_numarasi = db.Column(db.Integer, default=1)  # Revizyon 1, Revizyon 2, etc.
     baslik = db.Column(db.String(100))  # "Revizyon 1", "Revizyon 2", etc.
     revize_talep_eden = db.Column(db.String(100))
@@ -144,10 +235,18 @@ class Revizyon(db.Model):
     ne_yapildi = db.Column(db.Text)  # Revizyon onaylanırken ne yapıldığı
     durum = db.Column(db.String(20), default='Bekliyor')
 
+    musteri = db.relationship('Musteri')
+    is_gunlugu = db.relationship('IsGunlugu')
+
+    __table_args__ = (
+        db.Index('ix_revizyon_musteri_tarih', 'musteri_id', 'tarih'),
+        db.Index('ix_revizyon_is_gunlugu_numara', 'is_gunlugu_id', 'revizyon_numarasi'),
+    )
+
 class Arama(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     tarih = db.Column(db.Date, nullable=False)
-    musteri_id = db.Column(db.Integer, db.ForeignKey('musteri.id'))
+    musteri_id = db.Column(db.Integer, db.ForeignKey('musteri.id', ondelete='CASCADE'))
     arayan_aranan = db.Column(db.String(100))
     konu = db.Column(db.Text)
     sonuc = db.Column(db.String(50))
@@ -156,87 +255,130 @@ class Arama(db.Model):
     geri_donus_tarihi = db.Column(db.Date, nullable=True)
     durum = db.Column(db.String(20), default='Bekliyor')
 
+    musteri = db.relationship('Musteri')
+
+    __table_args__ = (
+        db.Index('ix_arama_musteri_tarih', 'musteri_id', 'tarih'),
+        db.Index('ix_arama_geri_donus_durum', 'geri_donus_tarihi', 'durum'),
+        db.Index('ix_arama_tarih', 'tarih'),
+    )
+
+class Sayac(db.Model):
+    """Kod üretimi için sıra sayaçları (kapsam başına bir satır)"""
+    kapsam = db.Column(db.String(50), primary_key=True)  # musteri, is:<musteri_id>, teslimat:<musteri_id>
+    deger = db.Column(db.Integer, nullable=False, default=0)
+
+class MusteriOzet(db.Model):
+    """Müşteri başına özet istatistikler (çocuk tablolara yazılırken aynı transaction'da güncellenir)"""
+    musteri_id = db.Column(db.Integer, db.ForeignKey('musteri.id', ondelete='CASCADE'), primary_key=True)
+    toplam_dakika = db.Column(db.Integer, nullable=False, default=0)
+    is_sayisi = db.Column(db.Integer, nullable=False, default=0)
+    teslimat_sayisi = db.Column(db.Integer, nullable=False, default=0)
+    onaylanan_teslimat = db.Column(db.Integer, nullable=False, default=0)  # Tamamlandı, Teslim Edildi
+    devam_eden_teslimat = db.Column(db.Integer, nullable=False, default=0)  # Hazırlanıyor
+    sosyal_medya_teslimat = db.Column(db.Integer, nullable=False, default=0)
+    revizyon_sayisi = db.Column(db.Integer, nullable=False, default=0)
+    son_aktivite_tarihi = db.Column(db.Date)  # Son iş veya teslimat tarihi
+    guncelleme_tarihi = db.Column(db.DateTime)
+
+class GunlukIsOzeti(db.Model):
+    """Dashboard grafikleri için günlük iş rollup'ı (iş günlüğüne yazılırken güncellenir)"""
+    tarih = db.Column(db.Date, primary_key=True)
+    musteri_id = db.Column(db.Integer, primary_key=True)  # Müşterisiz işler: 0
+    sorumlu_kisi = db.Column(db.String(100), primary_key=True)  # Boşsa: ''
+    aktivite_turu = db.Column(db.String(50), primary_key=True)  # Boşsa: ''
+    is_sayisi = db.Column(db.Integer, nullable=False, default=0)
+    toplam_dakika = db.Column(db.Integer, nullable=False, default=0)
+
+class RaporIsi(db.Model):
+    """Arka planda üretilen rapor işi (src/utils/jobs.py kuyruğu bu tablodan iş alır)"""
+    id = db.Column(db.Integer, primary_key=True)
+    tur = db.Column(db.String(20), nullable=False)  # excel, word
+    musteri_id = db.Column(db.Integer, db.ForeignKey('musteri.id', ondelete='CASCADE'))
+    parametreler = db.Column(db.Text)  # JSON: filtre, baslangic, bitis
+    durum = db.Column(db.String(20), nullable=False, default='bekliyor', index=True)  # bekliyor, calisiyor, tamamlandi, hata
+    ilerleme = db.Column(db.Integer, nullable=False, default=0)  # Yüzde
+    mesaj = db.Column(db.String(200))
+    dosya_yolu = db.Column(db.String(500))
+    dosya_adi = db.Column(db.String(200))  # İndirme adı
+    hata = db.Column(db.Text)
+    deneme = db.Column(db.Integer, nullable=False, default=0)
+    calisan = db.Column(db.String(100))  # host:pid
+    olusturma_tarihi = db.Column(db.DateTime, default=datetime.now)
+    baslama_tarihi = db.Column(db.DateTime)
+    bitis_tarihi = db.Column(db.DateTime)
+    guncelleme_tarihi = db.Column(db.DateTime)  # Çalışan sürecin son nabzı
+
+register_ozet_listeners(db.session)
+register_rollup_listeners(db.session)
+
+# İstatistik sorgu önbelleği: QUERY_CACHE_BACKEND=memory (varsayılan, worker başına)
+# veya worker'lar arası paylaşım için sqlite:////mutlak/yol/cache.db
+query_cache.configure(
+    backend=create_backend(os.getenv('QUERY_CACHE_BACKEND', 'memory'),
+                           int(os.getenv('QUERY_CACHE_MAX_GIRDI', '512'))),
+    etkin=os.getenv('QUERY_CACHE_ENABLED', 'True') == 'True'
+)
+register_cache_listeners(db.session)
+if metrics.etkin:
+    query_cache.gozlemci = lambda isabet: metrics.count_cache('sorgu', isabet)
+
 # Yardımcı fonksiyonlar - ID oluşturma
+# Kodlar sayac tablosundan, ekleme ile aynı transaction içinde atomik olarak alınır
+def son_musteri_numarasi():
+    """Mevcut müşteri kodlarındaki en büyük numara (sayaç ilk değeri)"""
+    kodlar = db.session.query(Musteri.musteri_kodu).filter(Musteri.musteri_kodu.like('MST%'))
+    return max_kod_numarasi([kod for (kod,) in kodlar], ayirici='MST')
+
 def generate_musteri_kodu():
     """Yeni müşteri kodu oluştur: MST001, MST002, etc."""
-    with app.app_context():
-        son_musteri = Musteri.query.order_by(Musteri.id.desc()).first()
-        if son_musteri and son_musteri.musteri_kodu:
-            try:
-                son_numara = int(son_musteri.musteri_kodu.replace('MST', ''))
-                yeni_numara = son_numara + 1
-            except:
-                yeni_numara = 1
-        else:
-            yeni_numara = 1
-        
-        # Kodun unique olduğundan emin ol
-        while True:
-            yeni_kod = f"MST{yeni_numara:03d}"
-            exists = Musteri.query.filter_by(musteri_kodu=yeni_kod).first()
-            if not exists:
-                return yeni_kod
-            yeni_numara += 1
+    yeni_numara = next_value(db, 'musteri', son_musteri_numarasi)
+    return f"MST{yeni_numara:03d}"
+
+def generate_musteri_kodlari(adet):
+    """Toplu ekleme için ardışık müşteri kodları (tek sayaç güncellemesi)"""
+    return [f"MST{numara:03d}" for numara in reserve_values(db, 'musteri', adet, son_musteri_numarasi)]
+
+def son_teslimat_numarasi(musteri_id):
+    """Müşterinin teslimat kodlarındaki en büyük numara (sayaç ilk değeri)"""
+    musteri_kodu = db.session.query(Musteri.musteri_kodu).filter(Musteri.id == musteri_id).scalar()
+    kodlar = db.session.query(Teslimat.teslimat_kodu).filter(Teslimat.musteri_id == musteri_id)
+    return max_kod_numarasi([kod for (kod,) in kodlar], onek=f'TSL{musteri_kodu}')
+
+def son_is_numarasi(musteri_id):
+    """Müşterinin iş kodlarındaki en büyük numara (sayaç ilk değeri)"""
+    kodlar = db.session.query(IsGunlugu.is_kodu).filter(IsGunlugu.musteri_id == musteri_id)
+    return max_kod_numarasi([kod for (kod,) in kodlar], ayirici='-IS')
 
 def generate_teslimat_kodu(musteri):
     """Yeni teslimat kodu oluştur: TSLMST001001, TSLMST001002, etc."""
     if not musteri or not musteri.musteri_kodu:
         return f"TSLUNKNOWN001"
-    
-    with app.app_context():
-        # Müşteri kodunu al (zaten tire yok)
-        musteri_kod = musteri.musteri_kodu
-        
-        # Bu müşterinin son teslimatını bul
-        son_teslimat = Teslimat.query.filter_by(musteri_id=musteri.id).order_by(Teslimat.id.desc()).first()
-        
-        if son_teslimat and son_teslimat.teslimat_kodu:
-            try:
-                # Son 3 karakteri al (teslimat sıra numarası)
-                son_numara = int(son_teslimat.teslimat_kodu[-3:])
-                yeni_numara = son_numara + 1
-            except:
-                yeni_numara = 1
-        else:
-            yeni_numara = 1
-        
-        # Kodun unique olduğundan emin ol
-        while True:
-            yeni_kod = f"TSL{musteri_kod}{yeni_numara:03d}"
-            exists = Teslimat.query.filter_by(teslimat_kodu=yeni_kod).first()
-            if not exists:
-                return yeni_kod
-            yeni_numara += 1
+
+    yeni_numara = next_value(db, f'teslimat:{musteri.id}', lambda: son_teslimat_numarasi(musteri.id))
+    return f"TSL{musteri.musteri_kodu}{yeni_numara:03d}"
+
+def generate_teslimat_kodlari(musteri, adet):
+    """Toplu ekleme için müşterinin ardışık teslimat kodları"""
+    numaralar = reserve_values(db, f'teslimat:{musteri.id}', adet, lambda: son_teslimat_numarasi(musteri.id))
+    return [f"TSL{musteri.musteri_kodu}{numara:03d}" for numara in numaralar]
 
 def generate_is_kodu(musteri):
     """Yeni iş kodu oluştur: MST001-IS001, MST001-IS002, etc."""
     if not musteri or not musteri.musteri_kodu:
         return f"UNKNOWN-IS001"
-    
-    with app.app_context():
-        # Müşteri kodunu al
-        musteri_kod = musteri.musteri_kodu
-        
-        # Bu müşterinin son işini bul
-        son_is = IsGunlugu.query.filter_by(musteri_id=musteri.id).order_by(IsGunlugu.id.desc()).first()
-        
-        if son_is and son_is.is_kodu:
-            try:
-                # Son 3 karakteri al (iş sıra numarası)
-                son_numara = int(son_is.is_kodu.split('-IS')[-1])
-                yeni_numara = son_numara + 1
-            except:
-                yeni_numara = 1
-        else:
-            yeni_numara = 1
-        
-        # Kodun unique olduğundan emin ol
-        while True:
-            yeni_kod = f"{musteri_kod}-IS{yeni_numara:03d}"
-            exists = IsGunlugu.query.filter_by(is_kodu=yeni_kod).first()
-            if not exists:
-                return yeni_kod
-            yeni_numara += 1
+
+    yeni_numara = next_value(db, f'is:{musteri.id}', lambda: son_is_numarasi(musteri.id))
+    return f"{musteri.musteri_kodu}-IS{yeni_numara:03d}"
+
+def generate_is_kodlari(musteri, adet):
+    """Toplu ekleme için müşterinin ardışık iş kodları"""
+    numaralar = reserve_values(db, f'is:{musteri.id}', adet, lambda: son_is_numarasi(musteri.id))
+    return [f"{musteri.musteri_kodu}-IS{numara:03d}" for numara in numaralar]
+
+def get_filtre_musterileri():
+    """Liste filtreleri için (id, ad) müşteri listesi"""
+    return db.session.query(Musteri.id, Musteri.ad).order_by(Musteri.ad).all()
 
 # Giriş sayfası
 @app.route('/login', methods=['GET', 'POST'])
@@ -300,8 +442,10 @@ def index():
 # Müşteri yönetimi
 @app.route('/musteriler')
 def musteriler():
-    musteriler = Musteri.query.all()
-    return render_template('musteriler.html', musteriler=musteriler)
+    query, filtreler = apply_list_filters(Musteri.query, Musteri, request.args)
+    sayfa = keyset_paginate(query, Musteri.id, cursor=request.args.get('cursor'),
+                            per_page=get_per_page(request.args))
+    return render_template('musteriler.html', musteriler=sayfa.items, sayfa=sayfa, filtreler=filtreler)
 
 # Müşteri Silme
 @app.route('/musteri_sil/<int:musteri_id>', methods=['POST'])
@@ -310,38 +454,21 @@ def musteri_sil(musteri_id):
     try:
         musteri = Musteri.query.get_or_404(musteri_id)
         musteri_adi = musteri.ad
-        
-        # İlişkili tüm kayıtları sil
-        # 1. İş günlüğü kayıtlarını al
-        isler = IsGunlugu.query.filter_by(musteri_id=musteri_id).all()
-        
-        for is_item in isler:
-            # Her iş için revizyonları sil
-            Revizyon.query.filter_by(is_gunlugu_id=is_item.id).delete()
-            # Her iş için sosyal medya kayıtlarını sil
-            SosyalMedya.query.filter_by(is_gunlugu_id=is_item.id).delete()
-        
-        # 2. İş günlüğü kayıtlarını sil
-        IsGunlugu.query.filter_by(musteri_id=musteri_id).delete()
-        
-        # 3. Teslimatları sil
-        Teslimat.query.filter_by(musteri_id=musteri_id).delete()
-        
-        # 4. Revizyonları sil (eğer kaldıysa)
-        Revizyon.query.filter_by(musteri_id=musteri_id).delete()
-        
-        # 5. Aramaları sil
-        Arama.query.filter_by(musteri_id=musteri_id).delete()
-        
-        # 6. Müşteriyi sil
-        db.session.delete(musteri)
+
+        # İlişkili kayıtlar tablo başına tek DELETE ile silinir
+        silinenler = delete_musteri(db, musteri_id)
         db.session.commit()
-        
-        flash(f'{musteri_adi} ve tüm ilişkili kayıtlar başarıyla silindi!', 'success')
-        logger.info(f"Müşteri silindi: {musteri_adi} (ID: {musteri_id})")
+
+        if request.accept_mimetypes.best == 'application/json':
+            return jsonify({'success': True, 'silinenler': silinenler})
+
+        flash(f'{musteri_adi} ve tüm ilişkili kayıtlar başarıyla silindi! ({format_silinenler(silinenler)})', 'success')
+        logger.info(f"Müşteri silindi: {musteri_adi} (ID: {musteri_id}) - {silinenler}")
     except Exception as e:
         db.session.rollback()
         logger.error(f"Müşteri silme hatası: {str(e)}", exc_info=True)
+        if request.accept_mimetypes.best == 'application/json':
+            return jsonify({'success': False, 'error': str(e)}), 500
         flash(f'Hata: {str(e)}', 'error')
     
     return redirect(url_for('musteriler'))
@@ -377,9 +504,6 @@ def bekleyen_isler():
 # Müşteri detay sayfası
 @app.route('/musteri_detay/<int:musteri_id>')
 def musteri_detay(musteri_id):
-    from datetime import datetime, timedelta
-    from sqlalchemy import func
-    
     musteri = Musteri.query.get_or_404(musteri_id)
     
     # Pagination parametreleri
@@ -398,10 +522,12 @@ def musteri_detay(musteri_id):
     revizyon_query = Revizyon.query.filter_by(musteri_id=musteri_id)
     is_gunlugu_query = IsGunlugu.query.filter_by(musteri_id=musteri_id)
     
-    # Pagination uygula
-    teslimatlar_pagination = teslimatlar_query.order_by(Teslimat.teslim_tarihi.desc()).paginate(
+    # Pagination uygula (iş kodları için ilişkili işler tek sorguda yüklenir)
+    teslimatlar_pagination = teslimatlar_query.options(selectinload(Teslimat.is_gunlugu))\
+        .order_by(Teslimat.teslim_tarihi.desc()).paginate(
         page=teslimat_page, per_page=per_page, error_out=False)
-    revizyonlar_pagination = revizyon_query.order_by(Revizyon.tarih.desc()).paginate(
+    revizyonlar_pagination = revizyon_query.options(selectinload(Revizyon.is_gunlugu))\
+        .order_by(Revizyon.tarih.desc()).paginate(
         page=revizyon_page, per_page=per_page, error_out=False)
     isler_pagination = is_gunlugu_query.order_by(IsGunlugu.tarih.desc()).paginate(
         page=is_page, per_page=per_page, error_out=False)
@@ -429,26 +555,9 @@ def musteri_detay(musteri_id):
     
     # Revizyon sayısı artık her iş için ayrı takip ediliyor (is_gunlugu.revizyon_sayisi)
     
-    # Dashboard İstatistikleri
-    # 1. Toplam çalışma saati (iş günlüğünden)
-    toplam_dakika = db.session.query(func.sum(IsGunlugu.sure_dakika))\
-        .filter(IsGunlugu.musteri_id == musteri_id).scalar() or 0
-    toplam_saat = toplam_dakika / 60
-    
-    # 2. Onaylanan teslimatlar
-    onaylanan_teslimatlar = len([t for t in teslimatlar if t.durum in ['Tamamlandı', 'Teslim Edildi']])
-    
-    # 3. Devam eden teslimatlar
-    devam_eden_teslimatlar = len([t for t in teslimatlar if t.durum == 'Hazırlanıyor'])
-    
-    # 4. Toplam iş sayısı
-    toplam_is = len(isler)
-    
-    # 5. Toplam teslimat sayısı
-    toplam_teslimat = len(teslimatlar)
-    
-    # 6. Sosyal medya teslimat sayısı
-    sosyal_medya_teslimat = len([t for t in teslimatlar if t.teslim_turu == 'Sosyal Medya'])
+    # Dashboard İstatistikleri - musteri_ozet tablosundan tek satır okunur
+    # (sayfalanmış listeler yerine müşterinin tüm kayıtları üzerinden)
+    ozet = get_musteri_ozet(db, musteri_id)
     
     return render_template('musteri_detay.html',
                          musteri=musteri,
@@ -462,19 +571,23 @@ def musteri_detay(musteri_id):
                          onayda_bekleyenler=onayda_bekleyenler,
                          aramalar=aramalar,
                          aramalar_pagination=aramalar_pagination,
+                         is_page=is_page,
+                         teslimat_page=teslimat_page,
+                         revizyon_page=revizyon_page,
+                         arama_page=arama_page,
                          # Dashboard istatistikleri
-                         toplam_saat=toplam_saat,
-                         onaylanan_teslimatlar=onaylanan_teslimatlar,
-                         devam_eden_teslimatlar=devam_eden_teslimatlar,
-                         toplam_is=toplam_is,
-                         toplam_teslimat=toplam_teslimat,
-                         sosyal_medya_teslimat=sosyal_medya_teslimat)
+                         ozet=ozet,
+                         toplam_saat=ozet.toplam_dakika / 60,
+                         onaylanan_teslimatlar=ozet.onaylanan_teslimat,
+                         devam_eden_teslimatlar=ozet.devam_eden_teslimat,
+                         toplam_is=ozet.is_sayisi,
+                         toplam_teslimat=ozet.teslimat_sayisi,
+                         sosyal_medya_teslimat=ozet.sosyal_medya_teslimat)
 
 @app.route('/musteri_rapor/<int:musteri_id>')
 def musteri_rapor(musteri_id):
     """Müşteri raporlama sayfası - detaylı istatistikler"""
     from datetime import datetime, timedelta
-    from sqlalchemy import func
     
     musteri = Musteri.query.get_or_404(musteri_id)
     
@@ -524,49 +637,41 @@ def musteri_rapor(musteri_id):
         is_gunlugu_query = is_gunlugu_query.filter(IsGunlugu.tarih <= end_date)
         sosyal_medya_query = sosyal_medya_query.filter(SosyalMedya.tarih <= end_date)
     
-    teslimatlar = teslimatlar_query.order_by(Teslimat.teslim_tarihi.desc()).all()
-    revizyonlar = revizyon_query.order_by(Revizyon.tarih.desc()).all()
+    # İş kodu gösterimi için ilişkili işler (filtre dışı da olsa) ilişki üzerinden yüklenir
+    teslimatlar = teslimatlar_query.options(selectinload(Teslimat.is_gunlugu))\
+        .order_by(Teslimat.teslim_tarihi.desc()).all()
+    revizyonlar = revizyon_query.options(selectinload(Revizyon.is_gunlugu))\
+        .order_by(Revizyon.tarih.desc()).all()
     isler = is_gunlugu_query.order_by(IsGunlugu.tarih.desc()).all()
-    sosyal_medyalar = sosyal_medya_query.order_by(SosyalMedya.tarih.desc()).all()
-    
-    # Tüm işleri de al (iş kodu gösterimi için - filtre dışı da olsa)
-    tum_isler = IsGunlugu.query.filter_by(musteri_id=musteri_id).all()
+    sosyal_medyalar = sosyal_medya_query.options(selectinload(SosyalMedya.is_gunlugu))\
+        .order_by(SosyalMedya.tarih.desc()).all()
     
     # Dashboard İstatistikleri
-    # 1. Toplam çalışma saati (iş günlüğünden)
-    toplam_dakika_query = db.session.query(func.sum(IsGunlugu.sure_dakika))\
-        .filter(IsGunlugu.musteri_id == musteri_id)
-    if start_date:
-        toplam_dakika_query = toplam_dakika_query.filter(IsGunlugu.tarih >= start_date)
-    if end_date:
-        toplam_dakika_query = toplam_dakika_query.filter(IsGunlugu.tarih <= end_date)
-    toplam_dakika = toplam_dakika_query.scalar() or 0
-    toplam_saat = toplam_dakika / 60
-    
-    # 2. Onaylanan teslimatlar
-    onaylanan_teslimatlar = len([t for t in teslimatlar if t.durum in ['Tamamlandı', 'Teslim Edildi']])
-    
-    # 3. Devam eden teslimatlar
-    devam_eden_teslimatlar = len([t for t in teslimatlar if t.durum == 'Hazırlanıyor'])
-    
-    # 4. Toplam iş sayısı
-    toplam_is = len(isler)
-    
-    # 5. Toplam teslimat sayısı
-    toplam_teslimat = len(teslimatlar)
-    
-    # 6. Sosyal medya teslimat sayısı
-    sosyal_medya_teslimat = len([t for t in teslimatlar if t.teslim_turu == 'Sosyal Medya'])
-    
-    # 7. Revizyon sayısı
-    toplam_revizyon = len(revizyonlar)
+    if not start_date and not end_date:
+        # Tüm zamanlar: musteri_ozet tablosundan tek satır okunur
+        ozet = get_musteri_ozet(db, musteri_id)
+        toplam_saat = ozet.toplam_dakika / 60
+        onaylanan_teslimatlar = ozet.onaylanan_teslimat
+        devam_eden_teslimatlar = ozet.devam_eden_teslimat
+        toplam_is = ozet.is_sayisi
+        toplam_teslimat = ozet.teslimat_sayisi
+        sosyal_medya_teslimat = ozet.sosyal_medya_teslimat
+        toplam_revizyon = ozet.revizyon_sayisi
+    else:
+        # Dönem filtresinde listeler zaten tam yüklü, sayımlar onlardan yapılır
+        toplam_saat = sum(i.sure_dakika or 0 for i in isler) / 60
+        onaylanan_teslimatlar = len([t for t in teslimatlar if t.durum in ['Tamamlandı', 'Teslim Edildi']])
+        devam_eden_teslimatlar = len([t for t in teslimatlar if t.durum == 'Hazırlanıyor'])
+        toplam_is = len(isler)
+        toplam_teslimat = len(teslimatlar)
+        sosyal_medya_teslimat = len([t for t in teslimatlar if t.teslim_turu == 'Sosyal Medya'])
+        toplam_revizyon = len(revizyonlar)
     
     return render_template('musteri_rapor.html',
                          musteri=musteri,
                          teslimatlar=teslimatlar,
                          revizyonlar=revizyonlar,
                          isler=isler,
-                         tum_isler=tum_isler,
                          sosyal_medyalar=sosyal_medyalar,
                          filtre=filtre,
                          # Dashboard istatistikleri
@@ -614,8 +719,14 @@ def musteri_ekle():
 # İş günlüğü
 @app.route('/is_gunlugu')
 def is_gunlugu():
-    isler = IsGunlugu.query.all()
-    return render_template('is_gunlugu.html', isler=isler)
+    query, filtreler = apply_list_filters(IsGunlugu.query.options(joinedload(IsGunlugu.musteri)), IsGunlugu, request.args, IsGunlugu.tarih)
+    sayfa = keyset_paginate(query, IsGunlugu.id, IsGunlugu.tarih, cursor=request.args.get('cursor'),
+                            per_page=get_per_page(request.args))
+    return render_template('is_gunlugu.html',
+                         isler=sayfa.items,
+                         sayfa=sayfa,
+                         filtreler=filtreler,
+                         filtre_musteriler=get_filtre_musterileri())
 
 @app.route('/is_ekle', methods=['GET', 'POST'])
 def is_ekle():
@@ -669,8 +780,14 @@ def is_ekle():
 # Teslimatlar
 @app.route('/teslimatlar')
 def teslimatlar():
-    teslimatlar = Teslimat.query.all()
-    return render_template('teslimatlar.html', teslimatlar=teslimatlar)
+    query, filtreler = apply_list_filters(Teslimat.query.options(joinedload(Teslimat.musteri)), Teslimat, request.args, Teslimat.teslim_tarihi)
+    sayfa = keyset_paginate(query, Teslimat.id, Teslimat.teslim_tarihi, cursor=request.args.get('cursor'),
+                            per_page=get_per_page(request.args))
+    return render_template('teslimatlar.html',
+                         teslimatlar=sayfa.items,
+                         sayfa=sayfa,
+                         filtreler=filtreler,
+                         filtre_musteriler=get_filtre_musterileri())
 
 @app.route('/teslimat_ekle', methods=['GET', 'POST'])
 @app.route('/teslimat_ekle/<int:musteri_id>', methods=['GET', 'POST'])
@@ -717,8 +834,14 @@ def teslimat_ekle(musteri_id=None):
 # Sosyal medya
 @app.route('/sosyal_medya')
 def sosyal_medya():
-    sosyal_medyalar = SosyalMedya.query.all()
-    return render_template('sosyal_medya.html', sosyal_medyalar=sosyal_medyalar)
+    query, filtreler = apply_list_filters(SosyalMedya.query.options(joinedload(SosyalMedya.musteri)), SosyalMedya, request.args, SosyalMedya.tarih)
+    sayfa = keyset_paginate(query, SosyalMedya.id, SosyalMedya.tarih, cursor=request.args.get('cursor'),
+                            per_page=get_per_page(request.args))
+    return render_template('sosyal_medya.html',
+                         sosyal_medyalar=sayfa.items,
+                         sayfa=sayfa,
+                         filtreler=filtreler,
+                         filtre_musteriler=get_filtre_musterileri())
 
 @app.route('/sosyal_medya_ekle', methods=['GET', 'POST'])
 @app.route('/sosyal_medya_ekle/<int:musteri_id>', methods=['GET', 'POST'])
@@ -797,6 +920,103 @@ def api_is_tipi_dagilimi():
     data = get_is_tipi_dagilimi(db, start_date, end_date)
     return jsonify(data)
 
+# Tam metin arama (iş açıklaması, revizyon konusu, arama notları, müşteri notları)
+def _arama_sonuclari(q):
+    from src.utils.search import search
+
+    sonuclar = search(db, q,
+                      limit=max(1, min(request.args.get('limit', 20, type=int), 100)),
+                      kaynak=request.args.get('kaynak'),
+                      musteri_id=request.args.get('musteri_id', type=int))
+    for sonuc in sonuclar:
+        if sonuc['kaynak'] == 'arama':
+            sonuc['url'] = url_for('arama_duzenle', arama_id=sonuc['id'])
+        elif sonuc['musteri_id']:
+            sonuc['url'] = url_for('musteri_detay', musteri_id=sonuc['musteri_id'])
+        else:
+            sonuc['url'] = None
+    return sonuclar
+
+@app.route('/api/arama_ara')
+def api_arama_ara():
+    from src.utils.search import search_index_available
+
+    q = (request.args.get('q') or '').strip()
+    if not search_index_available(db):
+        return jsonify({'success': False, 'error': 'Arama indeksi yok, flask db-upgrade çalıştırın'}), 503
+    return jsonify({'q': q, 'sonuclar': _arama_sonuclari(q) if q else []})
+
+@app.route('/ara')
+def ara():
+    from src.utils.search import search_index_available
+
+    q = (request.args.get('q') or '').strip()
+    sonuclar = []
+    if q:
+        if search_index_available(db):
+            sonuclar = _arama_sonuclari(q)
+        else:
+            flash('Arama indeksi bulunamadı. Lütfen veritabanını güncelleyin (flask db-upgrade).', 'warning')
+    return render_template('ara.html', q=q, sonuclar=sonuclar)
+
+# API endpoint - İstatistik önbelleği isabet/ıskalama sayaçları
+@app.route('/api/cache_durumu')
+def api_cache_durumu():
+    return jsonify(query_cache.stats())
+
+# Prometheus metrikleri (METRICS_ENABLED)
+@app.route('/metrics')
+def metrics_endpoint():
+    if not metrics.etkin:
+        return jsonify({'error': 'Metrikler kapalı (METRICS_ENABLED=True ile açılır)'}), 404
+    govde, icerik_turu = metrics.render()
+    return Response(govde, content_type=icerik_turu)
+
+# Performans ölçümü: endpoint ortalamaları ve son istekler (?endpoint=... ile süzülür)
+@app.route('/_perf', methods=['GET', 'DELETE'])
+def perf_durumu():
+    if not perf_monitor.etkin:
+        return jsonify({'error': 'Performans ölçümü kapalı (PERF_ENABLED=True ile açılır)'}), 404
+    if request.method == 'DELETE':
+        perf_monitor.clear()
+        return jsonify({'durum': 'temizlendi'})
+    return jsonify(perf_monitor.snapshot(request.args.get('endpoint')))
+
+# Yavaş sorgular: normalize cümle başına sayı/süre, sorgu planı, endpoint ve çağrı yerleri
+@app.route('/_perf/slow', methods=['GET', 'DELETE'])
+def perf_yavas_sorgular():
+    if not slow_query_log.etkin:
+        return jsonify({'error': 'Yavaş sorgu günlüğü kapalı (SLOW_QUERY_ENABLED=True ile açılır)'}), 404
+    if request.method == 'DELETE':
+        slow_query_log.clear()
+        return jsonify({'durum': 'temizlendi'})
+    return jsonify(slow_query_log.snapshot())
+
+# İstek profilleri: en üst fonksiyonlar ve paket dağılımı (PROFILE_ENABLED)
+@app.route('/_profil')
+def profil_listesi():
+    if not request_profiler.etkin:
+        return jsonify({'error': 'Profilleme kapalı (PROFILE_ENABLED=True ile açılır)'}), 404
+    return render_template('profiller.html', profiller=request_profiler.listele(),
+                           profilleyici=request_profiler)
+
+@app.route('/_profil/<dosya>')
+def profil_indir(dosya):
+    from flask import send_file
+
+    yol = request_profiler.dosya_yolu(dosya) if request_profiler.etkin else None
+    if not yol:
+        return jsonify({'error': 'Profil bulunamadı'}), 404
+    return send_file(yol, as_attachment=True, download_name=dosya)
+
+@app.route('/_profil/temizle', methods=['POST'])
+def profil_temizle():
+    if not request_profiler.etkin:
+        return jsonify({'error': 'Profilleme kapalı (PROFILE_ENABLED=True ile açılır)'}), 404
+    request_profiler.clear()
+    flash('Profiller silindi.', 'success')
+    return redirect(url_for('profil_listesi'))
+
 # İş onay/red/revize route'ları
 @app.route('/is_onaya_gonder/<int:is_id>', methods=['POST'])
 def is_onaya_gonder(is_id):
@@ -876,6 +1096,7 @@ def revizyon_onayla(is_id):
         
         # Otomatik teslimat oluştur
         teslimat = Teslimat(
+            teslimat_kodu=generate_teslimat_kodu(musteri),
             is_gunlugu_id=is_id,
             musteri_id=is_gunlugu.musteri_id,
             baslik=is_gunlugu.aciklama or is_gunlugu.proje,
@@ -1139,32 +1360,22 @@ def teslimat_sil(teslimat_id):
     try:
         teslimat = Teslimat.query.get_or_404(teslimat_id)
         musteri_id = teslimat.musteri_id
-        
-        # İş günlüğünü bul
-        is_gunlugu = IsGunlugu.query.get(teslimat.is_gunlugu_id) if teslimat.is_gunlugu_id else None
-        is_kodu = is_gunlugu.is_kodu if is_gunlugu else 'Teslimat'
-        
-        # Önce teslimatı sil
-        db.session.delete(teslimat)
-        
-        # Eğer ilişkili iş günlüğü varsa, onu ve revizyonlarını da sil
-        if is_gunlugu:
-            # İlişkili revizyonları sil
-            Revizyon.query.filter_by(is_gunlugu_id=is_gunlugu.id).delete()
-            
-            # İlişkili sosyal medya kayıtlarını sil
-            SosyalMedya.query.filter_by(is_gunlugu_id=is_gunlugu.id).delete()
-            
-            # İş günlüğünü sil
-            db.session.delete(is_gunlugu)
-            logger.info(f"İş günlüğü silindi: {is_kodu}")
-        
+        is_kodu = teslimat.is_gunlugu.is_kodu if teslimat.is_gunlugu else 'Teslimat'
+
+        # Teslimat, bağlı iş ve işin revizyon/sosyal medya kayıtları set tabanlı silinir
+        silinenler = delete_teslimat(db, teslimat)
         db.session.commit()
-        
-        flash(f'{is_kodu} teslimatı ve ilişkili iş kaydı tamamen silindi!', 'success')
+
+        if request.accept_mimetypes.best == 'application/json':
+            return jsonify({'success': True, 'silinenler': silinenler})
+
+        logger.info(f"Teslimat silindi: {is_kodu} - {silinenler}")
+        flash(f'{is_kodu} teslimatı ve ilişkili iş kaydı tamamen silindi! ({format_silinenler(silinenler)})', 'success')
     except Exception as e:
         db.session.rollback()
         logger.error(f"Teslimat silme hatası: {str(e)}", exc_info=True)
+        if request.accept_mimetypes.best == 'application/json':
+            return jsonify({'success': False, 'error': str(e)}), 500
         flash(f'Hata: {str(e)}', 'error')
     
     return redirect(url_for('musteri_detay', musteri_id=musteri_id))
@@ -1172,40 +1383,67 @@ def teslimat_sil(teslimat_id):
 # Excel import/export
 @app.route('/excel_import', methods=['GET', 'POST'])
 def excel_import():
+    """
+    Excel içe aktarma: dosya yüklenince önce kuru çalıştırma (eklenecek /
+    güncellenecek / değişmeyen) gösterilir, onaylanınca yalnızca farklar yazılır
+    """
     if request.method == 'POST':
+        # Onay adımı: önizlemesi gösterilen dosya yeniden planlanıp uygulanır
+        if request.form.get('dosya'):
+            filepath = os.path.join(app.config['UPLOAD_FOLDER'], secure_filename(request.form['dosya']))
+            if not os.path.exists(filepath):
+                flash('Önizlenen dosya bulunamadı, lütfen tekrar yükleyin.', 'error')
+                return redirect(url_for('excel_import'))
+
+            try:
+                plan = plan_import(db, read_workbook(filepath))
+                if plan['hatalar']:
+                    flash(f"{len(plan['hatalar'])} hata bulundu, hiçbir kayıt aktarılmadı.", 'error')
+                    return render_template('excel_import.html', hatalar=plan['hatalar'][:200],
+                                           hata_sayisi=len(plan['hatalar']))
+                sonuc = apply_import(db, plan)
+            except Exception as e:
+                logger.error(f"Excel içe aktarma hatası: {str(e)}", exc_info=True)
+                flash(f'Hata: {str(e)}', 'error')
+                return redirect(url_for('excel_import'))
+
+            os.remove(filepath)
+            ozet = ', '.join(f"{plan['varliklar'][varlik]['sayfa']}: {adet['eklenen']} yeni, "
+                             f"{adet['guncellenen']} güncellendi" for varlik, adet in sonuc.items())
+            logger.info(f"Excel içe aktarma tamamlandı - {ozet}")
+            flash(f'Excel verisi başarıyla içe aktarıldı! ({ozet})')
+            return redirect(url_for('index'))
+
         file = request.files['file']
         if file and file.filename.endswith('.xlsx'):
-            filename = secure_filename(file.filename)
+            # Önizleme ile onay arasında aynı adlı başka yükleme dosyayı ezmesin
+            filename = f"import_{datetime.now():%Y%m%d%H%M%S%f}_{secure_filename(file.filename)}"
             filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
             file.save(filepath)
 
-            # Excel'den veri oku ve veritabanına aktar
-            df = pd.read_excel(filepath)
-
-            # Müşterileri içe aktar
-            if 'Müşteri Adı' in df.columns:
-                for _, row in df.iterrows():
-                    musteri = Musteri(
-                        ad=row['Müşteri Adı'],
-                        sektor=row.get('Sektör', ''),
-                        aylik_ucret=row.get('Aylık Ücret (TL)', 0),
-                        ilgil_kisi=row.get('İlgili Kişi', ''),
-                        telefon=row.get('Telefon', ''),
-                        email=row.get('E-posta', ''),
-                        notlar=row.get('Notlar', '')
-                    )
-                    db.session.add(musteri)
+            try:
+                plan = plan_import(db, read_workbook(filepath))
+            except Exception as e:
+                logger.error(f"Excel okuma hatası: {str(e)}", exc_info=True)
+                flash(f'Hata: {str(e)}', 'error')
+                return render_template('excel_import.html')
+
+            if plan['hatalar']:
+                os.remove(filepath)
+                flash(f"{len(plan['hatalar'])} hata bulundu, hiçbir kayıt aktarılmadı.", 'error')
+                return render_template('excel_import.html', hatalar=plan['hatalar'][:200],
+                                       hata_sayisi=len(plan['hatalar']))
 
-            db.session.commit()
-            flash('Excel verisi başarıyla içe aktarıldı!')
-            return redirect(url_for('index'))
+            return render_template('excel_import.html', plan=plan, dosya=filename)
 
     return render_template('excel_import.html')
 
 # CRM - Arama Kayıtları
 @app.route('/aramalar')
 def aramalar():
-    aramalar = Arama.query.order_by(Arama.tarih.desc()).all()
+    query, filtreler = apply_list_filters(Arama.query, Arama, request.args, Arama.tarih)
+    sayfa = keyset_paginate(query, Arama.id, Arama.tarih, cursor=request.args.get('cursor'),
+                            per_page=get_per_page(request.args))
     # Geri dönüş gereken aramalar
     from datetime import date
     today = date.today()
@@ -1215,7 +1453,10 @@ def aramalar():
         Arama.durum == 'Bekliyor'
     ).count()
     return render_template('aramalar.html', 
-                         aramalar=aramalar,
+                         aramalar=sayfa.items,
+                         sayfa=sayfa,
+                         filtreler=filtreler,
+                         filtre_musteriler=get_filtre_musterileri(),
                          geri_donus_gereken=geri_donus_gereken)
 
 @app.route('/arama_ekle', methods=['GET', 'POST'])
@@ -1311,67 +1552,232 @@ def arama_sil(arama_id):
         flash(f'Hata: {str(e)}', 'error')
     return redirect(url_for('aramalar'))
 
+# Müşteri raporları: indirme route'ları ve arka plan rapor işleri aynı fonksiyonları kullanır
+def rapor_tarih_araligi(filtre, baslangic=None, bitis=None):
+    """Rapor filtresinden (ay, yil, 6ay, ozel, tumu) başlangıç ve bitiş tarihi"""
+    from datetime import timedelta
+    today = datetime.now().date()
+    if filtre == 'ay':
+        return datetime(today.year, today.month, 1).date(), None
+    if filtre == 'yil':
+        return datetime(today.year, 1, 1).date(), None
+    if filtre == '6ay':
+        return today - timedelta(days=180), None
+    if filtre == 'ozel' and baslangic and bitis:
+        return datetime.strptime(baslangic, '%Y-%m-%d').date(), datetime.strptime(bitis, '%Y-%m-%d').date()
+    return None, None  # 'tumu'
+
+def guvenli_dosya_adi(ad):
+    """Dosya adı için boşlukları ve Türkçe karakterleri temizler"""
+    return ad.replace(' ', '_').replace('ş', 's').replace('ğ', 'g').replace('ü', 'u').replace('ö', 'o').replace('ç', 'c').replace('ı', 'i').replace('/', '-').replace('\\', '-')
+
+def excel_rapor_dosya_adi(musteri, filtre, baslangic=None, bitis=None):
+    """Excel raporu indirme adı (ör. Firma_Rapor_2025_03.xlsx)"""
+    today = datetime.now().date()
+    if filtre == 'ay':
+        tarih_str = today.strftime('%Y_%m')
+    elif filtre == 'yil':
+        tarih_str = str(today.year)
+    elif filtre == 'ozel' and baslangic and bitis:
+        tarih_str = f"{baslangic}_{bitis}"
+    else:
+        tarih_str = datetime.now().strftime('%Y%m%d')
+    return f"{guvenli_dosya_adi(musteri.ad)}_Rapor_{tarih_str}.xlsx"
+
+def word_rapor_dosya_adi(musteri):
+    """Word raporu indirme adı (ör. Firma_20250301_101500_rapor.docx)"""
+    return f"{guvenli_dosya_adi(musteri.ad)}_{datetime.now():%Y%m%d_%H%M%S}_rapor.docx"
+
+def build_musteri_excel(musteri, start_date, end_date, hedef, write_only=None, ilerleme=None):
+    """
+    Müşterinin Excel raporunu (7 sayfa) hedefe yazar
+
+    Args:
+        musteri: Musteri
+        start_date, end_date: Tarih aralığı (None: sınırsız)
+        hedef: Dosya yolu veya BytesIO
+        write_only: None ise satır sayısına göre RAPOR_WRITE_ONLY_SATIR eşiğiyle seçilir
+        ilerleme: İsteğe bağlı ilerleme(yuzde, mesaj) geri çağrısı
+    """
+    musteri_id = musteri.id
+    
+    # Verileri çek ve filtrele
+    isler_query = IsGunlugu.query.filter_by(musteri_id=musteri_id)
+    teslimatlar_query = Teslimat.query.filter_by(musteri_id=musteri_id)
+    revizyonlar_query = Revizyon.query.filter_by(musteri_id=musteri_id)
+    sosyal_medya_query = SosyalMedya.query.filter_by(musteri_id=musteri_id)
+    aramalar_query = Arama.query.filter_by(musteri_id=musteri_id)
+    
+    if start_date:
+        isler_query = isler_query.filter(IsGunlugu.tarih >= start_date)
+        teslimatlar_query = teslimatlar_query.filter(Teslimat.teslim_tarihi >= start_date)
+        revizyonlar_query = revizyonlar_query.filter(Revizyon.tarih >= start_date)
+        sosyal_medya_query = sosyal_medya_query.filter(SosyalMedya.tarih >= start_date)
+        aramalar_query = aramalar_query.filter(Arama.tarih >= start_date)
+    
+    if end_date:
+        isler_query = isler_query.filter(IsGunlugu.tarih <= end_date)
+        teslimatlar_query = teslimatlar_query.filter(Teslimat.teslim_tarihi <= end_date)
+        revizyonlar_query = revizyonlar_query.filter(Revizyon.tarih <= end_date)
+        sosyal_medya_query = sosyal_medya_query.filter(SosyalMedya.tarih <= end_date)
+        aramalar_query = aramalar_query.filter(Arama.tarih <= end_date)
+    
+    # İş kodları ilişkiden okunur; işler satır başına değil, tablo başına tek sorguyla yüklenir
+    isler = isler_query.order_by(IsGunlugu.tarih.desc()).all()
+    teslimatlar = teslimatlar_query.options(selectinload(Teslimat.is_gunlugu))\
+        .order_by(Teslimat.teslim_tarihi.desc()).all()
+    revizyonlar = revizyonlar_query.options(selectinload(Revizyon.is_gunlugu))\
+        .order_by(Revizyon.tarih.desc()).all()
+    sosyal_medyalar = sosyal_medya_query.options(selectinload(SosyalMedya.is_gunlugu))\
+        .order_by(SosyalMedya.tarih.desc()).all()
+    aramalar = aramalar_query.order_by(Arama.tarih.desc()).all()
+    
+    if ilerleme:
+        ilerleme(30, 'Veriler yüklendi')
+    
+    # Excel oluştur - büyük müşterilerde satırlar write-only modunda diske akıtılır
+    if write_only is None:
+        toplam_satir = len(isler) + len(teslimatlar) + len(revizyonlar) + len(sosyal_medyalar) + len(aramalar)
+        write_only = toplam_satir > app.config['RAPOR_WRITE_ONLY_SATIR']
+    
+    write_musteri_excel(hedef, isler, teslimatlar, revizyonlar, sosyal_medyalar, aramalar,
+                        write_only=write_only, ilerleme=ilerleme)
+
+def build_musteri_word(musteri, start_date, end_date, hedef, ilerleme=None):
+    """Müşterinin Word raporunu oluşturup hedefe (dosya yolu veya BytesIO) kaydeder"""
+    from src.utils.report_generator import generate_musteri_raporu
+    
+    doc = generate_musteri_raporu(db, musteri, start_date, end_date)
+    if ilerleme:
+        ilerleme(80, 'Belge oluşturuldu')
+    doc.save(hedef)
+
+# Rapor türü: (üretici, uzantı, indirme adı)
+RAPOR_TURLERI = {
+    'excel': (build_musteri_excel, '.xlsx', excel_rapor_dosya_adi),
+    'word': (build_musteri_word, '.docx', lambda musteri, *_: word_rapor_dosya_adi(musteri)),
+}
+RAPOR_MIMETYPE = {
+    'excel': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'word': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+
+def musteri_raporu_dosyasi(tur, musteri, filtre, baslangic=None, bitis=None, ilerleme=None):
+    """
+    Müşteri raporunu önbellekten verir, yoksa üretip önbelleğe koyar
+
+    Returns:
+        tuple: (dosya yolu, indirme adı, önbellekten mi)
+    """
+    build, uzanti, dosya_adi = RAPOR_TURLERI[tur]
+    start_date, end_date = rapor_tarih_araligi(filtre, baslangic, bitis)
+    baslama = time.perf_counter()
+    yol, isabet = report_cache.get_or_build(
+        tur, musteri.id, start_date, end_date, uzanti,
+        lambda hedef: build(musteri, start_date, end_date, hedef, ilerleme=ilerleme)
+    )
+    metrics.count_cache('rapor', isabet)
+    if not isabet:
+        metrics.observe_report(tur, time.perf_counter() - baslama)
+    return yol, dosya_adi(musteri, filtre, baslangic, bitis), isabet
+
+def musteri_raporu_yaniti(tur, musteri):
+    """
+    Müşteri raporu indirme yanıtı
+
+    Rapor önbellekteyse dosya hemen döner. Yoksa rapor arka plan kuyruğuna
+    eklenir ve "hazırlanıyor" sayfası (202) döner; sayfa işi yoklar, hazır
+    olunca indirir. ?senkron=1 raporu istek içinde üretir (kuyruk
+    kullanılamadığında son çare).
+    """
+    from flask import send_file
+
+    filtre = request.args.get('filtre', 'ay')
+    baslangic, bitis = request.args.get('baslangic'), request.args.get('bitis')
+    if request.args.get('senkron') == '1':
+        dosya_yolu, dosya_adi, _ = musteri_raporu_dosyasi(tur, musteri, filtre, baslangic, bitis)
+    else:
+        start_date, end_date = rapor_tarih_araligi(filtre, baslangic, bitis)
+        dosya_yolu = report_cache.lookup(tur, musteri.id, start_date, end_date)
+        if dosya_yolu is None:
+            parametreler = {'filtre': filtre}
+            if filtre == 'ozel':
+                parametreler.update(baslangic=baslangic, bitis=bitis)
+            is_id = job_queue.submit(tur, musteri.id, parametreler)
+            # Sorgu dizesindeki senkron / musteri_id url_for argümanlarıyla çakışmasın
+            args = request.args.to_dict()
+            args.pop('senkron', None)
+            args.pop('musteri_id', None)
+            return render_template('rapor_hazirlaniyor.html', musteri=musteri, tur=tur, filtre=filtre,
+                                   durum_url=url_for('rapor_isi_durumu', is_id=is_id),
+                                   senkron_url=url_for(request.endpoint, musteri_id=musteri.id,
+                                                       **args, senkron='1')), 202
+        metrics.count_cache('rapor', True)
+        dosya_adi = RAPOR_TURLERI[tur][2](musteri, filtre, baslangic, bitis)
+
+    return send_file(dosya_yolu, mimetype=RAPOR_MIMETYPE[tur], as_attachment=True, download_name=dosya_adi)
+
+def rapor_isleyici(tur):
+    """Arka plan kuyruğu için rapor işleyicisi"""
+    def isleyici(musteri_id, parametreler, ilerleme):
+        musteri = db.session.get(Musteri, musteri_id)
+        if musteri is None:
+            raise ValueError('Müşteri bulunamadı')
+        ilerleme(10, 'Veriler yükleniyor')
+        yol, dosya_adi, _ = musteri_raporu_dosyasi(tur, musteri, parametreler.get('filtre', 'ay'),
+                                                  parametreler.get('baslangic'), parametreler.get('bitis'),
+                                                  ilerleme=ilerleme)
+        return yol, dosya_adi
+    return isleyici
+
+report_cache.configure(db, os.path.join(app.config['UPLOAD_FOLDER'], 'rapor_onbellek'),
+                       maks_boyut=app.config['RAPOR_ONBELLEK_MAKS_MB'] * 1024 * 1024,
+                       maks_yas=app.config['RAPOR_ONBELLEK_MAKS_GUN'] * 24 * 3600)
+job_queue.configure(app, db,
+                    isci_sayisi=app.config['RAPOR_ISCI_SAYISI'],
+                    eszamanli_limit=app.config['RAPOR_ESZAMANLI_LIMIT'],
+                    zaman_asimi=app.config['RAPOR_IS_ZAMAN_ASIMI'],
+                    saklama_gun=app.config['RAPOR_IS_SAKLAMA_GUN'])
+def toplu_rapor_klasoru():
+    return os.path.join(app.config['UPLOAD_FOLDER'], 'toplu_rapor')
+
+def toplu_rapor_isleyici(musteri_id, parametreler, ilerleme):
+    """Arka plan kuyruğu için toplu dönem raporu işleyicisi (zip döner)"""
+    from src.utils.batch_reports import generate_batch, donem_araligi, donem_adi, TURLER
+
+    if parametreler.get('baslangic') and parametreler.get('bitis'):
+        start_date = datetime.strptime(parametreler['baslangic'], '%Y-%m-%d').date()
+        end_date = datetime.strptime(parametreler['bitis'], '%Y-%m-%d').date()
+    else:
+        start_date, end_date = donem_araligi(parametreler.get('ay'))
+    baslama = time.perf_counter()
+    sonuc = generate_batch(db, start_date, end_date, toplu_rapor_klasoru(),
+                           musteri_idler=parametreler.get('musteri_idler'),
+                           turler=parametreler.get('turler') or TURLER,
+                           hepsi=bool(parametreler.get('hepsi')),
+                           isci_sayisi=app.config['TOPLU_RAPOR_ISCI_SAYISI'] or None,
+                           write_only_sinir=app.config['RAPOR_WRITE_ONLY_SATIR'],
+                           ilerleme=ilerleme)
+    metrics.observe_report('toplu', time.perf_counter() - baslama)
+    return sonuc['zip'], f"Toplu_Rapor_{donem_adi(start_date, end_date)}.zip"
+
+for _tur in RAPOR_TURLERI:
+    job_queue.register(_tur, rapor_isleyici(_tur))
+job_queue.register('toplu', toplu_rapor_isleyici)
+
+@app.before_request
+def rapor_kuyrugunu_baslat():
+    """Yeniden başlatmadan sonra bekleyen işler ilk istekte işçilere alınır"""
+    job_queue.start()
+
 # Müşteri raporu Word indirme
 @app.route('/musteri/<int:musteri_id>/rapor')
 def musteri_rapor_indir(musteri_id):
     try:
-        from src.utils.report_generator import generate_musteri_raporu
-        from datetime import datetime, timedelta
-        from flask import send_file
-        import os
-        
         musteri = Musteri.query.get_or_404(musteri_id)
         
-        # Filtre parametresi
-        filtre = request.args.get('filtre', 'ay')
-        today = datetime.now().date()
-        
-        # Tarih aralığını belirle
-        if filtre == 'ay':
-            start_date = datetime(today.year, today.month, 1).date()
-            end_date = None
-        elif filtre == 'yil':
-            start_date = datetime(today.year, 1, 1).date()
-            end_date = None
-        elif filtre == '6ay':
-            start_date = today - timedelta(days=180)
-            end_date = None
-        else:  # 'tumu'
-            start_date = None
-            end_date = None
-        
-        # Upload klasörünün var olduğundan emin ol
-        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-        
-        # Rapor oluştur
-        doc = generate_musteri_raporu(db, musteri, start_date, end_date)
-        
-        # Dosya adı oluştur (Türkçe karakterleri temizle)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_name = musteri.ad.replace(' ', '_').replace('ş', 's').replace('ğ', 'g').replace('ü', 'u').replace('ö', 'o').replace('ç', 'c').replace('ı', 'i')
-        filename = f"{safe_name}_{timestamp}_rapor.docx"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        
-        # Kaydet
-        doc.save(filepath)
-        
-        # İndir (Flask versiyonuna göre uyumlu)
-        try:
-            # Flask 2.0+ için download_name
-            return send_file(
-                filepath,
-                as_attachment=True,
-                download_name=filename,
-                mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-            )
-        except TypeError:
-            # Flask 1.x için attachment_filename
-            return send_file(
-                filepath,
-                as_attachment=True,
-                attachment_filename=filename,
-                mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-            )
+        # Önbellekteyse hemen iner, yoksa arka planda hazırlanır
+        return musteri_raporu_yaniti('word', musteri)
     except ImportError as e:
         logger.error(f"Import hatası: {str(e)}", exc_info=True)
         flash(f'Rapor modülü yüklenemedi. Lütfen python-docx kütüphanesinin kurulu olduğundan emin olun: {str(e)}', 'error')
@@ -1383,327 +1789,250 @@ def musteri_rapor_indir(musteri_id):
 
 @app.route('/excel_export')
 def excel_export():
-    # Tüm verileri Excel'e export et
-    with pd.ExcelWriter('ajans_raporu.xlsx', engine='openpyxl') as writer:
-        # Müşteriler
-        musteriler = pd.read_sql('SELECT * FROM musteri', db.engine)
-        musteriler.to_excel(writer, sheet_name='Müşteriler', index=False)
-
-        # İş günlüğü
-        isler = pd.read_sql('SELECT * FROM is_gunlugu', db.engine)
-        isler.to_excel(writer, sheet_name='İş Günlüğü', index=False)
+    """Tüm verileri akışlı olarak indirir (?format=xlsx | csv | jsonl)"""
+    bicim = request.args.get('format', 'xlsx')
+    if bicim not in EXPORT_BICIMLERI:
+        return jsonify({'error': f"Desteklenmeyen biçim: {bicim}"}), 400
 
-        # Teslimatlar
-        teslimatlar = pd.read_sql('SELECT * FROM teslimat', db.engine)
-        teslimatlar.to_excel(writer, sheet_name='Teslimatlar', index=False)
-
-        # Sosyal medya
-        sosyal = pd.read_sql('SELECT * FROM sosyal_medya', db.engine)
-        sosyal.to_excel(writer, sheet_name='Sosyal Medya', index=False)
-
-    flash('Veriler Excel dosyasına export edildi!')
-    return redirect(url_for('index'))
+    govde, mimetype, dosya_adi = export_stream(db, bicim)
+    return Response(stream_with_context(govde), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={dosya_adi}'})
 
 # Müşteri Excel Raporu İndirme
 @app.route('/musteri_rapor_excel/<int:musteri_id>')
 def musteri_rapor_excel(musteri_id):
-    """Excel formatında müşteri raporu indir"""
+    """Excel formatında müşteri raporu indir (önbellekte yoksa arka planda hazırlanır)"""
     try:
-        import pandas as pd
-        from io import BytesIO
-        from datetime import datetime, timedelta
-        from flask import send_file
-        
         musteri = Musteri.query.get_or_404(musteri_id)
         
-        # Filtre parametresi
-        filtre = request.args.get('filtre', 'ay')
-        today = datetime.now().date()
-        
-        # Tarih aralığını belirle
-        if filtre == 'ay':
-            start_date = datetime(today.year, today.month, 1).date()
-            end_date = None
-        elif filtre == 'yil':
-            start_date = datetime(today.year, 1, 1).date()
-            end_date = None
-        elif filtre == '6ay':
-            start_date = today - timedelta(days=180)
-            end_date = None
-        elif filtre == 'ozel':
-            # Özel tarih aralığı
-            baslangic = request.args.get('baslangic')
-            bitis = request.args.get('bitis')
-            if baslangic and bitis:
-                start_date = datetime.strptime(baslangic, '%Y-%m-%d').date()
-                end_date = datetime.strptime(bitis, '%Y-%m-%d').date()
-            else:
-                start_date = None
-                end_date = None
-        else:  # 'tumu'
-            start_date = None
-            end_date = None
-        
-        # Verileri çek ve filtrele
-        isler_query = IsGunlugu.query.filter_by(musteri_id=musteri_id)
-        teslimatlar_query = Teslimat.query.filter_by(musteri_id=musteri_id)
-        revizyonlar_query = Revizyon.query.filter_by(musteri_id=musteri_id)
-        sosyal_medya_query = SosyalMedya.query.filter_by(musteri_id=musteri_id)
-        aramalar_query = Arama.query.filter_by(musteri_id=musteri_id)
-        
-        if start_date:
-            isler_query = isler_query.filter(IsGunlugu.tarih >= start_date)
-            teslimatlar_query = teslimatlar_query.filter(Teslimat.teslim_tarihi >= start_date)
-            revizyonlar_query = revizyonlar_query.filter(Revizyon.tarih >= start_date)
-            sosyal_medya_query = sosyal_medya_query.filter(SosyalMedya.tarih >= start_date)
-            aramalar_query = aramalar_query.filter(Arama.tarih >= start_date)
-        
-        if end_date:
-            isler_query = isler_query.filter(IsGunlugu.tarih <= end_date)
-            teslimatlar_query = teslimatlar_query.filter(Teslimat.teslim_tarihi <= end_date)
-            revizyonlar_query = revizyonlar_query.filter(Revizyon.tarih <= end_date)
-            sosyal_medya_query = sosyal_medya_query.filter(SosyalMedya.tarih <= end_date)
-            aramalar_query = aramalar_query.filter(Arama.tarih <= end_date)
-        
-        isler = isler_query.order_by(IsGunlugu.tarih.desc()).all()
-        teslimatlar = teslimatlar_query.order_by(Teslimat.teslim_tarihi.desc()).all()
-        revizyonlar = revizyonlar_query.order_by(Revizyon.tarih.desc()).all()
-        sosyal_medyalar = sosyal_medya_query.order_by(SosyalMedya.tarih.desc()).all()
-        aramalar = aramalar_query.order_by(Arama.tarih.desc()).all()
-        
-        # Excel oluştur
-        output = BytesIO()
-        
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            # Sheet 1: Özet
-            # Sosyal medya: Teslimatlardan + Manuel
-            sosyal_medya_teslimatlar = [t for t in teslimatlar if t.teslim_turu == 'Sosyal Medya']
-            toplam_sosyal_medya = len(sosyal_medya_teslimatlar) + len(sosyal_medyalar)
-            
-            ozet_data = {
-                'Metrik': ['Toplam İş', 'Toplam Teslimat', 'Toplam Revizyon', 'Toplam Sosyal Medya', 
-                          'Toplam Arama/Toplantı', 'Onaylanan Teslimat', 'Bekleyen Teslimat', 'Toplam Süre (saat)'],
-                'Değer': [
-                    len(isler),
-                    len(teslimatlar),
-                    len(revizyonlar),
-                    toplam_sosyal_medya,  # Teslimat + Manuel
-                    len(aramalar),
-                    len([t for t in teslimatlar if t.durum in ['Tamamlandı', 'Teslim Edildi']]),
-                    len([t for t in teslimatlar if t.durum == 'Hazırlanıyor']),
-                    round(sum([is_item.sure_dakika or 0 for is_item in isler]) / 60, 1)
-                ]
-            }
-            pd.DataFrame(ozet_data).to_excel(writer, sheet_name='Özet', index=False)
-            
-            # Sheet 2: İş Günlüğü Detaylı (AI-Friendly)
-            is_data = []
-            for is_item in isler:
-                is_data.append({
-                    'İş Kodu': is_item.is_kodu,
-                    'Tarih': is_item.tarih.strftime('%d.%m.%Y') if is_item.tarih else '',
-                    'Proje': is_item.proje or '',
-                    'Aktivite Türü': is_item.aktivite_turu or '',
-                    'İş Açıklaması': is_item.aciklama or '',  # Tam metin
-                    'Ne Yapıldı': is_item.ne_yapildi or '',  # Revizyon yoksa ne yapıldı
-                    'Sorumlu': is_item.sorumlu_kisi or '',
-                    'Süre (dk)': is_item.sure_dakika or 0,
-                    'Süre (saat)': round((is_item.sure_dakika or 0) / 60, 1),
-                    'Durum': is_item.durum or '',
-                    'Revizyon Sayısı': is_item.revizyon_sayisi or 0
-                })
-            pd.DataFrame(is_data).to_excel(writer, sheet_name='İş Günlüğü', index=False)
-            
-            # Sheet 3: Teslimatlar
-            teslimat_data = []
-            for teslimat in teslimatlar:
-                # İş kodunu bul
-                is_gunlugu = IsGunlugu.query.get(teslimat.is_gunlugu_id) if teslimat.is_gunlugu_id else None
-                teslimat_data.append({
-                    'İş Kodu': is_gunlugu.is_kodu if is_gunlugu else '-',
-                    'Başlık': teslimat.baslik or '',
-                    'Tür': teslimat.teslim_turu or '',
-                    'Sorumlu': teslimat.sorumlu_kisi or '',
-                    'Teslim Tarihi': teslimat.teslim_tarihi.strftime('%d.%m.%Y') if teslimat.teslim_tarihi else '',
-                    'Durum': teslimat.durum or '',
-                    'Platform': teslimat.platform or '',
-                    'Gönderi Türü': teslimat.gonderi_turu or '',
-                    'Etkileşim': teslimat.etkileşim or 0,
-                    'Görüntülenme': teslimat.goruntulenme or 0,
-                    'Beğeni': teslimat.begeni or 0,
-                    'Yorum': teslimat.yorum or 0,
-                    'Paylaşım': teslimat.paylasim or 0
-                })
-            pd.DataFrame(teslimat_data).to_excel(writer, sheet_name='Teslimatlar', index=False)
-            
-            # Sheet 4: Revizyonlar Detaylı (AI-Friendly)
-            revizyon_data = []
-            for revizyon in revizyonlar:
-                # İş kodunu bul
-                is_gunlugu = IsGunlugu.query.get(revizyon.is_gunlugu_id) if revizyon.is_gunlugu_id else None
-                revizyon_data.append({
-                    'İş Kodu': is_gunlugu.is_kodu if is_gunlugu else '-',
-                    'Revizyon No': revizyon.revizyon_numarasi or 1,
-                    'Başlık': revizyon.baslik or '',
-                    'Tarih': revizyon.tarih.strftime('%d.%m.%Y') if revizyon.tarih else '',
-                    'Talep Eden': revizyon.revize_talep_eden or '',
-                    'Revizyon Konusu': revizyon.revize_konusu or '',  # Tam metin
-                    'Ne Yapıldı': revizyon.ne_yapildi or '',  # Tam metin
-                    'Durum': revizyon.durum or ''
-                })
-            pd.DataFrame(revizyon_data).to_excel(writer, sheet_name='Revizyonlar', index=False)
-            
-            # Sheet 5: Sosyal Medya
-            sm_data = []
-            # Teslimatlardan sosyal medya
-            for teslimat in [t for t in teslimatlar if t.teslim_turu == 'Sosyal Medya']:
-                is_gunlugu = IsGunlugu.query.get(teslimat.is_gunlugu_id) if teslimat.is_gunlugu_id else None
-                sm_data.append({
-                    'İş Kodu': is_gunlugu.is_kodu if is_gunlugu else '-',
-                    'Tarih': teslimat.teslim_tarihi.strftime('%d.%m.%Y') if teslimat.teslim_tarihi else '',
-                    'Platform': teslimat.platform or '',
-                    'Gönderi Türü': teslimat.gonderi_turu or '',
-                    'Etkileşim': teslimat.etkileşim or 0,
-                    'Görüntülenme': teslimat.goruntulenme or 0,
-                    'Beğeni': teslimat.begeni or 0,
-                    'Yorum': teslimat.yorum or 0,
-                    'Paylaşım': teslimat.paylasim or 0,
-                    'Kaynak': 'Teslimat'
-                })
-            
-            # Manuel sosyal medya
-            for sm in sosyal_medyalar:
-                is_gunlugu = IsGunlugu.query.get(sm.is_gunlugu_id) if sm.is_gunlugu_id else None
-                sm_data.append({
-                    'İş Kodu': is_gunlugu.is_kodu if is_gunlugu else '-',
-                    'Tarih': sm.tarih.strftime('%d.%m.%Y') if sm.tarih else '',
-                    'Platform': sm.platform or '',
-                    'Gönderi Türü': sm.gonderi_turu or '',
-                    'Etkileşim': sm.etkileşim or 0,
-                    'Görüntülenme': sm.goruntulenme or 0,
-                    'Beğeni': sm.begeni or 0,
-                    'Yorum': sm.yorum or 0,
-                    'Paylaşım': sm.paylasim or 0,
-                    'Kaynak': 'Manuel'
-                })
-            pd.DataFrame(sm_data).to_excel(writer, sheet_name='Sosyal Medya', index=False)
-            
-            # Sheet 6: Aramalar / Toplantılar
-            arama_data = []
-            for arama in aramalar:
-                arama_data.append({
-                    'Tarih': arama.tarih.strftime('%d.%m.%Y') if arama.tarih else '',
-                    'Arayan/Aranan': arama.arayan_aranan or '',
-                    'Konu': arama.konu or '',
-                    'Sonuç': arama.sonuc or '',
-                    'Sorumlu': arama.sorumlu_kisi or '',
-                    'Notlar': arama.notlar or '',
-                    'Geri Dönüş Tarihi': arama.geri_donus_tarihi.strftime('%d.%m.%Y') if arama.geri_donus_tarihi else '',
-                    'Durum': arama.durum or ''
-                })
-            pd.DataFrame(arama_data).to_excel(writer, sheet_name='Aramalar', index=False)
-            
-            # Sheet 7: AI Analiz Özeti (Yapay Zeka için özel sheet)
-            # Revizyon konularını frekansa göre say
-            from collections import Counter
-            revizyon_konulari = [r.revize_konusu for r in revizyonlar if r.revize_konusu]
-            top_konular = Counter(revizyon_konulari).most_common(5)
-            top_konular_str = '\n'.join([f"{i+1}. {konu[:100]} ({sayi} kez)" for i, (konu, sayi) in enumerate(top_konular)]) if top_konular else 'Revizyon yok'
-            
-            # En çok revize edilen iş
-            en_cok_revizeli_is = max(isler, key=lambda x: x.revizyon_sayisi or 0) if isler else None
-            
-            ai_ozet = {
-                'Metrik': [
-                    'Toplam İş Sayısı',
-                    'Toplam Revizyon Sayısı',
-                    'Ortalama Revizyon/İş',
-                    'En Çok Revize Edilen İş Kodu',
-                    'En Çok Revize Edilen İş - Revizyon Sayısı',
-                    'Toplam Revize Edilen İş',
-                    'Revizyonsuz Tamamlanan İş',
-                    'Revizyon Oranı (%)',
-                    'En Sık Revizyon Konuları (Top 5)',
-                    'Müşteri Memnuniyetsizlik Analizi'
-                ],
-                'Değer': [
-                    len(isler),
-                    len(revizyonlar),
-                    round(len(revizyonlar) / len(isler), 2) if len(isler) > 0 else 0,
-                    en_cok_revizeli_is.is_kodu if en_cok_revizeli_is else '-',
-                    en_cok_revizeli_is.revizyon_sayisi if en_cok_revizeli_is else 0,
-                    len([i for i in isler if (i.revizyon_sayisi or 0) > 0]),
-                    len([i for i in isler if (i.revizyon_sayisi or 0) == 0]),
-                    round((len([i for i in isler if (i.revizyon_sayisi or 0) > 0]) / len(isler) * 100), 1) if len(isler) > 0 else 0,
-                    top_konular_str,
-                    'Detaylı analiz için Revizyonlar sheet\'ine bakın. Her revizyonun konusu ve ne yapıldığı bilgisi mevcuttur.'
-                ],
-                'Açıklama': [
-                    'Rapor döneminde yapılan toplam iş sayısı',
-                    'Müşterinin talep ettiği toplam revizyon sayısı',
-                    'Her iş için ortalama revizyon sayısı (yüksek değer müşteri memnuniyetsizliği gösterir)',
-                    'En fazla revize edilen işin kodu',
-                    'Bu işe ait toplam revizyon sayısı',
-                    'En az bir revizyon almış işlerin sayısı',
-                    'Hiç revizyon almadan tamamlanan işlerin sayısı (mükemmel)',
-                    'İşlerin yüzde kaçı revize edildi',
-                    'En sık karşılaşılan revizyon konuları ve frekansları',
-                    'Tüm revizyon detayları için Revizyonlar sheet\'ine bakılmalıdır'
-                ]
-            }
-            pd.DataFrame(ai_ozet).to_excel(writer, sheet_name='AI Analiz Özeti', index=False)
-            
-            # Tüm sheet'lerde sütun genişliklerini otomatik ayarla
-            for sheet_name in writer.sheets:
-                worksheet = writer.sheets[sheet_name]
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    
-                    for cell in column:
-                        try:
-                            if cell.value:
-                                # Türkçe karakter desteği için len yerine str kullan
-                                cell_length = len(str(cell.value))
-                                if cell_length > max_length:
-                                    max_length = cell_length
-                        except:
-                            pass
-                    
-                    # Genişliği ayarla (minimum 10, maksimum sınır yok - tam gösterilsin)
-                    adjusted_width = max(max_length + 2, 10)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
-        
-        output.seek(0)
-        
-        # Dosya adı oluştur
-        tarih_str = ''
-        if filtre == 'ay':
-            tarih_str = today.strftime('%Y_%m')
-        elif filtre == 'yil':
-            tarih_str = str(today.year)
-        elif filtre == 'ozel' and request.args.get('baslangic') and request.args.get('bitis'):
-            tarih_str = f"{request.args.get('baslangic')}_{request.args.get('bitis')}"
-        else:
-            tarih_str = datetime.now().strftime('%Y%m%d')
-        
-        safe_name = musteri.ad.replace(' ', '_').replace('ş', 's').replace('ğ', 'g').replace('ü', 'u').replace('ö', 'o').replace('ç', 'c').replace('ı', 'i')
-        filename = f"{safe_name}_Rapor_{tarih_str}.xlsx"
-        
-        return send_file(
-            output,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name=filename
-        )
+        return musteri_raporu_yaniti('excel', musteri)
     except Exception as e:
         logger.error(f"Excel rapor hatası: {str(e)}", exc_info=True)
         flash(f'Excel rapor oluşturulamadı: {str(e)}', 'error')
         return redirect(url_for('musteri_rapor', musteri_id=musteri_id))
 
+# Arka plan rapor işleri
+@app.route('/api/jobs', methods=['POST'])
+def rapor_isi_olustur():
+    """Rapor işini kuyruğa ekler (tur: excel | word, musteri_id, filtre, baslangic, bitis)"""
+    veri = request.get_json(silent=True) or request.form
+    tur = veri.get('tur')
+    if tur not in RAPOR_TURLERI:
+        return jsonify({'error': f"Desteklenmeyen rapor türü: {tur}"}), 400
+    musteri = Musteri.query.get_or_404(int(veri.get('musteri_id', 0)))
+    parametreler = {anahtar: veri[anahtar] for anahtar in ('filtre', 'baslangic', 'bitis') if veri.get(anahtar)}
+    is_id = job_queue.submit(tur, musteri.id, parametreler)
+    return jsonify({'id': is_id, 'durum_url': url_for('rapor_isi_durumu', is_id=is_id)}), 202
+
+@app.route('/api/toplu-rapor', methods=['POST'])
+def toplu_rapor_olustur():
+    """
+    Toplu dönem raporu işini kuyruğa ekler
+
+    JSON: ay (YYYY-MM, varsayılan geçen ay) veya baslangic/bitis,
+    musteri_idler (liste), turler (word/excel), hepsi (kaydı olmayanlar da)
+    """
+    from src.utils.batch_reports import TURLER
+    veri = request.get_json(silent=True) or {}
+    turler = veri.get('turler') or list(TURLER)
+    if not set(turler) <= set(TURLER):
+        return jsonify({'error': f"Desteklenmeyen rapor türü: {', '.join(sorted(set(turler) - set(TURLER)))}"}), 400
+    try:
+        if veri.get('ay'):
+            datetime.strptime(veri['ay'], '%Y-%m')
+        for anahtar in ('baslangic', 'bitis'):
+            if veri.get(anahtar):
+                datetime.strptime(veri[anahtar], '%Y-%m-%d')
+        musteri_idler = sorted({int(i) for i in veri.get('musteri_idler') or []})
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Geçersiz tarih veya müşteri listesi'}), 400
+    parametreler = {anahtar: veri[anahtar] for anahtar in ('ay', 'baslangic', 'bitis', 'hepsi') if veri.get(anahtar)}
+    parametreler['turler'] = sorted(turler)
+    if musteri_idler:
+        parametreler['musteri_idler'] = musteri_idler
+    is_id = job_queue.submit('toplu', None, parametreler)
+    return jsonify({'id': is_id, 'durum_url': url_for('rapor_isi_durumu', is_id=is_id)}), 202
+
+@app.route('/api/jobs/<int:is_id>')
+def rapor_isi_durumu(is_id):
+    """Rapor işinin durumu ve ilerlemesi; tamamlandıysa indirme adresi"""
+    durum = job_queue.status(is_id)
+    if durum is None:
+        return jsonify({'error': 'İş bulunamadı'}), 404
+    yanit = {anahtar: durum[anahtar] for anahtar in
+             ('id', 'tur', 'musteri_id', 'parametreler', 'durum', 'ilerleme', 'mesaj', 'hata', 'deneme')}
+    for anahtar in ('olusturma_tarihi', 'baslama_tarihi', 'bitis_tarihi'):
+        yanit[anahtar] = durum[anahtar].isoformat() if durum[anahtar] else None
+    if 'sira' in durum:
+        yanit['sira'] = durum['sira']
+    if durum['durum'] == TAMAMLANDI:
+        yanit['indirme_url'] = url_for('rapor_isi_indir', is_id=is_id)
+    return jsonify(yanit)
+
+@app.route('/api/jobs/<int:is_id>/indir')
+def rapor_isi_indir(is_id):
+    """Tamamlanan rapor işinin dosyasını indirir"""
+    from flask import send_file
+    durum = job_queue.status(is_id)
+    if durum is None or durum['durum'] != TAMAMLANDI:
+        return jsonify({'error': 'Rapor hazır değil'}), 404
+    if not os.path.exists(durum['dosya_yolu'] or ''):
+        return jsonify({'error': 'Rapor dosyası önbellekten silinmiş, yeniden oluşturun'}), 410
+    return send_file(durum['dosya_yolu'], as_attachment=True, download_name=durum['dosya_adi'])
+
+# CLI komutları
+@app.cli.command('db-upgrade')
+def db_upgrade_komutu():
+    """Tabloları oluşturur ve bekleyen migration'ları uygular"""
+    from src.utils.migrations import run_migrations, get_schema_version, get_pending_versions
+
+    db.create_all()
+    uygulananlar = run_migrations(db, logger)
+    ertelenenler = get_pending_versions(db)
+    if uygulananlar:
+        print(f"Uygulanan migration'lar: {', '.join(str(v) for v in uygulananlar)}")
+    elif not ertelenenler:
+        print('Veritabanı güncel.')
+    if ertelenenler:
+        print(f"Ertelenen migration'lar (sonraki db-upgrade'de yeniden denenir): "
+              f"{', '.join(str(v) for v in ertelenenler)}")
+    print(f'Şema sürümü: {get_schema_version(db)}')
+
+@app.cli.command('ozet-yenile')
+def ozet_yenile_komutu():
+    """musteri_ozet tablosunu tüm müşteriler için yeniden oluşturur"""
+    adet = rebuild_musteri_ozet(db)
+    print(f'{adet} müşteri özeti yeniden oluşturuldu.')
+
+@app.cli.command('gunluk-ozet-yenile')
+@click.option('--baslangic', default=None, help='Başlangıç tarihi (YYYY-MM-DD)')
+@click.option('--bitis', default=None, help='Bitiş tarihi (YYYY-MM-DD)')
+def gunluk_ozet_yenile_komutu(baslangic, bitis):
+    """gunluk_is_ozeti rollup tablosunu iş günlüğünden yeniden oluşturur (backfill)"""
+    baslangic = datetime.strptime(baslangic, '%Y-%m-%d').date() if baslangic else None
+    bitis = datetime.strptime(bitis, '%Y-%m-%d').date() if bitis else None
+    adet = rebuild_gunluk_ozet(db, baslangic, bitis)
+    print(f'{adet} günlük özet satırı yazıldı.')
+
+@app.cli.command('gunluk-ozet-kontrol')
+def gunluk_ozet_kontrol_komutu():
+    """gunluk_is_ozeti tablosunu ham iş günlüğü ile karşılaştırır"""
+    farklar = check_gunluk_ozet(db)
+    if not farklar:
+        print('Günlük özet tutarlı.')
+        return
+    for fark in farklar:
+        print(f"[FARK] {fark['anahtar']}: beklenen={fark['beklenen']} rollup={fark['rollup']}")
+    raise SystemExit(f'{len(farklar)} tutarsız satır bulundu. Düzeltmek için: flask gunluk-ozet-yenile')
+
+@app.cli.command('excel-ice-aktar')
+@click.argument('dosya', type=click.Path(exists=True, dir_okay=False))
+@click.option('--uygula', is_flag=True, help='Farkları yaz (verilmezse sadece kuru çalıştırma)')
+def excel_ice_aktar_komutu(dosya, uygula):
+    """Excel dosyasını iş kodlarına göre eşleyerek içe aktarır"""
+    plan = plan_import(db, read_workbook(dosya))
+    for hata in plan['hatalar']:
+        print(f"[HATA] {hata['sayfa']} satır {hata['satir'] or '-'} / {hata['kolon']}: {hata['hata']}")
+    if plan['hatalar']:
+        raise SystemExit(f"{len(plan['hatalar'])} hata bulundu, hiçbir kayıt aktarılmadı.")
+
+    for sayfa in plan['atlanan_sayfalar']:
+        print(f'[ATLANDI] {sayfa}')
+    for adim in plan['varliklar'].values():
+        print(f"{adim['sayfa']}: {adim['eklenecek']} eklenecek, {adim['guncellenecek']} güncellenecek, "
+              f"{adim['degismeyen']} değişmeyen")
+    if not uygula:
+        print('Kuru çalıştırma, hiçbir şey yazılmadı. Uygulamak için: --uygula')
+        return
+
+    for varlik, sonuc in apply_import(db, plan).items():
+        print(f"{plan['varliklar'][varlik]['sayfa']}: {sonuc['eklenen']} eklendi, {sonuc['guncellenen']} güncellendi")
+
+@app.cli.command('rapor-onbellek-temizle')
+@click.option('--hepsi', is_flag=True, help='Sınırlara bakmadan tüm önbelleği sil')
+def rapor_onbellek_temizle_komutu(hepsi):
+    """Rapor önbelleğinde yaş/boyut sınırını aşan dosyaları siler"""
+    if hepsi:
+        report_cache.clear()
+        print('Rapor önbelleği silindi.')
+        return
+    sonuc = report_cache.evict()
+    print(f"{sonuc['silinen']} dosya silindi, {sonuc['kalan']} dosya kaldı "
+          f"({sonuc['boyut'] / 1024 / 1024:.1f} MB).")
+    print(f'{job_queue.purge()} eski rapor işi silindi.')
+
+@app.cli.command('toplu-rapor')
+@click.option('--ay', default=None, help='Dönem (YYYY-MM, varsayılan: geçen ay)')
+@click.option('--baslangic', default=None, help='Başlangıç tarihi (YYYY-MM-DD, --bitis ile)')
+@click.option('--bitis', default=None, help='Bitiş tarihi (YYYY-MM-DD)')
+@click.option('--musteri-id', 'musteri_idler', type=int, multiple=True, help='Yalnızca bu müşteri (tekrarlanabilir)')
+@click.option('--tur', 'turler', type=click.Choice(['word', 'excel']), multiple=True, help='Rapor türü (varsayılan: ikisi)')
+@click.option('--hepsi', is_flag=True, help='Dönemde kaydı olmayan müşterileri de dahil et')
+@click.option('--isci', type=int, default=None, help='Süreç sayısı (varsayılan: çekirdek sayısı)')
+@click.option('--yeniden', is_flag=True, help='Yarıda kalan çalışmadan devam etme, baştan üret')
+def toplu_rapor_komutu(ay, baslangic, bitis, musteri_idler, turler, hepsi, isci, yeniden):
+    """Müşterilerin dönem raporlarını paralel üretir ve zip'ler (kaldığı yerden devam eder)"""
+    from src.utils.batch_reports import generate_batch, donem_araligi, TURLER
+
+    if baslangic and bitis:
+        start_date = datetime.strptime(baslangic, '%Y-%m-%d').date()
+        end_date = datetime.strptime(bitis, '%Y-%m-%d').date()
+    else:
+        start_date, end_date = donem_araligi(ay)
+    print(f'Dönem: {start_date:%d.%m.%Y} - {end_date:%d.%m.%Y}')
+    sonuc = generate_batch(db, start_date, end_date, toplu_rapor_klasoru(),
+                           musteri_idler=list(musteri_idler) or None, turler=turler or TURLER, hepsi=hepsi,
+                           isci_sayisi=isci or app.config['TOPLU_RAPOR_ISCI_SAYISI'] or None,
+                           yeniden=yeniden, write_only_sinir=app.config['RAPOR_WRITE_ONLY_SATIR'],
+                           ilerleme=lambda yuzde, mesaj=None: print(f'[%{yuzde}] {mesaj or ""}'))
+    print(f"{sonuc['uretilen']} müşteri üretildi, {sonuc['onceden']} önceki çalışmadan alındı, "
+          f"{sonuc['hatali']} hatalı.")
+    print(f"Manifest: {sonuc['manifest']}")
+    print(f"Zip: {sonuc['zip']}")
+    if sonuc['hatali']:
+        raise SystemExit('Hatalı müşteriler manifest.json içinde; komutu tekrar çalıştırınca yeniden denenir.')
+
+@app.cli.command('veri-uret')
+@click.option('--musteri', 'musteri_sayisi', type=int, default=50, help='Müşteri sayısı')
+@click.option('--is', 'is_sayisi', type=int, default=20000, help='Toplam iş günlüğü satırı')
+@click.option('--gun', type=int, default=365, help='Kayıtların yayılacağı geçmiş gün sayısı')
+@click.option('--tohum', type=int, default=42, help='Rastgele üretici tohumu (aynı tohum aynı veri)')
+@click.option('--carpiklik', type=float, default=1.1, help='Zipf üssü: büyüdükçe ilk müşteriler daha baskın')
+@click.option('--temizle', is_flag=True, help='Mevcut TÜM kayıtları silip yeniden üret')
+def veri_uret_komutu(musteri_sayisi, is_sayisi, gun, tohum, carpiklik, temizle):
+    """Ölçek testleri için sentetik veri üretir (boş veritabanında)"""
+    from src.utils.seed_data import generate_seed_data, clear_data, has_data
+
+    if has_data(db):
+        if not temizle:
+            raise SystemExit('Veritabanında kayıt var. Silip yeniden üretmek için: --temizle')
+        click.confirm(f"{app.config['SQLALCHEMY_DATABASE_URI']} içindeki tüm kayıtlar silinecek. Devam?", abort=True)
+        clear_data(db)
+    report_cache.clear()
+    baslangic = time.perf_counter()
+    sayilar = generate_seed_data(db, musteri_sayisi, is_sayisi, gun=gun, tohum=tohum, carpiklik=carpiklik,
+                                 ilerleme=lambda yuzde, mesaj=None: print(f'[%{yuzde}] {mesaj or ""}'))
+    for tablo, adet in sayilar.items():
+        print(f'{tablo}: {adet}')
+    print(f'Süre: {time.perf_counter() - baslangic:.1f} sn')
+
+@app.cli.command('index-raporu')
+@click.option('--musteri-id', default=1, help='Sorgularda kullanılacak örnek müşteri ID')
+def index_raporu_komutu(musteri_id):
+    """Route sorgularının EXPLAIN QUERY PLAN çıktısını raporlar"""
+    from src.utils.migrations import explain_query_plans
+
+    for sonuc in explain_query_plans(db, musteri_id):
+        durum = 'TAM TARAMA' if sonuc['tarama'] else 'OK'
+        print(f"[{durum}] {sonuc['route']} - {sonuc['sorgu']}")
+        for satir in sonuc['plan']:
+            print(f'    {satir}')
+
 if __name__ == '__main__':
     with app.app_context():
+        from src.utils.migrations import run_migrations
         db.create_all()
+        run_migrations(db, logger)
         if not os.path.exists('uploads'):
             os.makedirs('uploads')
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+Akışlı dışa aktarma benchmark'ı
+Eski tüm tabloyu belleğe okuyan pd.read_sql + ExcelWriter yaklaşımıyla
+parçalı okuyup akıtan export_stream'in süre ve tepe belleğini karşılaştırır
+
+Kullanım:
+    python benchmarks/bench_akisli_export.py --boyutlar 20000 100000
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+# app import edilmeden önce geçici veritabanı ayarlanmalı
+_db_dosyasi = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DATABASE_URI'] = f'sqlite:///{_db_dosyasi}'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+from app import app, db  # noqa: E402
+from src.utils.export import export_stream  # noqa: E402
+
+
+def veri_olustur(is_sayisi):
+    """Tabloları sıfırlar ve is_sayisi kadar iş (ve yarısı kadar arama) ekler"""
+    db.drop_all()
+    db.create_all()
+    rastgele = random.Random(2)
+    bugun = date.today()
+    with db.engine.begin() as conn:
+        conn.execute(text("INSERT INTO musteri (id, musteri_kodu, ad) VALUES (1, 'MST001', 'Benchmark')"))
+        conn.execute(text(
+            'INSERT INTO is_gunlugu (id, is_kodu, tarih, musteri_id, aktivite_turu, aciklama, sure_dakika) '
+            'VALUES (:id, :kod, :tarih, 1, :tur, :aciklama, :sure)'
+        ), [{
+            'id': i, 'kod': f'MST001-IS{i:03d}', 'tarih': bugun - timedelta(days=i % 365),
+            'tur': rastgele.choice(['Tasarım', 'Video']), 'aciklama': f'İş açıklaması {i} ' * 4,
+            'sure': rastgele.randrange(15, 240),
+        } for i in range(1, is_sayisi + 1)])
+        conn.execute(text(
+            'INSERT INTO arama (tarih, musteri_id, arayan_aranan, konu) VALUES (:tarih, 1, :kisi, :konu)'
+        ), [{'tarih': bugun, 'kisi': f'Kişi {i}', 'konu': f'Konu {i}'} for i in range(is_sayisi // 2)])
+
+
+def eski_export():
+    """Karşılaştırma için önceki sürüm (tablolar tamamen belleğe okunur)"""
+    cikti = io.BytesIO()
+    with pd.ExcelWriter(cikti, engine='openpyxl') as writer:
+        for tablo, sayfa in (('musteri', 'Müşteriler'), ('is_gunlugu', 'İş Günlüğü'),
+                             ('teslimat', 'Teslimatlar'), ('sosyal_medya', 'Sosyal Medya')):
+            pd.read_sql(f'SELECT * FROM {tablo}', db.engine).to_excel(writer, sheet_name=sayfa, index=False)
+    return len(cikti.getvalue())
+
+
+def yeni_export(bicim):
+    govde, _, _ = export_stream(db, bicim)
+    return sum(len(parca) for parca in govde)
+
+
+def olc(fonksiyon):
+    tracemalloc.start()
+    baslangic = time.perf_counter()
+    boyut = fonksiyon()
+    sure = time.perf_counter() - baslangic
+    _, tepe = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sure, tepe / 1024 / 1024, boyut / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Akışlı dışa aktarma benchmark')
+    parser.add_argument('--boyutlar', type=int, nargs='+', default=[20000, 100000])
+    parser.add_argument('--eski-yok', action='store_true', help='Eski yöntemi ölçme (büyük boyutlarda yavaş)')
+    args = parser.parse_args()
+
+    print(f"{'İş sayısı':>10} | {'Yöntem':<14} | {'Süre (s)':>8} | {'Tepe bellek (MB)':>16} | {'Çıktı (MB)':>10}")
+    with app.app_context():
+        for boyut in args.boyutlar:
+            veri_olustur(boyut)
+            yontemler = [('akışlı xlsx', lambda: yeni_export('xlsx')),
+                         ('akışlı csv', lambda: yeni_export('csv')),
+                         ('akışlı jsonl', lambda: yeni_export('jsonl'))]
+            if not args.eski_yok:
+                yontemler.insert(0, ('eski', eski_export))
+            for ad, fonksiyon in yontemler:
+                sure, tepe, cikti = olc(fonksiyon)
+                print(f'{boyut:>10} | {ad:<14} | {sure:>8.2f} | {tepe:>16.1f} | {cikti:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Dashboard metrikleri benchmark'ı
+Eski çok sorgulu / Python küme farkı kullanan get_dashboard_metrics ile
+koşullu toplamlı (SUM(CASE) + NOT EXISTS) sürümü farklı tablo boyutlarında karşılaştırır
+
+Kullanım:
+    python benchmarks/bench_dashboard_metrikleri.py --boyutlar 10000 100000 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+# app import edilmeden önce geçici veritabanı ayarlanmalı
+_db_dosyasi = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DATABASE_URI'] = f'sqlite:///{_db_dosyasi}'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, text  # noqa: E402
+from app import app, db, Musteri, IsGunlugu, Teslimat, SosyalMedya  # noqa: E402
+from src.utils.statistics import get_dashboard_metrics  # noqa: E402
+
+
+def eski_get_dashboard_metrics(db):
+    """Karşılaştırma için önceki sürüm (8 sorgu, bekleyen işler Python kümeleriyle)"""
+    today = datetime.now()
+    current_month_start = datetime(today.year, today.month, 1)
+
+    toplam_musteri = db.session.query(Musteri).count()
+    bu_ay_is = db.session.query(IsGunlugu).filter(IsGunlugu.tarih >= current_month_start.date()).count()
+    onaylanan_teslimat = db.session.query(Teslimat).filter(Teslimat.durum == 'Onaylandı').count()
+    toplam_dakika = db.session.query(func.sum(IsGunlugu.sure_dakika)).scalar() or 0
+    reels_sayisi = db.session.query(SosyalMedya).filter(SosyalMedya.gonderi_turu == 'Reels').count()
+    bekleyen_teslimat = db.session.query(Teslimat).filter(
+        Teslimat.durum.in_(['Hazırlanıyor', 'Bekliyor', 'Revizede'])).count()
+
+    tum_is_id_set = {is_id[0] for is_id in db.session.query(IsGunlugu.id).all()}
+    teslimatli_is_id_set = {is_id[0] for is_id in db.session.query(Teslimat.is_gunlugu_id).filter(
+        Teslimat.is_gunlugu_id.isnot(None)).distinct().all()}
+    bekleyen_isler = len(tum_is_id_set - teslimatli_is_id_set)
+
+    bu_ay_dakika = db.session.query(func.sum(IsGunlugu.sure_dakika)).filter(
+        IsGunlugu.tarih >= current_month_start.date()).scalar() or 0
+
+    return {
+        'toplam_musteri': toplam_musteri,
+        'bu_ay_is': bu_ay_is,
+        'onaylanan_teslimat': onaylanan_teslimat,
+        'toplam_saat': round(toplam_dakika / 60, 1),
+        'reels_sayisi': reels_sayisi,
+        'bekleyen_teslimat': bekleyen_teslimat,
+        'bekleyen_isler': bekleyen_isler,
+        'bu_ay_saat': round(bu_ay_dakika / 60, 1)
+    }
+
+
+def veri_olustur(is_sayisi, musteri_sayisi=50):
+    """İş, teslimat ve sosyal medya tablolarını doğrudan executemany ile doldurur"""
+    db.drop_all()
+    db.create_all()
+
+    rastgele = random.Random(42)
+    bugun = date.today()
+    durumlar = ['Onaylandı', 'Hazırlanıyor', 'Bekliyor', 'Revizede', 'Tamamlandı']
+
+    with db.engine.begin() as conn:
+        conn.execute(text('INSERT INTO musteri (id, musteri_kodu, ad) VALUES (:id, :kod, :ad)'),
+                     [{'id': i, 'kod': f'MST{i:03d}', 'ad': f'Müşteri {i}'} for i in range(1, musteri_sayisi + 1)])
+
+        parca = 50000
+        for baslangic in range(1, is_sayisi + 1, parca):
+            idler = range(baslangic, min(baslangic + parca, is_sayisi + 1))
+            conn.execute(text(
+                'INSERT INTO is_gunlugu (id, is_kodu, tarih, musteri_id, aktivite_turu, sure_dakika, durum) '
+                'VALUES (:id, :kod, :tarih, :musteri_id, :tur, :sure, :durum)'
+            ), [{
+                'id': i, 'kod': f'IS{i}', 'tarih': bugun - timedelta(days=rastgele.randrange(730)),
+                'musteri_id': rastgele.randint(1, musteri_sayisi), 'tur': 'Tasarım',
+                'sure': rastgele.randint(10, 240), 'durum': 'Bekliyor',
+            } for i in idler])
+            # İşlerin ~%60'ının teslimatı var
+            conn.execute(text(
+                'INSERT INTO teslimat (musteri_id, is_gunlugu_id, durum) VALUES (:musteri_id, :is_id, :durum)'
+            ), [{
+                'musteri_id': 1, 'is_id': i, 'durum': rastgele.choice(durumlar)
+            } for i in idler if rastgele.random() < 0.6])
+            conn.execute(text(
+                'INSERT INTO sosyal_medya (tarih, musteri_id, gonderi_turu) VALUES (:tarih, 1, :tur)'
+            ), [{
+                'tarih': bugun, 'tur': rastgele.choice(['Reels', 'Post', 'Story'])
+            } for _ in range(len(idler) // 10)])
+
+
+def olc(fonksiyon, tekrar=3):
+    """En iyi süreyi (saniye) ve tepe Python bellek kullanımını (MB) döndürür"""
+    en_iyi = None
+    tepe = 0
+    for _ in range(tekrar):
+        db.session.expunge_all()
+        tracemalloc.start()
+        baslangic = time.perf_counter()
+        sonuc = fonksiyon(db)
+        sure = time.perf_counter() - baslangic
+        tepe = max(tepe, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        en_iyi = sure if en_iyi is None else min(en_iyi, sure)
+    return sonuc, en_iyi, tepe / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='get_dashboard_metrics benchmark')
+    parser.add_argument('--boyutlar', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'İş sayısı':>10} | {'Eski (ms)':>10} | {'Yeni (ms)':>10} | {'Eski bellek':>11} | {'Yeni bellek':>11}")
+    with app.app_context():
+        for boyut in args.boyutlar:
+            veri_olustur(boyut)
+            eski, eski_sure, eski_bellek = olc(eski_get_dashboard_metrics)
+            yeni, yeni_sure, yeni_bellek = olc(get_dashboard_metrics)
+            assert eski == yeni, (eski, yeni)
+            print(f'{boyut:>10} | {eski_sure * 1000:>10.1f} | {yeni_sure * 1000:>10.1f} | '
+                  f'{eski_bellek:>9.1f}MB | {yeni_bellek:>9.1f}MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""
+Idempotent Excel içe aktarma benchmark'ı
+Çok sayfalı bir çalışma kitabını içe aktarır, ardından yalnızca birkaç yüz
+satırı değiştirilmiş aynı kitabı tekrar yükler ve kaç satırın yazıldığını ölçer
+
+Kullanım:
+    python benchmarks/bench_excel_yeniden_import.py --satir 50000 --degisen 200 [--xlsx]
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# app import edilmeden önce geçici veritabanı ayarlanmalı
+_db_dosyasi = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DATABASE_URI'] = f'sqlite:///{_db_dosyasi}'
+os.environ['QUERY_CACHE_ENABLED'] = 'False'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from app import app, db  # noqa: E402
+from src.utils.bulk_import import VARLIKLAR, plan_import, apply_import, read_workbook  # noqa: E402
+from src.utils.migrations import run_migrations  # noqa: E402
+from src.utils.rollups import check_gunluk_ozet  # noqa: E402
+
+
+def calisma_kitabi(satir_sayisi):
+    """Satırları sayfalara bölünmüş, kodları dolu bir çalışma kitabı üretir"""
+    rastgele = random.Random(11)
+    musteri_sayisi = max(satir_sayisi // 25, 1)
+    is_sayisi = satir_sayisi // 2
+    teslimat_sayisi = satir_sayisi // 5
+    kalan = satir_sayisi - musteri_sayisi - is_sayisi - teslimat_sayisi
+    bugun = date.today()
+
+    musteri_kodlari = [f'MST{i:03d}' for i in range(1, musteri_sayisi + 1)]
+    musteriler = pd.DataFrame({
+        'musteri_kodu': musteri_kodlari,
+        'ad': [f'Firma {i}' for i in range(musteri_sayisi)],
+        'sektor': [rastgele.choice(['Gıda', 'Tekstil', 'Turizm']) for _ in range(musteri_sayisi)],
+        'aylik_ucret': [float(rastgele.randrange(5000, 50000, 500)) for _ in range(musteri_sayisi)],
+    })
+
+    is_musterileri = [rastgele.choice(musteri_kodlari) for _ in range(is_sayisi)]
+    isler = pd.DataFrame({
+        'is_kodu': [f'{kod}-IS{i:03d}' for i, kod in enumerate(is_musterileri, 1)],
+        'musteri_kodu': is_musterileri,
+        'tarih': [(bugun - timedelta(days=rastgele.randrange(365))).isoformat() for _ in range(is_sayisi)],
+        'aktivite_turu': [rastgele.choice(['Tasarım', 'Video', 'Metin']) for _ in range(is_sayisi)],
+        'aciklama': [f'İş açıklaması {i}' for i in range(is_sayisi)],
+        'sure_dakika': [rastgele.randrange(15, 240) for _ in range(is_sayisi)],
+    })
+
+    teslimat_isleri = isler.sample(teslimat_sayisi, random_state=1)
+    teslimatlar = pd.DataFrame({
+        'teslimat_kodu': [f'TSL{i:06d}' for i in range(teslimat_sayisi)],
+        'is_kodu': teslimat_isleri['is_kodu'].values,
+        'musteri_kodu': teslimat_isleri['musteri_kodu'].values,
+        'baslik': [f'Teslimat {i}' for i in range(teslimat_sayisi)],
+        'durum': [rastgele.choice(['Hazırlanıyor', 'Teslim Edildi']) for _ in range(teslimat_sayisi)],
+    })
+
+    aramalar = pd.DataFrame({
+        'musteri_kodu': [rastgele.choice(musteri_kodlari) for _ in range(kalan)],
+        'tarih': [(bugun - timedelta(days=i % 365)).isoformat() for i in range(kalan)],
+        'arayan_aranan': [f'Kişi {i}' for i in range(kalan)],
+        'konu': [f'Konu {i}' for i in range(kalan)],
+    })
+
+    return {
+        VARLIKLAR['musteri'][1]: musteriler,
+        VARLIKLAR['is_gunlugu'][1]: isler,
+        VARLIKLAR['teslimat'][1]: teslimatlar,
+        VARLIKLAR['arama'][1]: aramalar,
+    }
+
+
+def degistir(kitap, adet):
+    """Sayfalara dağılmış adet kadar satırın bir alanını değiştirir"""
+    rastgele = random.Random(5)
+    hedefler = [
+        (VARLIKLAR['musteri'][1], 'aylik_ucret', lambda deger: deger + 100),
+        (VARLIKLAR['is_gunlugu'][1], 'sure_dakika', lambda deger: deger + 1),
+        (VARLIKLAR['teslimat'][1], 'durum', lambda deger: 'Tamamlandı'),
+    ]
+    kitap = {sayfa: df.copy() for sayfa, df in kitap.items()}
+    for sira, (sayfa, kolon, degisim) in enumerate(hedefler):
+        df = kitap[sayfa]
+        pay = len(range(sira, adet, len(hedefler)))
+        for satir in rastgele.sample(range(len(df)), pay):
+            df.loc[satir, kolon] = degisim(df.loc[satir, kolon])
+    return kitap
+
+
+def xlsx_uzerinden(kitap):
+    """Kitabı gerçek bir .xlsx dosyasına yazıp geri okur"""
+    tampon = io.BytesIO()
+    with pd.ExcelWriter(tampon, engine='openpyxl') as writer:
+        for sayfa, df in kitap.items():
+            df.to_excel(writer, sheet_name=sayfa, index=False)
+    tampon.seek(0)
+    return read_workbook(tampon)
+
+
+class YazmaSayaci:
+    """INSERT/UPDATE cümlelerinin etkilediği satır sayısını toplar"""
+
+    def __init__(self, engine):
+        self.satir = 0
+        event.listen(engine, 'after_cursor_execute', self._say)
+
+    def _say(self, conn, cursor, statement, parameters, context, executemany):
+        ilk = statement.lstrip().split(' ', 3)
+        tablo = ilk[2] if ilk[0] == 'INSERT' else ilk[1]
+        if ilk[0] in ('INSERT', 'UPDATE') and tablo in VARLIKLAR:
+            self.satir += max(cursor.rowcount, 0)
+
+
+def olc(db, kitap, baslik):
+    baslangic = time.perf_counter()
+    plan = plan_import(db, kitap)
+    plan_suresi = time.perf_counter() - baslangic
+    assert not plan['hatalar'], plan['hatalar'][:5]
+
+    baslangic = time.perf_counter()
+    sonuc = apply_import(db, plan)
+    uygulama_suresi = time.perf_counter() - baslangic
+
+    eklenen = sum(adet['eklenen'] for adet in sonuc.values())
+    guncellenen = sum(adet['guncellenen'] for adet in sonuc.values())
+    degismeyen = sum(adet['degismeyen'] for adet in sonuc.values())
+    print(f'{baslik:<22} | plan {plan_suresi:6.2f} s | uygulama {uygulama_suresi:6.2f} s | '
+          f'eklenen {eklenen:>6} | güncellenen {guncellenen:>5} | değişmeyen {degismeyen:>6}')
+    return eklenen, guncellenen
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Idempotent Excel içe aktarma benchmark')
+    parser.add_argument('--satir', type=int, default=50000)
+    parser.add_argument('--degisen', type=int, default=200)
+    parser.add_argument('--xlsx', action='store_true', help='Kitabı .xlsx dosyasına yazıp okuyarak ölç')
+    args = parser.parse_args()
+
+    kitap = calisma_kitabi(args.satir)
+    degismis = degistir(kitap, args.degisen)
+    if args.xlsx:
+        baslangic = time.perf_counter()
+        kitap, degismis = xlsx_uzerinden(kitap), xlsx_uzerinden(degismis)
+        print(f'xlsx yazma + okuma (2 kitap): {time.perf_counter() - baslangic:.1f} s')
+
+    with app.app_context():
+        db.create_all()
+        run_migrations(db)
+        sayac = YazmaSayaci(db.engine)
+
+        olc(db, kitap, 'İlk yükleme')
+
+        sayac.satir = 0
+        eklenen, guncellenen = olc(db, kitap, 'Aynı kitap tekrar')
+        assert (eklenen, guncellenen, sayac.satir) == (0, 0, 0)
+
+        sayac.satir = 0
+        eklenen, guncellenen = olc(db, degismis, f'{args.degisen} satır değişmiş')
+        assert (eklenen, guncellenen) == (0, args.degisen), (eklenen, guncellenen)
+        print(f'Veri tablolarına yazılan satır: {sayac.satir}')
+        assert sayac.satir == args.degisen
+        assert not check_gunluk_ozet(db), 'Günlük özet tutarsız'
+
+
+if __name__ == '__main__':
+    main()
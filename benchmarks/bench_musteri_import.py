@@ -0,0 +1,103 @@
+"""
+Müşteri Excel içe aktarma benchmark'ı
+Eski iterrows + satır başına ORM nesnesi yaklaşımını vektörel doğrulama +
+blok kod ayırma + parçalı executemany sürümüyle karşılaştırır
+
+Kullanım:
+    python benchmarks/bench_musteri_import.py --satir 100000 --eski-satir 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# app import edilmeden önce geçici veritabanı ayarlanmalı
+_db_dosyasi = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DATABASE_URI'] = f'sqlite:///{_db_dosyasi}'
+os.environ['QUERY_CACHE_ENABLED'] = 'False'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+from app import app, db, Musteri, MusteriOzet, generate_musteri_kodu  # noqa: E402
+from src.utils.bulk_import import import_musteriler  # noqa: E402
+
+SEKTORLER = ['Gıda', 'Tekstil', 'İnşaat', 'Sağlık', 'Eğitim', 'Turizm']
+
+
+def ornek_tablo(satir_sayisi, hatali=0):
+    """Excel'den okunmuş gibi bir DataFrame üretir (hatali kadar satır bozulur)"""
+    rastgele = random.Random(3)
+    df = pd.DataFrame({
+        'Müşteri Adı': [f'Firma {i}' for i in range(satir_sayisi)],
+        'Sektör': [rastgele.choice(SEKTORLER) for _ in range(satir_sayisi)],
+        'Aylık Ücret (TL)': [float(rastgele.randrange(5000, 50000, 500)) for _ in range(satir_sayisi)],
+        'İlgili Kişi': [f'Kişi {i}' for i in range(satir_sayisi)],
+        'Telefon': [5320000000 + i for i in range(satir_sayisi)],
+        'E-posta': [f'info{i}@firma.com' for i in range(satir_sayisi)],
+        'Notlar': [None] * satir_sayisi,
+    })
+    for i in rastgele.sample(range(satir_sayisi), hatali):
+        df.loc[i, 'Müşteri Adı'] = None
+    return df
+
+
+def eski_import(df):
+    """Karşılaştırma için önceki sürüm: satır başına ORM nesnesi ve kod üretimi"""
+    for _, row in df.iterrows():
+        db.session.add(Musteri(
+            musteri_kodu=generate_musteri_kodu(),
+            ad=row['Müşteri Adı'],
+            sektor=row.get('Sektör', ''),
+            aylik_ucret=row.get('Aylık Ücret (TL)', 0),
+            ilgil_kisi=row.get('İlgili Kişi', ''),
+            telefon=row.get('Telefon', ''),
+            email=row.get('E-posta', ''),
+            notlar=row.get('Notlar', '')
+        ))
+    db.session.commit()
+
+
+def sifirla():
+    db.drop_all()
+    db.create_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Müşteri içe aktarma benchmark')
+    parser.add_argument('--satir', type=int, default=100000)
+    parser.add_argument('--eski-satir', type=int, default=5000,
+                        help='Eski yöntem yavaş olduğu için daha küçük tabloyla ölçülür')
+    args = parser.parse_args()
+
+    with app.app_context():
+        sifirla()
+        df = ornek_tablo(args.eski_satir)
+        baslangic = time.perf_counter()
+        eski_import(df)
+        eski_sure = time.perf_counter() - baslangic
+        print(f'Eski  ({args.eski_satir} satır): {eski_sure:.2f} s '
+              f'(~{eski_sure / args.eski_satir * args.satir:.0f} s / {args.satir} satır tahmini)')
+
+        sifirla()
+        df = ornek_tablo(args.satir)
+        baslangic = time.perf_counter()
+        sonuc = import_musteriler(db, df)
+        yeni_sure = time.perf_counter() - baslangic
+        print(f"Yeni  ({args.satir} satır): {yeni_sure:.2f} s, eklenen: {sonuc['eklenen']}")
+
+        kodlar = db.session.query(Musteri.musteri_kodu).distinct().count()
+        assert kodlar == args.satir, 'Müşteri kodları benzersiz olmalı'
+        assert db.session.query(MusteriOzet).count() == args.satir, 'Özet satırları oluşmalı'
+
+        sifirla()
+        baslangic = time.perf_counter()
+        sonuc = import_musteriler(db, ornek_tablo(args.satir, hatali=25))
+        print(f"Doğrulama ({args.satir} satır, 25 hatalı): {time.perf_counter() - baslangic:.2f} s, "
+              f"hata: {len(sonuc['hatalar'])}, eklenen: {sonuc['eklenen']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Müşteri rapor şablonu render benchmark'ı
+Eski selectattr taramalı iş kodu aramasını ilişki üzerinden O(1) erişimle karşılaştırır
+
+Kullanım:
+    python benchmarks/bench_musteri_sablon.py --is-sayisi 5000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# app import edilmeden önce geçici veritabanı ayarlanmalı
+_db_dosyasi = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DATABASE_URI'] = f'sqlite:///{_db_dosyasi}'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import selectinload  # noqa: E402
+from app import app, db, Musteri, IsGunlugu, Teslimat, Revizyon, SosyalMedya  # noqa: E402
+
+
+# Eski şablondaki arama kalıbı: her satır için tüm işler listesi taranır
+ESKI_SABLON = """
+{% for revizyon in revizyonlar %}{% set is = tum_isler|selectattr('id', 'equalto', revizyon.is_gunlugu_id)|first %}{{ is.is_kodu if is else '-' }}
+{% endfor %}
+{% for teslimat in teslimatlar %}{% set is = tum_isler|selectattr('id', 'equalto', teslimat.is_gunlugu_id)|first %}{{ is.is_kodu if is else '-' }}
+{% endfor %}
+{% for sm in sosyal_medyalar %}{% set is = tum_isler|selectattr('id', 'equalto', sm.is_gunlugu_id)|first %}{{ is.is_kodu if is else '-' }}
+{% endfor %}
+"""
+
+# Yeni kalıp: ilişkili iş nesnesi doğrudan okunur
+YENI_SABLON = """
+{% for revizyon in revizyonlar %}{% set is = revizyon.is_gunlugu %}{{ is.is_kodu if is else '-' }}
+{% endfor %}
+{% for teslimat in teslimatlar %}{% set is = teslimat.is_gunlugu %}{{ is.is_kodu if is else '-' }}
+{% endfor %}
+{% for sm in sosyal_medyalar %}{% set is = sm.is_gunlugu %}{{ is.is_kodu if is else '-' }}
+{% endfor %}
+"""
+
+
+def veri_olustur(is_sayisi):
+    """Tek müşteri için iş, teslimat, revizyon ve sosyal medya kayıtları oluşturur"""
+    db.drop_all()
+    db.create_all()
+
+    musteri = Musteri(musteri_kodu='MST001', ad='Benchmark Müşteri', aylik_ucret=0)
+    db.session.add(musteri)
+    db.session.flush()
+
+    baslangic = date(2024, 1, 1)
+    db.session.bulk_insert_mappings(IsGunlugu, [{
+        'id': i, 'is_kodu': f'MST001-IS{i:05d}', 'tarih': baslangic + timedelta(days=i % 365),
+        'musteri_id': musteri.id, 'aktivite_turu': 'Tasarım', 'aciklama': f'İş {i}',
+        'sure_dakika': 30, 'durum': 'Onaylandı', 'revizyon_sayisi': i % 3,
+    } for i in range(1, is_sayisi + 1)])
+    db.session.bulk_insert_mappings(Teslimat, [{
+        'musteri_id': musteri.id, 'is_gunlugu_id': i, 'baslik': f'Teslimat {i}',
+        'teslim_turu': 'Sosyal Medya' if i % 4 == 0 else 'Konvensiyonel',
+        'teslim_tarihi': baslangic + timedelta(days=i % 365), 'durum': 'Tamamlandı',
+        'etkileşim': 0, 'goruntulenme': 0, 'begeni': 0, 'yorum': 0, 'paylasim': 0,
+    } for i in range(1, is_sayisi + 1)])
+    db.session.bulk_insert_mappings(Revizyon, [{
+        'musteri_id': musteri.id, 'is_gunlugu_id': i, 'tarih': baslangic + timedelta(days=i % 365),
+        'revize_konusu': 'Renk değişikliği', 'durum': 'Onaylandı',
+    } for i in range(1, is_sayisi + 1, 2)])
+    db.session.bulk_insert_mappings(SosyalMedya, [{
+        'musteri_id': musteri.id, 'is_gunlugu_id': i, 'tarih': baslangic + timedelta(days=i % 365),
+        'platform': 'Instagram', 'icerik_basligi': f'Gönderi {i}', 'gonderi_turu': 'Post',
+        'etkileşim': 0, 'goruntulenme': 0, 'begeni': 0, 'yorum': 0, 'paylasim': 0, 'durum': 'Yayınlandı',
+    } for i in range(1, is_sayisi + 1, 5)])
+    db.session.commit()
+    return musteri.id
+
+
+def olc(fonksiyon):
+    """Fonksiyonu çalıştırıp süresini (saniye) döndürür"""
+    baslangic = time.perf_counter()
+    fonksiyon()
+    return time.perf_counter() - baslangic
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Müşteri rapor şablonu render benchmark')
+    parser.add_argument('--is-sayisi', type=int, default=5000)
+    args = parser.parse_args()
+
+    with app.app_context():
+        musteri_id = veri_olustur(args.is_sayisi)
+
+        teslimatlar = Teslimat.query.filter_by(musteri_id=musteri_id)\
+            .options(selectinload(Teslimat.is_gunlugu)).all()
+        revizyonlar = Revizyon.query.filter_by(musteri_id=musteri_id)\
+            .options(selectinload(Revizyon.is_gunlugu)).all()
+        sosyal_medyalar = SosyalMedya.query.filter_by(musteri_id=musteri_id)\
+            .options(selectinload(SosyalMedya.is_gunlugu)).all()
+        tum_isler = IsGunlugu.query.filter_by(musteri_id=musteri_id).all()
+        baglam = dict(teslimatlar=teslimatlar, revizyonlar=revizyonlar,
+                      sosyal_medyalar=sosyal_medyalar, tum_isler=tum_isler)
+
+        eski = app.jinja_env.from_string(ESKI_SABLON)
+        yeni = app.jinja_env.from_string(YENI_SABLON)
+        assert eski.render(**baglam) == yeni.render(**baglam)
+
+        eski_sure = olc(lambda: eski.render(**baglam))
+        yeni_sure = olc(lambda: yeni.render(**baglam))
+
+        client = app.test_client()
+        yanit = None
+
+        def sayfa_iste():
+            nonlocal yanit
+            yanit = client.get(f'/musteri_rapor/{musteri_id}?filtre=tumu')
+
+        sayfa_sure = olc(sayfa_iste)
+        assert yanit.status_code == 200, yanit.status_code
+
+    print(f'İş sayısı: {args.is_sayisi} | teslimat: {len(teslimatlar)} | '
+          f'revizyon: {len(revizyonlar)} | sosyal medya: {len(sosyal_medyalar)}')
+    print(f'Eski (selectattr taraması): {eski_sure * 1000:10.1f} ms')
+    print(f'Yeni (ilişki erişimi):      {yeni_sure * 1000:10.1f} ms')
+    print(f'Hızlanma:                   {eski_sure / yeni_sure:10.1f}x')
+    print(f'/musteri_rapor tam istek:   {sayfa_sure * 1000:10.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
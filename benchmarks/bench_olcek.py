@@ -0,0 +1,215 @@
+"""
+Uygulama ölçek benchmark'ı
+Her ölçek için (müşteri x iş) geçici bir SQLite veritabanına flask veri-uret
+ile aynı sentetik veriyi üretir ve ana route'ları Flask test client ile
+çağırır: dashboard, bekleyen işler, müşteri detay/rapor sayfaları, müşteri
+Excel ve Word raporları, tüm verinin Excel dışa aktarımı. Müşteriye bağlı
+route'lar en büyük müşteri (MST001) ve ortanca müşteri için ayrı ölçülür.
+
+Route başına p50/p95 süre, istek başına SQL sayısı ve süreç tepe RSS'i JSON
+dosyasına yazılır. Her ölçek ayrı süreçte çalışır (tepe RSS ölçekler arasında
+karışmaz). İstatistik önbelleği kapalıdır, rapor önbelleği her istekten önce
+temizlenir; ölçülen süreler soğuk isteklerdir. Rapor route'ları senkron=1 ile
+çağrılır (önbellek boşken kuyruğa atmak yerine istek içinde üretilir). İlk
+çağrı ısınma içindir, ölçüme katılmaz.
+
+Kullanım:
+    python benchmarks/bench_olcek.py --olcekler 20x5000 100x100000 500x2000000 --cikti olcek.json
+    python benchmarks/bench_olcek.py --olcekler 20x5000 --cikti yeni.json --karsilastir olcek.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+PROJE_KOKU = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (ad, yol şablonu, müşteriye bağlı mı)
+ROTALAR = [
+    ('dashboard', '/', False),
+    ('bekleyen_isler', '/bekleyen_isler', False),
+    ('musteri_detay', '/musteri_detay/{id}', True),
+    ('musteri_rapor', '/musteri_rapor/{id}?filtre={filtre}', True),
+    ('excel_rapor', '/musteri_rapor_excel/{id}?filtre={filtre}&senkron=1', True),
+    ('word_rapor', '/musteri/{id}/rapor?filtre={filtre}&senkron=1', True),
+    ('excel_export', '/excel_export?format=xlsx', False),
+]
+RAPOR_ROTALARI = {'excel_rapor', 'word_rapor'}
+
+
+def yuzdelik(degerler, oran):
+    """En yakın sıra yöntemiyle yüzdelik"""
+    sirali = sorted(degerler)
+    return sirali[max(0, math.ceil(oran * len(sirali)) - 1)]
+
+
+def tepe_rss_mb():
+    # Linux'ta ru_maxrss KB, macOS'ta bayt
+    tepe = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(tepe / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def tek_olcek(musteri_sayisi, is_sayisi, tekrar, tohum, filtre):
+    """Alt süreçte çalışır: veriyi üretir, route'ları ölçer, sonucu döner"""
+    klasor = tempfile.mkdtemp(prefix='bench_olcek_')
+    os.environ['DATABASE_URI'] = f"sqlite:///{os.path.join(klasor, 'bench.db')}"
+    os.environ['UPLOAD_FOLDER'] = os.path.join(klasor, 'uploads')
+    os.environ['QUERY_CACHE_ENABLED'] = 'False'
+    os.chdir(klasor)  # logs/ geçici klasöre yazılır
+    sys.path.insert(0, PROJE_KOKU)
+
+    from sqlalchemy import event
+    from app import app, db, logger
+    from src.utils.migrations import run_migrations
+    from src.utils.report_cache import report_cache
+    from src.utils.seed_data import generate_seed_data
+
+    logger.setLevel('WARNING')
+    with app.app_context():
+        db.create_all()
+        run_migrations(db)
+        baslangic = time.perf_counter()
+        satirlar = generate_seed_data(db, musteri_sayisi, is_sayisi, tohum=tohum)
+        uretim_suresi = time.perf_counter() - baslangic
+        db.session.remove()
+
+        sql_sayisi = [0]
+        ana_thread = threading.get_ident()
+
+        def say(*args):
+            # Arka plan iş kuyruğu thread'lerinin sorguları sayılmaz
+            if threading.get_ident() == ana_thread:
+                sql_sayisi[0] += 1
+        event.listen(db.engine, 'before_cursor_execute', say)
+
+    istemci = app.test_client()
+    with istemci.session_transaction() as oturum:
+        oturum['logged_in'] = True
+
+    musteriler = {'buyuk': 1, 'ortanca': max(1, (musteri_sayisi + 1) // 2)}
+    sonuclar = []
+    for ad, sablon, musteriye_bagli in ROTALAR:
+        for etiket, musteri_id in (musteriler.items() if musteriye_bagli else [(None, None)]):
+            yol = sablon.format(id=musteri_id, filtre=filtre)
+            sureler, sorgular, durum = [], [], None
+            rss_once = tepe_rss_mb()
+            for i in range(tekrar + 1):
+                if ad in RAPOR_ROTALARI:
+                    report_cache.clear()
+                sql_sayisi[0] = 0
+                baslangic = time.perf_counter()
+                yanit = istemci.get(yol)
+                boyut = len(yanit.get_data())  # Akış yanıtları burada tüketilir
+                sure = time.perf_counter() - baslangic
+                durum = yanit.status_code
+                if i:  # İlk çağrı ısınma
+                    sureler.append(sure * 1000)
+                    sorgular.append(sql_sayisi[0])
+            sonuclar.append({
+                'rota': ad, 'musteri': etiket, 'yol': yol, 'durum': durum, 'boyut': boyut,
+                'p50_ms': round(yuzdelik(sureler, 0.5), 1),
+                'p95_ms': round(yuzdelik(sureler, 0.95), 1),
+                'ort_sql': round(sum(sorgular) / len(sorgular), 1),
+                'tepe_rss_mb': tepe_rss_mb(),
+                'rss_artis_mb': round(tepe_rss_mb() - rss_once, 1),
+            })
+    return {
+        'musteri': musteri_sayisi, 'is': is_sayisi, 'satirlar': satirlar,
+        'uretim_sn': round(uretim_suresi, 1), 'tepe_rss_mb': tepe_rss_mb(), 'rotalar': sonuclar,
+    }
+
+
+def olcek_calistir(olcek, args):
+    """Ölçeği ayrı süreçte çalıştırır; sonuç stdout'un son satırındaki JSON'dur"""
+    musteri_sayisi, is_sayisi = olcek
+    komut = [sys.executable, os.path.abspath(__file__), '--tek', f'{musteri_sayisi}x{is_sayisi}',
+             '--tekrar', str(args.tekrar), '--tohum', str(args.tohum), '--filtre', args.filtre]
+    cikti = subprocess.run(komut, check=True, stdout=subprocess.PIPE, text=True).stdout
+    return json.loads(cikti.strip().splitlines()[-1])
+
+
+def git_surumu():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJE_KOKU, check=True,
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def karsilastir(onceki, yeni):
+    """Aynı ölçek/route/müşteri için p50, p95 ve SQL sayısı değişimini yazdırır"""
+    def anahtarlar(sonuc):
+        return {(o['musteri'], o['is'], r['rota'], r['musteri']): r
+                for o in sonuc['olcekler'] for r in o['rotalar']}
+
+    eski_rotalar = anahtarlar(onceki)
+    print(f"\nKarşılaştırma: {onceki.get('commit')} -> {yeni.get('commit')}")
+    print(f"{'Ölçek':>14} | {'Route':<24} | {'p50 (ms)':<27} | {'p95 (ms)':<27} | SQL")
+    for anahtar, rota in anahtarlar(yeni).items():
+        eski = eski_rotalar.get(anahtar)
+        if not eski:
+            continue
+        musteri, is_sayisi, ad, etiket = anahtar
+
+        def fark(alan):
+            oran = rota[alan] / eski[alan] if eski[alan] else float('inf')
+            return f'{eski[alan]:>8} -> {rota[alan]:<8} ({oran:.2f}x)'
+        print(f"{f'{musteri}x{is_sayisi}':>14} | {ad + (f' ({etiket})' if etiket else ''):<24} | "
+              f"{fark('p50_ms')} | {fark('p95_ms')} | {eski['ort_sql']:>5} -> {rota['ort_sql']:<5}")
+
+
+def olcek_coz(deger):
+    musteri_sayisi, is_sayisi = deger.lower().split('x')
+    return int(musteri_sayisi), int(is_sayisi)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Uygulama ölçek benchmark')
+    parser.add_argument('--olcekler', type=olcek_coz, nargs='+', default=[(20, 5000), (100, 50000)],
+                        help='müşteri x iş (ör. 500x2000000)')
+    parser.add_argument('--tekrar', type=int, default=5, help='Route başına ölçülen istek (ısınma hariç)')
+    parser.add_argument('--tohum', type=int, default=42)
+    parser.add_argument('--filtre', default='yil', help='Rapor route filtresi (ay, yil, 6ay, tumu)')
+    parser.add_argument('--cikti', default='olcek_sonuclari.json', help='Sonuç JSON dosyası')
+    parser.add_argument('--karsilastir', default=None, help='Önceki sonuç JSON dosyası')
+    parser.add_argument('--tek', type=olcek_coz, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.tek:
+        print(json.dumps(tek_olcek(*args.tek, args.tekrar, args.tohum, args.filtre), ensure_ascii=False))
+        return
+
+    sonuc = {
+        'commit': git_surumu(), 'tarih': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(), 'platform': platform.platform(),
+        'tekrar': args.tekrar, 'tohum': args.tohum, 'filtre': args.filtre, 'olcekler': [],
+    }
+    print(f"{'Ölçek':>14} | {'Route':<24} | {'Durum':>5} | {'p50 (ms)':>9} | {'p95 (ms)':>9} | "
+          f"{'SQL':>6} | {'Tepe RSS':>9}")
+    for olcek in args.olcekler:
+        olcek_sonucu = olcek_calistir(olcek, args)
+        sonuc['olcekler'].append(olcek_sonucu)
+        for rota in olcek_sonucu['rotalar']:
+            ad = rota['rota'] + (f" ({rota['musteri']})" if rota['musteri'] else '')
+            print(f"{f'{olcek[0]}x{olcek[1]}':>14} | {ad:<24} | {rota['durum']:>5} | {rota['p50_ms']:>9} | "
+                  f"{rota['p95_ms']:>9} | {rota['ort_sql']:>6} | {rota['tepe_rss_mb']:>6} MB")
+        with open(args.cikti, 'w', encoding='utf-8') as f:
+            json.dump(sonuc, f, ensure_ascii=False, indent=2)
+    print(f'\nSonuçlar: {args.cikti}')
+
+    if args.karsilastir:
+        with open(args.karsilastir, encoding='utf-8') as f:
+            karsilastir(json.load(f), sonuc)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Müşteri Excel raporu yazma benchmark'ı
+Sayfalar yazıldıktan sonra tüm hücreleri openpyxl üzerinden geri okuyarak
+sütun genişliği hesaplayan eski yaklaşımı, genişlikleri DataFrame'den
+vektörel hesaplayan ReportWorkbook'un normal ve write-only modlarıyla karşılaştırır
+
+Kullanım:
+    python benchmarks/bench_rapor_excel.py --satir 20000 100000
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+from src.utils.report_workbook import ReportWorkbook  # noqa: E402
+
+
+def rapor_sayfalari(satir_sayisi):
+    """musteri_rapor_excel'in ürettiğine benzer sayfalar (satırların yarısı iş, kalanı teslimat/arama)"""
+    rastgele = random.Random(4)
+    bugun = date.today()
+    is_sayisi = satir_sayisi // 2
+    diger = (satir_sayisi - is_sayisi) // 2
+    tarih = lambda i: (bugun - timedelta(days=i % 365)).strftime('%d.%m.%Y')  # noqa: E731
+    return {
+        'İş Günlüğü': pd.DataFrame({
+            'İş Kodu': [f'MST001-IS{i:03d}' for i in range(is_sayisi)],
+            'Tarih': [tarih(i) for i in range(is_sayisi)],
+            'Aktivite Türü': [rastgele.choice(['Tasarım', 'Video', 'Metin']) for _ in range(is_sayisi)],
+            'İş Açıklaması': [f'İş açıklaması {i} ' * rastgele.randrange(1, 8) for i in range(is_sayisi)],
+            'Süre (dk)': [rastgele.randrange(15, 240) for _ in range(is_sayisi)],
+            'Süre (saat)': [round(rastgele.randrange(15, 240) / 60, 1) for _ in range(is_sayisi)],
+            'Durum': [rastgele.choice(['Tamamlandı', 'Devam Ediyor']) for _ in range(is_sayisi)],
+        }),
+        'Teslimatlar': pd.DataFrame({
+            'İş Kodu': [f'MST001-IS{i:03d}' for i in range(diger)],
+            'Başlık': [f'Teslimat {i}' for i in range(diger)],
+            'Teslim Tarihi': [tarih(i) for i in range(diger)],
+            'Görüntülenme': [rastgele.randrange(10000) for _ in range(diger)],
+            'Beğeni': [rastgele.randrange(500) for _ in range(diger)],
+        }),
+        'Aramalar': pd.DataFrame({
+            'Tarih': [tarih(i) for i in range(diger)],
+            'Arayan/Aranan': [f'Kişi {i}' for i in range(diger)],
+            'Konu': [f'Konu {i}' for i in range(diger)],
+            'Notlar': [f'Görüşme notu {i} ' * 3 for i in range(diger)],
+        }),
+    }
+
+
+def eski_yaz(sayfalar):
+    """Karşılaştırma için önceki sürüm: yaz, ardından tüm hücreleri geri oku"""
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        for ad, df in sayfalar.items():
+            df.to_excel(writer, sheet_name=ad, index=False)
+        for sheet_name in writer.sheets:
+            worksheet = writer.sheets[sheet_name]
+            for column in worksheet.columns:
+                max_length = 0
+                column_letter = column[0].column_letter
+                for cell in column:
+                    if cell.value:
+                        max_length = max(max_length, len(str(cell.value)))
+                worksheet.column_dimensions[column_letter].width = max(max_length + 2, 10)
+    return output
+
+
+def yeni_yaz(sayfalar, write_only):
+    output = io.BytesIO()
+    with ReportWorkbook(output, write_only=write_only) as rapor:
+        for ad, df in sayfalar.items():
+            rapor.add_sheet(ad, df)
+    return output
+
+
+def olc(fonksiyon):
+    tracemalloc.start()
+    baslangic = time.perf_counter()
+    fonksiyon()
+    sure = time.perf_counter() - baslangic
+    _, tepe = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sure, tepe / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Müşteri Excel raporu benchmark')
+    parser.add_argument('--satir', type=int, nargs='+', default=[20000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'Satır':>8} | {'Yöntem':<26} | {'Süre (s)':>8} | {'Tepe bellek (MB)':>16}")
+    for satir_sayisi in args.satir:
+        sayfalar = rapor_sayfalari(satir_sayisi)
+        for ad, fonksiyon in (('eski (hücre taraması)', lambda: eski_yaz(sayfalar)),
+                              ('ReportWorkbook', lambda: yeni_yaz(sayfalar, False)),
+                              ('ReportWorkbook write-only', lambda: yeni_yaz(sayfalar, True))):
+            sure, tepe = olc(fonksiyon)
+            print(f'{satir_sayisi:>8} | {ad:<26} | {sure:>8.2f} | {tepe:>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
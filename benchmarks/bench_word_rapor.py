@@ -0,0 +1,123 @@
+"""
+Müşteri Word raporu veri hazırlama benchmark'ı
+generate_musteri_raporu'nun eski iç içe liste taramalarını (teslimat başına
+tüm revizyon ve sosyal medya listesini dolaşma) collect_musteri_raporu_verisi'nin
+sözlük indeksleriyle karşılaştırır. Kayıt başına süre yeni yöntemde sabit
+kalmalıdır (doğrusal ölçekleme); eski yöntemde boyutla birlikte artar.
+
+Eski kod revizyonları var olmayan teslimat_id alanıyla eşlediği için
+karşılaştırmada aynı alan is_gunlugu_id ile değiştirilmiştir.
+
+Kullanım:
+    python benchmarks/bench_word_rapor.py --boyutlar 1000 2000 4000 8000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# app import edilmeden önce geçici veritabanı ayarlanmalı
+_db_dosyasi = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DATABASE_URI'] = f'sqlite:///{_db_dosyasi}'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text  # noqa: E402
+from app import app, db, Musteri  # noqa: E402
+from src.utils.report_generator import collect_musteri_raporu_verisi  # noqa: E402
+
+
+def veri_olustur(boyut):
+    """Tabloları sıfırlar; son 30 güne boyut kadar iş, teslimat, revizyon ve gönderi ekler"""
+    db.drop_all()
+    db.create_all()
+    rastgele = random.Random(3)
+    bugun = date.today()
+    tarih = lambda i: bugun - timedelta(days=i % 30)  # noqa: E731
+    with db.engine.begin() as conn:
+        conn.execute(text("INSERT INTO musteri (id, musteri_kodu, ad) VALUES (1, 'MST001', 'Benchmark')"))
+        conn.execute(text(
+            'INSERT INTO is_gunlugu (id, is_kodu, tarih, musteri_id, aktivite_turu, sorumlu_kisi, sure_dakika) '
+            'VALUES (:id, :kod, :tarih, 1, :tur, :kisi, :sure)'
+        ), [{
+            'id': i, 'kod': f'MST001-IS{i:03d}', 'tarih': tarih(i), 'tur': rastgele.choice(['Tasarım', 'Video', 'Metin']),
+            'kisi': f'Kişi {i % 12}', 'sure': rastgele.randrange(15, 240),
+        } for i in range(1, boyut + 1)])
+        conn.execute(text(
+            'INSERT INTO teslimat (teslimat_kodu, musteri_id, is_gunlugu_id, teslim_turu, baslik, teslim_tarihi, durum) '
+            'VALUES (:kod, 1, :is_id, :tur, :baslik, :tarih, :durum)'
+        ), [{
+            'kod': f'TSLMST001{i:06d}', 'is_id': i, 'tur': rastgele.choice(['Tasarım', 'Video', 'Sosyal Medya']),
+            'baslik': f'İçerik {i}', 'tarih': tarih(i), 'durum': rastgele.choice(['Onaylandı', 'Hazırlanıyor']),
+        } for i in range(1, boyut + 1)])
+        conn.execute(text(
+            'INSERT INTO revizyon (tarih, musteri_id, is_gunlugu_id, revizyon_numarasi, revize_konusu, durum) '
+            'VALUES (:tarih, 1, :is_id, 1, :konu, :durum)'
+        ), [{
+            'tarih': tarih(i), 'is_id': rastgele.randrange(1, boyut + 1), 'konu': f'Revize {i}', 'durum': 'Bekliyor',
+        } for i in range(boyut)])
+        conn.execute(text(
+            'INSERT INTO sosyal_medya (tarih, musteri_id, platform, icerik_basligi, gonderi_turu, durum) '
+            'VALUES (:tarih, 1, :platform, :baslik, :tur, :durum)'
+        ), [{
+            'tarih': tarih(i), 'platform': rastgele.choice(['Instagram', 'LinkedIn']), 'baslik': f'İçerik {i}',
+            'tur': 'Post', 'durum': rastgele.choice(['Yayınlandı', 'Planlandı']),
+        } for i in range(1, boyut + 1)])
+
+
+def eski_esleme(teslimatlar, revizyonlar, sosyal_medyalar):
+    """Önceki sürümdeki iç içe taramalar (teslimat_id yerine is_gunlugu_id)"""
+    sonuc = []
+    tasarim_revize = len([r for r in revizyonlar if any(
+        t.is_gunlugu_id == r.is_gunlugu_id and 'tasarım' in (t.teslim_turu or '').lower() for t in teslimatlar)])
+    for teslimat in teslimatlar:
+        teslimat_revizyonlar = [r for r in revizyonlar if r.is_gunlugu_id == teslimat.is_gunlugu_id]
+        yayin_bilgisi = "-"
+        for sosyal in sosyal_medyalar:
+            if (sosyal.icerik_basligi and teslimat.baslik and
+                    teslimat.baslik.lower() in sosyal.icerik_basligi.lower() and
+                    sosyal.durum == 'Yayınlandı'):
+                yayin_bilgisi = f"{sosyal.platform}'da yayınlandı"
+                break
+        sonuc.append((len(teslimat_revizyonlar), yayin_bilgisi))
+    for revizyon in revizyonlar:
+        next((t for t in teslimatlar if t.is_gunlugu_id == revizyon.is_gunlugu_id), None)
+    return tasarim_revize, sonuc
+
+
+def olc(fonksiyon):
+    baslangic = time.perf_counter()
+    fonksiyon()
+    return time.perf_counter() - baslangic
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Müşteri Word raporu veri hazırlama benchmark')
+    parser.add_argument('--boyutlar', type=int, nargs='+', default=[1000, 2000, 4000, 8000])
+    parser.add_argument('--eski-yok', action='store_true', help='Eski yöntemi ölçme (büyük boyutlarda yavaş)')
+    args = parser.parse_args()
+
+    print(f"{'Kayıt':>8} | {'Yöntem':<22} | {'Süre (s)':>9} | {'µs / kayıt':>10}")
+    with app.app_context():
+        for boyut in args.boyutlar:
+            veri_olustur(boyut)
+            musteri = db.session.get(Musteri, 1)
+
+            sure = olc(lambda: collect_musteri_raporu_verisi(db, musteri))
+            print(f'{boyut:>8} | {"indeksli (yeni)":<22} | {sure:>9.3f} | {sure / boyut * 1e6:>10.1f}')
+
+            if not args.eski_yok:
+                # Aynı yüklenmiş listeler üzerinde yalnızca eşleme maliyeti (+ yükleme)
+                def eski():
+                    veri = collect_musteri_raporu_verisi(db, musteri)
+                    eski_esleme(veri['teslimatlar'], veri['revizyonlar'], veri['sosyal_medyalar'])
+                sure = olc(eski)
+                print(f'{boyut:>8} | {"iç içe tarama (eski)":<22} | {sure:>9.3f} | {sure / boyut * 1e6:>10.1f}')
+            db.session.remove()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Word rapor tablosu benchmark'ı
+Teslimat tablosunu (6 sütun) eski yöntemle - table.rows[i].cells[j].text
+ile hücre hücre - ve add_table_bulk ile oluşturup süreleri karşılaştırır
+
+Kullanım:
+    python benchmarks/bench_word_tablo.py --satir 500 2000 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document  # noqa: E402
+from src.utils.report_generator import add_table_bulk, TABLO_STILI  # noqa: E402
+
+BASLIKLAR = ['Dosya Adı', 'Gönderim Tarihi', 'Gönderen', 'Revize Durumu', 'Onay', 'Yayın/Paylaşım']
+
+
+def satirlar(adet):
+    return [(f'Teslimat {i}', '01.03.2025 00:00', f'Kişi {i % 7}', f'{i % 3} Revizyon', 'Onaylandı',
+             "Instagram'da yayınlandı") for i in range(adet)]
+
+
+def eski_tablo(veri):
+    """Karşılaştırma için önceki sürüm"""
+    doc = Document()
+    table = doc.add_table(rows=len(veri) + 1, cols=len(BASLIKLAR))
+    table.style = TABLO_STILI
+    for j, baslik in enumerate(BASLIKLAR):
+        table.rows[0].cells[j].text = baslik
+    for i, satir in enumerate(veri, 1):
+        for j, deger in enumerate(satir):
+            table.rows[i].cells[j].text = deger
+    return doc
+
+
+def yeni_tablo(veri):
+    doc = Document()
+    add_table_bulk(doc, BASLIKLAR, veri)
+    return doc
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Word rapor tablosu benchmark')
+    parser.add_argument('--satir', type=int, nargs='+', default=[500, 2000, 5000])
+    parser.add_argument('--eski-yok', action='store_true', help='Eski yöntemi ölçme (büyük tablolarda yavaş)')
+    args = parser.parse_args()
+
+    print(f"{'Satır':>8} | {'Yöntem':<22} | {'Süre (s)':>9}")
+    for adet in args.satir:
+        veri = satirlar(adet)
+        yontemler = [('add_table_bulk', yeni_tablo)]
+        if not args.eski_yok:
+            yontemler.insert(0, ('hücre hücre (eski)', eski_tablo))
+        for ad, fonksiyon in yontemler:
+            baslangic = time.perf_counter()
+            fonksiyon(veri)
+            print(f'{adet:>8} | {ad:<22} | {time.perf_counter() - baslangic:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -30,6 +30,7 @@ echo    ssh oguzhandiscioglu@ssh.pythonanywhere.com
 echo    cd /home/oguzhandiscioglu/ajans-yonetim-sistemi
 echo    git pull origin main
 echo    pip install --user -r requirements.txt
+echo    flask --app app db-upgrade
 echo.
 echo VEYA: Web interface'den Reload butonuna basın
 echo    https://www.pythonanywhere.com/user/oguzhandiscioglu/webapps/
@@ -4,6 +4,7 @@ UYARI: Tum veriler silinecektir!
 """
 import os
 from app import app, db
+from src.utils.migrations import run_migrations
 
 def reset_database():
     print("=" * 60)
@@ -31,6 +32,7 @@ def reset_database():
         
         # Yeni veritabanini olustur
         db.create_all()
+        run_migrations(db)
         print("Yeni veritabani olusturuldu!")
         print("=" * 60)
         print("Islem tamamlandi. Sistem hazir!")
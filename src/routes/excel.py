@@ -1,9 +1,9 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
-import pandas as pd
+from flask import Blueprint, render_template, request, redirect, url_for, flash, Response, stream_with_context
 import os
 from werkzeug.utils import secure_filename
-from src.models import Musteri
 from src.utils.database import db
+from src.utils.bulk_import import import_musteriler, read_workbook
+from src.utils.export import EXPORT_BICIMLERI, export_stream
 
 excel_bp = Blueprint('excel', __name__)
 
@@ -18,25 +18,17 @@ def excel_import():
             file.save(filepath)
             
             try:
-                # Excel'den veri oku ve veritabanına aktar
-                df = pd.read_excel(filepath)
+                # Excel'den veri oku (ilk sayfa, hücreler metin) ve veritabanına aktar
+                df = next(iter(read_workbook(filepath).values()))
                 
-                # Müşterileri içe aktar
-                if 'Müşteri Adı' in df.columns:
-                    for _, row in df.iterrows():
-                        musteri = Musteri(
-                            ad=row['Müşteri Adı'],
-                            sektor=row.get('Sektör', ''),
-                            aylik_ucret=row.get('Aylık Ücret (TL)', 0),
-                            ilgil_kisi=row.get('İlgili Kişi', ''),
-                            telefon=row.get('Telefon', ''),
-                            email=row.get('E-posta', ''),
-                            notlar=row.get('Notlar', '')
-                        )
-                        db.session.add(musteri)
+                # Müşterileri doğrula ve toplu olarak içe aktar
+                sonuc = import_musteriler(db, df)
+                if sonuc['hatalar']:
+                    flash(f"{len(sonuc['hatalar'])} hata bulundu, hiçbir kayıt aktarılmadı.", 'error')
+                    return render_template('excel_import.html', hatalar=sonuc['hatalar'][:200],
+                                           hata_sayisi=len(sonuc['hatalar']))
                 
-                db.session.commit()
-                flash('Excel verisi başarıyla içe aktarıldı!', 'success')
+                flash(f"Excel verisi başarıyla içe aktarıldı! ({sonuc['eklenen']} müşteri)", 'success')
                 return redirect(url_for('main.index'))
             except Exception as e:
                 db.session.rollback()
@@ -46,28 +38,12 @@ def excel_import():
 
 @excel_bp.route('/excel_export')
 def excel_export():
-    """Excel export"""
-    try:
-        # Tüm verileri Excel'e export et
-        with pd.ExcelWriter('ajans_raporu.xlsx', engine='openpyxl') as writer:
-            # Müşteriler
-            musteriler = pd.read_sql('SELECT * FROM musteri', db.engine)
-            musteriler.to_excel(writer, sheet_name='Müşteriler', index=False)
-            
-            # İş günlüğü
-            isler = pd.read_sql('SELECT * FROM is_gunlugu', db.engine)
-            isler.to_excel(writer, sheet_name='İş Günlüğü', index=False)
-            
-            # Teslimatlar
-            teslimatlar = pd.read_sql('SELECT * FROM teslimat', db.engine)
-            teslimatlar.to_excel(writer, sheet_name='Teslimatlar', index=False)
-            
-            # Sosyal medya
-            sosyal = pd.read_sql('SELECT * FROM sosyal_medya', db.engine)
-            sosyal.to_excel(writer, sheet_name='Sosyal Medya', index=False)
-        
-        flash('Veriler Excel dosyasına export edildi!', 'success')
-    except Exception as e:
-        flash(f'Hata: {str(e)}', 'error')
-    
-    return redirect(url_for('main.index'))
+    """Excel export (akışlı; ?format=xlsx | csv | jsonl)"""
+    bicim = request.args.get('format', 'xlsx')
+    if bicim not in EXPORT_BICIMLERI:
+        flash(f'Desteklenmeyen biçim: {bicim}', 'error')
+        return redirect(url_for('main.index'))
+
+    govde, mimetype, dosya_adi = export_stream(db, bicim)
+    return Response(stream_with_context(govde), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={dosya_adi}'})
@@ -0,0 +1,284 @@
+"""
+Toplu dönem raporu üretimi
+Dönem sonunda tüm (veya seçilen) müşteriler için Word ve Excel raporlarını
+süreç havuzunda paralel üretir, klasöre yazar ve manifest ile birlikte zip'ler.
+
+- Veri dönem başına bir kez yüklenir: her tablo için tek sorgu, satırlar
+  müşteriye göre gruplanır. Süreçlere ORM nesnesi değil, aynı alanlara
+  sahip düz nesneler gönderilir; işçiler veritabanına bağlanmaz.
+- Kaldığı yerden devam eder: her müşterinin dosyaları geçici adla yazılıp
+  yerine taşınır, ardından manifest.json güncellenir. Yarıda kalan çalışma
+  yeniden başlatıldığında manifest'te tamamlanmış ve dosyaları duran
+  müşteriler atlanır.
+
+Çıktı:
+    <cikti_klasoru>/<dönem>/manifest.json
+    <cikti_klasoru>/<dönem>/<müşteri kodu>_<ad>_<dönem>.docx|.xlsx
+    <cikti_klasoru>/<dönem>.zip
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import time
+import zipfile
+from calendar import monthrange
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import select
+
+
+TURLER = ('word', 'excel')
+UZANTILAR = {'word': '.docx', 'excel': '.xlsx'}
+TAMAMLANDI = 'tamamlandi'
+HATA = 'hata'
+
+# (veri anahtarı, model adı, tarih kolonu, iş kodu eklenir mi)
+DONEM_TABLOLARI = (
+    ('isler', 'IsGunlugu', 'tarih', False),
+    ('teslimatlar', 'Teslimat', 'teslim_tarihi', True),
+    ('revizyonlar', 'Revizyon', 'tarih', True),
+    ('sosyal_medyalar', 'SosyalMedya', 'tarih', True),
+    ('aramalar', 'Arama', 'tarih', False),
+)
+
+
+def donem_araligi(ay=None):
+    """
+    'YYYY-MM' ayının ilk ve son günü (ay verilmezse bir önceki ay)
+
+    Returns:
+        tuple: (başlangıç, bitiş)
+    """
+    if ay:
+        baslangic = datetime.strptime(ay, '%Y-%m').date()
+    else:
+        baslangic = (date.today().replace(day=1) - timedelta(days=1)).replace(day=1)
+    return baslangic, baslangic.replace(day=monthrange(baslangic.year, baslangic.month)[1])
+
+
+def donem_adi(start_date, end_date):
+    """Klasör/zip adı: tam ay ise 2025-03, değilse 2025-03-01_2025-03-15"""
+    if start_date.day == 1 and (start_date.year, start_date.month) == (end_date.year, end_date.month) \
+            and end_date.day == monthrange(end_date.year, end_date.month)[1]:
+        return start_date.strftime('%Y-%m')
+    return f'{start_date.isoformat()}_{end_date.isoformat()}'
+
+
+def load_donem_verisi(db, start_date, end_date, musteri_idler=None):
+    """
+    Dönemin tüm rapor kayıtlarını tablo başına tek sorguyla yükler
+
+    Teslimat, revizyon ve sosyal medya satırlarına raporların okuduğu
+    is_gunlugu.is_kodu aynı sorgudaki join ile eklenir.
+
+    Returns:
+        dict: {musteri_id: {'isler': [...], 'teslimatlar': [...], ...}}
+    """
+    import app as uygulama
+
+    is_tablosu = uygulama.IsGunlugu.__table__
+    veri = defaultdict(lambda: {anahtar: [] for anahtar, *_ in DONEM_TABLOLARI})
+    with db.engine.connect() as conn:
+        for anahtar, model_adi, tarih_kolonu, is_kodu in DONEM_TABLOLARI:
+            tablo = getattr(uygulama, model_adi).__table__
+            tarih = tablo.c[tarih_kolonu]
+            if is_kodu:
+                sorgu = select(tablo, is_tablosu.c.id.label('_is_id'), is_tablosu.c.is_kodu.label('_is_kodu'))\
+                    .outerjoin(is_tablosu, is_tablosu.c.id == tablo.c.is_gunlugu_id)
+            else:
+                sorgu = select(tablo)
+            sorgu = sorgu.where(tarih >= start_date, tarih <= end_date)
+            if musteri_idler:
+                sorgu = sorgu.where(tablo.c.musteri_id.in_(musteri_idler))
+            # Tek müşteri raporlarıyla aynı sıra: en yeni önce
+            for satir in conn.execute(sorgu.order_by(tarih.desc(), tablo.c.id)).mappings():
+                kayit = SimpleNamespace(**{k: v for k, v in satir.items() if not k.startswith('_')})
+                if is_kodu:
+                    kayit.is_gunlugu = SimpleNamespace(is_kodu=satir['_is_kodu']) if satir['_is_id'] is not None else None
+                veri[kayit.musteri_id][anahtar].append(kayit)
+    return veri
+
+
+def _ozet(yol):
+    sha = hashlib.sha256()
+    with open(yol, 'rb') as dosya:
+        for blok in iter(lambda: dosya.read(1024 * 1024), b''):
+            sha.update(blok)
+    return sha.hexdigest()
+
+
+def _musteri_raporlari(gorev):
+    """Bir müşterinin raporlarını üretir (süreç havuzunda çalışır)"""
+    from src.utils.report_excel import write_musteri_excel
+    from src.utils.report_generator import index_musteri_raporu_verisi, render_musteri_raporu
+
+    baslama = time.perf_counter()
+    musteri, veri = gorev['musteri'], gorev['veri']
+    dosyalar = []
+    for tur, ad in gorev['dosyalar']:
+        yol = os.path.join(gorev['klasor'], ad)
+        gecici = os.path.join(gorev['klasor'], f'.{os.getpid()}_{ad}')  # Uzantı korunur (ExcelWriter için)
+        if tur == 'word':
+            rapor_verisi = index_musteri_raporu_verisi(
+                musteri, gorev['start_date'], gorev['end_date'],
+                veri['isler'], veri['teslimatlar'], veri['revizyonlar'], veri['sosyal_medyalar'],
+            )
+            render_musteri_raporu(rapor_verisi).save(gecici)
+        else:
+            write_only = sum(len(kayitlar) for kayitlar in veri.values()) > gorev['write_only_sinir']
+            write_musteri_excel(gecici, veri['isler'], veri['teslimatlar'], veri['revizyonlar'],
+                                veri['sosyal_medyalar'], veri['aramalar'], write_only=write_only)
+        os.replace(gecici, yol)
+        dosyalar.append({'tur': tur, 'dosya': ad, 'boyut': os.path.getsize(yol), 'sha256': _ozet(yol)})
+    return {'dosyalar': dosyalar, 'sure': round(time.perf_counter() - baslama, 2)}
+
+
+def _manifest_yaz(yol, manifest):
+    manifest['guncelleme_tarihi'] = datetime.now().isoformat(timespec='seconds')
+    gecici = f'{yol}.part'
+    with open(gecici, 'w', encoding='utf-8') as dosya:
+        json.dump(manifest, dosya, ensure_ascii=False, indent=2)
+    os.replace(gecici, yol)
+
+
+def _tamamlanmis(girdi, klasor, adlar):
+    """Manifest girdisi istenen tüm dosyalarla tamamlanmış ve dosyalar duruyor mu?"""
+    if not girdi or girdi.get('durum') != TAMAMLANDI:
+        return False
+    yazilanlar = {dosya['dosya'] for dosya in girdi['dosyalar']}
+    return all(ad in yazilanlar and os.path.exists(os.path.join(klasor, ad)) for ad in adlar)
+
+
+def _paketle(klasor, manifest):
+    """Tamamlanan dosyaları ve manifest'i <klasor>.zip'e yazar"""
+    zip_yolu = f'{klasor}.zip'
+    gecici = f'{zip_yolu}.part'
+    with zipfile.ZipFile(gecici, 'w') as arsiv:
+        arsiv.write(os.path.join(klasor, 'manifest.json'), 'manifest.json', compress_type=zipfile.ZIP_DEFLATED)
+        for girdi in manifest['musteriler'].values():
+            if girdi['durum'] != TAMAMLANDI:
+                continue
+            for dosya in girdi['dosyalar']:
+                # docx/xlsx zaten sıkıştırılmış
+                arsiv.write(os.path.join(klasor, dosya['dosya']), dosya['dosya'], compress_type=zipfile.ZIP_STORED)
+    os.replace(gecici, zip_yolu)
+    return zip_yolu
+
+
+def generate_batch(db, start_date, end_date, cikti_klasoru, musteri_idler=None, turler=TURLER, hepsi=False,
+                   isci_sayisi=None, yeniden=False, write_only_sinir=20000, ilerleme=None):
+    """
+    Dönem raporlarını müşteriler için paralel üretip zip'ler
+
+    Args:
+        start_date, end_date: Rapor dönemi
+        cikti_klasoru: Dönem klasörünün ve zip'in yazılacağı klasör
+        musteri_idler: Yalnızca bu müşteriler (None: tümü)
+        turler: 'word' ve/veya 'excel'
+        hepsi: Dönemde kaydı olmayan müşterileri de dahil et
+        isci_sayisi: Süreç sayısı (None: çekirdek sayısı, 1: havuzsuz aynı süreçte)
+        yeniden: Önceki çalışmayı yok sayıp baştan üret
+        write_only_sinir: Bu kadar satırı aşan Excel raporları write-only yazılır
+        ilerleme: İsteğe bağlı ilerleme(yuzde, mesaj) geri çağrısı
+
+    Returns:
+        dict: {'zip', 'manifest', 'uretilen', 'onceden', 'hatali'}
+    """
+    from app import Musteri, guvenli_dosya_adi
+
+    klasor = os.path.join(cikti_klasoru, donem_adi(start_date, end_date))
+    manifest_yolu = os.path.join(klasor, 'manifest.json')
+    if yeniden and os.path.isdir(klasor):
+        shutil.rmtree(klasor)
+    os.makedirs(klasor, exist_ok=True)
+    for ad in os.listdir(klasor):
+        if ad.startswith('.'):
+            os.remove(os.path.join(klasor, ad))  # Yarıda kalmış geçici dosyalar
+
+    manifest = {
+        'donem': {'baslangic': start_date.isoformat(), 'bitis': end_date.isoformat()},
+        'turler': list(turler),
+        'olusturma_tarihi': datetime.now().isoformat(timespec='seconds'),
+        'musteriler': {},
+    }
+    if os.path.exists(manifest_yolu):
+        with open(manifest_yolu, encoding='utf-8') as dosya:
+            onceki = json.load(dosya)
+        manifest['olusturma_tarihi'] = onceki.get('olusturma_tarihi', manifest['olusturma_tarihi'])
+        manifest['musteriler'] = onceki.get('musteriler', {})
+
+    veri = load_donem_verisi(db, start_date, end_date, musteri_idler)
+    sorgu = db.session.query(Musteri.id, Musteri.musteri_kodu, Musteri.ad).order_by(Musteri.id)
+    if musteri_idler:
+        sorgu = sorgu.filter(Musteri.id.in_(musteri_idler))
+    musteriler = [m for m in sorgu.all() if hepsi or musteri_idler or m.id in veri]
+    if ilerleme:
+        ilerleme(10, f'{len(musteriler)} müşterinin verisi yüklendi')
+
+    bos = {anahtar: [] for anahtar, *_ in DONEM_TABLOLARI}
+    gorevler, onceden = [], 0
+    for musteri in musteriler:
+        onek = guvenli_dosya_adi(f'{musteri.musteri_kodu or musteri.id}_{musteri.ad}')
+        adlar = [(tur, f'{onek}_{donem_adi(start_date, end_date)}{UZANTILAR[tur]}') for tur in turler]
+        if not yeniden and _tamamlanmis(manifest['musteriler'].get(str(musteri.id)), klasor, [ad for _, ad in adlar]):
+            onceden += 1
+            continue
+        gorevler.append({
+            'musteri': SimpleNamespace(id=musteri.id, musteri_kodu=musteri.musteri_kodu, ad=musteri.ad),
+            'veri': veri.get(musteri.id, bos),
+            'start_date': start_date,
+            'end_date': end_date,
+            'klasor': klasor,
+            'dosyalar': adlar,
+            'write_only_sinir': write_only_sinir,
+        })
+    del veri
+    sayac = {'biten': onceden, 'hatali': 0}
+
+    def kaydet(gorev, sonuc=None, hata=None):
+        musteri = gorev['musteri']
+        girdi = {'musteri_id': musteri.id, 'musteri_kodu': musteri.musteri_kodu, 'ad': musteri.ad}
+        if hata is None:
+            girdi.update(durum=TAMAMLANDI, **sonuc)
+        else:
+            girdi.update(durum=HATA, hata=str(hata), dosyalar=[])
+            sayac['hatali'] += 1
+        manifest['musteriler'][str(musteri.id)] = girdi
+        _manifest_yaz(manifest_yolu, manifest)
+        sayac['biten'] += 1
+        if ilerleme:
+            ilerleme(10 + int(85 * sayac['biten'] / len(musteriler)), f"{sayac['biten']}/{len(musteriler)} müşteri")
+
+    isci_sayisi = min(isci_sayisi or os.cpu_count() or 1, max(len(gorevler), 1))
+    if isci_sayisi == 1:
+        for gorev in gorevler:
+            try:
+                kaydet(gorev, _musteri_raporlari(gorev))
+            except Exception as e:
+                kaydet(gorev, hata=e)
+    elif gorevler:
+        # spawn: web sürecindeki thread'ler ve veritabanı bağlantıları işçilere kopyalanmaz
+        havuz = ProcessPoolExecutor(max_workers=isci_sayisi, mp_context=multiprocessing.get_context('spawn'))
+        try:
+            bekleyenler = {havuz.submit(_musteri_raporlari, gorev): gorev for gorev in gorevler}
+            for gelecek in as_completed(bekleyenler):
+                gorev = bekleyenler.pop(gelecek)
+                try:
+                    kaydet(gorev, gelecek.result())
+                except Exception as e:
+                    kaydet(gorev, hata=e)
+        finally:
+            havuz.shutdown(wait=True, cancel_futures=True)
+
+    _manifest_yaz(manifest_yolu, manifest)
+    zip_yolu = _paketle(klasor, manifest)
+    if ilerleme:
+        ilerleme(98, 'Zip hazır')
+    return {'zip': zip_yolu, 'manifest': manifest_yolu, 'uretilen': len(gorevler) - sayac['hatali'],
+            'onceden': onceden, 'hatali': sayac['hatali']}
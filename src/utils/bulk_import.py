@@ -0,0 +1,672 @@
+"""
+Toplu Excel içe aktarma modülü
+Müşteri, iş, teslimat, revizyon, sosyal medya ve arama sayfalarını iş
+anahtarlarına (musteri_kodu, is_kodu, ...) göre eşleyerek idempotent aktarır
+
+Akış iki adımlıdır:
+    plan = plan_import(db, read_workbook(dosya))   # kuru çalıştırma, yazmaz
+    sonuc = apply_import(db, plan)                 # sadece farkları yazar
+
+Kolonlar vektörel pandas işlemleriyle temizlenir ve tüm satırlar yazmadan
+önce doğrulanır. Her satırın karşılaştırılan kolonları hem dosyada hem
+veritabanında aynı biçime getirilip hash'lenir; hash'i aynı olan satırlar
+atlanır, böylece aynı dosyayı tekrar yüklemek yalnızca değişen satırlara dokunur.
+"""
+
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import insert, update, select, bindparam, func
+
+from src.utils.customer_summary import refresh_musteri_ozet
+from src.utils.rollups import refresh_gunluk_ozet
+from src.utils.query_cache import bump_table_versions
+from src.utils.sequences import advance_value, max_kod_numarasi
+
+
+# varlık: (model, sayfa adı, anahtar kolonları, eksikse üretilen kod kolonu)
+# Sıra bağımlılık sırasıdır: referans verilen varlıklar önce yazılır
+VARLIKLAR = {
+    'musteri': ('Musteri', 'Müşteriler', ('musteri_kodu',), 'musteri_kodu'),
+    'is_gunlugu': ('IsGunlugu', 'İş Günlüğü', ('is_kodu',), 'is_kodu'),
+    'teslimat': ('Teslimat', 'Teslimatlar', ('teslimat_kodu',), 'teslimat_kodu'),
+    'revizyon': ('Revizyon', 'Revizyonlar', ('is_kodu', 'revizyon_numarasi'), None),
+    'sosyal_medya': ('SosyalMedya', 'Sosyal Medya', ('musteri_kodu', 'tarih', 'platform', 'icerik_basligi'), None),
+    'arama': ('Arama', 'Aramalar', ('musteri_kodu', 'tarih', 'arayan_aranan', 'konu'), None),
+}
+
+# Dosyada ID yerine iş kodlarıyla verilen referanslar: FK kolonu -> kod kolonu
+REFERANSLAR = {
+    'musteri_id': ('musteri_kodu', 'musteri'),
+    'is_gunlugu_id': ('is_kodu', 'is_gunlugu'),
+}
+
+# Eski tek sayfalık müşteri şablonunun Türkçe başlıkları -> Musteri kolonu
+MUSTERI_KOLONLARI = {
+    'Müşteri Kodu': 'musteri_kodu',
+    'Müşteri Adı': 'ad',
+    'Sektör': 'sektor',
+    'Aylık Ücret (TL)': 'aylik_ucret',
+    'İlgili Kişi': 'ilgil_kisi',
+    'Telefon': 'telefon',
+    'E-posta': 'email',
+    'Notlar': 'notlar',
+}
+
+# Üretilen kodların sayaç kapsamı ve numara biçimi (app.generate_*_kodu ile aynı)
+KOD_BICIMLERI = {
+    'musteri': ('musteri', {'ayirici': 'MST'}),
+    'is_gunlugu': ('is:{musteri_id}', {'ayirici': '-IS'}),
+    'teslimat': ('teslimat:{musteri_id}', {'onek': 'TSL{musteri_kodu}'}),
+}
+
+PARCA_BOYUTU = 5000
+# Excel'de 1. satır başlık olduğu için DataFrame indeksi 0 -> Excel satırı 2
+EXCEL_SATIR_KAYMASI = 2
+
+_EPOSTA_DESENI = r'^[^@\s]+@[^@\s]+\.[^@\s]+$'
+
+
+def _model(varlik):
+    import app
+    return getattr(app, VARLIKLAR[varlik][0])
+
+
+def _kolon_tipleri(varlik):
+    """
+    Varlığın dosyada beklenen kolonları ve Python tipleri
+
+    id kolonu dışarıda bırakılır, FK kolonları kod kolonlarıyla değiştirilir.
+
+    Returns:
+        dict: {kolon_adi: (python_tipi, uzunluk, zorunlu)}
+    """
+    model = _model(varlik)
+    kolonlar = {}
+    for kolon in model.__table__.columns:
+        if kolon.name == 'id':
+            continue
+        if kolon.name in REFERANSLAR:
+            kod_kolonu, hedef = REFERANSLAR[kolon.name]
+            kolonlar[kod_kolonu] = (str, None, not kolon.nullable)
+            continue
+        uzunluk = getattr(kolon.type, 'length', None)
+        kolonlar[kolon.name] = (kolon.type.python_type, uzunluk, not kolon.nullable)
+    return kolonlar
+
+
+def _metin_kolonu(seri):
+    """Hücreleri kırpılmış metne çevirir; boş hücreler <NA> olur"""
+    if pd.api.types.is_numeric_dtype(seri):
+        # Telefon gibi sayı olarak okunan değerlerde '.0' kuyruğunu at
+        tam = seri.dropna()
+        if (tam % 1 == 0).all():
+            seri = seri.astype('Int64')
+    metin = seri.astype('string').str.strip()
+    return metin.mask(metin == '')
+
+
+def _sayi_kolonu(seri):
+    """
+    Hücreleri sayıya çevirir ('15.000,50 TL' gibi Türkçe yazımlar dahil)
+
+    Returns:
+        tuple: (sayılar, dolu olup sayıya çevrilemeyen hücre maskesi)
+    """
+    if pd.api.types.is_numeric_dtype(seri):
+        return seri.astype(float), pd.Series(False, index=seri.index)
+
+    metin = seri.astype('string').str.strip()
+    metin = metin.mask(metin == '')
+    # Sayı hücreleri metin olarak okunduğunda ('15000.5', '1e+16') doğrudan çevrilir
+    dogrudan = pd.to_numeric(metin, errors='coerce').astype(float)
+    sade = metin.str.replace(r'[^\d,.\-]', '', regex=True)
+    # Virgül varsa nokta binlik ayırıcıdır
+    virgullu = sade.str.contains(',', na=False)
+    sade = sade.mask(virgullu, sade.str.replace('.', '', regex=False).str.replace(',', '.', regex=False))
+    sayilar = dogrudan.fillna(pd.to_numeric(sade, errors='coerce').astype(float))
+    return sayilar, metin.notna() & sayilar.isna()
+
+
+def _tarih_kolonu(seri):
+    """
+    Hücreleri 'YYYY-MM-DD' metnine çevirir (ISO ve gg.aa.yyyy yazımları)
+
+    Tarihler metin olarak tutulur; böylece dosyadan ve veritabanından gelen
+    değerler aynı hash'i üretir.
+
+    Returns:
+        tuple: (tarih metinleri, dolu olup tarihe çevrilemeyen hücre maskesi)
+    """
+    metin = seri.astype('string').str.strip()
+    metin = metin.mask(metin == '')
+    tarihler = pd.to_datetime(metin, format='ISO8601', errors='coerce')
+    kalan = tarihler.isna() & metin.notna()
+    if kalan.any():
+        tarihler = tarihler.mask(kalan, pd.to_datetime(metin[kalan], format='mixed', dayfirst=True, errors='coerce'))
+    sonuc = tarihler.dt.strftime('%Y-%m-%d').astype('string')
+    return sonuc, metin.notna() & sonuc.isna()
+
+
+def _normalize(seri, tip, uzunluk=None):
+    """
+    Kolonu tipine göre karşılaştırılabilir biçime getirir
+
+    Returns:
+        tuple: (normalize seri, [(hata_maskesi, mesaj), ...])
+    """
+    if tip is str:
+        metin = _metin_kolonu(seri)
+        hatalar = []
+        if uzunluk:
+            hatalar.append((metin.str.len() > uzunluk, f'En fazla {uzunluk} karakter olabilir'))
+        return metin, hatalar
+
+    if tip in (int, float):
+        sayilar, gecersiz = _sayi_kolonu(seri)
+        hatalar = [(gecersiz, 'Sayı olmalı'), (sayilar < 0, 'Negatif olamaz')]
+        if tip is int:
+            kesirli = sayilar.notna() & (sayilar % 1 != 0)
+            hatalar.append((kesirli, 'Tam sayı olmalı'))
+            return sayilar.mask(kesirli).astype('Int64'), hatalar
+        return sayilar.astype('Float64'), hatalar
+
+    tarihler, gecersiz = _tarih_kolonu(seri)
+    return tarihler, [(gecersiz, 'Geçersiz tarih')]
+
+
+def read_workbook(dosya_yolu):
+    """
+    Excel dosyasındaki tüm sayfaları {sayfa_adi: DataFrame} olarak okur
+
+    Hücreler metin olarak okunur: pandas'ın tip tahmini '05457368886' gibi
+    telefon ve kodları sayıya çevirip baştaki sıfırı siler. Sayı ve tarih
+    kolonları _normalize içinde metinden çevrilir.
+    """
+    return pd.read_excel(dosya_yolu, sheet_name=None, dtype=str)
+
+
+def _sayfa_varligi(sayfa_adi, df):
+    """Sayfanın hangi varlığa ait olduğunu bulur (yoksa None)"""
+    for varlik, (_, sayfa, _, _) in VARLIKLAR.items():
+        if sayfa_adi in (sayfa, varlik):
+            return varlik
+    # Eski tek sayfalık müşteri şablonu (sayfa adı serbest)
+    if 'Müşteri Adı' in df.columns:
+        return 'musteri'
+    return None
+
+
+def _hazirla(varlik, df):
+    """
+    Sayfayı temizler ve satırları doğrular
+
+    Returns:
+        tuple: (temiz DataFrame [sadece bilinen kolonlar], hatalar)
+    """
+    _, sayfa, anahtar, uretilen = VARLIKLAR[varlik]
+    tipler = _kolon_tipleri(varlik)
+
+    if varlik == 'musteri':
+        df = df.rename(columns=MUSTERI_KOLONLARI)
+    df = df.reset_index(drop=True)
+
+    hatalar = []
+
+    def sayfa_hatasi(kolon, mesaj):
+        hatalar.append({'sayfa': sayfa, 'satir': None, 'kolon': kolon, 'hata': mesaj})
+
+    # Doğal anahtarın tüm kolonları sayfada bulunmalı; değer olarak yalnızca
+    # NOT NULL kolonlar ve anahtarın ilk kolonu zorunludur
+    zorunlular = [kolon for kolon, (_, _, zorunlu) in tipler.items() if zorunlu]
+    if not uretilen and anahtar[0] not in zorunlular:
+        zorunlular.append(anahtar[0])
+    for kolon in zorunlular + [kolon for kolon in anahtar if kolon != uretilen]:
+        if kolon not in df.columns and not any(h['kolon'] == kolon for h in hatalar):
+            sayfa_hatasi(kolon, 'Zorunlu kolon bulunamadı')
+    if hatalar:
+        return pd.DataFrame(), hatalar
+
+    temiz = pd.DataFrame(index=df.index)
+    maskeler = []
+    for kolon, (tip, uzunluk, _) in tipler.items():
+        if kolon not in df.columns:
+            continue
+        temiz[kolon], kolon_hatalari = _normalize(df[kolon], tip, uzunluk)
+        maskeler.extend((kolon, maske, mesaj) for maske, mesaj in kolon_hatalari)
+        if kolon == 'email':
+            maskeler.append((kolon, temiz[kolon].notna() & ~temiz[kolon].str.match(_EPOSTA_DESENI, na=False),
+                             'Geçersiz e-posta adresi'))
+
+    # Geçersiz değerler ayrıca raporlandığı için yalnızca gerçekten boş hücreler
+    for kolon in zorunlular:
+        metin = df[kolon].astype('string').str.strip()
+        maskeler.append((kolon, metin.isna() | (metin == ''), 'Boş olamaz'))
+
+    if uretilen and uretilen not in temiz.columns:
+        temiz[uretilen] = pd.array([None] * len(temiz), dtype='string')
+    if varlik == 'is_gunlugu':
+        # Kodu üretilecek işin müşterisi bilinmeli (kod müşteri koduyla başlar)
+        musterisiz = temiz['is_kodu'].isna() & (temiz['musteri_kodu'].isna() if 'musteri_kodu' in temiz
+                                                 else pd.Series(True, index=temiz.index))
+        maskeler.append(('musteri_kodu', musterisiz, 'İş kodu boşsa müşteri kodu zorunlu'))
+    anahtarli = temiz[uretilen].notna() if uretilen else pd.Series(True, index=temiz.index)
+    tekrar = anahtarli & temiz.duplicated(list(anahtar), keep=False)
+    maskeler.append((', '.join(anahtar), tekrar, 'Dosyada aynı anahtarla birden fazla satır var'))
+
+    # Maskeler vektörel hesaplanır; yalnızca hatalı satırlar üzerinde dönülür
+    for kolon, maske, mesaj in maskeler:
+        maske = maske.fillna(False).astype(bool)
+        for indeks in df.index[maske]:
+            hatalar.append({'sayfa': sayfa, 'satir': int(indeks) + EXCEL_SATIR_KAYMASI,
+                            'kolon': kolon, 'hata': mesaj})
+
+    return temiz, hatalar
+
+
+def _parcalar(degerler, boyut=PARCA_BOYUTU):
+    degerler = list(degerler)
+    for bas in range(0, len(degerler), boyut):
+        yield degerler[bas:bas + boyut]
+
+
+def _kod_sorgusu(varlik):
+    """Varlığın kod kolonu ve ID'si (referans çözümlemesi için)"""
+    model = _model(varlik)
+    kod_kolonu = VARLIKLAR[varlik][3]
+    return model.id, getattr(model, kod_kolonu)
+
+
+def _kod_idleri(db, varlik, kodlar):
+    """Kodları ID'lere çevirir: {kod: id}"""
+    id_kolonu, kod_kolonu = _kod_sorgusu(varlik)
+    sonuc = {}
+    for parca in _parcalar({kod for kod in kodlar if kod is not None and not pd.isna(kod)}):
+        sonuc.update(db.session.execute(select(kod_kolonu, id_kolonu).where(kod_kolonu.in_(parca))).all())
+    return sonuc
+
+
+def _musteri_adlarini_esle(db, temiz):
+    """
+    Kodsuz müşteri satırlarını ada göre mevcut müşteriyle eşler
+
+    Eski şablonda kod kolonu yoktur; ad hem dosyada hem veritabanında tek ise
+    o müşterinin kodu atanır, böylece aynı dosya tekrar yüklendiğinde
+    müşteriler çoğalmaz.
+    """
+    from app import Musteri
+
+    kodsuz = temiz['musteri_kodu'].isna() & temiz['ad'].notna()
+    if not kodsuz.any():
+        return
+    adlar = temiz.loc[kodsuz, 'ad']
+    tekil_adlar = adlar[~adlar.duplicated(keep=False)]
+
+    eslesen = {}
+    for parca in _parcalar(tekil_adlar.unique()):
+        eslesen.update(db.session.execute(
+            select(Musteri.ad, func.min(Musteri.musteri_kodu))
+            .where(Musteri.ad.in_(parca))
+            .group_by(Musteri.ad).having(func.count(Musteri.id) == 1)
+        ).all())
+    if eslesen:
+        temiz.loc[tekil_adlar.index, 'musteri_kodu'] = tekil_adlar.map(eslesen).astype('string')
+
+
+def entity_select(varlik, kolonlar=None):
+    """
+    Varlığın satırlarını dosya biçiminde (FK'lar kod olarak) okuyan SELECT
+
+    Dışa aktarma da aynı sorguyu kullanır; böylece dışa aktarılan dosya
+    tekrar içe aktarılabilir.
+
+    Args:
+        varlik: VARLIKLAR anahtarı
+        kolonlar: Okunacak dosya kolonları (None ise tümü)
+
+    Returns:
+        tuple: (select, {kolon_adi: kolon ifadesi}) - ilk kolon 'id'
+    """
+    from app import Musteri, IsGunlugu
+
+    model = _model(varlik)
+    tablo = model.__table__
+    musteri = Musteri.__table__.alias('m')
+    is_gunlugu = IsGunlugu.__table__.alias('ig')
+
+    kaynak = tablo
+    ifadeler = {'id': tablo.c.id}
+    for kolon in (kolonlar if kolonlar is not None else _kolon_tipleri(varlik)):
+        if kolon in tablo.c:
+            ifadeler[kolon] = tablo.c[kolon]
+        elif kolon == 'musteri_kodu':
+            kaynak = kaynak.outerjoin(musteri, musteri.c.id == tablo.c.musteri_id)
+            ifadeler[kolon] = musteri.c.musteri_kodu
+        elif kolon == 'is_kodu':
+            kaynak = kaynak.outerjoin(is_gunlugu, is_gunlugu.c.id == tablo.c.is_gunlugu_id)
+            ifadeler[kolon] = is_gunlugu.c.is_kodu
+
+    sorgu = select(*[ifade.label(ad) for ad, ifade in ifadeler.items()]).select_from(kaynak)
+    return sorgu, ifadeler
+
+
+def _mevcut_kayitlar(db, varlik, kolonlar, temiz):
+    """
+    Dosyadaki anahtarlara karşılık gelen veritabanı satırlarını dosyayla aynı
+    biçimde okur (FK'lar kod olarak)
+
+    Sorgu ilk anahtar kolonuna göre parça parça filtrelenir; tüm tablo okunmaz.
+    """
+    sorgu, ifadeler = entity_select(varlik, kolonlar)
+    ilk_anahtar = VARLIKLAR[varlik][2][0]
+
+    parcalar = [pd.DataFrame({ad: pd.Series(dtype=object) for ad in ifadeler})]
+    for parca in _parcalar(temiz[ilk_anahtar].dropna().unique()):
+        parcalar.append(pd.read_sql(
+            sorgu.where(ifadeler[ilk_anahtar].in_([str(deger) for deger in parca])), db.session.connection()
+        ))
+
+    mevcut = pd.concat(parcalar, ignore_index=True)
+    tipler = _kolon_tipleri(varlik)
+    for kolon in kolonlar:
+        mevcut[kolon], _ = _normalize(mevcut[kolon], tipler[kolon][0])
+    # Doğal anahtarı veritabanında tekrarlanan eski kayıtlardan ilki eşlenir
+    return mevcut.drop_duplicates(list(VARLIKLAR[varlik][2]))
+
+
+def _satir_hashleri(df, kolonlar):
+    """Satır başına 64 bit hash (kolon sırası sabit)"""
+    return pd.util.hash_pandas_object(df[kolonlar], index=False)
+
+
+def _referans_hatalari(db, varlik, temiz, dosya_kodlari):
+    """Dosyada ve veritabanında bulunmayan müşteri/iş kodlarını raporlar"""
+    sayfa = VARLIKLAR[varlik][1]
+    hatalar = []
+    for kod_kolonu, hedef in REFERANSLAR.values():
+        if hedef == varlik or kod_kolonu not in temiz.columns:
+            continue
+        kodlar = temiz[kod_kolonu].dropna()
+        bilinen = set(_kod_idleri(db, hedef, kodlar.unique())) | dosya_kodlari.get(hedef, set())
+        for indeks in kodlar.index[~kodlar.isin(bilinen)]:
+            hatalar.append({'sayfa': sayfa, 'satir': int(indeks) + EXCEL_SATIR_KAYMASI,
+                            'kolon': kod_kolonu, 'hata': f'{kodlar[indeks]} bulunamadı'})
+    return hatalar
+
+
+def plan_import(db, sayfalar):
+    """
+    Kuru çalıştırma: sayfaları doğrular ve veritabanıyla karşılaştırır, yazmaz
+
+    Args:
+        db: Database session
+        sayfalar: {sayfa_adi: DataFrame} (read_workbook çıktısı)
+
+    Returns:
+        dict: {'varliklar': {varlik: {'sayfa', 'kolonlar', 'ekle', 'guncelle',
+               'eklenecek', 'guncellenecek', 'degismeyen'}},
+               'hatalar': [{'sayfa', 'satir', 'kolon', 'hata'}, ...],
+               'atlanan_sayfalar': [...]}
+    """
+    hazir = {}
+    atlanan = []
+    hatalar = []
+    for sayfa_adi, df in sayfalar.items():
+        varlik = _sayfa_varligi(sayfa_adi, df)
+        if varlik is None or varlik in hazir:
+            atlanan.append(sayfa_adi)
+            continue
+        temiz, sayfa_hatalari = _hazirla(varlik, df)
+        hazir[varlik] = temiz
+        hatalar.extend(sayfa_hatalari)
+
+    # Aynı dosyada tanımlanan kodlara alt sayfalardan referans verilebilir
+    dosya_kodlari = {}
+    for varlik in VARLIKLAR:
+        temiz = hazir.get(varlik)
+        if temiz is None or temiz.empty:
+            continue
+        uretilen = VARLIKLAR[varlik][3]
+        if varlik == 'musteri':
+            _musteri_adlarini_esle(db, temiz)
+        hatalar.extend(_referans_hatalari(db, varlik, temiz, dosya_kodlari))
+        if uretilen:
+            dosya_kodlari[varlik] = set(temiz[uretilen].dropna())
+
+    sayfa_sirasi = {sayfa: sira for sira, (_, sayfa, _, _) in enumerate(VARLIKLAR.values())}
+    hatalar.sort(key=lambda hata: (sayfa_sirasi.get(hata['sayfa'], 0), hata['satir'] or 0))
+    plan = {'varliklar': {}, 'hatalar': hatalar, 'atlanan_sayfalar': atlanan}
+    if hatalar:
+        return plan
+
+    for varlik in VARLIKLAR:
+        if varlik not in hazir:
+            continue
+        temiz = hazir[varlik]
+        _, sayfa, anahtar, uretilen = VARLIKLAR[varlik]
+
+        kolonlar = list(temiz.columns)
+        yeni = temiz[anahtar[0]].isna() if uretilen else pd.Series(False, index=temiz.index)
+        mevcut = _mevcut_kayitlar(db, varlik, kolonlar, temiz[~yeni])
+
+        eslesme = temiz[~yeni].reset_index().merge(
+            mevcut, on=list(anahtar), how='left', suffixes=('', '_db'), validate='one_to_one'
+        ).set_index('index')
+        bulunan = eslesme['id'].notna()
+
+        farkli = pd.Series(False, index=eslesme.index)
+        if bulunan.any():
+            dosya = eslesme.loc[bulunan, kolonlar]
+            veritabani = eslesme.loc[bulunan, [k if k in anahtar else f'{k}_db' for k in kolonlar]]
+            veritabani.columns = kolonlar
+            farkli[bulunan] = (_satir_hashleri(dosya, kolonlar).values
+                               != _satir_hashleri(veritabani, kolonlar).values)
+
+        ekle = pd.concat([temiz[yeni], eslesme.loc[~bulunan, kolonlar]])
+        guncelle = eslesme.loc[farkli, kolonlar + ['id']].astype({'id': 'int64'})
+        plan['varliklar'][varlik] = {
+            'sayfa': sayfa,
+            'kolonlar': kolonlar,
+            'ekle': ekle,
+            'guncelle': guncelle,
+            'eklenecek': len(ekle),
+            'guncellenecek': len(guncelle),
+            'degismeyen': int(bulunan.sum() - farkli.sum()),
+        }
+
+    return plan
+
+
+def _kayitlara_cevir(varlik, df):
+    """DataFrame'i NaN/<NA> yerine None, tarih metni yerine date içeren sözlük listesine çevirir"""
+    tipler = _kolon_tipleri(varlik)
+    df = df.copy()
+    for kolon in df.columns:
+        if kolon in tipler and tipler[kolon][0] is date:
+            df[kolon] = pd.to_datetime(df[kolon]).dt.date
+    nesne = df.astype(object)
+    return nesne.where(nesne.notna(), None).to_dict('records')
+
+
+def _referanslari_coz(db, varlik, kayitlar):
+    """Kayıtlardaki kod kolonlarını FK ID'lerine çevirir (yerinde)"""
+    from app import IsGunlugu
+
+    model = _model(varlik)
+    for fk_kolonu, (kod_kolonu, hedef) in REFERANSLAR.items():
+        if hedef == varlik or fk_kolonu not in model.__table__.c:
+            continue
+        if not kayitlar or kod_kolonu not in kayitlar[0]:
+            continue
+        idler = _kod_idleri(db, hedef, [kayit[kod_kolonu] for kayit in kayitlar])
+        for kayit in kayitlar:
+            kayit[fk_kolonu] = idler.get(kayit.pop(kod_kolonu))
+
+    # Müşteri kodu verilmemiş alt kayıtlarda müşteri işten alınır
+    if 'musteri_id' in model.__table__.c and kayitlar and 'is_gunlugu_id' in kayitlar[0] \
+            and 'musteri_id' not in kayitlar[0]:
+        is_musterileri = dict(db.session.execute(
+            select(IsGunlugu.id, IsGunlugu.musteri_id)
+            .where(IsGunlugu.id.in_(bindparam('idler', expanding=True))),
+            {'idler': list({kayit['is_gunlugu_id'] for kayit in kayitlar})}
+        ).all())
+        for kayit in kayitlar:
+            kayit['musteri_id'] = is_musterileri.get(kayit['is_gunlugu_id'])
+
+
+def _sayaclari_ilerlet(db, varlik, kayitlar):
+    """Hazır kodla eklenen kayıtların numaralarını sayaçlara işler"""
+    from app import Musteri, son_musteri_numarasi, son_is_numarasi, son_teslimat_numarasi
+
+    kod_kolonu = VARLIKLAR[varlik][3]
+    kapsam, bicim = KOD_BICIMLERI[varlik]
+    gruplar = {}
+    for kayit in kayitlar:
+        if kayit.get(kod_kolonu):
+            gruplar.setdefault(kayit.get('musteri_id'), []).append(kayit[kod_kolonu])
+
+    for musteri_id, kodlar in gruplar.items():
+        if varlik == 'musteri':
+            advance_value(db, kapsam, max_kod_numarasi(kodlar, **bicim), son_musteri_numarasi)
+        elif musteri_id:
+            # Teslimat kodunun öneki müşteri koduna bağlıdır (TSLMST001...)
+            musteri_kodu = db.session.get(Musteri, musteri_id).musteri_kodu
+            numara = max_kod_numarasi(kodlar, **{ad: deger.format(musteri_kodu=musteri_kodu)
+                                                 for ad, deger in bicim.items()})
+            son_numara = son_is_numarasi if varlik == 'is_gunlugu' else son_teslimat_numarasi
+            advance_value(db, kapsam.format(musteri_id=musteri_id), numara, lambda: son_numara(musteri_id))
+
+
+def _kodlari_uret(db, varlik, kayitlar):
+    """Kodu boş yeni kayıtlara sayaçtan blok halinde kod atar (yerinde)"""
+    from app import Musteri, generate_musteri_kodlari, generate_is_kodlari, generate_teslimat_kodlari
+
+    kod_kolonu = VARLIKLAR[varlik][3]
+    kodsuz = [kayit for kayit in kayitlar if kod_kolonu and not kayit.get(kod_kolonu)]
+    if not kodsuz:
+        return
+
+    if varlik == 'musteri':
+        for kayit, kod in zip(kodsuz, generate_musteri_kodlari(len(kodsuz))):
+            kayit[kod_kolonu] = kod
+        return
+
+    # İş ve teslimat kodları müşteri başına numaralanır
+    uretici = generate_is_kodlari if varlik == 'is_gunlugu' else generate_teslimat_kodlari
+    gruplar = {}
+    for kayit in kodsuz:
+        gruplar.setdefault(kayit.get('musteri_id'), []).append(kayit)
+    for musteri_id, grup in gruplar.items():
+        musteri = db.session.get(Musteri, musteri_id) if musteri_id else None
+        for kayit, kod in zip(grup, uretici(musteri, len(grup))):
+            kayit[kod_kolonu] = kod
+
+
+def _etkilenenler(db, varlik, kayitlar, eski_idler=()):
+    """Yazılan kayıtların (eski ve yeni) müşteri ID'leri ve iş günleri"""
+    model = _model(varlik)
+    musteriler, gunler = set(), set()
+    if varlik == 'musteri':
+        musteriler.update(eski_idler)
+    else:
+        musteriler.update(kayit.get('musteri_id') for kayit in kayitlar)
+    if varlik == 'is_gunlugu':
+        gunler.update(kayit.get('tarih') for kayit in kayitlar)
+
+    if eski_idler and varlik != 'musteri':
+        kolonlar = [model.musteri_id] + ([model.tarih] if varlik == 'is_gunlugu' else [])
+        for satir in db.session.execute(
+            select(*kolonlar).where(model.id.in_(bindparam('idler', expanding=True))),
+            {'idler': list(eski_idler)}
+        ):
+            musteriler.add(satir[0])
+            if varlik == 'is_gunlugu':
+                gunler.add(satir[1])
+    return musteriler, gunler
+
+
+def _parcayi_yaz(db, varlik, kayitlar, guncelleme):
+    """Tek parçayı yazar, özetleri günceller ve commit eder"""
+    model = _model(varlik)
+    eski_idler = [kayit['id'] for kayit in kayitlar] if guncelleme else []
+    musteriler, gunler = _etkilenenler(db, varlik, kayitlar, eski_idler)
+
+    try:
+        if guncelleme:
+            db.session.execute(update(model), kayitlar)
+        else:
+            db.session.execute(insert(model), kayitlar)
+            if varlik == 'musteri':
+                musteriler.update(_kod_idleri(db, 'musteri', [kayit['musteri_kodu'] for kayit in kayitlar]).values())
+        # Toplu yazmalar flush'tan geçmediği için özetler burada güncellenir
+        conn = db.session.connection()
+        refresh_musteri_ozet(conn, musteriler)
+        refresh_gunluk_ozet(conn, gunler)
+        bump_table_versions(conn, [model.__tablename__])
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def apply_import(db, plan, parca_boyutu=PARCA_BOYUTU):
+    """
+    Planlanan ekleme ve güncellemeleri varlık sırasıyla yazar
+
+    Kayıtlar parca_boyutu'luk transaction'larda executemany ile yazılır;
+    yalnızca değişen kolonlar değil, sayfadaki tüm kolonlar güncellenir.
+    Yarıda kesilirse aynı dosya tekrar yüklenebilir: yazılmış satırlar
+    değişmeyen olarak atlanır.
+
+    Args:
+        db: Database session
+        plan: plan_import çıktısı (hatasız olmalı)
+        parca_boyutu: Transaction başına satır sayısı
+
+    Returns:
+        dict: {varlik: {'eklenen': n, 'guncellenen': n, 'degismeyen': n}}
+    """
+    if plan['hatalar']:
+        raise ValueError('Hatalı plan uygulanamaz')
+
+    sonuc = {}
+    for varlik, adim in plan['varliklar'].items():
+        ozet = sonuc[varlik] = {'eklenen': 0, 'guncellenen': 0, 'degismeyen': adim['degismeyen']}
+
+        for kayitlar in _parcalar(_kayitlara_cevir(varlik, adim['ekle']), parca_boyutu):
+            _referanslari_coz(db, varlik, kayitlar)
+            if varlik in KOD_BICIMLERI:
+                _sayaclari_ilerlet(db, varlik, kayitlar)
+                _kodlari_uret(db, varlik, kayitlar)
+            _parcayi_yaz(db, varlik, kayitlar, guncelleme=False)
+            ozet['eklenen'] += len(kayitlar)
+
+        for kayitlar in _parcalar(_kayitlara_cevir(varlik, adim['guncelle']), parca_boyutu):
+            _referanslari_coz(db, varlik, kayitlar)
+            _parcayi_yaz(db, varlik, kayitlar, guncelleme=True)
+            ozet['guncellenen'] += len(kayitlar)
+
+    return sonuc
+
+
+def import_musteriler(db, df, parca_boyutu=PARCA_BOYUTU):
+    """
+    Tek sayfalık müşteri tablosunu içe aktarır (plan + uygulama)
+
+    Args:
+        db: Database session
+        df: Müşteri sayfası (read_workbook çıktısındaki bir DataFrame)
+        parca_boyutu: Transaction başına eklenecek satır sayısı
+
+    Returns:
+        dict: {'toplam', 'eklenen', 'guncellenen', 'hatalar'}
+    """
+    plan = plan_import(db, {VARLIKLAR['musteri'][1]: df})
+    sonuc = {'toplam': len(df), 'eklenen': 0, 'guncellenen': 0, 'hatalar': plan['hatalar']}
+    if plan['hatalar']:
+        return sonuc
+
+    ozet = apply_import(db, plan, parca_boyutu).get('musteri', {})
+    sonuc['eklenen'] = ozet.get('eklenen', 0)
+    sonuc['guncellenen'] = ozet.get('guncellenen', 0)
+    return sonuc
@@ -0,0 +1,142 @@
+"""
+Toplu (set tabanlı) silme modülü
+SQLite foreign key zorlaması ve müşteri/teslimat silme işlemleri
+"""
+
+from sqlalchemy import event, delete, select, or_
+from src.utils.customer_summary import refresh_musteri_ozet
+from src.utils.rollups import refresh_gunluk_ozet
+from src.utils.query_cache import bump_table_versions
+
+
+def enable_sqlite_foreign_keys(engine):
+    """
+    SQLite bağlantılarında foreign key zorlamasını açar
+
+    SQLite'ta PRAGMA foreign_keys bağlantı başına ayarlanır ve varsayılanı
+    kapalıdır; bu yüzden havuza giren her yeni bağlantıda çalıştırılır.
+    ON DELETE CASCADE tanımları ancak bu ayar açıkken uygulanır.
+
+    Args:
+        engine: SQLAlchemy engine
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    if event.contains(engine, 'connect', _foreign_keys_on):
+        return
+    event.listen(engine, 'connect', _foreign_keys_on)
+
+
+def _foreign_keys_on(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+
+def _sil(db, model, kosul):
+    """Tek bir DELETE cümlesi çalıştırır ve silinen satır sayısını döndürür"""
+    sonuc = db.session.execute(
+        delete(model).where(kosul).execution_options(synchronize_session=False)
+    )
+    return sonuc.rowcount or 0
+
+
+def delete_musteri(db, musteri_id):
+    """
+    Müşteriyi ve ilişkili tüm kayıtlarını set tabanlı DELETE'lerle siler
+
+    İş başına ayrı sorgu atmak yerine çocuk tablolar
+    "is_gunlugu_id IN (SELECT id FROM is_gunlugu WHERE musteri_id = ?)"
+    alt sorgusuyla tek seferde silinir; 6 DELETE cümlesi çalışır. Tablolar
+    tek tek silindiği için tablo başına silinen satır sayısı raporlanabilir,
+    ON DELETE CASCADE ise gözden kaçan kayıtlar için güvenlik ağıdır.
+    Commit çağırana bırakılır.
+
+    Args:
+        db: Database session
+        musteri_id: Silinecek müşteri ID
+
+    Returns:
+        dict: {tablo_adi: silinen_satir_sayisi}
+    """
+    from app import Musteri, IsGunlugu, Teslimat, SosyalMedya, Revizyon, Arama
+
+    musteri_isleri = select(IsGunlugu.id).where(IsGunlugu.musteri_id == musteri_id)
+
+    # İşlere bağlı olup başka müşteriye yazılmış kayıtlar varsa o müşterilerin özeti de değişir
+    etkilenenler = {musteri_id}
+    for model in (Revizyon, SosyalMedya, Teslimat):
+        etkilenenler.update(db.session.execute(
+            select(model.musteri_id).where(model.is_gunlugu_id.in_(musteri_isleri),
+                                           model.musteri_id != musteri_id).distinct()
+        ).scalars())
+
+    # Silinecek işlerin günleri, günlük rollup'ı yeniden hesaplamak için
+    is_gunleri = db.session.execute(
+        select(IsGunlugu.tarih).where(IsGunlugu.musteri_id == musteri_id).distinct()
+    ).scalars().all()
+
+    silinenler = {}
+    for model in (Revizyon, SosyalMedya, Teslimat):
+        silinenler[model.__tablename__] = _sil(db, model, or_(
+            model.musteri_id == musteri_id,
+            model.is_gunlugu_id.in_(musteri_isleri)
+        ))
+    silinenler[Arama.__tablename__] = _sil(db, Arama, Arama.musteri_id == musteri_id)
+    silinenler[IsGunlugu.__tablename__] = _sil(db, IsGunlugu, IsGunlugu.musteri_id == musteri_id)
+    silinenler[Musteri.__tablename__] = _sil(db, Musteri, Musteri.id == musteri_id)
+
+    # Core DELETE'ler flush'tan geçmediği için özetler burada güncellenir
+    refresh_musteri_ozet(db.session.connection(), etkilenenler)
+    refresh_gunluk_ozet(db.session.connection(), is_gunleri)
+    bump_table_versions(db.session.connection(), silinenler.keys())
+
+    return silinenler
+
+
+def delete_teslimat(db, teslimat):
+    """
+    Teslimatı, bağlı olduğu işi ve işin revizyon/sosyal medya kayıtlarını siler
+
+    Aynı işe bağlı diğer teslimatlar da (iş silindiği için) kaldırılır.
+    Commit çağırana bırakılır.
+
+    Args:
+        db: Database session
+        teslimat: Silinecek Teslimat nesnesi
+
+    Returns:
+        dict: {tablo_adi: silinen_satir_sayisi}
+    """
+    from app import IsGunlugu, Teslimat, SosyalMedya, Revizyon
+
+    is_id = teslimat.is_gunlugu_id
+    etkilenenler = {teslimat.musteri_id}
+    is_gunleri = []
+    if teslimat.is_gunlugu:
+        etkilenenler.add(teslimat.is_gunlugu.musteri_id)
+        is_gunleri.append(teslimat.is_gunlugu.tarih)
+    silinenler = {}
+
+    if is_id:
+        for model in (Revizyon, SosyalMedya):
+            silinenler[model.__tablename__] = _sil(db, model, model.is_gunlugu_id == is_id)
+        silinenler[Teslimat.__tablename__] = _sil(db, Teslimat, or_(
+            Teslimat.id == teslimat.id,
+            Teslimat.is_gunlugu_id == is_id
+        ))
+        silinenler[IsGunlugu.__tablename__] = _sil(db, IsGunlugu, IsGunlugu.id == is_id)
+    else:
+        silinenler[Teslimat.__tablename__] = _sil(db, Teslimat, Teslimat.id == teslimat.id)
+
+    refresh_musteri_ozet(db.session.connection(), etkilenenler)
+    refresh_gunluk_ozet(db.session.connection(), is_gunleri)
+    bump_table_versions(db.session.connection(), silinenler.keys())
+
+    return silinenler
+
+
+def format_silinenler(silinenler):
+    """Silinen satır sayılarını kullanıcı mesajı için metne çevirir"""
+    return ', '.join(f'{tablo}: {adet}' for tablo, adet in silinenler.items() if adet)
@@ -0,0 +1,162 @@
+"""
+Müşteri özet tablosu modülü
+musteri_ozet satırlarını çocuk tablolardaki yazmalarla aynı transaction'da günceller
+"""
+
+from sqlalchemy import event, select, insert, delete, func, case, inspect
+
+# Onaylanan / devam eden teslimat sayılırken kullanılan durumlar
+ONAYLANAN_DURUMLAR = ('Tamamlandı', 'Teslim Edildi')
+DEVAM_EDEN_DURUM = 'Hazırlanıyor'
+
+
+def _ozet_select(musteri_ids=None):
+    """Müşteri başına özet değerlerini hesaplayan SELECT (INSERT ... SELECT için)"""
+    from app import Musteri, IsGunlugu, Teslimat, Revizyon
+
+    def alt_sorgu(ifade, model):
+        return select(ifade).where(model.musteri_id == Musteri.id).scalar_subquery()
+
+    son_is = alt_sorgu(func.max(IsGunlugu.tarih), IsGunlugu)
+    son_teslimat = alt_sorgu(func.max(Teslimat.teslim_tarihi), Teslimat)
+
+    sorgu = select(
+        Musteri.id,
+        alt_sorgu(func.coalesce(func.sum(IsGunlugu.sure_dakika), 0), IsGunlugu),
+        alt_sorgu(func.count(IsGunlugu.id), IsGunlugu),
+        alt_sorgu(func.count(Teslimat.id), Teslimat),
+        alt_sorgu(func.coalesce(func.sum(case((Teslimat.durum.in_(ONAYLANAN_DURUMLAR), 1), else_=0)), 0), Teslimat),
+        alt_sorgu(func.coalesce(func.sum(case((Teslimat.durum == DEVAM_EDEN_DURUM, 1), else_=0)), 0), Teslimat),
+        alt_sorgu(func.coalesce(func.sum(case((Teslimat.teslim_turu == 'Sosyal Medya', 1), else_=0)), 0), Teslimat),
+        alt_sorgu(func.count(Revizyon.id), Revizyon),
+        # Son aktivite: son iş veya teslimat tarihi (biri boşsa diğeri)
+        case((son_is >= son_teslimat, son_is), else_=func.coalesce(son_teslimat, son_is)),
+        func.current_timestamp(),
+    )
+    if musteri_ids is not None:
+        sorgu = sorgu.where(Musteri.id.in_(musteri_ids))
+    return sorgu
+
+
+def refresh_musteri_ozet(conn, musteri_ids=None):
+    """
+    Verilen müşterilerin özet satırlarını yeniden hesaplar
+
+    Sayımlar (musteri_id, ...) indeksleri üzerinden müşteri başına yapılır;
+    silinmiş müşterilerin satırı kaldırılır. Çağıranın bağlantısı/transaction'ı
+    kullanıldığı için asıl yazma ile birlikte commit veya rollback olur.
+
+    Args:
+        conn: SQLAlchemy Connection (ör. db.session.connection())
+        musteri_ids: Müşteri ID listesi (None ise tüm müşteriler)
+
+    Returns:
+        int: Yazılan özet satırı sayısı
+    """
+    from app import MusteriOzet
+
+    if musteri_ids is not None:
+        musteri_ids = sorted({m for m in musteri_ids if m is not None})
+        if not musteri_ids:
+            return 0
+
+    silme = delete(MusteriOzet)
+    if musteri_ids is not None:
+        silme = silme.where(MusteriOzet.musteri_id.in_(musteri_ids))
+    conn.execute(silme)
+
+    kolonlar = ['musteri_id', 'toplam_dakika', 'is_sayisi', 'teslimat_sayisi',
+                'onaylanan_teslimat', 'devam_eden_teslimat', 'sosyal_medya_teslimat',
+                'revizyon_sayisi', 'son_aktivite_tarihi', 'guncelleme_tarihi']
+    sonuc = conn.execute(insert(MusteriOzet).from_select(kolonlar, _ozet_select(musteri_ids)))
+    return sonuc.rowcount
+
+
+def rebuild_musteri_ozet(db):
+    """
+    Tüm müşterilerin özet tablosunu sıfırdan oluşturur ve commit eder
+
+    Args:
+        db: Database session
+
+    Returns:
+        int: Oluşturulan özet satırı sayısı
+    """
+    adet = refresh_musteri_ozet(db.session.connection())
+    db.session.commit()
+    return adet
+
+
+def get_musteri_ozet(db, musteri_id):
+    """
+    Müşterinin özet satırını tek birincil anahtar okumasıyla döndürür
+
+    Satır yoksa (ör. migration öncesi kayıt) o anda hesaplanıp yazılır.
+
+    Args:
+        db: Database session
+        musteri_id: Müşteri ID
+
+    Returns:
+        MusteriOzet veya None (müşteri yoksa)
+    """
+    from app import MusteriOzet
+
+    ozet = db.session.get(MusteriOzet, musteri_id)
+    if ozet is None:
+        refresh_musteri_ozet(db.session.connection(), [musteri_id])
+        db.session.commit()
+        ozet = db.session.get(MusteriOzet, musteri_id)
+    return ozet
+
+
+def _etkilenen_musteriler(session):
+    """Flush edilen özet kaynaklı kayıtların müşteri ID'lerini toplar"""
+    from app import Musteri, IsGunlugu, Teslimat, Revizyon
+
+    kaynaklar = (IsGunlugu, Teslimat, Revizyon)
+    musteri_ids = set()
+
+    for nesne in session.new:
+        if isinstance(nesne, kaynaklar):
+            musteri_ids.add(nesne.musteri_id)
+        elif isinstance(nesne, Musteri):
+            musteri_ids.add(nesne.id)
+
+    for nesne in session.deleted:
+        if isinstance(nesne, kaynaklar):
+            musteri_ids.add(nesne.musteri_id)
+
+    for nesne in session.dirty:
+        if not isinstance(nesne, kaynaklar) or not session.is_modified(nesne):
+            continue
+        musteri_ids.add(nesne.musteri_id)
+        # Kayıt başka müşteriye taşındıysa eski müşterinin özeti de değişir
+        gecmis = inspect(nesne).attrs.musteri_id.history
+        musteri_ids.update(gecmis.deleted or ())
+
+    musteri_ids.discard(None)
+    return musteri_ids
+
+
+def register_ozet_listeners(session):
+    """
+    Session flush'larında etkilenen müşterilerin özetini günceller
+
+    after_flush, INSERT/UPDATE/DELETE'ler veritabanına gittikten sonra ama
+    commit'ten önce çalışır; özet aynı transaction'da güncellenir.
+    Toplu Core DELETE/UPDATE'ler (ör. cascade modülü) flush'tan geçmediği
+    için refresh_musteri_ozet'i kendileri çağırmalıdır.
+
+    Args:
+        session: db.session (scoped_session)
+    """
+    if event.contains(session, 'after_flush', _after_flush):
+        return
+    event.listen(session, 'after_flush', _after_flush)
+
+
+def _after_flush(session, flush_context):
+    musteri_ids = _etkilenen_musteriler(session)
+    if musteri_ids:
+        refresh_musteri_ozet(session.connection(), musteri_ids)
@@ -0,0 +1,183 @@
+"""
+Akışlı (streaming) dışa aktarma modülü
+Altı veri tablosunu parça parça okur ve xlsx (openpyxl write-only) ya da
+CSV / JSON Lines zip olarak yanıt gövdesine akıtır
+
+Bellek kullanımı tablo boyutundan bağımsızdır: her parça ayrı, kısa bir
+keyset sorgusuyla (id > son_id ORDER BY id LIMIT n) okunur, yazılır ve
+bırakılır. Okuma kilidi parçalar arasında serbest kaldığı için uzun bir
+dışa aktarma yazmaları bekletmez. Kolonlar içe aktarma biçimindedir
+(FK'lar kod olarak), dosya doğrudan tekrar içe aktarılabilir.
+"""
+
+import csv
+import io
+import json
+import os
+import tempfile
+import zipfile
+from datetime import date, datetime
+
+from src.utils.bulk_import import VARLIKLAR, entity_select
+
+
+PARCA_BOYUTU = 2000
+AKIS_BLOK_BOYUTU = 64 * 1024
+
+# biçim: (mimetype, dosya uzantısı)
+EXPORT_BICIMLERI = {
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'csv': ('application/zip', 'zip'),
+    'jsonl': ('application/zip', 'zip'),
+}
+
+
+def entity_columns(varlik):
+    """Dışa aktarılan kolon adları (id hariç, içe aktarma biçiminde)"""
+    return list(entity_select(varlik)[1])[1:]
+
+
+def iter_entity_rows(db, varlik, parca_boyutu=PARCA_BOYUTU):
+    """
+    Varlığın satırlarını id sırasıyla parça parça üretir
+
+    Args:
+        db: Database (Flask-SQLAlchemy)
+        varlik: VARLIKLAR anahtarı
+        parca_boyutu: Sorgu başına satır sayısı
+
+    Yields:
+        tuple: (kolon adları, [satır, ...]) - kolonlarda id yoktur
+    """
+    sorgu, ifadeler = entity_select(varlik)
+    kolonlar = list(ifadeler)[1:]
+    son_id = 0
+    while True:
+        with db.engine.connect() as conn:
+            satirlar = conn.execute(
+                sorgu.where(ifadeler['id'] > son_id).order_by(ifadeler['id']).limit(parca_boyutu)
+            ).all()
+        if not satirlar:
+            return
+        son_id = satirlar[-1][0]
+        yield kolonlar, [satir[1:] for satir in satirlar]
+
+
+class _AkisTamponu(io.RawIOBase):
+    """
+    zipfile'ın yazdığı baytları toplayan, geri sarılamayan tampon
+
+    Seek desteklemediği için zipfile kayıt boyutlarını veri tanımlayıcılarıyla
+    (data descriptor) yazar; arşiv baştan sona tek geçişte üretilebilir.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._parcalar = []
+
+    def writable(self):
+        return True
+
+    def write(self, veri):
+        self._parcalar.append(bytes(veri))
+        return len(veri)
+
+    def bosalt(self):
+        veri = b''.join(self._parcalar)
+        self._parcalar.clear()
+        return veri
+
+
+def _json_degeri(deger):
+    if isinstance(deger, (date, datetime)):
+        return deger.isoformat()
+    return deger
+
+
+def _csv_parcasi(satirlar):
+    tampon = io.StringIO()
+    csv.writer(tampon).writerows(satirlar)
+    return tampon.getvalue()
+
+
+def _jsonl_parcasi(kolonlar, satirlar):
+    return ''.join(
+        json.dumps({kolon: _json_degeri(deger) for kolon, deger in zip(kolonlar, satir)}, ensure_ascii=False) + '\n'
+        for satir in satirlar
+    )
+
+
+def stream_zip(db, bicim, parca_boyutu=PARCA_BOYUTU):
+    """
+    Her tabloyu zip içinde ayrı bir CSV veya JSON Lines dosyası olarak üretir
+
+    Yields:
+        bytes: Zip arşivinin ardışık parçaları
+    """
+    tampon = _AkisTamponu()
+    with zipfile.ZipFile(tampon, 'w', compression=zipfile.ZIP_DEFLATED) as arsiv:
+        for varlik in VARLIKLAR:
+            with arsiv.open(f'{varlik}.{bicim}', 'w', force_zip64=True) as dosya:
+                if bicim == 'csv':
+                    # BOM: Excel'in Türkçe karakterleri doğru açması için
+                    dosya.write(('\ufeff' + _csv_parcasi([entity_columns(varlik)])).encode('utf-8'))
+                for kolonlar, satirlar in iter_entity_rows(db, varlik, parca_boyutu):
+                    metin = _csv_parcasi(satirlar) if bicim == 'csv' else _jsonl_parcasi(kolonlar, satirlar)
+                    dosya.write(metin.encode('utf-8'))
+                    yield tampon.bosalt()
+            yield tampon.bosalt()
+    yield tampon.bosalt()
+
+
+def stream_xlsx(db, parca_boyutu=PARCA_BOYUTU):
+    """
+    Tabloları openpyxl write-only modunda geçici bir xlsx dosyasına yazar ve
+    dosyayı bloklar halinde üretir (dosya sonunda silinir)
+
+    xlsx bir zip arşivi olduğu ve openpyxl kaydetmeden önce tamamlanmasını
+    beklediği için ilk bayt dosya bittiğinde gönderilir; bellek yine sabittir.
+
+    Yields:
+        bytes: xlsx dosyasının ardışık blokları
+    """
+    from openpyxl import Workbook
+
+    tanimlayici, dosya_yolu = tempfile.mkstemp(suffix='.xlsx')
+    os.close(tanimlayici)
+    try:
+        kitap = Workbook(write_only=True)
+        for varlik, (_, sayfa_adi, _, _) in VARLIKLAR.items():
+            sayfa = kitap.create_sheet(sayfa_adi)
+            sayfa.append(entity_columns(varlik))
+            for _, satirlar in iter_entity_rows(db, varlik, parca_boyutu):
+                for satir in satirlar:
+                    sayfa.append(list(satir))
+        kitap.save(dosya_yolu)
+
+        with open(dosya_yolu, 'rb') as dosya:
+            while True:
+                blok = dosya.read(AKIS_BLOK_BOYUTU)
+                if not blok:
+                    break
+                yield blok
+    finally:
+        os.remove(dosya_yolu)
+
+
+def export_stream(db, bicim='xlsx', parca_boyutu=PARCA_BOYUTU):
+    """
+    Tüm veriyi istenen biçimde akıtan üreteç ve yanıt bilgileri
+
+    Args:
+        db: Database (Flask-SQLAlchemy)
+        bicim: 'xlsx', 'csv' veya 'jsonl'
+        parca_boyutu: Sorgu başına satır sayısı
+
+    Returns:
+        tuple: (bytes üreteci, mimetype, dosya adı)
+    """
+    mimetype, uzanti = EXPORT_BICIMLERI[bicim]
+    dosya_adi = f"ajans_verileri_{datetime.now():%Y%m%d_%H%M}{'_' + bicim if uzanti == 'zip' else ''}.{uzanti}"
+    if bicim == 'xlsx':
+        return stream_xlsx(db, parca_boyutu), mimetype, dosya_adi
+    return stream_zip(db, bicim, parca_boyutu), mimetype, dosya_adi
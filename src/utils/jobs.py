@@ -0,0 +1,322 @@
+"""
+Arka plan rapor işleri kuyruğu
+Rapor istekleri rapor_isi tablosuna yazılır; her web sürecindeki işçi
+thread'leri tabloyu yoklayarak iş alır ve işleyicinin ürettiği dosyanın
+yolunu işe kaydeder.
+
+- İş alma tek bir UPDATE ... RETURNING cümlesidir. SQLite yazmaları
+  sıraladığı için aynı işi iki süreç alamaz ve tüm süreçlerde aynı anda
+  çalışan iş sayısı eszamanli_limit'i aşmaz.
+- İşler tabloda durduğu için süreç yeniden başlasa da kaybolmaz: bekleyen
+  işleri yeni süreç alır; süreci ölmüş ya da nabzı zaman aşımını geçmiş
+  'calisiyor' işler deneme sınırına kadar yeniden kuyruğa konur.
+- Bitmiş ('tamamlandi', 'hata') işler saklama_gun'den eski olunca nabız
+  thread'i tarafından tablodan silinir; rapor dosyaları rapor önbelleğinde
+  kendi sınırlarıyla yönetilir.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, insert, update, delete, func, and_
+
+
+BEKLIYOR = 'bekliyor'
+CALISIYOR = 'calisiyor'
+TAMAMLANDI = 'tamamlandi'
+HATA = 'hata'
+
+YOKLAMA_ARALIGI = 2  # saniye; yeni iş eklenince işçiler beklemeden uyanır
+TEMIZLIK_ARALIGI = 3600  # saniye; eski işlerin silinme sıklığı
+
+
+def _tablo():
+    from app import RaporIsi
+    return RaporIsi.__table__
+
+
+class JobQueue:
+    """rapor_isi tablosu üzerinde süreçler arası güvenli iş kuyruğu"""
+
+    def __init__(self):
+        self.app = None
+        self.db = None
+        self.isci_sayisi = 2
+        self.eszamanli_limit = 2
+        self.zaman_asimi = 600
+        self.en_fazla_deneme = 3
+        self.saklama_gun = 7
+        self.kimlik = None
+        self._isleyiciler = {}
+        self._calisanlar = set()  # Bu süreçte çalışan iş id'leri
+        self._kilit = threading.Lock()
+        self._uyandir = threading.Event()
+        self._pid = None
+        self._son_temizlik = 0.0
+
+    def configure(self, app, db, isci_sayisi=None, eszamanli_limit=None,
+                  zaman_asimi=None, en_fazla_deneme=None, saklama_gun=None):
+        """
+        Kuyruğu uygulamaya bağlar
+
+        Args:
+            isci_sayisi: Süreç başına işçi thread sayısı
+            eszamanli_limit: Tüm süreçlerde aynı anda çalışabilecek iş sayısı
+            zaman_asimi: Nabzı bu kadar saniye gelmeyen iş yeniden kuyruğa konur
+            en_fazla_deneme: Yarıda kalan bir işin en fazla kaç kez başlatılacağı
+            saklama_gun: Bitmiş işlerin tabloda tutulacağı gün sayısı (0: silinmez)
+        """
+        self.app = app
+        self.db = db
+        if isci_sayisi is not None:
+            self.isci_sayisi = isci_sayisi
+        if eszamanli_limit is not None:
+            self.eszamanli_limit = eszamanli_limit
+        if zaman_asimi is not None:
+            self.zaman_asimi = zaman_asimi
+        if en_fazla_deneme is not None:
+            self.en_fazla_deneme = en_fazla_deneme
+        if saklama_gun is not None:
+            self.saklama_gun = saklama_gun
+
+    def register(self, tur, isleyici):
+        """
+        Rapor türü için işleyici kaydeder
+
+        isleyici(musteri_id, parametreler, ilerleme) raporu üretir ve
+        (dosya yolu, indirme adı) döner; ilerleme(yuzde, mesaj) durumu
+        tabloya işler.
+        """
+        self._isleyiciler[tur] = isleyici
+
+    @property
+    def turler(self):
+        return tuple(self._isleyiciler)
+
+    def start(self):
+        """İşçi ve nabız thread'lerini süreç başına bir kez başlatır"""
+        with self._kilit:
+            # fork edilen süreçler thread'leri devralmaz; pid değiştiyse yeniden başlatılır
+            if self.app is None or self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self.kimlik = f'{socket.gethostname()}:{self._pid}:{uuid.uuid4().hex[:8]}'
+            self._calisanlar.clear()
+
+        for sira in range(self.isci_sayisi):
+            threading.Thread(target=self._isci_dongusu, name=f'rapor-isci-{sira}', daemon=True).start()
+        threading.Thread(target=self._nabiz_dongusu, name='rapor-nabiz', daemon=True).start()
+
+    def submit(self, tur, musteri_id, parametreler=None):
+        """
+        Rapor işini kuyruğa ekler
+
+        Aynı rapor (tür, müşteri, parametreler) zaten bekliyor veya çalışıyorsa
+        yeni iş açılmaz, mevcut işin id'si döner.
+
+        Returns:
+            int: İş id'si
+        """
+        if tur not in self._isleyiciler:
+            raise ValueError(f'Bilinmeyen rapor türü: {tur}')
+        tablo = _tablo()
+        parametre_json = json.dumps(parametreler or {}, sort_keys=True, ensure_ascii=False)
+        with self.db.engine.begin() as conn:
+            is_id = conn.execute(select(tablo.c.id).where(
+                tablo.c.tur == tur,
+                tablo.c.musteri_id == musteri_id,
+                tablo.c.parametreler == parametre_json,
+                tablo.c.durum.in_((BEKLIYOR, CALISIYOR)),
+            )).scalar()
+            if is_id is None:
+                is_id = conn.execute(insert(tablo).values(
+                    tur=tur, musteri_id=musteri_id, parametreler=parametre_json, durum=BEKLIYOR,
+                    ilerleme=0, deneme=0, mesaj='Sırada', olusturma_tarihi=datetime.now(),
+                )).inserted_primary_key[0]
+        self.start()
+        self._uyandir.set()
+        return is_id
+
+    def status(self, is_id):
+        """
+        İşin durumu (bulunamazsa None)
+
+        Returns:
+            dict: rapor_isi satırı; bekleyen işlerde 'sira' (önündeki iş sayısı) eklenir
+        """
+        tablo = _tablo()
+        with self.db.engine.connect() as conn:
+            satir = conn.execute(select(tablo).where(tablo.c.id == is_id)).mappings().first()
+            if satir is None:
+                return None
+            durum = dict(satir)
+            durum['parametreler'] = json.loads(durum['parametreler'] or '{}')
+            if durum['durum'] == BEKLIYOR:
+                durum['sira'] = conn.execute(select(func.count()).select_from(tablo).where(
+                    tablo.c.durum == BEKLIYOR, tablo.c.id < is_id
+                )).scalar()
+        return durum
+
+    def purge(self, gun=None):
+        """
+        Bitişinden bu yana gun günden fazla geçmiş tamamlanan/hatalı işleri siler
+
+        Bekleyen ve çalışan işlere dokunulmaz.
+
+        Returns:
+            int: Silinen iş sayısı
+        """
+        gun = self.saklama_gun if gun is None else gun
+        if gun <= 0:
+            return 0
+        tablo = _tablo()
+        sinir = datetime.now() - timedelta(days=gun)
+        with self.db.engine.begin() as conn:
+            sonuc = conn.execute(delete(tablo).where(
+                tablo.c.durum.in_((TAMAMLANDI, HATA)),
+                func.coalesce(tablo.c.bitis_tarihi, tablo.c.olusturma_tarihi) < sinir,
+            ))
+        return sonuc.rowcount
+
+    def _al(self):
+        """Sıradaki bekleyen işi atomik olarak bu sürece alır (limit doluysa None)"""
+        tablo = _tablo()
+        simdi = datetime.now()
+        siradaki = select(tablo.c.id).where(tablo.c.durum == BEKLIYOR)\
+            .order_by(tablo.c.id).limit(1).scalar_subquery()
+        calisan_sayisi = select(func.count()).select_from(tablo)\
+            .where(tablo.c.durum == CALISIYOR).scalar_subquery()
+        with self.db.engine.begin() as conn:
+            is_ = conn.execute(
+                update(tablo)
+                .where(tablo.c.id == siradaki, calisan_sayisi < self.eszamanli_limit)
+                .values(durum=CALISIYOR, calisan=self.kimlik, deneme=tablo.c.deneme + 1, ilerleme=0,
+                        mesaj='Hazırlanıyor', hata=None, baslama_tarihi=simdi, guncelleme_tarihi=simdi)
+                .returning(tablo.c.id, tablo.c.tur, tablo.c.musteri_id, tablo.c.parametreler)
+            ).first()
+            if is_ is not None:
+                with self._kilit:
+                    self._calisanlar.add(is_.id)
+        return is_
+
+    def _guncelle(self, is_id, **degerler):
+        """Yalnızca bu sürecin hâlâ sahibi olduğu işi günceller"""
+        tablo = _tablo()
+        with self.db.engine.begin() as conn:
+            conn.execute(update(tablo).where(
+                tablo.c.id == is_id, tablo.c.calisan == self.kimlik, tablo.c.durum == CALISIYOR
+            ).values(guncelleme_tarihi=datetime.now(), **degerler))
+
+    def _isci_dongusu(self):
+        with self.app.app_context():
+            while True:
+                try:
+                    is_ = self._al()
+                except Exception:
+                    self.app.logger.error('Rapor işi alınamadı', exc_info=True)
+                    is_ = None
+                if is_ is None:
+                    self._uyandir.wait(YOKLAMA_ARALIGI)
+                    self._uyandir.clear()
+                    continue
+                self._calistir(is_)
+
+    def _calistir(self, is_):
+        def ilerleme(yuzde, mesaj=None):
+            self._guncelle(is_.id, ilerleme=int(yuzde), mesaj=mesaj)
+
+        try:
+            isleyici = self._isleyiciler.get(is_.tur)
+            if isleyici is None:
+                raise ValueError(f'Bilinmeyen rapor türü: {is_.tur}')
+            # Her iş kendi bağlamında çalışır; ORM oturumu iş bitince kapanır
+            with self.app.app_context():
+                dosya_yolu, dosya_adi = isleyici(is_.musteri_id, json.loads(is_.parametreler or '{}'), ilerleme)
+            self._guncelle(is_.id, durum=TAMAMLANDI, ilerleme=100, mesaj='Hazır', dosya_yolu=dosya_yolu,
+                           dosya_adi=dosya_adi, bitis_tarihi=datetime.now())
+        except Exception as e:
+            self.app.logger.error(f'Rapor işi {is_.id} başarısız: {e}', exc_info=True)
+            self._guncelle(is_.id, durum=HATA, mesaj='Hata', hata=str(e), bitis_tarihi=datetime.now())
+        finally:
+            with self._kilit:
+                self._calisanlar.discard(is_.id)
+            # Limit yüzünden bekleyen işçiler yer açıldığını hemen görsün
+            self._uyandir.set()
+
+    def _nabiz_dongusu(self):
+        aralik = max(self.zaman_asimi / 3, 1)
+        with self.app.app_context():
+            while True:
+                try:
+                    self._nabiz()
+                    self._kurtar()
+                    if time.monotonic() - self._son_temizlik >= TEMIZLIK_ARALIGI:
+                        self._son_temizlik = time.monotonic()
+                        silinen = self.purge()
+                        if silinen:
+                            self.app.logger.info(f'{silinen} eski rapor işi silindi')
+                except Exception:
+                    self.app.logger.error('Rapor kuyruğu bakımı başarısız', exc_info=True)
+                time.sleep(aralik)
+
+    def _nabiz(self):
+        """Bu süreçte çalışan işlerin guncelleme_tarihi'ni yeniler"""
+        with self._kilit:
+            idler = list(self._calisanlar)
+        if not idler:
+            return
+        tablo = _tablo()
+        with self.db.engine.begin() as conn:
+            conn.execute(update(tablo).where(
+                tablo.c.id.in_(idler), tablo.c.calisan == self.kimlik
+            ).values(guncelleme_tarihi=datetime.now()))
+
+    def _surec_olu(self, calisan):
+        """Aynı makinede, artık yaşamayan bir sürecin kimliği mi?"""
+        if calisan == self.kimlik or os.name != 'posix':
+            return False
+        makine, pid, _ = calisan.rsplit(':', 2)
+        if makine != socket.gethostname():
+            return False  # Başka makine: yalnızca zaman aşımıyla kurtarılır
+        if int(pid) == os.getpid():
+            return True  # Aynı pid'le yeniden başlamış bu sürecin önceki hali
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        return False
+
+    def _kurtar(self):
+        """Süreci ölmüş veya nabzı kesilmiş işleri yeniden kuyruğa koyar"""
+        tablo = _tablo()
+        simdi = datetime.now()
+        with self.db.engine.begin() as conn:
+            calisanlar = conn.execute(
+                select(tablo.c.calisan).where(tablo.c.durum == CALISIYOR).distinct()
+            ).scalars().all()
+            olu_calisanlar = [calisan for calisan in calisanlar if calisan and self._surec_olu(calisan)]
+            yarim = and_(
+                tablo.c.durum == CALISIYOR,
+                (tablo.c.guncelleme_tarihi < simdi - timedelta(seconds=self.zaman_asimi))
+                | tablo.c.calisan.in_(olu_calisanlar),
+            )
+            conn.execute(update(tablo).where(yarim, tablo.c.deneme >= self.en_fazla_deneme).values(
+                durum=HATA, mesaj='Hata', hata='İş tamamlanamadan yarıda kaldı (deneme sınırı aşıldı)',
+                bitis_tarihi=simdi,
+            ))
+            sonuc = conn.execute(update(tablo).where(yarim).values(
+                durum=BEKLIYOR, calisan=None, ilerleme=0, mesaj='Yeniden kuyruğa alındı',
+            ))
+        if sonuc.rowcount:
+            self.app.logger.warning(f'{sonuc.rowcount} yarım kalmış rapor işi yeniden kuyruğa alındı')
+            self._uyandir.set()
+
+
+job_queue = JobQueue()
@@ -0,0 +1,178 @@
+"""
+Prometheus metrikleri
+/metrics Prometheus metin biçiminde şunları döner:
+
+    ajans_http_request_duration_seconds{endpoint, status}   histogram
+    ajans_db_query_duration_seconds{islem}                   histogram (SELECT/INSERT/...)
+    ajans_report_generation_seconds{tur}                     histogram (önbellekten gelmeyen raporlar)
+    ajans_cache_lookups_total{onbellek, sonuc}               sayaç (sorgu/rapor, isabet/iskalama)
+    ajans_cache_hit_ratio{onbellek}                          gauge (okuma anında sayaçlardan)
+    ajans_model_rows{model}                                  gauge (okuma anında COUNT(*))
+
+Birden fazla worker (gunicorn) çalışıyorsa PROMETHEUS_MULTIPROC_DIR ortam
+değişkeni worker'lar başlamadan boş bir klasöre ayarlanmalıdır:
+prometheus_client değerleri bu klasördeki dosyalara yazar ve /metrics hangi
+worker'a düşerse düşsün tüm worker'ların toplamını döner. Satır sayıları ve
+isabet oranı dosyalara yazılmaz, okuma anında hesaplanır.
+
+prometheus_client yalnızca ölçüm açıkken (METRICS_ENABLED) import edilir.
+"""
+
+import os
+import threading
+import time
+
+from flask import g, has_request_context, request, request_started, request_finished
+from sqlalchemy import event, text
+
+
+HTTP_KOVALARI = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30)
+SQL_KOVALARI = (.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5)
+RAPOR_KOVALARI = (.1, .25, .5, 1, 2.5, 5, 10, 30, 60, 120, 300, 900)
+SQL_ISLEMLERI = ('SELECT', 'INSERT', 'UPDATE', 'DELETE')
+HARIC_ENDPOINTLER = {'static', 'metrics_endpoint'}
+
+
+class _Anlik:
+    """generate_latest için önceden toplanmış metrik aileleri"""
+
+    def __init__(self, aileler):
+        self.aileler = aileler
+
+    def collect(self):
+        return self.aileler
+
+
+class Metrics:
+    """Prometheus metrik nesneleri ve /metrics çıktısı"""
+
+    def __init__(self):
+        self.etkin = False
+        self.db = None
+        self.registry = None
+        self._kilit = threading.Lock()
+
+    def configure(self, app, db, etkin=False):
+        """
+        Metrikleri oluşturur ve istek/SQL dinleyicilerini bağlar (etkin değilse hiçbir şey yapmaz)
+
+        Args:
+            app: Flask uygulaması
+            db: Flask-SQLAlchemy nesnesi (app context içinde çağrılmalı)
+        """
+        self.etkin = etkin
+        if not etkin:
+            return
+        from prometheus_client import CollectorRegistry, Counter, Histogram
+
+        self.db = db
+        self.registry = CollectorRegistry()
+        self.http_sure = Histogram('ajans_http_request_duration_seconds', 'HTTP istek süresi',
+                                   ['endpoint', 'status'], buckets=HTTP_KOVALARI, registry=self.registry)
+        self.sql_sure = Histogram('ajans_db_query_duration_seconds', 'SQL cümlesi süresi',
+                                  ['islem'], buckets=SQL_KOVALARI, registry=self.registry)
+        self.rapor_sure = Histogram('ajans_report_generation_seconds', 'Rapor üretim süresi',
+                                    ['tur'], buckets=RAPOR_KOVALARI, registry=self.registry)
+        self.onbellek = Counter('ajans_cache_lookups', 'Önbellek okumaları',
+                                ['onbellek', 'sonuc'], registry=self.registry)
+
+        if not event.contains(db.engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(db.engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(db.engine, 'after_cursor_execute', _after_cursor_execute)
+        request_started.connect(_istek_basladi, app)
+        request_finished.connect(_istek_bitti, app)
+
+    def observe_report(self, tur, sure):
+        """Üretilen (önbellekten gelmeyen) raporun süresi"""
+        if self.etkin:
+            self.rapor_sure.labels(tur=tur).observe(sure)
+
+    def count_cache(self, onbellek, isabet):
+        """Önbellek okuması: onbellek='sorgu' | 'rapor'"""
+        if self.etkin:
+            self.onbellek.labels(onbellek=onbellek, sonuc='isabet' if isabet else 'iskalama').inc()
+
+    def _aileler(self):
+        """Tüm worker'ların (çok süreçli modda) veya bu sürecin metrikleri"""
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            from prometheus_client import multiprocess
+            return list(multiprocess.MultiProcessCollector(None).collect())
+        return list(self.registry.collect())
+
+    def _isabet_orani(self, aileler):
+        from prometheus_client.core import GaugeMetricFamily
+
+        sayilar = {}
+        for aile in aileler:
+            if aile.name != 'ajans_cache_lookups':
+                continue
+            for ornek in aile.samples:
+                if ornek.name.endswith('_total'):
+                    onbellek = sayilar.setdefault(ornek.labels['onbellek'], {'isabet': 0, 'iskalama': 0})
+                    onbellek[ornek.labels['sonuc']] += ornek.value
+        oran = GaugeMetricFamily('ajans_cache_hit_ratio', 'Önbellek isabet oranı (sayaçlar sıfırlandığından beri)',
+                                 labels=['onbellek'])
+        for onbellek, sayi in sorted(sayilar.items()):
+            toplam = sayi['isabet'] + sayi['iskalama']
+            oran.add_metric([onbellek], sayi['isabet'] / toplam if toplam else 0.0)
+        return oran
+
+    def _satir_sayilari(self):
+        from prometheus_client.core import GaugeMetricFamily
+
+        modeller = sorted((mapper.class_.__name__, mapper.local_table.name)
+                          for mapper in self.db.Model.registry.mappers)
+        # Tüm tablolar tek cümlede: (SELECT COUNT(*) FROM a), (SELECT COUNT(*) FROM b), ...
+        sayilar = self.db.session.execute(text('SELECT ' + ', '.join(
+            f'(SELECT COUNT(*) FROM "{tablo}")' for _, tablo in modeller
+        ))).one()
+        gauge = GaugeMetricFamily('ajans_model_rows', 'Model başına satır sayısı', labels=['model'])
+        for (model, _), sayi in zip(modeller, sayilar):
+            gauge.add_metric([model], sayi)
+        return gauge
+
+    def render(self):
+        """
+        /metrics çıktısı
+
+        Returns:
+            tuple: (gövde, content-type)
+        """
+        from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+
+        aileler = self._aileler()
+        aileler.append(self._isabet_orani(aileler))
+        aileler.append(self._satir_sayilari())
+        return generate_latest(_Anlik(aileler)), CONTENT_TYPE_LATEST
+
+
+def _sql_islemi(statement):
+    kelime = statement.lstrip()[:6].upper()
+    return kelime if kelime in SQL_ISLEMLERI else 'OTHER'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_metrik_baslangic', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    baslangiclar = conn.info.get('_metrik_baslangic')
+    if baslangiclar:
+        metrics.sql_sure.labels(islem=_sql_islemi(statement)).observe(time.perf_counter() - baslangiclar.pop())
+
+
+def _istek_basladi(sender, **extra):
+    if request.endpoint not in HARIC_ENDPOINTLER:
+        g._metrik_baslangic = time.perf_counter()
+
+
+def _istek_bitti(sender, response, **extra):
+    baslangic = g.pop('_metrik_baslangic', None) if has_request_context() else None
+    if baslangic is None:
+        return
+    # Eşleşmeyen yollar tek etikette toplanır (etiket sayısı sınırlı kalır)
+    metrics.http_sure.labels(endpoint=request.endpoint or 'eslesmedi', status=str(response.status_code))\
+        .observe(time.perf_counter() - baslangic)
+
+
+metrics = Metrics()
@@ -0,0 +1,352 @@
+"""
+Veritabanı migration modülü
+Sürümlü şema değişiklikleri ve indeks kullanım raporu (EXPLAIN QUERY PLAN)
+"""
+
+from datetime import datetime, timedelta
+from sqlalchemy import text, inspect
+from sqlalchemy.schema import CreateTable
+
+
+class MigrationErtelendi(Exception):
+    """
+    Migration bu ortamda uygulanamıyor (ör. SQLite FTS5 desteği yok)
+
+    Adım bu hatayı fırlatırsa transaction geri alınır ve sürüm kaydedilmez;
+    migration sonraki db-upgrade'de yeniden denenir, sonraki sürümler
+    uygulanmaya devam eder.
+    """
+
+
+def _teslimat_kodu_kolonu(conn):
+    """Eski veritabanlarına teslimat.teslimat_kodu kolonunu ekler"""
+    kolonlar = {kolon['name'] for kolon in inspect(conn).get_columns('teslimat')}
+    if 'teslimat_kodu' not in kolonlar:
+        conn.execute(text('ALTER TABLE teslimat ADD COLUMN teslimat_kodu VARCHAR(30)'))
+        conn.execute(text('CREATE UNIQUE INDEX IF NOT EXISTS ix_teslimat_teslimat_kodu ON teslimat (teslimat_kodu)'))
+
+
+def _cascade_foreign_keys(conn):
+    """
+    Çocuk tabloların foreign key'lerini ON DELETE CASCADE ile yeniden kurar
+
+    SQLite mevcut bir kısıtı değiştiremediği için tablo, modeldeki tanımla
+    yeni adla oluşturulup veriler kopyalanır, eski tablo silinir ve yenisi
+    yeniden adlandırılır. run_migrations bu sırada foreign key zorlamasını
+    kapatır; aksi halde DROP TABLE çocuk kayıtları da silerdi.
+    """
+    from app import IsGunlugu, Teslimat, SosyalMedya, Revizyon, Arama
+
+    if conn.dialect.name != 'sqlite':
+        return
+
+    for model in (IsGunlugu, Teslimat, SosyalMedya, Revizyon, Arama):
+        tablo = model.__table__
+        fk_kurallari = conn.exec_driver_sql(f'PRAGMA foreign_key_list({tablo.name})').fetchall()
+        # foreign_key_list satırı: (id, seq, table, from, to, on_update, on_delete, match)
+        if fk_kurallari and all(kural[6] == 'CASCADE' for kural in fk_kurallari):
+            continue
+
+        yeni_ad = f'{tablo.name}__yeni'
+        ddl = str(CreateTable(tablo).compile(dialect=conn.dialect)).strip()
+        conn.exec_driver_sql(f'DROP TABLE IF EXISTS {yeni_ad}')
+        conn.exec_driver_sql(ddl.replace(f'CREATE TABLE {tablo.name} ', f'CREATE TABLE {yeni_ad} ', 1))
+
+        mevcut = {kolon['name'] for kolon in inspect(conn).get_columns(tablo.name)}
+        kolonlar = ', '.join(f'"{kolon.name}"' for kolon in tablo.columns if kolon.name in mevcut)
+        conn.exec_driver_sql(f'INSERT INTO {yeni_ad} ({kolonlar}) SELECT {kolonlar} FROM {tablo.name}')
+        conn.exec_driver_sql(f'DROP TABLE {tablo.name}')
+        conn.exec_driver_sql(f'ALTER TABLE {yeni_ad} RENAME TO {tablo.name}')
+
+        for indeks in tablo.indexes:
+            indeks.create(conn, checkfirst=True)
+
+
+def _musteri_ozet_tablosu(conn):
+    """musteri_ozet tablosunu oluşturur ve mevcut verilerden doldurur"""
+    from app import MusteriOzet
+    from src.utils.customer_summary import refresh_musteri_ozet
+
+    MusteriOzet.__table__.create(conn, checkfirst=True)
+    refresh_musteri_ozet(conn)
+
+
+def _gunluk_is_ozeti_tablosu(conn):
+    """gunluk_is_ozeti rollup tablosunu oluşturur ve iş günlüğünden doldurur"""
+    from app import GunlukIsOzeti
+    from src.utils.rollups import refresh_gunluk_ozet
+
+    GunlukIsOzeti.__table__.create(conn, checkfirst=True)
+    refresh_gunluk_ozet(conn)
+
+
+def _metin_indeksi(conn):
+    """FTS5 metin indeksini, tetikleyicilerini oluşturur ve mevcut kayıtları yükler"""
+    from src.utils.search import create_search_index
+
+    if not create_search_index(conn):
+        raise MigrationErtelendi('SQLite FTS5 desteği yok, tam metin arama (/ara) kullanılamaz')
+
+
+def _eksik_metin_indeksi(conn):
+    """
+    Sürüm 7'yi FTS5 desteği olmadan kaydetmiş veritabanlarında metin
+    indeksini yeniden dener (7 ertelenmişse kendisi yeniden denenir)
+    """
+    from src.utils.search import INDEKS_TABLOSU
+
+    if inspect(conn).has_table(INDEKS_TABLOSU):
+        return
+    if conn.execute(text('SELECT 1 FROM schema_version WHERE version = 7')).first() is None:
+        return
+    _metin_indeksi(conn)
+
+
+def _rapor_isi_tablosu(conn):
+    """Arka plan rapor kuyruğunun rapor_isi tablosunu oluşturur"""
+    from app import RaporIsi
+
+    RaporIsi.__table__.create(conn, checkfirst=True)
+
+
+# Sürümlü migration listesi: (sürüm, açıklama, adımlar)
+# Her adım ya bir SQL cümlesi ya da bağlantıyı parametre alan bir fonksiyondur.
+# Yeni migration'lar listenin SONUNA, bir sonraki sürüm numarasıyla eklenir.
+MIGRATIONS = [
+    (1, 'Sık kullanılan filtreler için bileşik indeksler', [
+        'CREATE INDEX IF NOT EXISTS ix_is_gunlugu_musteri_tarih ON is_gunlugu (musteri_id, tarih)',
+        'CREATE INDEX IF NOT EXISTS ix_is_gunlugu_musteri_durum ON is_gunlugu (musteri_id, durum)',
+        'CREATE INDEX IF NOT EXISTS ix_is_gunlugu_tarih ON is_gunlugu (tarih)',
+        'CREATE INDEX IF NOT EXISTS ix_teslimat_musteri_teslim_tarihi ON teslimat (musteri_id, teslim_tarihi)',
+        'CREATE INDEX IF NOT EXISTS ix_teslimat_is_gunlugu ON teslimat (is_gunlugu_id)',
+        'CREATE INDEX IF NOT EXISTS ix_teslimat_durum ON teslimat (durum)',
+        'CREATE INDEX IF NOT EXISTS ix_sosyal_medya_musteri_tarih ON sosyal_medya (musteri_id, tarih)',
+        'CREATE INDEX IF NOT EXISTS ix_sosyal_medya_is_gunlugu ON sosyal_medya (is_gunlugu_id)',
+        'CREATE INDEX IF NOT EXISTS ix_revizyon_musteri_tarih ON revizyon (musteri_id, tarih)',
+        'CREATE INDEX IF NOT EXISTS ix_revizyon_is_gunlugu_numara ON revizyon (is_gunlugu_id, revizyon_numarasi)',
+        'CREATE INDEX IF NOT EXISTS ix_arama_musteri_tarih ON arama (musteri_id, tarih)',
+        'CREATE INDEX IF NOT EXISTS ix_arama_geri_donus_durum ON arama (geri_donus_tarihi, durum)',
+    ]),
+    (2, 'Teslimat kodu kolonu ve kod sayaçları', [
+        _teslimat_kodu_kolonu,
+        'CREATE TABLE IF NOT EXISTS sayac (kapsam VARCHAR(50) PRIMARY KEY, deger INTEGER NOT NULL)',
+    ]),
+    (3, 'Liste sayfalarının keyset sıralaması için tarih indeksleri', [
+        'CREATE INDEX IF NOT EXISTS ix_teslimat_teslim_tarihi ON teslimat (teslim_tarihi)',
+        'CREATE INDEX IF NOT EXISTS ix_sosyal_medya_tarih ON sosyal_medya (tarih)',
+        'CREATE INDEX IF NOT EXISTS ix_arama_tarih ON arama (tarih)',
+    ]),
+    (4, 'Foreign key\'lerde ON DELETE CASCADE', [
+        _cascade_foreign_keys,
+    ]),
+    (5, 'Müşteri özet tablosu', [
+        _musteri_ozet_tablosu,
+    ]),
+    (6, 'Dashboard grafikleri için günlük iş rollup tablosu', [
+        _gunluk_is_ozeti_tablosu,
+    ]),
+    (7, 'Tam metin arama indeksi (FTS5) ve tetikleyicileri', [
+        _metin_indeksi,
+    ]),
+    (8, 'Arka plan rapor işleri tablosu', [
+        _rapor_isi_tablosu,
+    ]),
+    (9, 'FTS5 olmadan kaydedilmiş metin indeksinin yeniden denenmesi', [
+        _eksik_metin_indeksi,
+    ]),
+]
+
+
+def _ensure_version_table(conn):
+    """schema_version tablosunu yoksa oluşturur"""
+    conn.execute(text(
+        'CREATE TABLE IF NOT EXISTS schema_version ('
+        'version INTEGER PRIMARY KEY, '
+        'aciklama VARCHAR(200), '
+        'uygulanma_tarihi DATETIME)'
+    ))
+
+
+def get_schema_version(db):
+    """
+    Veritabanına uygulanmış son migration sürümünü döndürür
+
+    Args:
+        db: Database session
+
+    Returns:
+        int: Son sürüm (hiç migration yoksa 0)
+    """
+    with db.engine.begin() as conn:
+        _ensure_version_table(conn)
+        version = conn.execute(text('SELECT MAX(version) FROM schema_version')).scalar()
+    return version or 0
+
+
+def get_pending_versions(db):
+    """
+    Henüz uygulanmamış (ertelenmiş dahil) migration sürümleri
+
+    Args:
+        db: Database session
+
+    Returns:
+        list: Sürüm numaraları
+    """
+    with db.engine.begin() as conn:
+        _ensure_version_table(conn)
+        uygulanan = {satir[0] for satir in conn.execute(text('SELECT version FROM schema_version'))}
+    return [version for version, _, _ in MIGRATIONS if version not in uygulanan]
+
+
+def run_migrations(db, logger=None):
+    """
+    Bekleyen migration'ları sırayla uygular
+
+    Her migration kendi transaction'ı içinde çalışır; sürüm kaydı da aynı
+    transaction'da yazılır, böylece yarım kalan bir migration tekrar denenir.
+    MigrationErtelendi fırlatan migration kaydedilmez ve uyarı loglanır;
+    uygulanmış sürümler tek tek tutulduğu için sonraki çalıştırmada yeniden
+    denenir.
+
+    Args:
+        db: Database session
+        logger: Logger (opsiyonel)
+
+    Returns:
+        list: Uygulanan sürüm numaraları
+    """
+    uygulananlar = []
+    bekleyenler = set(get_pending_versions(db))
+    sqlite = db.engine.dialect.name == 'sqlite'
+
+    for version, aciklama, adimlar in MIGRATIONS:
+        if version not in bekleyenler:
+            continue
+
+        with db.engine.connect() as conn:
+            # Tablo yeniden kurulurken cascade silmeler tetiklenmesin;
+            # PRAGMA transaction içinde etkisiz olduğu için önce çalıştırılır
+            if sqlite:
+                conn.exec_driver_sql('PRAGMA foreign_keys=OFF')
+                conn.commit()
+            try:
+                with conn.begin():
+                    for adim in adimlar:
+                        if callable(adim):
+                            adim(conn)
+                        else:
+                            conn.execute(text(adim))
+                    conn.execute(
+                        text('INSERT INTO schema_version (version, aciklama, uygulanma_tarihi) '
+                             'VALUES (:version, :aciklama, :tarih)'),
+                        {'version': version, 'aciklama': aciklama, 'tarih': datetime.now()}
+                    )
+            except MigrationErtelendi as e:
+                if logger:
+                    logger.warning(f"Migration ertelendi: {version} - {aciklama} ({e}); "
+                                   f"sonraki db-upgrade'de yeniden denenecek")
+                continue
+            finally:
+                if sqlite:
+                    conn.exec_driver_sql('PRAGMA foreign_keys=ON')
+                    conn.commit()
+
+        uygulananlar.append(version)
+        if logger:
+            logger.info(f"Migration uygulandı: {version} - {aciklama}")
+
+    return uygulananlar
+
+
+def get_route_queries(db, musteri_id=1):
+    """
+    Route'ların çalıştırdığı temsili sorguları döndürür
+
+    Args:
+        db: Database session
+        musteri_id: Sorgularda kullanılacak örnek müşteri ID
+
+    Returns:
+        list: [(route_adi, sorgu_adi, Query), ...]
+    """
+    from app import IsGunlugu, Teslimat, SosyalMedya, Revizyon, Arama, GunlukIsOzeti
+
+    bugun = datetime.now().date()
+    baslangic = bugun - timedelta(days=30)
+
+    teslimatli_isler = db.session.query(Teslimat.is_gunlugu_id).filter(
+        Teslimat.is_gunlugu_id.isnot(None)
+    ).distinct().subquery()
+
+    return [
+        ('index', 'Teslimat durum dağılımı',
+         db.session.query(Teslimat.durum, db.func.count(Teslimat.id)).group_by(Teslimat.durum)),
+        ('index', 'Son 30 gün iş adedi',
+         db.session.query(GunlukIsOzeti.tarih, db.func.sum(GunlukIsOzeti.is_sayisi))
+         .filter(GunlukIsOzeti.tarih >= baslangic, GunlukIsOzeti.tarih <= bugun)
+         .group_by(GunlukIsOzeti.tarih)),
+        ('bekleyen_isler', 'Teslimatı olmayan işler',
+         IsGunlugu.query.filter(~IsGunlugu.id.in_(db.session.query(teslimatli_isler)))
+         .order_by(IsGunlugu.tarih.desc())),
+        ('musteri_detay', 'İş günlüğü',
+         IsGunlugu.query.filter_by(musteri_id=musteri_id).order_by(IsGunlugu.tarih.desc())),
+        ('musteri_detay', 'Teslimatlar',
+         Teslimat.query.filter_by(musteri_id=musteri_id).order_by(Teslimat.teslim_tarihi.desc())),
+        ('musteri_detay', 'Revizyonlar',
+         Revizyon.query.filter_by(musteri_id=musteri_id).order_by(Revizyon.tarih.desc())),
+        ('musteri_detay', 'Sosyal medya',
+         SosyalMedya.query.filter_by(musteri_id=musteri_id).order_by(SosyalMedya.tarih.desc())),
+        ('musteri_detay', 'Aramalar',
+         Arama.query.filter_by(musteri_id=musteri_id).order_by(Arama.tarih.desc())),
+        ('musteri_detay', 'Onayda bekleyenler',
+         IsGunlugu.query.filter_by(musteri_id=musteri_id, durum='Onayda').order_by(IsGunlugu.tarih.desc())),
+        ('musteri_rapor', 'Dönem iş günlüğü',
+         IsGunlugu.query.filter(IsGunlugu.musteri_id == musteri_id,
+                                IsGunlugu.tarih >= baslangic, IsGunlugu.tarih <= bugun)),
+        ('musteri_rapor', 'Dönem teslimatları',
+         Teslimat.query.filter(Teslimat.musteri_id == musteri_id,
+                               Teslimat.teslim_tarihi >= baslangic, Teslimat.teslim_tarihi <= bugun)),
+        ('musteri_rapor', 'Dönem toplam süre',
+         db.session.query(db.func.sum(IsGunlugu.sure_dakika))
+         .filter(IsGunlugu.musteri_id == musteri_id, IsGunlugu.tarih >= baslangic)),
+        ('is_red', 'Son revizyon',
+         Revizyon.query.filter_by(is_gunlugu_id=1).order_by(Revizyon.revizyon_numarasi.desc()).limit(1)),
+        ('aramalar', 'Geri dönüş gereken aramalar',
+         Arama.query.filter(Arama.geri_donus_tarihi.isnot(None),
+                            Arama.geri_donus_tarihi <= bugun, Arama.durum == 'Bekliyor')),
+    ]
+
+
+def explain_query_plans(db, musteri_id=1):
+    """
+    Route sorgularının EXPLAIN QUERY PLAN çıktısını toplar (sadece SQLite)
+
+    Args:
+        db: Database session
+        musteri_id: Sorgularda kullanılacak örnek müşteri ID
+
+    Returns:
+        list: [{'route', 'sorgu', 'plan': [str, ...], 'tarama': bool}, ...]
+    """
+    if db.engine.dialect.name != 'sqlite':
+        raise RuntimeError('EXPLAIN QUERY PLAN sadece SQLite veritabanında desteklenir')
+
+    sonuclar = []
+    for route_adi, sorgu_adi, query in get_route_queries(db, musteri_id):
+        compiled = query.statement.compile(dialect=db.engine.dialect)
+        params = tuple(compiled.params[key] for key in compiled.positiontup)
+
+        with db.engine.connect() as conn:
+            satirlar = conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', params).fetchall()
+
+        plan = [satir[-1] for satir in satirlar]
+        sonuclar.append({
+            'route': route_adi,
+            'sorgu': sorgu_adi,
+            'plan': plan,
+            # İndekssiz tam tablo taraması: "SCAN tablo" (ama "USING INDEX" değil)
+            'tarama': any(p.startswith('SCAN') and 'INDEX' not in p for p in plan)
+        })
+
+    return sonuclar
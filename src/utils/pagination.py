@@ -0,0 +1,171 @@
+"""
+Keyset (cursor) sayfalama modülü
+Liste sayfaları için (tarih, id) üzerinden OFFSET kullanmayan sayfalama ve filtreler
+"""
+
+from datetime import datetime
+from sqlalchemy import or_
+
+
+VARSAYILAN_SAYFA_BOYUTU = 50
+MAKSIMUM_SAYFA_BOYUTU = 200
+
+
+class KeysetPage:
+    """Keyset sayfalama sonucu"""
+
+    def __init__(self, items, per_page, cursor, next_cursor):
+        self.items = items
+        self.per_page = per_page
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def is_first(self):
+        return not self.cursor
+
+
+def encode_cursor(tarih, kayit_id):
+    """
+    Son kaydın (tarih, id) değerinden cursor metni üretir
+
+    Tarihsiz sayfalamada veya tarihi boş kayıtlarda sadece id kullanılır: "_42"
+    """
+    if tarih is None:
+        return f'_{kayit_id}'
+    return f'{tarih.isoformat()}_{kayit_id}'
+
+
+def decode_cursor(cursor):
+    """
+    Cursor metnini (tarih, id) ikilisine çevirir
+
+    Returns:
+        tuple: (date veya None, int) - geçersiz cursor için None
+    """
+    if not cursor or '_' not in cursor:
+        return None
+    tarih_str, _, id_str = cursor.rpartition('_')
+    try:
+        kayit_id = int(id_str)
+        tarih = datetime.strptime(tarih_str, '%Y-%m-%d').date() if tarih_str else None
+    except ValueError:
+        return None
+    return tarih, kayit_id
+
+
+def get_per_page(args, varsayilan=VARSAYILAN_SAYFA_BOYUTU):
+    """İstekteki per_page parametresini güvenli aralığa çeker"""
+    per_page = args.get('per_page', varsayilan, type=int) or varsayilan
+    return max(1, min(per_page, MAKSIMUM_SAYFA_BOYUTU))
+
+
+def apply_list_filters(query, model, args, tarih_kolonu=None):
+    """
+    Liste sayfalarının ortak filtrelerini sorguya uygular
+
+    Desteklenen parametreler (modelde kolon varsa): musteri_id, sorumlu_kisi,
+    durum, sektor, baslangic, bitis (YYYY-MM-DD, tarih_kolonu üzerinden)
+
+    Args:
+        query: SQLAlchemy sorgusu
+        model: Model sınıfı
+        args: request.args
+        tarih_kolonu: Tarih aralığı filtresinin uygulanacağı kolon
+
+    Returns:
+        tuple: (filtrelenmiş sorgu, aktif filtreler dict'i)
+    """
+    filtreler = {}
+
+    musteri_id = args.get('musteri_id', type=int)
+    if musteri_id and hasattr(model, 'musteri_id'):
+        query = query.filter(model.musteri_id == musteri_id)
+        filtreler['musteri_id'] = musteri_id
+
+    for alan in ('sorumlu_kisi', 'durum', 'sektor'):
+        deger = (args.get(alan) or '').strip()
+        if deger and hasattr(model, alan):
+            query = query.filter(getattr(model, alan) == deger)
+            filtreler[alan] = deger
+
+    if tarih_kolonu is not None:
+        for alan in ('baslangic', 'bitis'):
+            deger = args.get(alan)
+            if not deger:
+                continue
+            try:
+                tarih = datetime.strptime(deger, '%Y-%m-%d').date()
+            except ValueError:
+                continue
+            if alan == 'baslangic':
+                query = query.filter(tarih_kolonu >= tarih)
+            else:
+                query = query.filter(tarih_kolonu <= tarih)
+            filtreler[alan] = deger
+
+    return query, filtreler
+
+
+def keyset_paginate(query, id_kolonu, tarih_kolonu=None, cursor=None, per_page=VARSAYILAN_SAYFA_BOYUTU):
+    """
+    Sorguyu (tarih DESC, id DESC) sırasında keyset ile sayfalar
+
+    OFFSET yerine son görülen (tarih, id) değerinden sonrası istendiği için
+    N. sayfa ile 1. sayfa aynı maliyettedir ve araya kayıt eklense bile
+    sayfalar kaymaz. Boş tarihli kayıtlar listenin sonunda yer alır.
+
+    Args:
+        query: Filtrelenmiş SQLAlchemy sorgusu
+        id_kolonu: Benzersiz sıralama kolonu (id)
+        tarih_kolonu: Tarih kolonu (None ise sadece id ile sıralanır)
+        cursor: Önceki sayfanın next_cursor değeri
+        per_page: Sayfa boyutu
+
+    Returns:
+        KeysetPage: Sayfa kayıtları ve sonraki sayfa cursor'ı
+    """
+    konum = decode_cursor(cursor)
+
+    if tarih_kolonu is None:
+        if konum:
+            query = query.filter(id_kolonu < konum[1])
+        kayitlar = query.order_by(id_kolonu.desc()).limit(per_page + 1).all()
+    else:
+        bos_olabilir = getattr(tarih_kolonu, 'nullable', True)
+        bos_tarihliler = query.filter(tarih_kolonu.is_(None)).order_by(id_kolonu.desc())
+
+        if konum and konum[0] is None:
+            # Tarihli kayıtlar bitti, boş tarihli kayıtlarda devam ediliyor
+            kayitlar = bos_tarihliler.filter(id_kolonu < konum[1]).limit(per_page + 1).all()
+        else:
+            tarihliler = query
+            if konum:
+                son_tarih, son_id = konum
+                # "tarih <= x" koşulu indeks üzerinde aralık araması yapılmasını sağlar
+                tarihliler = tarihliler.filter(
+                    tarih_kolonu <= son_tarih,
+                    or_(tarih_kolonu < son_tarih, id_kolonu < son_id)
+                )
+            elif bos_olabilir:
+                tarihliler = tarihliler.filter(tarih_kolonu.isnot(None))
+            kayitlar = tarihliler.order_by(tarih_kolonu.desc(), id_kolonu.desc()).limit(per_page + 1).all()
+
+            # Boş tarihli kayıtlar listenin sonunda yer alır
+            if bos_olabilir and len(kayitlar) <= per_page:
+                kayitlar += bos_tarihliler.limit(per_page + 1 - len(kayitlar)).all()
+
+    # Sonraki sayfa var mı anlamak için bir kayıt fazla çekildi
+    items = kayitlar[:per_page]
+
+    next_cursor = None
+    if len(kayitlar) > per_page:
+        son = items[-1]
+        son_tarih = getattr(son, tarih_kolonu.key) if tarih_kolonu is not None else None
+        next_cursor = encode_cursor(son_tarih, getattr(son, id_kolonu.key))
+
+    return KeysetPage(items, per_page, cursor, next_cursor)
@@ -0,0 +1,189 @@
+"""
+İstek performans ölçümü
+Her istek için SQL sorgu sayısı ve süresi, şablon (render) süresi, toplam
+süre ve yanıt boyutu toplanır. Son istekler bellekte halka tamponda
+(deque), endpoint toplamları sözlükte tutulur; /_perf bunları döner.
+
+- SQL: engine'in before/after_cursor_execute olayları. Yalnızca istek
+  bağlamındaki sorgular sayılır (arka plan işçileri ölçülmez).
+- İstek ve şablon: Flask request_started / request_finished ve
+  before_render_template / template_rendered sinyalleri. Şablon süresi
+  şablon içinde tetiklenen (lazy load) sorguları da içerir.
+- Kapalıyken (varsayılan) hiçbir olay dinleyicisi bağlanmaz; ek yük yoktur.
+
+Akış (stream) yanıtlarında gövde yazılırken çalışan sorgular ve süre
+request_finished'tan sonra olduğu için sayılmaz; boyut da bilinmez.
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from flask import g, has_request_context, request, request_started, request_finished, \
+    before_render_template, template_rendered
+from sqlalchemy import event
+
+
+VARSAYILAN_KAPASITE = 500
+HARIC_ENDPOINTLER = {'static', 'perf_durumu', 'perf_yavas_sorgular'}
+
+
+class PerfMonitor:
+    """İstek bazlı SQL/render ölçümü ve son isteklerin halka tamponu"""
+
+    def __init__(self):
+        self.etkin = False
+        self.server_timing = False
+        self._istekler = deque(maxlen=VARSAYILAN_KAPASITE)
+        self._endpointler = {}
+        self._kilit = threading.Lock()
+
+    def configure(self, app, engine, etkin=False, kapasite=None, server_timing=False):
+        """
+        Ölçümü açar ve dinleyicileri bağlar (etkin değilse hiçbir şey bağlanmaz)
+
+        Args:
+            app: Flask uygulaması
+            engine: SQLAlchemy engine (db.engine)
+            kapasite: Halka tamponda tutulacak son istek sayısı
+            server_timing: Yanıtlara Server-Timing başlığı eklensin mi
+        """
+        self.etkin = etkin
+        self.server_timing = server_timing
+        if kapasite:
+            self._istekler = deque(self._istekler, maxlen=kapasite)
+        if not etkin:
+            return
+
+        if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+        request_started.connect(_istek_basladi, app)
+        request_finished.connect(_istek_bitti, app)
+        before_render_template.connect(_render_basladi, app)
+        template_rendered.connect(_render_bitti, app)
+
+    def kaydet(self, kayit):
+        """Biten isteği halka tampona ve endpoint toplamlarına ekler"""
+        with self._kilit:
+            self._istekler.append(kayit)
+            toplam = self._endpointler.setdefault(kayit['endpoint'], {
+                'istek': 0, 'sure_ms': 0.0, 'sql_sayisi': 0, 'sql_ms': 0.0, 'render_ms': 0.0,
+                'boyut': 0, 'en_uzun_ms': 0.0, 'en_cok_sql': 0,
+            })
+            toplam['istek'] += 1
+            toplam['sure_ms'] += kayit['sure_ms']
+            toplam['sql_sayisi'] += kayit['sql_sayisi']
+            toplam['sql_ms'] += kayit['sql_ms']
+            toplam['render_ms'] += kayit['render_ms']
+            toplam['boyut'] += kayit['boyut'] or 0
+            toplam['en_uzun_ms'] = max(toplam['en_uzun_ms'], kayit['sure_ms'])
+            toplam['en_cok_sql'] = max(toplam['en_cok_sql'], kayit['sql_sayisi'])
+
+    def snapshot(self, endpoint=None):
+        """
+        Endpoint ortalamaları (toplam süreye göre azalan) ve son istekler (yeniden eskiye)
+
+        Args:
+            endpoint: Verilirse son istekler bu endpoint'e göre süzülür
+        """
+        with self._kilit:
+            istekler = [kayit for kayit in reversed(self._istekler)
+                        if endpoint is None or kayit['endpoint'] == endpoint]
+            toplamlar = {ad: dict(toplam) for ad, toplam in self._endpointler.items()}
+
+        endpointler = []
+        for ad, toplam in sorted(toplamlar.items(), key=lambda x: x[1]['sure_ms'], reverse=True):
+            adet = toplam['istek']
+            endpointler.append({
+                'endpoint': ad,
+                'istek': adet,
+                'ort_sure_ms': round(toplam['sure_ms'] / adet, 2),
+                'ort_sql_sayisi': round(toplam['sql_sayisi'] / adet, 1),
+                'ort_sql_ms': round(toplam['sql_ms'] / adet, 2),
+                'ort_render_ms': round(toplam['render_ms'] / adet, 2),
+                'ort_boyut': round(toplam['boyut'] / adet),
+                'en_uzun_ms': round(toplam['en_uzun_ms'], 2),
+                'en_cok_sql': toplam['en_cok_sql'],
+            })
+        return {
+            'etkin': self.etkin,
+            'kapasite': self._istekler.maxlen,
+            'endpointler': endpointler,
+            'son_istekler': istekler,
+        }
+
+    def clear(self):
+        with self._kilit:
+            self._istekler.clear()
+            self._endpointler.clear()
+
+
+def _olcum():
+    """İsteğin ölçüm durumu (istek dışında veya ölçülmeyen istekte None)"""
+    if not has_request_context():
+        return None
+    return g.get('_perf')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _olcum() is not None:
+        conn.info.setdefault('_perf_baslangic', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    olcum = _olcum()
+    baslangiclar = conn.info.get('_perf_baslangic')
+    if olcum is None or not baslangiclar:
+        return
+    olcum['sql_sayisi'] += 1
+    olcum['sql_sure'] += time.perf_counter() - baslangiclar.pop()
+
+
+def _istek_basladi(sender, **extra):
+    if request.endpoint in HARIC_ENDPOINTLER:
+        return
+    g._perf = {'baslangic': time.perf_counter(), 'sql_sayisi': 0, 'sql_sure': 0.0,
+               'render_sure': 0.0, 'render_baslangic': []}
+
+
+def _render_basladi(sender, template, context, **extra):
+    olcum = _olcum()
+    if olcum is not None:
+        olcum['render_baslangic'].append(time.perf_counter())
+
+
+def _render_bitti(sender, template, context, **extra):
+    olcum = _olcum()
+    if olcum is not None and olcum['render_baslangic']:
+        olcum['render_sure'] += time.perf_counter() - olcum['render_baslangic'].pop()
+
+
+def _istek_bitti(sender, response, **extra):
+    olcum = _olcum()
+    if olcum is None:
+        return
+    g._perf = None  # Yanıttan sonra çalışan sorgular sayılmaz
+    sure = time.perf_counter() - olcum['baslangic']
+    kayit = {
+        'zaman': datetime.now().isoformat(timespec='seconds'),
+        'endpoint': request.endpoint or '<eşleşmedi>',
+        'method': request.method,
+        'yol': request.path,
+        'durum': response.status_code,
+        'sure_ms': round(sure * 1000, 2),
+        'sql_sayisi': olcum['sql_sayisi'],
+        'sql_ms': round(olcum['sql_sure'] * 1000, 2),
+        'render_ms': round(olcum['render_sure'] * 1000, 2),
+        'boyut': response.calculate_content_length(),  # Akış yanıtlarında None
+    }
+    perf_monitor.kaydet(kayit)
+    if perf_monitor.server_timing:
+        response.headers['Server-Timing'] = (
+            f'sql;dur={kayit["sql_ms"]};desc="{kayit["sql_sayisi"]} sorgu", '
+            f'render;dur={kayit["render_ms"]}, total;dur={kayit["sure_ms"]}'
+        )
+
+
+perf_monitor = PerfMonitor()
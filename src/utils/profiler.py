@@ -0,0 +1,312 @@
+"""
+İstek profilleyici
+Açıkken (PROFILE_ENABLED) seçilen istekler profillenir: X-Profile başlığı
+gönderilen istekler ve PROFILE_SAMPLE_RATE oranında rastgele istekler.
+
+İki mod vardır:
+- cprofile: deterministik cProfile, .prof dosyası (snakeviz, pstats ile açılır)
+- sampling: ayrı bir thread istek thread'inin yığınını her `aralik_ms`'de
+  okur, collapsed-stack (.collapsed, flamegraph.pl / speedscope) yazar.
+  Ek yükü düşüktür ama kısa fonksiyonları kaçırabilir
+
+X-Profile başlığı 'cprofile' veya 'sampling' ise o istek için mod seçilir.
+Her profil için yanında .json özet yazılır: endpoint, süre, kümülatif süreye
+göre en üst fonksiyonlar ve kendi (self) sürenin pakete göre dağılımı
+(pandas / openpyxl / sqlalchemy / uygulama ...). Klasörde en fazla
+`maks_dosya` profil tutulur, eskiler silinir.
+
+Profil yalnızca istek thread'ini kapsar; akış yanıtlarında gövde
+yazılırken çalışan kod profile girmez.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from flask import g, request, request_started, request_finished, request_tearing_down
+
+
+MODLAR = ('cprofile', 'sampling')
+BASLIK = 'X-Profile'
+UST_FONKSIYON_SAYISI = 25
+HARIC_ENDPOINTLER = {'static', 'profil_listesi', 'profil_indir', 'profil_temizle'}
+PROJE_KOKU = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_GUVENLI_AD = re.compile(r'^[\w.-]+$')
+
+
+def _paket(dosya, fonksiyon=''):
+    """Fonksiyonun ait olduğu paket: site-packages altındaki ilk klasör, proje kodu için 'uygulama'"""
+    if dosya == '~':
+        # cProfile yerleşik (C) fonksiyonları: "<method 'execute' of 'sqlite3.Cursor' objects>"
+        return 'sqlite3' if 'sqlite3' in fonksiyon else 'yerleşik'
+    if 'site-packages' in dosya:
+        return dosya.split('site-packages')[-1].strip(os.sep).split(os.sep)[0].split('.')[0]
+    if dosya.startswith(PROJE_KOKU):
+        return 'uygulama'
+    return 'stdlib'
+
+
+def _kisa_yol(dosya):
+    if 'site-packages' in dosya:
+        return dosya.split('site-packages')[-1].strip(os.sep)
+    if dosya.startswith(PROJE_KOKU):
+        return os.path.relpath(dosya, PROJE_KOKU)
+    return os.path.basename(dosya)
+
+
+class _Ornekleyici(threading.Thread):
+    """Hedef thread'in yığınını aralıklarla okuyup collapsed-stack sayar"""
+
+    def __init__(self, hedef, aralik):
+        super().__init__(daemon=True, name='profil-ornekleyici')
+        self.hedef = hedef
+        self.aralik = aralik
+        self.yiginlar = Counter()
+        self.paketler = Counter()  # Yaprak çerçevenin paketi
+        self._dur = threading.Event()
+
+    def run(self):
+        while not self._dur.wait(self.aralik):
+            cerceve = sys._current_frames().get(self.hedef)
+            if cerceve is None:
+                continue
+            self.paketler[_paket(cerceve.f_code.co_filename)] += 1
+            yigin = []
+            while cerceve is not None:
+                kod = cerceve.f_code
+                yigin.append(f'{kod.co_name} ({_kisa_yol(kod.co_filename)}:{kod.co_firstlineno})')
+                cerceve = cerceve.f_back
+            self.yiginlar[';'.join(reversed(yigin))] += 1
+
+    def durdur(self):
+        self._dur.set()
+        self.join()
+
+
+class RequestProfiler:
+    """Seçilen istekleri profiller ve sınırlı bir klasörde saklar"""
+
+    def __init__(self):
+        self.etkin = False
+        self.klasor = None
+        self.oran = 0.0
+        self.maks_dosya = 50
+        self.mod = 'cprofile'
+        self.aralik = 0.005
+        self._kilit = threading.Lock()
+
+    def configure(self, app, etkin=False, klasor='profiller', oran=0.0, maks_dosya=50, mod='cprofile',
+                  aralik_ms=5):
+        """
+        Profillemeyi açar ve istek sinyallerini bağlar (etkin değilse hiçbir şey bağlanmaz)
+
+        Args:
+            app: Flask uygulaması
+            klasor: Profil dosyalarının klasörü
+            oran: Başlıksız isteklerin profillenme olasılığı (0-1)
+            maks_dosya: Klasörde tutulacak en fazla profil sayısı
+            mod: 'cprofile' veya 'sampling' (varsayılan mod)
+            aralik_ms: sampling modunda örnekleme aralığı
+        """
+        if mod not in MODLAR:
+            raise ValueError(f'Geçersiz profil modu: {mod} (seçenekler: {", ".join(MODLAR)})')
+        self.etkin = etkin
+        self.klasor = klasor
+        self.oran = oran
+        self.maks_dosya = maks_dosya
+        self.mod = mod
+        self.aralik = aralik_ms / 1000
+        if not etkin:
+            return
+
+        os.makedirs(klasor, exist_ok=True)
+        request_started.connect(_istek_basladi, app)
+        request_finished.connect(_istek_bitti, app)
+        request_tearing_down.connect(_istek_kapandi, app)
+
+    def secilen_mod(self):
+        """İstek profillenecekse modu, değilse None döner"""
+        baslik = request.headers.get(BASLIK, '').strip().lower()
+        if baslik in MODLAR:
+            return baslik
+        if baslik in ('1', 'true', 'evet'):
+            return self.mod
+        if self.oran and random.random() < self.oran:
+            return self.mod
+        return None
+
+    def kaydet(self, ozet, profil=None, ornekleyici=None):
+        """
+        Profili (.prof veya .collapsed) ve özetini (.json) yazar, eski profilleri siler
+
+        Returns:
+            str: Profil adı (dosya adlarının ortak kökü)
+        """
+        endpoint = re.sub(r'[^\w-]', '_', ozet['endpoint'])
+        ad = f"{datetime.now():%Y%m%d_%H%M%S_%f}_{endpoint}"
+        if profil is not None:
+            dosya = f'{ad}.prof'
+            profil.dump_stats(os.path.join(self.klasor, dosya))
+            ozet.update(_cprofile_ozeti(profil))
+        else:
+            dosya = f'{ad}.collapsed'
+            with open(os.path.join(self.klasor, dosya), 'w', encoding='utf-8') as f:
+                for yigin, adet in ornekleyici.yiginlar.most_common():
+                    f.write(f'{yigin} {adet}\n')
+            ozet.update(_ornek_ozeti(ornekleyici, ozet['sure_ms']))
+        ozet.update({'ad': ad, 'dosya': dosya})
+        with open(os.path.join(self.klasor, f'{ad}.json'), 'w', encoding='utf-8') as f:
+            json.dump(ozet, f, ensure_ascii=False)
+        self._buda()
+        return ad
+
+    def _buda(self):
+        """En yeni maks_dosya profil dışındakileri siler (adlar zaman damgasıyla başlar)"""
+        with self._kilit:
+            ozetler = sorted(ad for ad in os.listdir(self.klasor) if ad.endswith('.json'))
+            for ozet in ozetler[:max(0, len(ozetler) - self.maks_dosya)]:
+                kok = ozet[:-len('.json')]
+                for uzanti in ('.json', '.prof', '.collapsed'):
+                    try:
+                        os.remove(os.path.join(self.klasor, kok + uzanti))
+                    except FileNotFoundError:
+                        pass
+
+    def listele(self):
+        """Profil özetleri (yeniden eskiye)"""
+        ozetler = []
+        for ad in sorted(os.listdir(self.klasor), reverse=True):
+            if not ad.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.klasor, ad), encoding='utf-8') as f:
+                    ozetler.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # Başka worker aynı anda siliyor veya yazıyor
+        return ozetler
+
+    def dosya_yolu(self, dosya):
+        """İndirilecek profil dosyasının yolu (geçersiz ad veya yoksa None)"""
+        if not _GUVENLI_AD.match(dosya) or not dosya.endswith(('.prof', '.collapsed')):
+            return None
+        yol = os.path.join(self.klasor, dosya)
+        return yol if os.path.exists(yol) else None
+
+    def clear(self):
+        with self._kilit:
+            for ad in os.listdir(self.klasor):
+                if ad.endswith(('.json', '.prof', '.collapsed')):
+                    try:
+                        os.remove(os.path.join(self.klasor, ad))
+                    except FileNotFoundError:
+                        pass
+
+
+def _cprofile_ozeti(profil):
+    """Kümülatif süreye göre en üst fonksiyonlar ve self sürenin paket dağılımı"""
+    istatistik = pstats.Stats(profil).stats
+    fonksiyonlar, paketler = [], Counter()
+    for (dosya, satir, ad), (_, cagri, kendi, kumulatif, _) in istatistik.items():
+        paketler[_paket(dosya, ad)] += kendi
+        fonksiyonlar.append({
+            'fonksiyon': ad if dosya == '~' else f'{ad} ({_kisa_yol(dosya)}:{satir})',
+            'cagri': cagri,
+            'kendi_ms': round(kendi * 1000, 2),
+            'kumulatif_ms': round(kumulatif * 1000, 2),
+        })
+    fonksiyonlar.sort(key=lambda f: f['kumulatif_ms'], reverse=True)
+    return {
+        'ust_fonksiyonlar': fonksiyonlar[:UST_FONKSIYON_SAYISI],
+        'paketler': {paket: round(sure * 1000, 2) for paket, sure in paketler.most_common()},
+    }
+
+
+def _ornek_ozeti(ornekleyici, sure_ms):
+    """
+    Örnek sayılarından kapsayıcı (kümülatif) ve yaprak (self) süreler
+
+    GIL yüzünden örnekler tam `aralik`ta alınamaz; örnek başına süre
+    isteğin gerçek süresi / örnek sayısı kabul edilir.
+    """
+    ornek_sayisi = sum(ornekleyici.yiginlar.values())
+    ornek_ms = sure_ms / ornek_sayisi if ornek_sayisi else 0
+    kumulatif, kendi = Counter(), Counter()
+    for yigin, adet in ornekleyici.yiginlar.items():
+        cerceveler = yigin.split(';')
+        for cerceve in set(cerceveler):  # Özyinelemede bir kez sayılır
+            kumulatif[cerceve] += adet
+        kendi[cerceveler[-1]] += adet
+    return {
+        'ust_fonksiyonlar': [{
+            'fonksiyon': cerceve, 'cagri': None,
+            'kendi_ms': round(kendi[cerceve] * ornek_ms, 2),
+            'kumulatif_ms': round(adet * ornek_ms, 2),
+        } for cerceve, adet in kumulatif.most_common(UST_FONKSIYON_SAYISI)],
+        'paketler': {paket: round(adet * ornek_ms, 2) for paket, adet in ornekleyici.paketler.most_common()},
+        'ornek_sayisi': ornek_sayisi,
+    }
+
+
+def _istek_basladi(sender, **extra):
+    if request.endpoint in HARIC_ENDPOINTLER:
+        return
+    mod = request_profiler.secilen_mod()
+    if mod is None:
+        return
+    if mod == 'cprofile':
+        profil = cProfile.Profile()
+        try:
+            profil.enable()
+        except ValueError:
+            return  # Bu thread'de başka bir profilleyici çalışıyor
+        g._profil = {'mod': mod, 'profil': profil, 'baslangic': time.perf_counter()}
+    else:
+        ornekleyici = _Ornekleyici(threading.get_ident(), request_profiler.aralik)
+        ornekleyici.start()
+        g._profil = {'mod': mod, 'ornekleyici': ornekleyici, 'baslangic': time.perf_counter()}
+
+
+def _durdur(durum):
+    if durum['mod'] == 'cprofile':
+        durum['profil'].disable()
+    else:
+        durum['ornekleyici'].durdur()
+
+
+def _istek_bitti(sender, response, **extra):
+    durum = g.pop('_profil', None)
+    if durum is None:
+        return
+    _durdur(durum)
+    ozet = {
+        'zaman': datetime.now().isoformat(timespec='seconds'),
+        'endpoint': request.endpoint or '<eşleşmedi>',
+        'method': request.method,
+        'yol': request.full_path.rstrip('?'),
+        'durum': response.status_code,
+        'mod': durum['mod'],
+        'sure_ms': round((time.perf_counter() - durum['baslangic']) * 1000, 2),
+    }
+    if durum['mod'] == 'cprofile':
+        ad = request_profiler.kaydet(ozet, profil=durum['profil'])
+    else:
+        ad = request_profiler.kaydet(ozet, ornekleyici=durum['ornekleyici'])
+    response.headers['X-Profile-Id'] = ad
+
+
+def _istek_kapandi(sender, **extra):
+    """request_finished çalışmadıysa (ör. yanıt üretilemeden hata) profilleyici kapatılır"""
+    durum = g.pop('_profil', None)
+    if durum is not None:
+        _durdur(durum)
+
+
+request_profiler = RequestProfiler()
@@ -0,0 +1,308 @@
+"""
+Sorgu sonucu önbellek modülü
+Tablo sürüm sayaçlarıyla geçersiz kılınan, LRU tahliyeli sonuç önbelleği
+
+İstatistik fonksiyonları okudukları tabloları @cached_query ile bildirir.
+Anahtar: fonksiyon + argümanlar + bu tabloların güncel sürümleri. Bir tabloya
+yazıldığında (after_flush) sürümü artar; eski anahtarlar bir daha istenmez
+ve LRU ile zamanla düşer. Sürümler veritabanındaki sayac tablosunda
+tutulduğu için birden fazla worker aynı sürümleri görür.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from functools import wraps
+
+from sqlalchemy import event, text, bindparam, inspect
+
+
+SURUM_ONEKI = 'tablo:'
+VARSAYILAN_MAKSIMUM_GIRDI = 512
+
+
+class MemoryBackend:
+    """Süreç içi LRU önbellek (OrderedDict)"""
+
+    def __init__(self, maksimum_girdi=VARSAYILAN_MAKSIMUM_GIRDI):
+        self.maksimum_girdi = maksimum_girdi
+        self._girdiler = OrderedDict()
+        self._kilit = threading.Lock()
+
+    def get(self, anahtar):
+        with self._kilit:
+            if anahtar not in self._girdiler:
+                return False, None
+            self._girdiler.move_to_end(anahtar)
+            return True, self._girdiler[anahtar]
+
+    def set(self, anahtar, deger):
+        with self._kilit:
+            self._girdiler[anahtar] = deger
+            self._girdiler.move_to_end(anahtar)
+            tahliye = 0
+            while len(self._girdiler) > self.maksimum_girdi:
+                self._girdiler.popitem(last=False)
+                tahliye += 1
+            return tahliye
+
+    def clear(self):
+        with self._kilit:
+            self._girdiler.clear()
+
+    def __len__(self):
+        return len(self._girdiler)
+
+
+class SqliteBackend:
+    """
+    Aynı sunucudaki worker'ların paylaştığı SQLite dosyası tabanlı önbellek
+
+    Değerler pickle ile saklanır. Son erişim zamanı her okumada değil,
+    ERISIM_ARALIGI saniyeden eskiyse güncellenir (yaklaşık LRU).
+    """
+
+    ERISIM_ARALIGI = 30
+
+    def __init__(self, dosya_yolu, maksimum_girdi=VARSAYILAN_MAKSIMUM_GIRDI):
+        self.dosya_yolu = dosya_yolu
+        self.maksimum_girdi = maksimum_girdi
+        self._yerel = threading.local()
+        with self._baglanti() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS onbellek ('
+                         'anahtar TEXT PRIMARY KEY, deger BLOB NOT NULL, erisim REAL NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_onbellek_erisim ON onbellek (erisim)')
+
+    def _baglanti(self):
+        conn = getattr(self._yerel, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.dosya_yolu, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._yerel.conn = conn
+        return conn
+
+    def get(self, anahtar):
+        conn = self._baglanti()
+        satir = conn.execute('SELECT deger, erisim FROM onbellek WHERE anahtar = ?', (anahtar,)).fetchone()
+        if satir is None:
+            return False, None
+        simdi = time.time()
+        if simdi - satir[1] > self.ERISIM_ARALIGI:
+            with conn:
+                conn.execute('UPDATE onbellek SET erisim = ? WHERE anahtar = ?', (simdi, anahtar))
+        return True, pickle.loads(satir[0])
+
+    def set(self, anahtar, deger):
+        conn = self._baglanti()
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO onbellek (anahtar, deger, erisim) VALUES (?, ?, ?)',
+                         (anahtar, pickle.dumps(deger), time.time()))
+            fazla = conn.execute('SELECT COUNT(*) FROM onbellek').fetchone()[0] - self.maksimum_girdi
+            if fazla > 0:
+                conn.execute('DELETE FROM onbellek WHERE anahtar IN '
+                             '(SELECT anahtar FROM onbellek ORDER BY erisim LIMIT ?)', (fazla,))
+            return max(fazla, 0)
+
+    def clear(self):
+        with self._baglanti() as conn:
+            conn.execute('DELETE FROM onbellek')
+
+    def __len__(self):
+        return self._baglanti().execute('SELECT COUNT(*) FROM onbellek').fetchone()[0]
+
+
+class QueryCache:
+    """Sürüm anahtarlı sonuç önbelleği ve isabet/ıskalama sayaçları"""
+
+    def __init__(self, backend=None, etkin=True):
+        self.backend = backend or MemoryBackend()
+        self.etkin = etkin
+        self.isabet = 0
+        self.iskalama = 0
+        self.tahliye = 0
+        self.gozlemci = None  # İsteğe bağlı gozlemci(isabet) - ör. Prometheus sayacı
+        self._kilit = threading.Lock()
+
+    def configure(self, backend=None, etkin=None):
+        """Backend'i veya etkinlik durumunu değiştirir (sayaçlar sıfırlanır)"""
+        if backend is not None:
+            self.backend = backend
+        if etkin is not None:
+            self.etkin = etkin
+        self.isabet = self.iskalama = self.tahliye = 0
+
+    def get_or_compute(self, anahtar, hesapla):
+        bulundu, deger = self.backend.get(anahtar)
+        if self.gozlemci:
+            self.gozlemci(bulundu)
+        if bulundu:
+            with self._kilit:
+                self.isabet += 1
+            return deger
+
+        deger = hesapla()
+        tahliye = self.backend.set(anahtar, deger)
+        with self._kilit:
+            self.iskalama += 1
+            self.tahliye += tahliye
+        return deger
+
+    def stats(self):
+        """İsabet/ıskalama sayaçları ve girdi sayısı"""
+        toplam = self.isabet + self.iskalama
+        return {
+            'backend': type(self.backend).__name__,
+            'etkin': self.etkin,
+            'girdi': len(self.backend),
+            'isabet': self.isabet,
+            'iskalama': self.iskalama,
+            'tahliye': self.tahliye,
+            'isabet_orani': round(self.isabet / toplam, 3) if toplam else 0.0,
+        }
+
+    def clear(self):
+        self.backend.clear()
+
+
+query_cache = QueryCache()
+
+
+def create_backend(adres, maksimum_girdi=VARSAYILAN_MAKSIMUM_GIRDI):
+    """
+    Yapılandırma değerinden backend oluşturur
+
+    Args:
+        adres: 'memory' veya paylaşımlı önbellek için 'sqlite:///dosya/yolu.db'
+        maksimum_girdi: LRU üst sınırı
+
+    Returns:
+        MemoryBackend veya SqliteBackend
+    """
+    if adres and adres.startswith('sqlite:///'):
+        dosya_yolu = adres[len('sqlite:///'):]
+        klasor = os.path.dirname(dosya_yolu)
+        if klasor:
+            os.makedirs(klasor, exist_ok=True)
+        return SqliteBackend(dosya_yolu, maksimum_girdi)
+    return MemoryBackend(maksimum_girdi)
+
+
+def get_table_versions(db, tablolar):
+    """
+    Tabloların güncel sürümlerini tek sorguda okur
+
+    Args:
+        db: Database session
+        tablolar: Tablo adları
+
+    Returns:
+        tuple: Tablo sırasıyla sürüm numaraları (hiç yazılmamışsa 0)
+    """
+    kapsamlar = [SURUM_ONEKI + tablo for tablo in tablolar]
+    satirlar = dict(db.session.execute(
+        text('SELECT kapsam, deger FROM sayac WHERE kapsam IN :kapsamlar')
+        .bindparams(bindparam('kapsamlar', expanding=True)),
+        {'kapsamlar': kapsamlar}
+    ).all())
+    return tuple(satirlar.get(kapsam, 0) for kapsam in kapsamlar)
+
+
+def bump_table_versions(conn, tablolar):
+    """
+    Tabloların sürümlerini çağıranın transaction'ında bir artırır
+
+    Yazma geri alınırsa sürüm artışı da geri alınır. Sayaç satırı yoksa
+    oluşturulur (SQLite'ta yazma kilidi bu transaction'da olduğu için
+    eşzamanlı ekleme çakışmaz).
+
+    Args:
+        conn: SQLAlchemy Connection (ör. session.connection())
+        tablolar: Tablo adları
+    """
+    kapsamlar = sorted({SURUM_ONEKI + tablo for tablo in tablolar})
+    if not kapsamlar:
+        return
+
+    conn.execute(
+        text('UPDATE sayac SET deger = deger + 1 WHERE kapsam IN :kapsamlar')
+        .bindparams(bindparam('kapsamlar', expanding=True)),
+        {'kapsamlar': kapsamlar}
+    )
+    mevcut = set(conn.execute(
+        text('SELECT kapsam FROM sayac WHERE kapsam IN :kapsamlar')
+        .bindparams(bindparam('kapsamlar', expanding=True)),
+        {'kapsamlar': kapsamlar}
+    ).scalars())
+    eksik = [kapsam for kapsam in kapsamlar if kapsam not in mevcut]
+    if eksik:
+        conn.execute(text('INSERT INTO sayac (kapsam, deger) VALUES (:kapsam, 1)'),
+                     [{'kapsam': kapsam} for kapsam in eksik])
+
+
+def cached_query(*tablolar, gune_bagli=False):
+    """
+    İlk argümanı db olan okuma fonksiyonları için önbellek dekoratörü
+
+    Args:
+        tablolar: Fonksiyonun okuduğu tablo adları
+        gune_bagli: Sonuç bugünün tarihine bağlıysa (ör. "bu ay") True;
+                    tarih anahtara eklenir
+
+    Örnek:
+        @cached_query('is_gunlugu', 'teslimat')
+        def get_metrik(db, start_date=None): ...
+    """
+    def dekorator(fonksiyon):
+        ad = f'{fonksiyon.__module__}.{fonksiyon.__qualname__}'
+
+        @wraps(fonksiyon)
+        def sarmalayici(db, *args, **kwargs):
+            if not query_cache.etkin:
+                return fonksiyon(db, *args, **kwargs)
+
+            surumler = get_table_versions(db, tablolar)
+            anahtar = repr((ad, args, sorted(kwargs.items()), surumler,
+                            date.today() if gune_bagli else None))
+            return query_cache.get_or_compute(anahtar, lambda: fonksiyon(db, *args, **kwargs))
+
+        sarmalayici.tablolar = tablolar
+        return sarmalayici
+    return dekorator
+
+
+def _yazilan_tablolar(session):
+    """Flush edilen nesnelerin tablo adlarını toplar"""
+    tablolar = set()
+    for nesne in list(session.new) + list(session.deleted):
+        tablolar.add(inspect(nesne).mapper.local_table.name)
+    for nesne in session.dirty:
+        if session.is_modified(nesne):
+            tablolar.add(inspect(nesne).mapper.local_table.name)
+    # Sayaç tablosunun kendisi (kod üretimi) önbelleği etkilemez
+    tablolar.discard('sayac')
+    return tablolar
+
+
+def register_cache_listeners(session):
+    """
+    Session flush'larında yazılan tabloların sürümlerini artırır
+
+    Toplu Core DELETE/UPDATE'ler flush'tan geçmediği için
+    bump_table_versions'ı kendileri çağırmalıdır.
+
+    Args:
+        session: db.session (scoped_session)
+    """
+    if event.contains(session, 'after_flush', _after_flush):
+        return
+    event.listen(session, 'after_flush', _after_flush)
+
+
+def _after_flush(session, flush_context):
+    tablolar = _yazilan_tablolar(session)
+    if tablolar:
+        bump_table_versions(session.connection(), tablolar)
@@ -0,0 +1,219 @@
+"""
+İçerik adresli rapor önbelleği
+Üretilen Word/Excel raporları klasör altında içeriklerinin SHA-256 özetiyle
+saklanır; aynı içerik tek dosyadır.
+
+Anahtar: rapor türü + müşteri + tarih aralığı + rapor tablolarının sürümleri
+(query_cache sayaçları) + SABLON_SURUMU + bugünün tarihi (raporda "Rapor
+Tarihi" yazdığı için). Anahtar dosyası yalnızca içerik özetini tutar:
+
+    <klasor>/anahtar/<anahtar>        -> "<özet><uzantı>"
+    <klasor>/icerik/<özet><uzantı>    -> rapor dosyası
+
+Veri değişmeden gelen istek dosyayı üretmeden döner. Sürümler tablo
+genelinde olduğu için başka bir müşteriye yazmak da anahtarı değiştirir;
+yeniden üretilen rapor aynıysa (docx/xlsx zip zaman damgaları sabitlenir)
+yeni dosya yazılmaz. Dosyalar yaş ve toplam boyut sınırıyla, en eski
+erişilenden başlanarak silinir.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import zipfile
+from datetime import date, datetime, time
+
+from src.utils.query_cache import get_table_versions
+
+
+SABLON_SURUMU = 2  # Rapor içeriği veya biçimi değiştiğinde artırılır
+RAPOR_TABLOLARI = ('musteri', 'is_gunlugu', 'teslimat', 'revizyon', 'sosyal_medya', 'arama')
+VARSAYILAN_MAKS_BOYUT = 500 * 1024 * 1024
+VARSAYILAN_MAKS_YAS = 30 * 24 * 3600
+
+_CORE_TARIHI = re.compile(rb'(<dcterms:(?:created|modified)[^>]*>)[^<]*(</dcterms:(?:created|modified)>)')
+
+
+def _sabit_zip(kaynak, hedef, gun):
+    """
+    docx/xlsx arşivini zaman damgaları sabit olarak yeniden yazar
+
+    Aynı içerikli iki rapor böylece bayt bayt aynı olur. Belge özelliklerindeki
+    oluşturma/değiştirme zamanı raporun gününe çekilir.
+    """
+    zaman = datetime.combine(gun, time())
+    damga = zaman.strftime('%Y-%m-%dT%H:%M:%SZ').encode()
+    with zipfile.ZipFile(kaynak) as giris, zipfile.ZipFile(hedef, 'w', zipfile.ZIP_DEFLATED) as cikis:
+        for bilgi in giris.infolist():
+            veri = giris.read(bilgi.filename)
+            if bilgi.filename == 'docProps/core.xml':
+                veri = _CORE_TARIHI.sub(rb'\g<1>' + damga + rb'\g<2>', veri)
+            cikis.writestr(zipfile.ZipInfo(bilgi.filename, date_time=zaman.timetuple()[:6]), veri,
+                           compress_type=zipfile.ZIP_DEFLATED)
+
+
+def _ozet(yol):
+    sha = hashlib.sha256()
+    with open(yol, 'rb') as dosya:
+        for blok in iter(lambda: dosya.read(1024 * 1024), b''):
+            sha.update(blok)
+    return sha.hexdigest()
+
+
+class ReportCache:
+    """Rapor dosyaları için içerik adresli disk önbelleği"""
+
+    def __init__(self):
+        self.db = None
+        self.klasor = None
+        self.maks_boyut = VARSAYILAN_MAKS_BOYUT
+        self.maks_yas = VARSAYILAN_MAKS_YAS
+
+    def configure(self, db, klasor, maks_boyut=None, maks_yas=None):
+        """
+        Args:
+            klasor: Önbellek klasörü (anahtar/ ve icerik/ alt klasörleri)
+            maks_boyut: icerik/ klasörünün bayt sınırı
+            maks_yas: Son erişimden bu kadar saniye sonra dosya silinir
+        """
+        self.db = db
+        self.klasor = klasor
+        if maks_boyut is not None:
+            self.maks_boyut = maks_boyut
+        if maks_yas is not None:
+            self.maks_yas = maks_yas
+
+    def _yol(self, *parcalar):
+        return os.path.join(self.klasor, *parcalar)
+
+    def key(self, tur, musteri_id, start_date, end_date):
+        """Rapor anahtarı (hex); tablolardan biri yazıldığında değişir"""
+        surumler = get_table_versions(self.db, RAPOR_TABLOLARI)
+        tanim = json.dumps([
+            tur, musteri_id,
+            start_date.isoformat() if start_date else None,
+            end_date.isoformat() if end_date else None,
+            surumler, SABLON_SURUMU, date.today().isoformat(),
+        ])
+        return hashlib.sha256(tanim.encode()).hexdigest()
+
+    def get(self, anahtar):
+        """Anahtarın dosya yolu (yoksa None); isabet dosyanın erişim zamanını yeniler"""
+        try:
+            with open(self._yol('anahtar', anahtar)) as dosya:
+                icerik_yolu = self._yol('icerik', dosya.read().strip())
+            os.utime(icerik_yolu)
+            return icerik_yolu
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put(self, anahtar, kaynak, uzanti):
+        """
+        Üretilmiş rapor dosyasını önbelleğe taşır
+
+        Args:
+            kaynak: Geçici dosya (taşınır veya silinir)
+            uzanti: '.docx' / '.xlsx'
+
+        Returns:
+            str: Önbellekteki dosya yolu
+        """
+        os.makedirs(self._yol('icerik'), exist_ok=True)
+        os.makedirs(self._yol('anahtar'), exist_ok=True)
+        ad = _ozet(kaynak) + uzanti
+        icerik_yolu = self._yol('icerik', ad)
+        if os.path.exists(icerik_yolu):
+            os.remove(kaynak)  # Aynı içerik zaten var
+            os.utime(icerik_yolu)
+        else:
+            os.replace(kaynak, icerik_yolu)
+
+        gecici = self._yol('anahtar', f'.{anahtar}.{os.getpid()}')
+        with open(gecici, 'w') as dosya:
+            dosya.write(ad)
+        os.replace(gecici, self._yol('anahtar', anahtar))
+        self.evict()
+        return icerik_yolu
+
+    def lookup(self, tur, musteri_id, start_date, end_date):
+        """Raporun önbellekteki dosya yolu; yoksa None (üretmez)"""
+        return self.get(self.key(tur, musteri_id, start_date, end_date))
+
+    def get_or_build(self, tur, musteri_id, start_date, end_date, uzanti, build):
+        """
+        Raporu önbellekten döner, yoksa build(hedef_yolu) ile üretip saklar
+
+        Returns:
+            tuple: (dosya yolu, isabet mi)
+        """
+        anahtar = self.key(tur, musteri_id, start_date, end_date)
+        yol = self.get(anahtar)
+        if yol:
+            return yol, True
+
+        os.makedirs(self.klasor, exist_ok=True)
+        ham = self._yol(f'.uretim_{anahtar[:16]}_{os.getpid()}_ham{uzanti}')
+        sabit = self._yol(f'.uretim_{anahtar[:16]}_{os.getpid()}{uzanti}')
+        try:
+            build(ham)
+            _sabit_zip(ham, sabit, date.today())
+            return self.put(anahtar, sabit, uzanti), False
+        finally:
+            for yol in (ham, sabit):
+                if os.path.exists(yol):
+                    os.remove(yol)
+
+    def evict(self):
+        """
+        Yaş ve boyut sınırını aşan içerik dosyalarını, en eski erişilenden
+        başlayarak siler; eskimiş veya hedefi kalmayan anahtarları da temizler
+
+        Returns:
+            dict: {'silinen': dosya sayısı, 'kalan': dosya sayısı, 'boyut': bayt}
+        """
+        icerik = self._yol('icerik')
+        if not os.path.isdir(icerik):
+            return {'silinen': 0, 'kalan': 0, 'boyut': 0}
+
+        dosyalar = []
+        for girdi in os.scandir(icerik):
+            if girdi.is_file():
+                bilgi = girdi.stat()
+                dosyalar.append((bilgi.st_mtime, bilgi.st_size, girdi.path))
+        dosyalar.sort()
+
+        sinir = datetime.now().timestamp() - self.maks_yas
+        toplam = sum(boyut for _, boyut, _ in dosyalar)
+        silinen = 0
+        for erisim, boyut, yol in dosyalar:
+            if erisim >= sinir and toplam <= self.maks_boyut:
+                break
+            try:
+                os.remove(yol)
+            except FileNotFoundError:
+                pass
+            toplam -= boyut
+            silinen += 1
+
+        # Eski sürümlere ait veya hedefi silinmiş anahtarlar
+        kalanlar = set(os.listdir(icerik))
+        for girdi in os.scandir(self._yol('anahtar')):
+            if girdi.name.startswith('.'):
+                continue  # Yazılmakta olan anahtar
+            try:
+                with open(girdi.path) as dosya:
+                    hedef = dosya.read().strip()
+                if hedef not in kalanlar or girdi.stat().st_mtime < sinir:
+                    os.remove(girdi.path)
+            except FileNotFoundError:
+                pass
+        return {'silinen': silinen, 'kalan': len(dosyalar) - silinen, 'boyut': toplam}
+
+    def clear(self):
+        if self.klasor and os.path.isdir(self.klasor):
+            shutil.rmtree(self.klasor)
+
+
+report_cache = ReportCache()
@@ -0,0 +1,204 @@
+"""
+Müşteri Excel raporu
+Yüklenmiş iş, teslimat, revizyon, sosyal medya ve arama kayıtlarından
+7 sayfalık müşteri raporunu yazar. Veritabanına erişmez; kayıtlar ORM
+nesnesi veya aynı alanlara sahip herhangi bir nesne olabilir (toplu rapor
+üretiminde süreçlere gönderilen satırlar gibi).
+"""
+
+from collections import Counter
+
+import pandas as pd
+
+from src.utils.report_workbook import ReportWorkbook
+
+
+def write_musteri_excel(hedef, isler, teslimatlar, revizyonlar, sosyal_medyalar, aramalar,
+                        write_only=False, ilerleme=None):
+    """
+    Müşterinin Excel raporunu (7 sayfa) hedefe yazar
+
+    Args:
+        hedef: Dosya yolu veya BytesIO
+        isler, teslimatlar, revizyonlar, sosyal_medyalar, aramalar: Rapor dönemi kayıtları
+            (teslimat, revizyon ve sosyal medya kayıtlarında is_gunlugu.is_kodu okunur)
+        write_only: Satırları openpyxl write-only modunda diske akıt
+        ilerleme: İsteğe bağlı ilerleme(yuzde, mesaj) geri çağrısı
+    """
+    with ReportWorkbook(hedef, write_only=write_only) as rapor:
+        # Sheet 1: Özet
+        # Sosyal medya: Teslimatlardan + Manuel
+        sosyal_medya_teslimatlar = [t for t in teslimatlar if t.teslim_turu == 'Sosyal Medya']
+        toplam_sosyal_medya = len(sosyal_medya_teslimatlar) + len(sosyal_medyalar)
+        
+        ozet_data = {
+            'Metrik': ['Toplam İş', 'Toplam Teslimat', 'Toplam Revizyon', 'Toplam Sosyal Medya', 
+                      'Toplam Arama/Toplantı', 'Onaylanan Teslimat', 'Bekleyen Teslimat', 'Toplam Süre (saat)'],
+            'Değer': [
+                len(isler),
+                len(teslimatlar),
+                len(revizyonlar),
+                toplam_sosyal_medya,  # Teslimat + Manuel
+                len(aramalar),
+                len([t for t in teslimatlar if t.durum in ['Tamamlandı', 'Teslim Edildi']]),
+                len([t for t in teslimatlar if t.durum == 'Hazırlanıyor']),
+                round(sum([is_item.sure_dakika or 0 for is_item in isler]) / 60, 1)
+            ]
+        }
+        rapor.add_sheet('Özet', pd.DataFrame(ozet_data))
+        
+        # Sheet 2: İş Günlüğü Detaylı (AI-Friendly)
+        is_data = []
+        for is_item in isler:
+            is_data.append({
+                'İş Kodu': is_item.is_kodu,
+                'Tarih': is_item.tarih.strftime('%d.%m.%Y') if is_item.tarih else '',
+                'Proje': is_item.proje or '',
+                'Aktivite Türü': is_item.aktivite_turu or '',
+                'İş Açıklaması': is_item.aciklama or '',  # Tam metin
+                'Ne Yapıldı': is_item.ne_yapildi or '',  # Revizyon yoksa ne yapıldı
+                'Sorumlu': is_item.sorumlu_kisi or '',
+                'Süre (dk)': is_item.sure_dakika or 0,
+                'Süre (saat)': round((is_item.sure_dakika or 0) / 60, 1),
+                'Durum': is_item.durum or '',
+                'Revizyon Sayısı': is_item.revizyon_sayisi or 0
+            })
+        rapor.add_sheet('İş Günlüğü', pd.DataFrame(is_data))
+        
+        # Sheet 3: Teslimatlar
+        teslimat_data = []
+        for teslimat in teslimatlar:
+            is_gunlugu = teslimat.is_gunlugu
+            teslimat_data.append({
+                'İş Kodu': is_gunlugu.is_kodu if is_gunlugu else '-',
+                'Başlık': teslimat.baslik or '',
+                'Tür': teslimat.teslim_turu or '',
+                'Sorumlu': teslimat.sorumlu_kisi or '',
+                'Teslim Tarihi': teslimat.teslim_tarihi.strftime('%d.%m.%Y') if teslimat.teslim_tarihi else '',
+                'Durum': teslimat.durum or '',
+                'Platform': teslimat.platform or '',
+                'Gönderi Türü': teslimat.gonderi_turu or '',
+                'Etkileşim': teslimat.etkileşim or 0,
+                'Görüntülenme': teslimat.goruntulenme or 0,
+                'Beğeni': teslimat.begeni or 0,
+                'Yorum': teslimat.yorum or 0,
+                'Paylaşım': teslimat.paylasim or 0
+            })
+        rapor.add_sheet('Teslimatlar', pd.DataFrame(teslimat_data))
+        
+        # Sheet 4: Revizyonlar Detaylı (AI-Friendly)
+        revizyon_data = []
+        for revizyon in revizyonlar:
+            is_gunlugu = revizyon.is_gunlugu
+            revizyon_data.append({
+                'İş Kodu': is_gunlugu.is_kodu if is_gunlugu else '-',
+                'Revizyon No': revizyon.revizyon_numarasi or 1,
+                'Başlık': revizyon.baslik or '',
+                'Tarih': revizyon.tarih.strftime('%d.%m.%Y') if revizyon.tarih else '',
+                'Talep Eden': revizyon.revize_talep_eden or '',
+                'Revizyon Konusu': revizyon.revize_konusu or '',  # Tam metin
+                'Ne Yapıldı': revizyon.ne_yapildi or '',  # Tam metin
+                'Durum': revizyon.durum or ''
+            })
+        rapor.add_sheet('Revizyonlar', pd.DataFrame(revizyon_data))
+        
+        # Sheet 5: Sosyal Medya
+        sm_data = []
+        # Teslimatlardan sosyal medya
+        for teslimat in [t for t in teslimatlar if t.teslim_turu == 'Sosyal Medya']:
+            is_gunlugu = teslimat.is_gunlugu
+            sm_data.append({
+                'İş Kodu': is_gunlugu.is_kodu if is_gunlugu else '-',
+                'Tarih': teslimat.teslim_tarihi.strftime('%d.%m.%Y') if teslimat.teslim_tarihi else '',
+                'Platform': teslimat.platform or '',
+                'Gönderi Türü': teslimat.gonderi_turu or '',
+                'Etkileşim': teslimat.etkileşim or 0,
+                'Görüntülenme': teslimat.goruntulenme or 0,
+                'Beğeni': teslimat.begeni or 0,
+                'Yorum': teslimat.yorum or 0,
+                'Paylaşım': teslimat.paylasim or 0,
+                'Kaynak': 'Teslimat'
+            })
+        
+        # Manuel sosyal medya
+        for sm in sosyal_medyalar:
+            is_gunlugu = sm.is_gunlugu
+            sm_data.append({
+                'İş Kodu': is_gunlugu.is_kodu if is_gunlugu else '-',
+                'Tarih': sm.tarih.strftime('%d.%m.%Y') if sm.tarih else '',
+                'Platform': sm.platform or '',
+                'Gönderi Türü': sm.gonderi_turu or '',
+                'Etkileşim': sm.etkileşim or 0,
+                'Görüntülenme': sm.goruntulenme or 0,
+                'Beğeni': sm.begeni or 0,
+                'Yorum': sm.yorum or 0,
+                'Paylaşım': sm.paylasim or 0,
+                'Kaynak': 'Manuel'
+            })
+        rapor.add_sheet('Sosyal Medya', pd.DataFrame(sm_data))
+        
+        # Sheet 6: Aramalar / Toplantılar
+        arama_data = []
+        for arama in aramalar:
+            arama_data.append({
+                'Tarih': arama.tarih.strftime('%d.%m.%Y') if arama.tarih else '',
+                'Arayan/Aranan': arama.arayan_aranan or '',
+                'Konu': arama.konu or '',
+                'Sonuç': arama.sonuc or '',
+                'Sorumlu': arama.sorumlu_kisi or '',
+                'Notlar': arama.notlar or '',
+                'Geri Dönüş Tarihi': arama.geri_donus_tarihi.strftime('%d.%m.%Y') if arama.geri_donus_tarihi else '',
+                'Durum': arama.durum or ''
+            })
+        rapor.add_sheet('Aramalar', pd.DataFrame(arama_data))
+        if ilerleme:
+            ilerleme(70, 'Sayfalar yazıldı')
+        
+        # Sheet 7: AI Analiz Özeti (Yapay Zeka için özel sheet)
+        # Revizyon konularını frekansa göre say
+        revizyon_konulari = [r.revize_konusu for r in revizyonlar if r.revize_konusu]
+        top_konular = Counter(revizyon_konulari).most_common(5)
+        top_konular_str = '\n'.join([f"{i+1}. {konu[:100]} ({sayi} kez)" for i, (konu, sayi) in enumerate(top_konular)]) if top_konular else 'Revizyon yok'
+        
+        # En çok revize edilen iş
+        en_cok_revizeli_is = max(isler, key=lambda x: x.revizyon_sayisi or 0) if isler else None
+        
+        ai_ozet = {
+            'Metrik': [
+                'Toplam İş Sayısı',
+                'Toplam Revizyon Sayısı',
+                'Ortalama Revizyon/İş',
+                'En Çok Revize Edilen İş Kodu',
+                'En Çok Revize Edilen İş - Revizyon Sayısı',
+                'Toplam Revize Edilen İş',
+                'Revizyonsuz Tamamlanan İş',
+                'Revizyon Oranı (%)',
+                'En Sık Revizyon Konuları (Top 5)',
+                'Müşteri Memnuniyetsizlik Analizi'
+            ],
+            'Değer': [
+                len(isler),
+                len(revizyonlar),
+                round(len(revizyonlar) / len(isler), 2) if len(isler) > 0 else 0,
+                en_cok_revizeli_is.is_kodu if en_cok_revizeli_is else '-',
+                en_cok_revizeli_is.revizyon_sayisi if en_cok_revizeli_is else 0,
+                len([i for i in isler if (i.revizyon_sayisi or 0) > 0]),
+                len([i for i in isler if (i.revizyon_sayisi or 0) == 0]),
+                round((len([i for i in isler if (i.revizyon_sayisi or 0) > 0]) / len(isler) * 100), 1) if len(isler) > 0 else 0,
+                top_konular_str,
+                'Detaylı analiz için Revizyonlar sheet\'ine bakın. Her revizyonun konusu ve ne yapıldığı bilgisi mevcuttur.'
+            ],
+            'Açıklama': [
+                'Rapor döneminde yapılan toplam iş sayısı',
+                'Müşterinin talep ettiği toplam revizyon sayısı',
+                'Her iş için ortalama revizyon sayısı (yüksek değer müşteri memnuniyetsizliği gösterir)',
+                'En fazla revize edilen işin kodu',
+                'Bu işe ait toplam revizyon sayısı',
+                'En az bir revizyon almış işlerin sayısı',
+                'Hiç revizyon almadan tamamlanan işlerin sayısı (mükemmel)',
+                'İşlerin yüzde kaçı revize edildi',
+                'En sık karşılaşılan revizyon konuları ve frekansları',
+                'Tüm revizyon detayları için Revizyonlar sheet\'ine bakılmalıdır'
+            ]
+        }
+        rapor.add_sheet('AI Analiz Özeti', pd.DataFrame(ai_ozet))
@@ -6,8 +6,16 @@ Müşteri bazlı detaylı raporlar oluşturur
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml.ns import qn
+from docx.table import _Cell
 from datetime import datetime, timedelta
 from collections import Counter
+from copy import deepcopy
+
+TABLO_STILI = 'Light Grid Accent 1'
+_W_T = qn('w:t')
+_XML_SPACE = qn('xml:space')
+_OZEL_KARAKTERLER = frozenset('\n\r\t')
 
 
 def add_heading_custom(doc, text, level=1):
@@ -21,32 +29,226 @@ def add_heading_custom(doc, text, level=1):
     return heading
 
 
-def generate_musteri_raporu(db, musteri, start_date=None, end_date=None):
+def add_table_bulk(doc, basliklar, satirlar, style=TABLO_STILI):
     """
-    Müşteri için detaylı Word raporu oluşturur
-    
+    Başlık ve veri satırlarından tabloyu tek geçişte oluşturur
+
+    table.rows[i].cells[j] her erişimde satır/hücre proxy listelerini
+    yeniden kurar; hücre hücre yazmak büyük tablolarda karesel büyür.
+    Burada her hücresinde boş bir <w:r><w:t/> bulunan <w:tr> şablonu
+    kopyalanır ve metin doğrudan <w:t>'ye yazılır (cell.text ile aynı XML);
+    stil bir kez uygulanır.
+
+    Args:
+        basliklar: Sütun başlıkları
+        satirlar: Her biri sütun sayısı kadar değer içeren satırlar (str'e çevrilir)
+
+    Returns:
+        Table: Oluşturulan tablo
+    """
+    table = doc.add_table(rows=1, cols=len(basliklar))
+    table.style = style
+    tbl = table._tbl
+    baslik_satiri = tbl.tr_lst[0]
+    sablon = deepcopy(baslik_satiri)  # Hücre genişlikleri ve boş paragraflar
+    for tc in sablon.tc_lst:
+        tc.p_lst[0].add_r().add_t('')
+    for tc, baslik in zip(baslik_satiri.tc_lst, basliklar):
+        _Cell(tc, table).text = baslik
+
+    for satir in satirlar:
+        tr = deepcopy(sablon)
+        for t, deger in zip(list(tr.iter(_W_T)), satir):
+            deger = str(deger)
+            if not deger or _OZEL_KARAKTERLER.intersection(deger):
+                # Boş metin ve satır sonu/sekme python-docx'in run yazımıyla
+                r = t.getparent()
+                r.remove(t)
+                r.text = deger
+                continue
+            t.text = deger
+            if deger != deger.strip():
+                t.set(_XML_SPACE, 'preserve')
+        tbl.append(tr)
+    return table
+
+
+def _normal_baslik(metin):
+    """Başlık eşlemesi için küçük harf, tek boşluklu metin"""
+    return ' '.join((metin or '').lower().split())
+
+
+def collect_musteri_raporu_verisi(db, musteri, start_date=None, end_date=None):
+    """
+    Rapor için verileri yükler ve tüm hesaplamaları yapar (belge oluşturmaz)
+
+    Teslimat, revizyon ve sosyal medya kayıtları aynı işe (is_gunlugu_id)
+    bağlıdır; eşlemeler her tablo için bir kez kurulan sözlüklerle yapılır,
+    süre veri boyutuyla doğrusal artar.
+
     Args:
         db: Database session
         musteri: Musteri objesi
-        start_date: Başlangıç tarihi
-        end_date: Bitiş tarihi
-    
+        start_date: Başlangıç tarihi (yoksa bitişten 30 gün önce)
+        end_date: Bitiş tarihi (yoksa bugün)
+
     Returns:
-        Document: Word dokümanı
+        dict: render_musteri_raporu'nun kullandığı alanlar
     """
-    try:
-        from app import IsGunlugu, Teslimat, SosyalMedya, Revizyon
-    except ImportError:
-        # Alternatif import yolu
-        from ...app import IsGunlugu, Teslimat, SosyalMedya, Revizyon
-    
+    from sqlalchemy.orm import selectinload
+    from app import IsGunlugu, Teslimat, SosyalMedya, Revizyon
+
     # Tarih aralığı belirleme
     if not end_date:
         end_date = datetime.now().date()
     if not start_date:
         # Son 30 gün
         start_date = end_date - timedelta(days=30)
-    
+
+    isler = db.session.query(IsGunlugu).filter(
+        IsGunlugu.musteri_id == musteri.id,
+        IsGunlugu.tarih >= start_date,
+        IsGunlugu.tarih <= end_date
+    ).all()
+    teslimatlar = db.session.query(Teslimat).filter(
+        Teslimat.musteri_id == musteri.id,
+        Teslimat.teslim_tarihi >= start_date,
+        Teslimat.teslim_tarihi <= end_date
+    ).all()
+    revizyonlar = db.session.query(Revizyon).options(selectinload(Revizyon.is_gunlugu)).filter(
+        Revizyon.musteri_id == musteri.id,
+        Revizyon.tarih >= start_date,
+        Revizyon.tarih <= end_date
+    ).all()
+    sosyal_medyalar = db.session.query(SosyalMedya).filter(
+        SosyalMedya.musteri_id == musteri.id,
+        SosyalMedya.tarih >= start_date,
+        SosyalMedya.tarih <= end_date
+    ).all()
+
+    return index_musteri_raporu_verisi(musteri, start_date, end_date,
+                                       isler, teslimatlar, revizyonlar, sosyal_medyalar)
+
+
+def index_musteri_raporu_verisi(musteri, start_date, end_date, isler, teslimatlar, revizyonlar, sosyal_medyalar):
+    """
+    Yüklenmiş dönem kayıtlarından rapor verisini hesaplar (veritabanına erişmez)
+
+    Kayıtlar ORM nesnesi ya da aynı alanlara sahip nesneler olabilir;
+    revizyonlarda is_gunlugu ilişkisi (is_kodu) okunur.
+
+    Returns:
+        dict: render_musteri_raporu'nun kullandığı alanlar
+    """
+    # İş günlüğü özetleri: kişi ve aktivite türü tek geçişte toplanır
+    toplam_dakika = 0
+    kisi_istatistik = {}
+    aktivite_dakika = Counter()
+    for is_item in isler:
+        dakika = is_item.sure_dakika or 0
+        toplam_dakika += dakika
+        if is_item.sorumlu_kisi:
+            istatistik = kisi_istatistik.setdefault(is_item.sorumlu_kisi, {'is_sayisi': 0, 'toplam_dakika': 0})
+            istatistik['is_sayisi'] += 1
+            istatistik['toplam_dakika'] += dakika
+        if is_item.aktivite_turu:
+            aktivite_dakika[is_item.aktivite_turu] += dakika
+    aktivite_sayaci = Counter(is_item.aktivite_turu for is_item in isler if is_item.aktivite_turu)
+
+    # İndeksler: iş -> teslimatlar / revizyon sayısı, iş ve başlık -> yayınlanan gönderi
+    teslimat_isleri = {}
+    tasarim_isleri, video_isleri = set(), set()
+    for teslimat in teslimatlar:
+        teslimat_isleri.setdefault(teslimat.is_gunlugu_id, []).append(teslimat)
+        tur = (teslimat.teslim_turu or '').lower()
+        if 'tasarım' in tur:
+            tasarim_isleri.add(teslimat.is_gunlugu_id)
+        if 'video' in tur:
+            video_isleri.add(teslimat.is_gunlugu_id)
+    is_revizyon_sayisi = Counter(revizyon.is_gunlugu_id for revizyon in revizyonlar)
+
+    yayinlanan_icerikler = [s for s in sosyal_medyalar if s.durum == 'Yayınlandı']
+    yayin_isleri, yayin_basliklari = {}, {}
+    for sosyal in yayinlanan_icerikler:
+        # İlk yayın kazanır (sosyal medya kayıtlarının sırasıyla)
+        if sosyal.is_gunlugu_id:
+            yayin_isleri.setdefault(sosyal.is_gunlugu_id, sosyal)
+        yayin_basliklari.setdefault(_normal_baslik(sosyal.icerik_basligi), sosyal)
+
+    teslimat_satirlari = []
+    for teslimat in teslimatlar:
+        revizyon_sayisi = is_revizyon_sayisi.get(teslimat.is_gunlugu_id, 0)
+        sosyal = yayin_isleri.get(teslimat.is_gunlugu_id)
+        if sosyal is None and teslimat.baslik:
+            sosyal = yayin_basliklari.get(_normal_baslik(teslimat.baslik))
+        teslimat_satirlari.append({
+            'teslimat': teslimat,
+            'revize_durumu': f"{revizyon_sayisi} Revizyon" if revizyon_sayisi else "Revize yok",
+            'yayin_bilgisi': f"{sosyal.platform}'da yayınlandı" if sosyal else "-",
+        })
+
+    revizyon_satirlari = []
+    for revizyon in revizyonlar:
+        is_teslimatlari = teslimat_isleri.get(revizyon.is_gunlugu_id)
+        if is_teslimatlari:
+            teslimat_adi = is_teslimatlari[0].baslik
+        elif revizyon.is_gunlugu and revizyon.is_gunlugu.is_kodu:
+            teslimat_adi = f"İş {revizyon.is_gunlugu.is_kodu}"
+        else:
+            teslimat_adi = '-'
+        revizyon_satirlari.append({'revizyon': revizyon, 'teslimat_adi': teslimat_adi})
+
+    # Teslimat türlerine göre grupla
+    kategori_grup = {}
+    for teslimat in teslimatlar:
+        kategori = teslimat.teslim_turu or teslimat.aktivite_turu or 'Diğer'
+        kategori_grup.setdefault(kategori, []).append(teslimat)
+
+    return {
+        'musteri': musteri,
+        'start_date': start_date,
+        'end_date': end_date,
+        'isler': isler,
+        'teslimatlar': teslimatlar,
+        'revizyonlar': revizyonlar,
+        'sosyal_medyalar': sosyal_medyalar,
+        'toplam_saat': round(toplam_dakika / 60, 1),
+        'benzersiz_gunler': len({is_item.tarih for is_item in isler}),
+        'ekip_buyuklugu': len(kisi_istatistik),
+        'tasarim_sayisi': len([t for t in teslimatlar if 'tasarım' in (t.teslim_turu or '').lower() or 'tasarım' in (t.aktivite_turu or '').lower()]),
+        'video_sayisi': len([t for t in teslimatlar if 'video' in (t.teslim_turu or '').lower() or 'video' in (t.aktivite_turu or '').lower()]),
+        'tasarim_revize': sum(1 for r in revizyonlar if r.is_gunlugu_id in tasarim_isleri),
+        'video_revize': sum(1 for r in revizyonlar if r.is_gunlugu_id in video_isleri),
+        'onaylanan': len([t for t in teslimatlar if t.durum == 'Onaylandı']),
+        'yayinlanan_icerikler': yayinlanan_icerikler,
+        'top_kisiler': sorted(kisi_istatistik.items(), key=lambda x: x[1]['is_sayisi'], reverse=True)[:5],
+        'aktivite_dagilimi': [(aktivite, sayi, aktivite_dakika[aktivite]) for aktivite, sayi in aktivite_sayaci.most_common()],
+        'teslimat_satirlari': teslimat_satirlari,
+        'revizyon_satirlari': revizyon_satirlari,
+        'kategori_grup': kategori_grup,
+    }
+
+
+def render_musteri_raporu(veri):
+    """
+    collect_musteri_raporu_verisi çıktısından Word dokümanı oluşturur
+
+    Returns:
+        Document: Word dokümanı
+    """
+    musteri = veri['musteri']
+    start_date, end_date = veri['start_date'], veri['end_date']
+    teslimatlar = veri['teslimatlar']
+    revizyonlar = veri['revizyonlar']
+    toplam_saat = veri['toplam_saat']
+    benzersiz_gunler = veri['benzersiz_gunler']
+    ekip_buyuklugu = veri['ekip_buyuklugu']
+    tasarim_sayisi, video_sayisi = veri['tasarim_sayisi'], veri['video_sayisi']
+    tasarim_revize, video_revize = veri['tasarim_revize'], veri['video_revize']
+    onaylanan = veri['onaylanan']
+    yayinlanan_icerikler = veri['yayinlanan_icerikler']
+    yayinlanan = len(yayinlanan_icerikler)
+
     # Word dokümanı oluştur
     doc = Document()
     
@@ -69,24 +271,6 @@ def generate_musteri_raporu(db, musteri, start_date=None, end_date=None):
     # ===== GENEL ÖZET =====
     add_heading_custom(doc, '📊 Genel Özet', level=1)
     
-    # İş günlüğü verileri
-    isler = db.session.query(IsGunlugu).filter(
-        IsGunlugu.musteri_id == musteri.id,
-        IsGunlugu.tarih >= start_date,
-        IsGunlugu.tarih <= end_date
-    ).all()
-    
-    toplam_dakika = sum([is_item.sure_dakika for is_item in isler])
-    toplam_saat = round(toplam_dakika / 60, 1)
-    is_sayisi = len(isler)
-    
-    # Benzersiz iş günü sayısı
-    benzersiz_gunler = len(set([is_item.tarih for is_item in isler]))
-    
-    # Benzersiz sorumlu kişiler
-    sorumlu_kisiler = set([is_item.sorumlu_kisi for is_item in isler if is_item.sorumlu_kisi])
-    ekip_buyuklugu = len(sorumlu_kisiler)
-    
     # Özet paragraf
     ozet = doc.add_paragraph()
     ozet_text = (
@@ -101,95 +285,26 @@ def generate_musteri_raporu(db, musteri, start_date=None, end_date=None):
     # ===== GENEL GÖSTERGELER TABLOSU =====
     add_heading_custom(doc, '📈 Genel Göstergeler', level=2)
     
-    # Teslimat verileri
-    teslimatlar = db.session.query(Teslimat).filter(
-        Teslimat.musteri_id == musteri.id,
-        Teslimat.teslim_tarihi >= start_date,
-        Teslimat.teslim_tarihi <= end_date
-    ).all()
-    
-    # Teslimat türlerine göre say
-    tasarim_sayisi = len([t for t in teslimatlar if 'tasarım' in (t.teslim_turu or '').lower() or 'tasarım' in (t.aktivite_turu or '').lower()])
-    video_sayisi = len([t for t in teslimatlar if 'video' in (t.teslim_turu or '').lower() or 'video' in (t.aktivite_turu or '').lower()])
-    
-    # Revizyonlar
-    revizyonlar = db.session.query(Revizyon).filter(
-        Revizyon.musteri_id == musteri.id,
-        Revizyon.tarih >= start_date,
-        Revizyon.tarih <= end_date
-    ).all()
-    
-    tasarim_revize = len([r for r in revizyonlar if any(t.id == r.teslimat_id and 'tasarım' in (t.teslim_turu or '').lower() for t in teslimatlar)])
-    video_revize = len([r for r in revizyonlar if any(t.id == r.teslimat_id and 'video' in (t.teslim_turu or '').lower() for t in teslimatlar)])
-    
-    onaylanan = len([t for t in teslimatlar if t.durum == 'Onaylandı'])
-    
-    # Sosyal medya
-    sosyal_medyalar = db.session.query(SosyalMedya).filter(
-        SosyalMedya.musteri_id == musteri.id,
-        SosyalMedya.tarih >= start_date,
-        SosyalMedya.tarih <= end_date
-    ).all()
-    
-    yayinlanan = len([s for s in sosyal_medyalar if s.durum == 'Yayınlandı'])
-    
-    # Tablo oluştur
-    table = doc.add_table(rows=7, cols=2)
-    table.style = 'Light Grid Accent 1'
-    
-    # Başlıklar
-    table.rows[0].cells[0].text = 'Gösterge'
-    table.rows[0].cells[1].text = 'Sonuç'
-    
-    # Veriler
-    table.rows[1].cells[0].text = 'Toplam medya dosyası'
-    table.rows[1].cells[1].text = f"{len(teslimatlar)} ({tasarim_sayisi} tasarım + {video_sayisi} video)"
-    
-    table.rows[2].cells[0].text = 'Toplam revize'
-    table.rows[2].cells[1].text = f"{len(revizyonlar)} ({tasarim_revize} tasarım + {video_revize} video)"
-    
-    table.rows[3].cells[0].text = 'Onaylanan işler'
-    table.rows[3].cells[1].text = str(onaylanan)
-    
-    table.rows[4].cells[0].text = 'Yayınlanan işler'
-    table.rows[4].cells[1].text = str(yayinlanan)
-    
-    table.rows[5].cells[0].text = 'Red edilen'
-    table.rows[5].cells[1].text = "0"
-    
-    table.rows[6].cells[0].text = 'Proje süresi'
-    table.rows[6].cells[1].text = f"{(end_date - start_date).days} gün ({start_date.strftime('%d %b')} – {end_date.strftime('%d %b %Y')})"
+    add_table_bulk(doc, ['Gösterge', 'Sonuç'], [
+        ('Toplam medya dosyası', f"{len(teslimatlar)} ({tasarim_sayisi} tasarım + {video_sayisi} video)"),
+        ('Toplam revize', f"{len(revizyonlar)} ({tasarim_revize} tasarım + {video_revize} video)"),
+        ('Onaylanan işler', onaylanan),
+        ('Yayınlanan işler', yayinlanan),
+        ('Red edilen', "0"),
+        ('Proje süresi', f"{(end_date - start_date).days} gün ({start_date.strftime('%d %b')} – {end_date.strftime('%d %b %Y')})"),
+    ])
     
     doc.add_page_break()
     
     # ===== KİŞİ BAŞI İŞ DAĞILIMI =====
     add_heading_custom(doc, '👥 Kişi Başı İş Dağılımı (Top 5)', level=2)
     
-    # Sorumlu kişilere göre iş sayısı ve süre
-    kisi_istatistik = {}
-    for is_item in isler:
-        if is_item.sorumlu_kisi:
-            if is_item.sorumlu_kisi not in kisi_istatistik:
-                kisi_istatistik[is_item.sorumlu_kisi] = {'is_sayisi': 0, 'toplam_dakika': 0}
-            kisi_istatistik[is_item.sorumlu_kisi]['is_sayisi'] += 1
-            kisi_istatistik[is_item.sorumlu_kisi]['toplam_dakika'] += is_item.sure_dakika
-    
-    # Top 5 kişi
-    top_kisiler = sorted(kisi_istatistik.items(), key=lambda x: x[1]['is_sayisi'], reverse=True)[:5]
-    
+    top_kisiler = veri['top_kisiler']
     if top_kisiler:
-        kisi_table = doc.add_table(rows=len(top_kisiler) + 1, cols=3)
-        kisi_table.style = 'Light Grid Accent 1'
-        
-        # Başlıklar
-        kisi_table.rows[0].cells[0].text = 'İsim'
-        kisi_table.rows[0].cells[1].text = 'İş Sayısı'
-        kisi_table.rows[0].cells[2].text = 'Toplam Saat'
-        
-        for i, (kisi, stats) in enumerate(top_kisiler, 1):
-            kisi_table.rows[i].cells[0].text = kisi
-            kisi_table.rows[i].cells[1].text = str(stats['is_sayisi'])
-            kisi_table.rows[i].cells[2].text = f"{round(stats['toplam_dakika'] / 60, 1)} saat"
+        add_table_bulk(doc, ['İsim', 'İş Sayısı', 'Toplam Saat'], [
+            (kisi, stats['is_sayisi'], f"{round(stats['toplam_dakika'] / 60, 1)} saat")
+            for kisi, stats in top_kisiler
+        ])
     else:
         doc.add_paragraph("Kişi bazlı iş verisi bulunmuyor.")
     
@@ -199,37 +314,17 @@ def generate_musteri_raporu(db, musteri, start_date=None, end_date=None):
     add_heading_custom(doc, '📦 Teslimat Revize & Onay Süreci', level=2)
     
     if teslimatlar:
-        # Tablo oluştur
-        teslimat_table = doc.add_table(rows=len(teslimatlar) + 1, cols=6)
-        teslimat_table.style = 'Light Grid Accent 1'
-        
-        # Başlıklar
-        teslimat_table.rows[0].cells[0].text = 'Dosya Adı'
-        teslimat_table.rows[0].cells[1].text = 'Gönderim Tarihi'
-        teslimat_table.rows[0].cells[2].text = 'Gönderen'
-        teslimat_table.rows[0].cells[3].text = 'Revize Durumu'
-        teslimat_table.rows[0].cells[4].text = 'Onay'
-        teslimat_table.rows[0].cells[5].text = 'Yayın/Paylaşım'
-        
-        for i, teslimat in enumerate(teslimatlar, 1):
-            # Revizyon sayısını hesapla
-            teslimat_revizyonlari = [r for r in revizyonlar if r.teslimat_id == teslimat.id]
-            revize_durumu = f"{len(teslimat_revizyonlari)} Revizyon" if teslimat_revizyonlari else "Revize yok"
-            
-            # Yayın bilgisi - sosyal medyadan kontrol
-            yayin_bilgisi = "-"
-            for sosyal in sosyal_medyalar:
-                if teslimat.baslik and teslimat.baslik.lower() in (sosyal.icerik_basligi or '').lower():
-                    if sosyal.durum == 'Yayınlandı':
-                        yayin_bilgisi = f"{sosyal.platform}'da yayınlandı"
-                        break
-            
-            teslimat_table.rows[i].cells[0].text = teslimat.baslik or 'Başlıksız'
-            teslimat_table.rows[i].cells[1].text = teslimat.teslim_tarihi.strftime('%d.%m.%Y %H:%M') if teslimat.teslim_tarihi else '-'
-            teslimat_table.rows[i].cells[2].text = teslimat.sorumlu_kisi or 'Belirsiz'
-            teslimat_table.rows[i].cells[3].text = revize_durumu
-            teslimat_table.rows[i].cells[4].text = teslimat.durum or 'Bekliyor'
-            teslimat_table.rows[i].cells[5].text = yayin_bilgisi
+        add_table_bulk(doc, ['Dosya Adı', 'Gönderim Tarihi', 'Gönderen', 'Revize Durumu', 'Onay', 'Yayın/Paylaşım'], [
+            (
+                satir['teslimat'].baslik or 'Başlıksız',
+                satir['teslimat'].teslim_tarihi.strftime('%d.%m.%Y %H:%M') if satir['teslimat'].teslim_tarihi else '-',
+                satir['teslimat'].sorumlu_kisi or 'Belirsiz',
+                satir['revize_durumu'],
+                satir['teslimat'].durum or 'Bekliyor',
+                satir['yayin_bilgisi'],
+            )
+            for satir in veri['teslimat_satirlari']
+        ])
     else:
         doc.add_paragraph("Bu dönemde teslimat bulunmuyor.")
     
@@ -239,25 +334,15 @@ def generate_musteri_raporu(db, musteri, start_date=None, end_date=None):
     add_heading_custom(doc, '🔄 Revizyon Durumları', level=2)
     
     if revizyonlar:
-        # Tablo oluştur
-        revizyon_table = doc.add_table(rows=len(revizyonlar) + 1, cols=4)
-        revizyon_table.style = 'Light Grid Accent 1'
-        
-        # Başlıklar
-        revizyon_table.rows[0].cells[0].text = 'Tarih'
-        revizyon_table.rows[0].cells[1].text = 'Dosya/Tasarım'
-        revizyon_table.rows[0].cells[2].text = 'Revize Nedeni'
-        revizyon_table.rows[0].cells[3].text = 'Durum'
-        
-        for i, revizyon in enumerate(revizyonlar, 1):
-            # Teslimat bilgisini bul
-            teslimat = next((t for t in teslimatlar if t.id == revizyon.teslimat_id), None)
-            teslimat_adi = teslimat.baslik if teslimat else f"Teslimat #{revizyon.teslimat_id}"
-            
-            revizyon_table.rows[i].cells[0].text = revizyon.tarih.strftime('%d.%m.%Y')
-            revizyon_table.rows[i].cells[1].text = teslimat_adi
-            revizyon_table.rows[i].cells[2].text = revizyon.revize_konusu[:50] if revizyon.revize_konusu else '-'
-            revizyon_table.rows[i].cells[3].text = revizyon.durum or 'Bekliyor'
+        add_table_bulk(doc, ['Tarih', 'Dosya/Tasarım', 'Revize Nedeni', 'Durum'], [
+            (
+                satir['revizyon'].tarih.strftime('%d.%m.%Y'),
+                satir['teslimat_adi'] or '-',
+                satir['revizyon'].revize_konusu[:50] if satir['revizyon'].revize_konusu else '-',
+                satir['revizyon'].durum or 'Bekliyor',
+            )
+            for satir in veri['revizyon_satirlari']
+        ])
     else:
         doc.add_paragraph("Bu dönemde revizyon bulunmuyor.")
     
@@ -266,48 +351,23 @@ def generate_musteri_raporu(db, musteri, start_date=None, end_date=None):
     # ===== DURUM ÖZETİ TABLOSU =====
     add_heading_custom(doc, '📋 Durum Özeti', level=2)
     
-    durum_table = doc.add_table(rows=5, cols=2)
-    durum_table.style = 'Light Grid Accent 1'
-    
-    durum_table.rows[0].cells[0].text = 'Kategori'
-    durum_table.rows[0].cells[1].text = 'Adet'
-    
-    durum_table.rows[1].cells[0].text = 'Toplam iş üretilen'
-    durum_table.rows[1].cells[1].text = str(len(teslimatlar))
-    
-    durum_table.rows[2].cells[0].text = 'Revize alan'
-    durum_table.rows[2].cells[1].text = str(len(revizyonlar))
-    
-    durum_table.rows[3].cells[0].text = 'Onaylanan'
-    durum_table.rows[3].cells[1].text = str(onaylanan)
-    
-    durum_table.rows[4].cells[0].text = 'Yayınlanan'
-    durum_table.rows[4].cells[1].text = str(yayinlanan)
+    add_table_bulk(doc, ['Kategori', 'Adet'], [
+        ('Toplam iş üretilen', len(teslimatlar)),
+        ('Revize alan', len(revizyonlar)),
+        ('Onaylanan', onaylanan),
+        ('Yayınlanan', yayinlanan),
+    ])
     
     doc.add_paragraph()
     
     # ===== İŞ TİPİ DAĞILIMI =====
     add_heading_custom(doc, '🎨 İş Tipi Dağılımı', level=2)
     
-    aktivite_turleri = [is_item.aktivite_turu for is_item in isler if is_item.aktivite_turu]
-    aktivite_sayaci = Counter(aktivite_turleri)
-    
-    if aktivite_sayaci:
-        # Tablo formatında göster
-        is_tipi_table = doc.add_table(rows=len(aktivite_sayaci) + 1, cols=3)
-        is_tipi_table.style = 'Light Grid Accent 1'
-        
-        # Başlıklar
-        is_tipi_table.rows[0].cells[0].text = 'Aktivite Türü'
-        is_tipi_table.rows[0].cells[1].text = 'İş Sayısı'
-        is_tipi_table.rows[0].cells[2].text = 'Toplam Saat'
-        
-        # Aktivite türüne göre süre hesapla
-        for i, (aktivite, sayi) in enumerate(aktivite_sayaci.most_common(), 1):
-            toplam_dakika_aktivite = sum([is_item.sure_dakika for is_item in isler if is_item.aktivite_turu == aktivite])
-            is_tipi_table.rows[i].cells[0].text = aktivite
-            is_tipi_table.rows[i].cells[1].text = str(sayi)
-            is_tipi_table.rows[i].cells[2].text = f"{round(toplam_dakika_aktivite / 60, 1)} saat"
+    aktivite_dagilimi = veri['aktivite_dagilimi']
+    if aktivite_dagilimi:
+        add_table_bulk(doc, ['Aktivite Türü', 'İş Sayısı', 'Toplam Saat'], [
+            (aktivite, sayi, f"{round(dakika / 60, 1)} saat") for aktivite, sayi, dakika in aktivite_dagilimi
+        ])
     else:
         doc.add_paragraph("İş tipi verisi bulunmuyor.")
     
@@ -317,24 +377,17 @@ def generate_musteri_raporu(db, musteri, start_date=None, end_date=None):
     add_heading_custom(doc, '📅 Teslim Takvimi - Teslimat Çıktıları', level=2)
     
     if teslimatlar:
-        # Tarihe göre grupla
-        from itertools import groupby
         teslimatlar_sorted = sorted(teslimatlar, key=lambda t: t.teslim_tarihi if t.teslim_tarihi else datetime(1900, 1, 1).date())
         
-        teslim_table = doc.add_table(rows=len(teslimatlar) + 1, cols=4)
-        teslim_table.style = 'Light Grid Accent 1'
-        
-        # Başlıklar
-        teslim_table.rows[0].cells[0].text = 'Teslim Tarihi'
-        teslim_table.rows[0].cells[1].text = 'Tür'
-        teslim_table.rows[0].cells[2].text = 'Dosyalar'
-        teslim_table.rows[0].cells[3].text = 'Durum'
-        
-        for i, teslimat in enumerate(teslimatlar_sorted, 1):
-            teslim_table.rows[i].cells[0].text = teslimat.teslim_tarihi.strftime('%d.%m.%Y') if teslimat.teslim_tarihi else '-'
-            teslim_table.rows[i].cells[1].text = teslimat.teslim_turu or teslimat.aktivite_turu or '-'
-            teslim_table.rows[i].cells[2].text = teslimat.baslik or '-'
-            teslim_table.rows[i].cells[3].text = teslimat.durum or 'Bekliyor'
+        add_table_bulk(doc, ['Teslim Tarihi', 'Tür', 'Dosyalar', 'Durum'], [
+            (
+                teslimat.teslim_tarihi.strftime('%d.%m.%Y') if teslimat.teslim_tarihi else '-',
+                teslimat.teslim_turu or teslimat.aktivite_turu or '-',
+                teslimat.baslik or '-',
+                teslimat.durum or 'Bekliyor',
+            )
+            for teslimat in teslimatlar_sorted
+        ])
     else:
         doc.add_paragraph("Teslimat verisi bulunmuyor.")
     
@@ -343,14 +396,7 @@ def generate_musteri_raporu(db, musteri, start_date=None, end_date=None):
     # ===== KATEGORİ BAZLI İÇERİK LİSTESİ =====
     add_heading_custom(doc, '🎨 Kategori Bazlı İçerik Listesi', level=2)
     
-    # Teslimat türlerine göre grupla
-    kategori_grup = {}
-    for teslimat in teslimatlar:
-        kategori = teslimat.teslim_turu or teslimat.aktivite_turu or 'Diğer'
-        if kategori not in kategori_grup:
-            kategori_grup[kategori] = []
-        kategori_grup[kategori].append(teslimat)
-    
+    kategori_grup = veri['kategori_grup']
     if kategori_grup:
         for kategori, items in sorted(kategori_grup.items()):
             doc.add_heading(f"{kategori} ({len(items)} adet)", level=3)
@@ -367,28 +413,19 @@ def generate_musteri_raporu(db, musteri, start_date=None, end_date=None):
     doc.add_paragraph()
     
     # ===== YAYINLANAN İÇERİKLER =====
-    yayinlanan_icerikler = [s for s in sosyal_medyalar if s.durum == 'Yayınlandı']
-    
     if yayinlanan_icerikler:
         add_heading_custom(doc, '🌐 Yayınlanan Grafik İçerikler', level=2)
         
-        # Tablo oluştur
-        yayin_table = doc.add_table(rows=len(yayinlanan_icerikler) + 1, cols=5)
-        yayin_table.style = 'Light Grid Accent 1'
-        
-        # Başlıklar
-        yayin_table.rows[0].cells[0].text = 'Tarih'
-        yayin_table.rows[0].cells[1].text = 'İçerik'
-        yayin_table.rows[0].cells[2].text = 'Platform'
-        yayin_table.rows[0].cells[3].text = 'Görüntülenme'
-        yayin_table.rows[0].cells[4].text = 'Beğeni'
-        
-        for i, sosyal in enumerate(yayinlanan_icerikler, 1):
-            yayin_table.rows[i].cells[0].text = sosyal.tarih.strftime('%d.%m.%Y')
-            yayin_table.rows[i].cells[1].text = f"{sosyal.icerik_basligi} ({sosyal.gonderi_turu})"
-            yayin_table.rows[i].cells[2].text = sosyal.platform
-            yayin_table.rows[i].cells[3].text = str(sosyal.goruntulenme or 0)
-            yayin_table.rows[i].cells[4].text = str(sosyal.begeni or 0)
+        add_table_bulk(doc, ['Tarih', 'İçerik', 'Platform', 'Görüntülenme', 'Beğeni'], [
+            (
+                sosyal.tarih.strftime('%d.%m.%Y'),
+                f"{sosyal.icerik_basligi} ({sosyal.gonderi_turu})",
+                sosyal.platform or '-',
+                sosyal.goruntulenme or 0,
+                sosyal.begeni or 0,
+            )
+            for sosyal in yayinlanan_icerikler
+        ])
         
         doc.add_paragraph()
     
@@ -413,7 +450,7 @@ def generate_musteri_raporu(db, musteri, start_date=None, end_date=None):
     
     # Onay ve yayın
     sonuc.add_run(f"• {onaylanan} tanesi onaylanmış\n")
-    sonuc.add_run(f"• {len(yayinlanan_icerikler)} tanesi dijital yayına gitmiştir\n")
+    sonuc.add_run(f"• {yayinlanan} tanesi dijital yayına gitmiştir\n")
     
     # Çalışma saati
     sonuc.add_run(f"• Toplam {toplam_saat} saat hizmet verilmiştir\n")
@@ -424,13 +461,29 @@ def generate_musteri_raporu(db, musteri, start_date=None, end_date=None):
         sonuc.add_run(f"• {ekip_buyuklugu} kişilik ekip çalışmıştır\n")
     
     # Aktivite yoğunluğu
-    if aktivite_sayaci:
-        en_yogun_aktivite = aktivite_sayaci.most_common(1)[0]
+    if aktivite_dagilimi:
+        en_yogun_aktivite = aktivite_dagilimi[0]
         sonuc.add_run(f"\nAktivite yoğunluğu: {en_yogun_aktivite[0]} ({en_yogun_aktivite[1]} iş)")
     
     return doc
 
 
+def generate_musteri_raporu(db, musteri, start_date=None, end_date=None):
+    """
+    Müşteri için detaylı Word raporu oluşturur
+    
+    Args:
+        db: Database session
+        musteri: Musteri objesi
+        start_date: Başlangıç tarihi
+        end_date: Bitiş tarihi
+    
+    Returns:
+        Document: Word dokümanı
+    """
+    return render_musteri_raporu(collect_musteri_raporu_verisi(db, musteri, start_date, end_date))
+
+
 def save_musteri_raporu(doc, musteri, output_path=None):
     """
     Raporu dosyaya kaydeder
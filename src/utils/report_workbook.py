@@ -0,0 +1,101 @@
+"""
+Rapor çalışma kitabı oluşturucu
+DataFrame'leri sayfa sayfa xlsx'e yazar; sütun genişlikleri yazmadan önce
+kaynak DataFrame'den vektörel olarak hesaplanır (hücreler geri okunmaz)
+
+İki mod vardır:
+    - Normal: pandas ExcelWriter (openpyxl)
+    - write_only: openpyxl write-only modu - satırlar diske akıtılır, bellek
+      sayfa boyutundan bağımsızdır (çok büyük müşteri raporları için)
+"""
+
+import pandas as pd
+
+EN_AZ_GENISLIK = 10
+EN_FAZLA_GENISLIK = 255  # Excel'in kabul ettiği en büyük sütun genişliği
+WRITE_ONLY_PARCA = 5000
+
+
+def column_widths(df, en_az=EN_AZ_GENISLIK):
+    """
+    Her sütun için başlık ve değerlerin en uzun metin uzunluğuna göre genişlik
+
+    Args:
+        df: Sayfaya yazılacak DataFrame
+        en_az: En küçük genişlik
+
+    Returns:
+        list: Sütun sırasıyla genişlikler
+    """
+    genislikler = []
+    for kolon in df.columns:
+        seri = df[kolon].dropna()
+        en_uzun = int(seri.astype(str).str.len().max()) if len(seri) else 0
+        genislik = max(en_uzun, len(str(kolon))) + 2
+        genislikler.append(min(max(genislik, en_az), EN_FAZLA_GENISLIK))
+    return genislikler
+
+
+class ReportWorkbook:
+    """
+    Sayfa sayfa rapor kitabı yazar
+
+    Kullanım:
+        with ReportWorkbook(output, write_only=True) as rapor:
+            rapor.add_sheet('Özet', ozet_df)
+            rapor.add_sheet('İş Günlüğü', is_df)
+
+    hedef dosya yolu ya da yazılabilir bir dosya nesnesidir (BytesIO gibi);
+    kitap close() ile (with bloğu sonunda) kaydedilir.
+    """
+
+    def __init__(self, hedef, write_only=False):
+        self.hedef = hedef
+        self.write_only = write_only
+        if write_only:
+            from openpyxl import Workbook
+            self._kitap = Workbook(write_only=True)
+        else:
+            self._writer = pd.ExcelWriter(hedef, engine='openpyxl')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add_sheet(self, sayfa_adi, df):
+        """DataFrame'i sayfa olarak yazar ve sütun genişliklerini ayarlar"""
+        from openpyxl.utils import get_column_letter
+
+        genislikler = column_widths(df)
+        if self.write_only:
+            sayfa = self._kitap.create_sheet(sayfa_adi)
+            # write-only modunda genişlikler ilk satırdan önce verilmelidir
+            for sira, genislik in enumerate(genislikler, 1):
+                sayfa.column_dimensions[get_column_letter(sira)].width = genislik
+            self._satirlari_yaz(sayfa, df)
+        else:
+            df.to_excel(self._writer, sheet_name=sayfa_adi, index=False)
+            sayfa = self._writer.sheets[sayfa_adi]
+            for sira, genislik in enumerate(genislikler, 1):
+                sayfa.column_dimensions[get_column_letter(sira)].width = genislik
+
+    def _satirlari_yaz(self, sayfa, df):
+        if len(df.columns) == 0:
+            return
+        sayfa.append([str(kolon) for kolon in df.columns])
+        for baslangic in range(0, len(df), WRITE_ONLY_PARCA):
+            parca = df.iloc[baslangic:baslangic + WRITE_ONLY_PARCA].astype(object)
+            parca = parca.where(parca.notna(), None)
+            for satir in parca.itertuples(index=False, name=None):
+                sayfa.append(satir)
+
+    def close(self):
+        """Kitabı hedefe kaydeder"""
+        if self.write_only:
+            if not self._kitap.worksheets:
+                self._kitap.create_sheet('Sayfa1')
+            self._kitap.save(self.hedef)
+        else:
+            self._writer.close()
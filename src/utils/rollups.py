@@ -0,0 +1,177 @@
+"""
+Günlük iş özeti (rollup) modülü
+Dashboard grafikleri için (tarih, müşteri, sorumlu kişi, aktivite türü) bazında
+iş adedi ve süre tutan gunluk_is_ozeti tablosunun bakımı
+"""
+
+from sqlalchemy import event, select, insert, delete, func, inspect
+
+from src.utils.query_cache import bump_table_versions
+
+
+# Rollup satırını etkileyen iş günlüğü alanları
+_ETKILEYEN_ALANLAR = ('tarih', 'musteri_id', 'sorumlu_kisi', 'aktivite_turu', 'sure_dakika')
+
+
+def _gunluk_select(gunler=None):
+    """İş günlüğünden rollup satırlarını üreten GROUP BY sorgusu"""
+    from app import IsGunlugu
+
+    # Anahtar kolonları boş olamaz: müşterisiz iş 0, boş kişi/tür '' olarak tutulur
+    musteri = func.coalesce(IsGunlugu.musteri_id, 0)
+    kisi = func.coalesce(IsGunlugu.sorumlu_kisi, '')
+    tur = func.coalesce(IsGunlugu.aktivite_turu, '')
+
+    sorgu = select(
+        IsGunlugu.tarih, musteri, kisi, tur,
+        func.count(IsGunlugu.id),
+        func.coalesce(func.sum(IsGunlugu.sure_dakika), 0),
+    )
+    if gunler is not None:
+        sorgu = sorgu.where(IsGunlugu.tarih.in_(gunler))
+    return sorgu.group_by(IsGunlugu.tarih, musteri, kisi, tur)
+
+
+def refresh_gunluk_ozet(conn, gunler=None):
+    """
+    Verilen günlerin rollup satırlarını iş günlüğünden yeniden hesaplar
+
+    Gün dilimi ix_is_gunlugu_tarih üzerinden okunduğu için maliyet o günlerdeki
+    iş sayısıyla orantılıdır. Çağıranın transaction'ında çalışır; Core ile
+    yazdığı için gunluk_is_ozeti'nin önbellek sürümünü de artırır.
+
+    Args:
+        conn: SQLAlchemy Connection (ör. db.session.connection())
+        gunler: date listesi (None ise tüm tablo yeniden oluşturulur)
+
+    Returns:
+        int: Yazılan rollup satırı sayısı
+    """
+    from app import GunlukIsOzeti
+
+    if gunler is not None:
+        gunler = sorted({gun for gun in gunler if gun is not None})
+        if not gunler:
+            return 0
+
+    silme = delete(GunlukIsOzeti)
+    if gunler is not None:
+        silme = silme.where(GunlukIsOzeti.tarih.in_(gunler))
+    conn.execute(silme)
+
+    kolonlar = ['tarih', 'musteri_id', 'sorumlu_kisi', 'aktivite_turu', 'is_sayisi', 'toplam_dakika']
+    sonuc = conn.execute(insert(GunlukIsOzeti).from_select(kolonlar, _gunluk_select(gunler)))
+    bump_table_versions(conn, [GunlukIsOzeti.__tablename__])
+    return sonuc.rowcount
+
+
+def rebuild_gunluk_ozet(db, baslangic=None, bitis=None):
+    """
+    Rollup tablosunu (isteğe bağlı tarih aralığında) yeniden oluşturur ve commit eder
+
+    Args:
+        db: Database session
+        baslangic: Başlangıç tarihi (opsiyonel)
+        bitis: Bitiş tarihi (opsiyonel)
+
+    Returns:
+        int: Yazılan rollup satırı sayısı
+    """
+    from app import IsGunlugu, GunlukIsOzeti
+
+    conn = db.session.connection()
+    if baslangic is None and bitis is None:
+        adet = refresh_gunluk_ozet(conn)
+    else:
+        # Aralıkta artık işi kalmamış günlerin satırları da silinmeli
+        gunler = set()
+        for kolon in (IsGunlugu.tarih, GunlukIsOzeti.tarih):
+            sorgu = select(kolon).distinct()
+            if baslangic:
+                sorgu = sorgu.where(kolon >= baslangic)
+            if bitis:
+                sorgu = sorgu.where(kolon <= bitis)
+            gunler.update(conn.execute(sorgu).scalars())
+        adet = refresh_gunluk_ozet(conn, gunler)
+
+    db.session.commit()
+    return adet
+
+
+def check_gunluk_ozet(db):
+    """
+    Rollup tablosunu ham iş günlüğü ile karşılaştırır
+
+    Args:
+        db: Database session
+
+    Returns:
+        list: Tutarsız anahtarlar [{'anahtar': (tarih, musteri_id, kisi, tur),
+              'beklenen': (adet, dakika), 'rollup': (adet, dakika)}, ...]
+    """
+    from app import GunlukIsOzeti
+
+    beklenen = {satir[:4]: tuple(satir[4:]) for satir in db.session.execute(_gunluk_select())}
+    rollup = {satir[:4]: tuple(satir[4:]) for satir in db.session.execute(select(
+        GunlukIsOzeti.tarih, GunlukIsOzeti.musteri_id, GunlukIsOzeti.sorumlu_kisi,
+        GunlukIsOzeti.aktivite_turu, GunlukIsOzeti.is_sayisi, GunlukIsOzeti.toplam_dakika
+    ))}
+
+    farklar = []
+    for anahtar in sorted(beklenen.keys() | rollup.keys(), key=str):
+        if beklenen.get(anahtar) != rollup.get(anahtar):
+            farklar.append({
+                'anahtar': anahtar,
+                'beklenen': beklenen.get(anahtar),
+                'rollup': rollup.get(anahtar)
+            })
+    return farklar
+
+
+def _etkilenen_gunler(session):
+    """Flush edilen iş günlüğü kayıtlarının (eski ve yeni) tarihlerini toplar"""
+    from app import IsGunlugu
+
+    gunler = set()
+    for nesne in session.new:
+        if isinstance(nesne, IsGunlugu):
+            gunler.add(nesne.tarih)
+
+    for nesne in session.deleted:
+        if isinstance(nesne, IsGunlugu):
+            gunler.add(nesne.tarih)
+
+    for nesne in session.dirty:
+        if not isinstance(nesne, IsGunlugu):
+            continue
+        durum = inspect(nesne)
+        if not any(durum.attrs[alan].history.has_changes() for alan in _ETKILEYEN_ALANLAR):
+            continue
+        gunler.add(nesne.tarih)
+        # Tarihi değişen işin eski günü de yeniden hesaplanır
+        gunler.update(durum.attrs.tarih.history.deleted or ())
+
+    gunler.discard(None)
+    return gunler
+
+
+def register_rollup_listeners(session):
+    """
+    İş günlüğü flush'larında etkilenen günlerin rollup satırlarını günceller
+
+    Güncelleme after_flush içinde, yazma ile aynı transaction'da yapılır.
+    Toplu Core DELETE/UPDATE'ler flush'tan geçmediği için
+    refresh_gunluk_ozet'i kendileri çağırmalıdır.
+
+    Args:
+        session: db.session (scoped_session)
+    """
+    if event.contains(session, 'after_flush', _after_flush):
+        return
+    event.listen(session, 'after_flush', _after_flush)
+
+
+def _after_flush(session, flush_context):
+    gunler = _etkilenen_gunler(session)
+    if gunler:
+        refresh_gunluk_ozet(session.connection(), gunler)
@@ -0,0 +1,212 @@
+"""
+Tam metin arama modülü (SQLite FTS5)
+İş açıklamaları, revizyon konuları, arama (telefon) notları ve müşteri notları
+tek bir FTS5 indeksinde tutulur; indeks tablo tetikleyicileriyle güncel kalır.
+
+Türkçe büyük/küçük harf: SQLite'ın unicode61 tokenizer'ı I'yı i'ye çevirir
+ama ı ve İ'yı tanımaz. Bu yüzden indekse yazarken ve sorguda İ, I, ı ve i
+aynı harfe ('i') indirgenir; remove_diacritics 2 ile ş/ğ/ç/ö/ü de s/g/c/o/u
+olarak eşleşir ("isik" araması "IŞIK" kaydını bulur).
+"""
+
+import re
+from markupsafe import escape
+from sqlalchemy import text, bindparam
+
+
+INDEKS_TABLOSU = 'metin_indeksi'
+
+# kaynak: (rowid kodu, tablo, başlık kolonu, metin kolonu, müşteri kolonu)
+# FTS rowid = kayit_id * 10 + kod; tetikleyiciler satırı rowid ile bulur
+KAYNAKLAR = {
+    'is_gunlugu': (1, 'is_gunlugu', 'is_kodu', 'aciklama', 'musteri_id'),
+    'revizyon': (2, 'revizyon', 'baslik', 'revize_konusu', 'musteri_id'),
+    'arama': (3, 'arama', 'konu', 'notlar', 'musteri_id'),
+    'musteri': (4, 'musteri', 'ad', 'notlar', 'id'),
+}
+
+_VURGU_BASI = '\x02'
+_VURGU_SONU = '\x03'
+_KELIME = re.compile(r'\w+', re.UNICODE)
+
+
+def tr_fold(metin):
+    """İ, I, ı harflerini 'i'ye indirger (karakter sayısı değişmez)"""
+    if not metin:
+        return ''
+    return metin.replace('İ', 'i').replace('I', 'i').replace('ı', 'i')
+
+
+def _sql_fold(ifade):
+    """tr_fold'un tetikleyicilerde kullanılan SQL karşılığı"""
+    return f"replace(replace(replace(COALESCE({ifade}, ''), 'İ', 'i'), 'I', 'i'), 'ı', 'i')"
+
+
+def create_search_index(conn):
+    """
+    FTS5 indeks tablosunu ve senkronizasyon tetikleyicilerini oluşturur,
+    mevcut kayıtları indekse yükler (migration adımı)
+
+    Args:
+        conn: SQLAlchemy Connection
+
+    Returns:
+        bool: İndeks oluşturulduysa True; veritabanı SQLite değilse veya
+              SQLite FTS5 desteğiyle derlenmemişse False
+    """
+    if conn.dialect.name != 'sqlite':
+        return False
+    derleme = {satir[0] for satir in conn.exec_driver_sql('PRAGMA compile_options')}
+    if 'ENABLE_FTS5' not in derleme:
+        return False
+
+    conn.exec_driver_sql(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {INDEKS_TABLOSU} USING fts5('
+        'baslik, metin, kaynak UNINDEXED, kayit_id UNINDEXED, musteri_id UNINDEXED, '
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+
+    for kaynak, (kod, tablo, baslik, metin, musteri) in KAYNAKLAR.items():
+        def satir(ref):
+            return (f"{ref}.id * 10 + {kod}, {_sql_fold(f'{ref}.{baslik}')}, {_sql_fold(f'{ref}.{metin}')}, "
+                    f"'{kaynak}', {ref}.id, {ref}.{musteri}")
+
+        kolonlar = 'rowid, baslik, metin, kaynak, kayit_id, musteri_id'
+        ekle = f'INSERT INTO {INDEKS_TABLOSU} ({kolonlar}) VALUES ({satir("NEW")});'
+        sil = f'DELETE FROM {INDEKS_TABLOSU} WHERE rowid = OLD.id * 10 + {kod};'
+
+        conn.exec_driver_sql(f'DROP TRIGGER IF EXISTS {tablo}_fts_ekle')
+        conn.exec_driver_sql(f'DROP TRIGGER IF EXISTS {tablo}_fts_guncelle')
+        conn.exec_driver_sql(f'DROP TRIGGER IF EXISTS {tablo}_fts_sil')
+        conn.exec_driver_sql(f'CREATE TRIGGER {tablo}_fts_ekle AFTER INSERT ON {tablo} BEGIN {ekle} END')
+        conn.exec_driver_sql(
+            f'CREATE TRIGGER {tablo}_fts_guncelle AFTER UPDATE OF {baslik}, {metin}, {musteri} ON {tablo} '
+            f'BEGIN {sil} {ekle} END'
+        )
+        conn.exec_driver_sql(f'CREATE TRIGGER {tablo}_fts_sil AFTER DELETE ON {tablo} BEGIN {sil} END')
+
+        conn.exec_driver_sql(f'DELETE FROM {INDEKS_TABLOSU} WHERE kaynak = ?', (kaynak,))
+        conn.exec_driver_sql(
+            f'INSERT INTO {INDEKS_TABLOSU} ({kolonlar}) SELECT {satir(tablo)} FROM {tablo}'
+        )
+    return True
+
+
+def search_index_available(db):
+    """Metin indeksi tablosu veritabanında var mı"""
+    return db.session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :ad"),
+        {'ad': INDEKS_TABLOSU}
+    ).first() is not None
+
+
+def build_match_query(sorgu):
+    """
+    Kullanıcı girdisini güvenli bir FTS5 MATCH ifadesine çevirir
+
+    Her kelime tırnak içinde önek araması olur ve kelimeler AND ile bağlanır;
+    böylece FTS5 operatörleri ve tırnaklar sözdizimi hatası üretmez.
+
+    Returns:
+        str veya None (aranacak kelime yoksa)
+    """
+    kelimeler = _KELIME.findall(tr_fold(sorgu or '').lower())
+    if not kelimeler:
+        return None
+    return ' '.join(f'"{kelime}"*' for kelime in kelimeler[:10])
+
+
+def _orijinale_uygula(vurgulu, orijinal):
+    """
+    Katlanmış metin üzerindeki vurgu işaretlerini orijinal metne taşır
+
+    tr_fold karakter sayısını değiştirmediği için işaretler dışındaki
+    karakterler birebir eşleşir.
+    """
+    sonuc = []
+    i = 0
+    for karakter in vurgulu:
+        if karakter in (_VURGU_BASI, _VURGU_SONU):
+            sonuc.append(karakter)
+        else:
+            sonuc.append(orijinal[i] if i < len(orijinal) else karakter)
+            i += 1
+    return ''.join(sonuc)
+
+
+def _snippet(vurgulu, orijinal, pencere=80):
+    """İlk eşleşme etrafında kısa, HTML-güvenli ve <mark>'lı bir özet üretir"""
+    metin = _orijinale_uygula(vurgulu, orijinal or '')
+    ilk = metin.find(_VURGU_BASI)
+    if ilk == -1:
+        ilk = 0
+    bas = max(0, ilk - pencere // 2)
+    son = min(len(metin), bas + pencere)
+    parca = metin[bas:son]
+
+    # Pencere sonunda kesilen vurgunun kapanış işaretini tamamla
+    if parca.count(_VURGU_BASI) > parca.count(_VURGU_SONU):
+        parca += _VURGU_SONU
+
+    html = str(escape(parca)).replace(_VURGU_BASI, '<mark>').replace(_VURGU_SONU, '</mark>')
+    return ('…' if bas > 0 else '') + html + ('…' if son < len(metin) else '')
+
+
+def search(db, sorgu, limit=20, kaynak=None, musteri_id=None):
+    """
+    Metin indeksinde sıralı (bm25) arama yapar
+
+    Args:
+        db: Database session
+        sorgu: Kullanıcının arama metni
+        limit: En fazla sonuç sayısı
+        kaynak: Sadece bu kaynakta ara ('is_gunlugu', 'revizyon', 'arama', 'musteri')
+        musteri_id: Sadece bu müşterinin kayıtları
+
+    Returns:
+        list: [{'kaynak', 'id', 'musteri_id', 'baslik', 'snippet', 'skor'}, ...]
+    """
+    ifade = build_match_query(sorgu)
+    if not ifade:
+        return []
+
+    kosullar = [f'{INDEKS_TABLOSU} MATCH :ifade']
+    params = {'ifade': ifade, 'limit': limit, 'bas': _VURGU_BASI, 'son': _VURGU_SONU}
+    if kaynak in KAYNAKLAR:
+        kosullar.append('kaynak = :kaynak')
+        params['kaynak'] = kaynak
+    if musteri_id:
+        kosullar.append('musteri_id = :musteri_id')
+        params['musteri_id'] = musteri_id
+
+    # Başlıktaki eşleşme metindekinden iki kat ağırlıklı
+    satirlar = db.session.execute(text(
+        f'SELECT kaynak, kayit_id, musteri_id, '
+        f'highlight({INDEKS_TABLOSU}, 0, :bas, :son), highlight({INDEKS_TABLOSU}, 1, :bas, :son), '
+        f'bm25({INDEKS_TABLOSU}, 2.0, 1.0) AS skor '
+        f'FROM {INDEKS_TABLOSU} WHERE {" AND ".join(kosullar)} ORDER BY skor LIMIT :limit'
+    ), params).all()
+
+    # Özetler orijinal (katlanmamış) metinden üretilir: kaynak başına tek sorgu
+    orijinaller = {}
+    for kaynak_adi in {satir[0] for satir in satirlar}:
+        _, tablo, baslik, metin, _ = KAYNAKLAR[kaynak_adi]
+        idler = [satir[1] for satir in satirlar if satir[0] == kaynak_adi]
+        for kayit_id, baslik_degeri, metin_degeri in db.session.execute(
+            text(f'SELECT id, {baslik}, {metin} FROM {tablo} WHERE id IN :idler')
+            .bindparams(bindparam('idler', expanding=True)), {'idler': idler}
+        ):
+            orijinaller[(kaynak_adi, kayit_id)] = (baslik_degeri or '', metin_degeri or '')
+
+    sonuclar = []
+    for kaynak_adi, kayit_id, musteri, baslik_vurgulu, metin_vurgulu, skor in satirlar:
+        baslik_orj, metin_orj = orijinaller.get((kaynak_adi, kayit_id), ('', ''))
+        sonuclar.append({
+            'kaynak': kaynak_adi,
+            'id': kayit_id,
+            'musteri_id': musteri,
+            'baslik': _snippet(baslik_vurgulu, baslik_orj, pencere=120),
+            'snippet': _snippet(metin_vurgulu, metin_orj),
+            'skor': round(-skor, 3),
+        })
+    return sonuclar
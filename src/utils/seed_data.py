@@ -0,0 +1,274 @@
+"""
+Sentetik veri üretici
+Ölçek testleri için altı ana modelde (müşteri, iş günlüğü, teslimat, sosyal
+medya, revizyon, arama) tohumlu rastgele, gerçekçi veri üretir:
+
+- Müşteri başına iş sayısı çarpık (Zipf): ilk birkaç müşteri verinin büyük
+  kısmını alır, MST001 en büyük müşteridir
+- Tarihler son `gun` güne yayılır, yakın tarihler daha yoğundur
+- İşlerin bir kısmında revizyon zinciri (Revizyon 1, 2, ...) vardır;
+  onaylanan işlere revizyon_onayla'daki gibi otomatik teslimat,
+  yayınlanan sosyal medya işlerine gönderi kaydı eklenir
+- Aynı tohum aynı veriyi üretir
+
+Satırlar ORM yerine Core toplu INSERT ile parça parça yazılır; oturum
+dinleyicileri çalışmadığı için musteri_ozet, gunluk_is_ozeti, kod
+sayaçları ve sorgu önbelleği tablo sürümleri sonda toplu olarak güncellenir.
+"""
+
+import random
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from src.utils.query_cache import bump_table_versions, SURUM_ONEKI
+
+
+PARCA_BOYUTU = 5000
+AKTIVITELER = ['Tasarım', 'Sosyal Medya', 'Video', 'Çekim', 'Edit', 'Yazısal', 'Fotoğraf', 'Planlama',
+               'Toplantı', 'Diğer']
+AKTIVITE_AGIRLIKLARI = [26, 22, 10, 7, 7, 10, 6, 6, 4, 2]
+SEKTORLER = ['Gıda', 'Tekstil', 'Otomotiv', 'Sağlık', 'Eğitim', 'Turizm', 'Yapı', 'Enerji', 'Perakende',
+             'Finans', 'Mobilya', 'Kozmetik']
+FIRMA_ONEKLERI = ['Anadolu', 'Ege', 'Marmara', 'Yıldız', 'Doğa', 'Kuzey', 'Mavi', 'Altın', 'Yeşil', 'Güneş',
+                  'Atlas', 'Zirve', 'Defne', 'Çınar', 'Liman', 'Kartal']
+ADLAR = ['Ayşe', 'Mehmet', 'Zeynep', 'Can', 'Elif', 'Burak', 'Selin', 'Emre', 'Deniz', 'İrem', 'Oğuz', 'Ece',
+         'Kaan', 'Şule', 'Umut', 'Gizem', 'Barış', 'Nazlı', 'Onur', 'Ceren']
+SOYADLAR = ['Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Aydın', 'Öztürk', 'Arslan', 'Doğan', 'Koç']
+KAMPANYALAR = ['Yaz Kampanyası', 'Lansman', 'Kurumsal Kimlik', 'Bayram', 'Web Sitesi', 'Katalog', 'Fuar',
+               'Yılbaşı', 'Marka Yenileme', 'Okula Dönüş']
+PLATFORMLAR = ['Instagram', 'Facebook', 'LinkedIn', 'TikTok', 'YouTube', 'Twitter']
+GONDERI_TURLERI = ['Post', 'Reels', 'Story', 'Video', 'Fotoğraf']
+REVIZE_KONULARI = ['Renkler değişsin', 'Logo büyütülsün', 'Metin kısaltılsın', 'Görsel değişsin',
+                   'Yazım hatası düzeltilsin', 'Müzik değişsin', 'Font değişsin', 'Fiyat bilgisi eklensin']
+ARAMA_KONULARI = ['Aylık rapor', 'Yeni kampanya talebi', 'Fatura', 'Revize görüşmesi', 'Toplantı planı',
+                  'İçerik onayı', 'Bütçe']
+ARAMA_SONUCLARI = ['Tamamlandı', 'Geri Dönülecek', 'Olumsuz', 'Bekliyor']
+
+# Sırayla silinecek tablolar (çocuktan ebeveyne)
+TABLOLAR = ['sosyal_medya', 'revizyon', 'teslimat', 'arama', 'rapor_isi', 'is_gunlugu', 'musteri_ozet',
+            'gunluk_is_ozeti', 'musteri']
+# Üretilen satırların tabloları (önbellek sürümleri artırılır)
+URETILEN_TABLOLAR = ['musteri', 'is_gunlugu', 'teslimat', 'revizyon', 'sosyal_medya', 'arama']
+
+
+def dagit(toplam, musteri_sayisi, carpiklik):
+    """
+    Toplamı Zipf ağırlıklarıyla müşterilere dağıtır (en büyük kalan yöntemi)
+
+    Returns:
+        list: Müşteri başına adet (azalan sırada, toplamı `toplam`)
+    """
+    agirliklar = [1 / (i + 1) ** carpiklik for i in range(musteri_sayisi)]
+    toplam_agirlik = sum(agirliklar)
+    paylar = [toplam * a / toplam_agirlik for a in agirliklar]
+    adetler = [int(p) for p in paylar]
+    kalanlar = sorted(range(musteri_sayisi), key=lambda i: paylar[i] - adetler[i], reverse=True)
+    for i in kalanlar[:toplam - sum(adetler)]:
+        adetler[i] += 1
+    return adetler
+
+
+def _musteri(rastgele, numara, bugun):
+    ad = f"{rastgele.choice(FIRMA_ONEKLERI)} {rastgele.choice(SEKTORLER)} {numara}"
+    kisi = f'{rastgele.choice(ADLAR)} {rastgele.choice(SOYADLAR)}'
+    return {
+        'id': numara,
+        'musteri_kodu': f'MST{numara:03d}',
+        'ad': ad,
+        'sektor': rastgele.choice(SEKTORLER),
+        'sozlesme_baslangic': bugun - timedelta(days=rastgele.randrange(30, 1500)),
+        'aylik_ucret': float(rastgele.randrange(10, 200) * 500),
+        'ilgil_kisi': kisi,
+        'telefon': f'05{rastgele.randrange(30, 60)}{rastgele.randrange(1000000, 9999999)}',
+        'email': f'iletisim{numara}@ornek.com',
+        'notlar': f'{ad} için sentetik kayıt',
+    }
+
+
+def _tarih(rastgele, bugun, gun):
+    """Son `gun` gün içinde, yakın tarihlere ağırlıklı"""
+    return bugun - timedelta(days=int(gun * rastgele.random() ** 1.6))
+
+
+def _is_durumu(rastgele, yas):
+    """Eski işler çoğunlukla onaylanmış, yeni işler karışık"""
+    if yas > 30 or rastgele.random() < 0.5:
+        return 'Onaylandı' if rastgele.random() < 0.94 else rastgele.choice(['Reddedildi', 'Bekliyor'])
+    return rastgele.choice(['Bekliyor', 'Bekliyor', 'Revizede', 'Onayda'])
+
+
+def generate_seed_data(db, musteri_sayisi=50, is_sayisi=20000, gun=365, tohum=42, carpiklik=1.1,
+                       ilerleme=None):
+    """
+    Boş veritabanına sentetik veri yazar
+
+    Args:
+        db: Database session
+        musteri_sayisi: Müşteri adedi
+        is_sayisi: Toplam iş günlüğü satırı (müşterilere Zipf ile dağıtılır)
+        gun: Kayıtların yayılacağı geçmiş gün sayısı
+        tohum: Rastgele üretici tohumu
+        carpiklik: Zipf üssü (büyüdükçe ilk müşteriler daha baskın)
+        ilerleme: İsteğe bağlı ilerleme(yuzde, mesaj) fonksiyonu
+
+    Returns:
+        dict: Tablo başına yazılan satır sayısı
+    """
+    from app import Musteri, IsGunlugu, Teslimat, SosyalMedya, Revizyon, Arama
+    from src.utils.customer_summary import rebuild_musteri_ozet
+    from src.utils.rollups import rebuild_gunluk_ozet
+
+    rastgele = random.Random(tohum)
+    bugun = date.today()
+    ekip = [f'{ad} {soyad}' for ad, soyad in zip(ADLAR, SOYADLAR * 2)]
+    ekip_agirliklari = [1 / (i + 1) ** 0.7 for i in range(len(ekip))]
+    sayilar = {'musteri': 0, 'is_gunlugu': 0, 'teslimat': 0, 'sosyal_medya': 0, 'revizyon': 0, 'arama': 0}
+    tablolar = {
+        'is_gunlugu': IsGunlugu.__table__, 'teslimat': Teslimat.__table__, 'sosyal_medya': SosyalMedya.__table__,
+        'revizyon': Revizyon.__table__, 'arama': Arama.__table__,
+    }
+    bekleyen = {ad: [] for ad in tablolar}
+
+    def bosalt(conn, hepsi=False):
+        # Bir tablo dolunca hepsi yazılır: çocuk satırların işleri önce eklenmiş olmalı
+        if not hepsi and all(len(satirlar) < PARCA_BOYUTU for satirlar in bekleyen.values()):
+            return
+        for ad, satirlar in bekleyen.items():
+            if satirlar:
+                conn.execute(tablolar[ad].insert(), satirlar)
+                sayilar[ad] += len(satirlar)
+                satirlar.clear()
+
+    musteriler = [_musteri(rastgele, numara, bugun) for numara in range(1, musteri_sayisi + 1)]
+    is_adetleri = dagit(is_sayisi, musteri_sayisi, carpiklik)
+    is_id = teslimat_id = 0
+    sayaclar = [{'kapsam': 'musteri', 'deger': musteri_sayisi}]
+
+    with db.engine.begin() as conn:
+        conn.execute(Musteri.__table__.insert(), musteriler)
+        sayilar['musteri'] = len(musteriler)
+
+        for sira, (musteri, adet) in enumerate(zip(musteriler, is_adetleri)):
+            kod = musteri['musteri_kodu']
+            projeler = [f"{musteri['ad'].split()[0]} {k}" for k in rastgele.sample(KAMPANYALAR, rastgele.randint(2, 6))]
+            teslimat_no = 0
+            for no in range(1, adet + 1):
+                is_id += 1
+                tarih = _tarih(rastgele, bugun, gun)
+                aktivite = rastgele.choices(AKTIVITELER, AKTIVITE_AGIRLIKLARI)[0]
+                proje = rastgele.choice(projeler)
+                sorumlu = rastgele.choices(ekip, ekip_agirliklari)[0]
+                durum = _is_durumu(rastgele, (bugun - tarih).days)
+                aciklama = f'{proje} - {aktivite} #{no}'
+
+                # Revizyon zinciri: işlerin ~%35'i, uzunluk geometrik (en fazla 6)
+                revizyon_sayisi = 0
+                if rastgele.random() < 0.35:
+                    revizyon_sayisi = 1
+                    while revizyon_sayisi < 6 and rastgele.random() < 0.45:
+                        revizyon_sayisi += 1
+                if durum == 'Revizede' and not revizyon_sayisi:
+                    revizyon_sayisi = 1
+                rev_tarih = tarih
+                for numara in range(1, revizyon_sayisi + 1):
+                    rev_tarih = min(bugun, rev_tarih + timedelta(days=rastgele.randint(1, 4)))
+                    son_bekliyor = durum == 'Revizede' and numara == revizyon_sayisi
+                    bekleyen['revizyon'].append({
+                        'tarih': rev_tarih, 'musteri_id': musteri['id'], 'is_gunlugu_id': is_id,
+                        'revizyon_numarasi': numara, 'baslik': f'Revizyon {numara}',
+                        'revize_talep_eden': musteri['ilgil_kisi'], 'revize_konusu': rastgele.choice(REVIZE_KONULARI),
+                        'ne_yapildi': None if son_bekliyor else 'Talep uygulandı',
+                        'durum': 'Bekliyor' if son_bekliyor else 'Onaylandı',
+                    })
+
+                bekleyen['is_gunlugu'].append({
+                    'id': is_id, 'is_kodu': f'{kod}-IS{no:03d}', 'tarih': tarih, 'musteri_id': musteri['id'],
+                    'proje': proje, 'aktivite_turu': aktivite, 'aciklama': aciklama, 'sorumlu_kisi': sorumlu,
+                    'sure_dakika': max(15, min(600, round(rastgele.lognormvariate(4.2, 0.6) / 15) * 15)),
+                    'etiketler': f'{aktivite.lower()},{proje.split()[-1].lower()}', 'durum': durum,
+                    'revizyon_sayisi': revizyon_sayisi,
+                    'ne_yapildi': 'Tamamlandı' if durum == 'Onaylandı' and not revizyon_sayisi else None,
+                })
+
+                # Onaylanan işe otomatik teslimat (revizyon_onayla ile aynı alanlar)
+                if durum == 'Onaylandı':
+                    teslimat_id += 1
+                    teslimat_no += 1
+                    sosyal = aktivite == 'Sosyal Medya'
+                    platform = rastgele.choice(PLATFORMLAR) if sosyal else None
+                    gonderi_turu = rastgele.choice(GONDERI_TURLERI) if sosyal else None
+                    goruntulenme = int(rastgele.paretovariate(1.3) * 300) if sosyal else None
+                    begeni = int(goruntulenme * rastgele.uniform(0.02, 0.12)) if sosyal else None
+                    etkilesim = {
+                        'goruntulenme': goruntulenme, 'begeni': begeni,
+                        'yorum': begeni // 12 if sosyal else None, 'paylasim': begeni // 20 if sosyal else None,
+                        'etkileşim': begeni + begeni // 12 + begeni // 20 if sosyal else None,
+                    }
+                    teslim_tarihi = min(bugun, rev_tarih + timedelta(days=rastgele.randint(0, 3)))
+                    bekleyen['teslimat'].append({
+                        'id': teslimat_id, 'teslimat_kodu': f'TSL{kod}{teslimat_no:03d}', 'musteri_id': musteri['id'],
+                        'is_gunlugu_id': is_id, 'aktivite_turu': aktivite, 'proje': proje,
+                        'teslim_turu': 'Sosyal Medya' if sosyal else rastgele.choice(['Konvensiyonel', 'Diğer']),
+                        'baslik': aciklama, 'sorumlu_kisi': sorumlu, 'olusturma_tarihi': tarih,
+                        'teslim_tarihi': teslim_tarihi,
+                        'durum': 'Tamamlandı' if rastgele.random() < 0.85 else 'Teslim Edildi',
+                        'aciklama': f'İş Kodu: {kod}-IS{no:03d} - Otomatik oluşturuldu',
+                        'platform': platform, 'gonderi_turu': gonderi_turu, **etkilesim,
+                    })
+                    if sosyal:
+                        bekleyen['sosyal_medya'].append({
+                            'tarih': teslim_tarihi, 'musteri_id': musteri['id'], 'is_gunlugu_id': is_id,
+                            'platform': platform, 'icerik_basligi': aciklama, 'gonderi_turu': gonderi_turu,
+                            **etkilesim,
+                            'durum': 'Yayınlandı' if rastgele.random() < 0.85 else 'Planlandı',
+                        })
+                bosalt(conn)
+
+            # Müşteri aramaları: iş hacmiyle orantılı (en az 1)
+            for _ in range(max(1, adet // 15)):
+                arama_tarihi = _tarih(rastgele, bugun, gun)
+                sonuc = rastgele.choice(ARAMA_SONUCLARI)
+                bekleyen['arama'].append({
+                    'tarih': arama_tarihi, 'musteri_id': musteri['id'], 'arayan_aranan': musteri['ilgil_kisi'],
+                    'konu': rastgele.choice(ARAMA_KONULARI), 'sonuc': sonuc,
+                    'sorumlu_kisi': rastgele.choices(ekip, ekip_agirliklari)[0], 'notlar': 'Sentetik görüşme notu',
+                    'geri_donus_tarihi': arama_tarihi + timedelta(days=rastgele.randint(1, 10))
+                    if sonuc == 'Geri Dönülecek' else None,
+                    'durum': 'Tamamlandı' if sonuc != 'Geri Dönülecek' else 'Bekliyor',
+                })
+            sayaclar.append({'kapsam': f"is:{musteri['id']}", 'deger': adet})
+            sayaclar.append({'kapsam': f"teslimat:{musteri['id']}", 'deger': teslimat_no})
+            if ilerleme:
+                ilerleme(int((sira + 1) * 90 / musteri_sayisi), f'{kod}: {adet} iş')
+
+        bosalt(conn, hepsi=True)
+        conn.execute(text('INSERT INTO sayac (kapsam, deger) VALUES (:kapsam, :deger)'), sayaclar)
+        # Toplu INSERT'ler flush'tan geçmediği için önbellek sürümleri burada artırılır
+        bump_table_versions(conn, URETILEN_TABLOLAR)
+
+    if ilerleme:
+        ilerleme(95, 'Özet tabloları oluşturuluyor')
+    rebuild_musteri_ozet(db)
+    rebuild_gunluk_ozet(db)
+    return sayilar
+
+
+def clear_data(db):
+    """
+    Üretici tablolarını, özet tablolarını ve kod sayaçlarını boşaltır
+
+    Sorgu önbelleğinin tablo sürümleri (sayac'taki 'tablo:' satırları)
+    silinmez, artırılır: sıfırlansalar çalışan süreçler eski önbellek
+    girdilerini sunmaya devam eder.
+    """
+    with db.engine.begin() as conn:
+        for tablo in TABLOLAR:
+            conn.execute(text(f'DELETE FROM {tablo}'))
+        conn.execute(text('DELETE FROM sayac WHERE kapsam NOT LIKE :onek'), {'onek': f'{SURUM_ONEKI}%'})
+        bump_table_versions(conn, TABLOLAR)
+
+
+def has_data(db):
+    """Veritabanında müşteri kaydı var mı"""
+    return db.session.execute(text('SELECT 1 FROM musteri LIMIT 1')).first() is not None
@@ -0,0 +1,140 @@
+"""
+Sıra sayacı modülü
+Müşteri, iş ve teslimat kodları için kapsam başına atomik sayaçlar
+"""
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+
+def next_value(db, kapsam, baslangic=0):
+    """
+    Kapsamın sayacını bir artırır ve yeni değeri döndürür
+
+    Artırma, çağıranın açık transaction'ı içinde tek bir UPDATE ile yapılır.
+    UPDATE satır kilidini (SQLite'ta yazma kilidini) aldığı için eşzamanlı
+    işlemler sırayla ilerler; ekleme geri alınırsa sayaç da geri alınır.
+
+    Args:
+        db: Database session
+        kapsam: Sayaç anahtarı (ör. 'musteri', 'is:5', 'teslimat:5')
+        baslangic: Sayaç ilk kez oluşturulurken kullanılacak mevcut son değer
+                   (int veya int döndüren fonksiyon)
+
+    Returns:
+        int: Kapsam için yeni sıra numarası
+    """
+    return reserve_values(db, kapsam, 1, baslangic).start
+
+
+def reserve_values(db, kapsam, adet, baslangic=0):
+    """
+    Kapsamın sayacını adet kadar artırarak ardışık bir numara bloğu ayırır
+
+    Toplu eklemelerde satır başına bir UPDATE yerine tek UPDATE çalışır.
+    Kilitleme ve geri alma davranışı next_value ile aynıdır.
+
+    Args:
+        db: Database session
+        kapsam: Sayaç anahtarı
+        adet: Ayrılacak numara sayısı
+        baslangic: Sayaç ilk kez oluşturulurken kullanılacak mevcut son değer
+                   (int veya int döndüren fonksiyon)
+
+    Returns:
+        range: Ayrılan numaralar (adet 0 ise boş)
+    """
+    if adet <= 0:
+        return range(0)
+
+    params = {'kapsam': kapsam, 'adet': adet}
+    guncellenen = db.session.execute(
+        text('UPDATE sayac SET deger = deger + :adet WHERE kapsam = :kapsam'), params
+    ).rowcount
+
+    if not guncellenen:
+        ilk_deger = (baslangic() if callable(baslangic) else baslangic) or 0
+        try:
+            with db.session.begin_nested():
+                db.session.execute(
+                    text('INSERT INTO sayac (kapsam, deger) VALUES (:kapsam, :deger)'),
+                    {'kapsam': kapsam, 'deger': ilk_deger + adet}
+                )
+            return range(ilk_deger + 1, ilk_deger + adet + 1)
+        except IntegrityError:
+            # Başka bir işlem sayacı aynı anda oluşturdu, artırmaya devam et
+            db.session.execute(
+                text('UPDATE sayac SET deger = deger + :adet WHERE kapsam = :kapsam'), params
+            )
+
+    son = db.session.execute(
+        text('SELECT deger FROM sayac WHERE kapsam = :kapsam'), params
+    ).scalar()
+    return range(son - adet + 1, son + 1)
+
+
+def advance_value(db, kapsam, deger, baslangic=0):
+    """
+    Sayacı en az deger olacak şekilde ilerletir
+
+    Dışarıdan hazır kodla eklenen kayıtlar (ör. Excel içe aktarma) sayacı
+    atladığı için, sonradan üretilecek kodların çakışmaması için kullanılır.
+
+    Args:
+        db: Database session
+        kapsam: Sayaç anahtarı
+        deger: Kullanılmış en büyük numara
+        baslangic: Sayaç ilk kez oluşturulurken kullanılacak mevcut son değer
+                   (int veya int döndüren fonksiyon)
+    """
+    params = {'kapsam': kapsam, 'deger': deger}
+    guncellenen = db.session.execute(
+        text('UPDATE sayac SET deger = MAX(deger, :deger) WHERE kapsam = :kapsam'), params
+    ).rowcount
+    if guncellenen:
+        return
+
+    ilk_deger = (baslangic() if callable(baslangic) else baslangic) or 0
+    try:
+        with db.session.begin_nested():
+            db.session.execute(
+                text('INSERT INTO sayac (kapsam, deger) VALUES (:kapsam, :deger)'),
+                {'kapsam': kapsam, 'deger': max(ilk_deger, deger)}
+            )
+    except IntegrityError:
+        db.session.execute(
+            text('UPDATE sayac SET deger = MAX(deger, :deger) WHERE kapsam = :kapsam'), params
+        )
+
+
+def max_kod_numarasi(kodlar, ayirici=None, onek=None):
+    """
+    Mevcut kodlardan en büyük sıra numarasını bulur (sayaç ilk değeri için)
+
+    Numara sabit genişlikte değildir: 999'dan sonra MST001-IS1000,
+    TSLMST0011000 gibi kodlar üretilir.
+
+    Args:
+        kodlar: Kod listesi (None değerler atlanır)
+        ayirici: Numaradan önceki ayırıcı (ör. 'MST', '-IS')
+        onek: Ayırıcı yoksa numaradan önceki sabit önek (ör. 'TSLMST001');
+              bu önekle başlamayan kodlar atlanır
+
+    Returns:
+        int: En büyük numara (yoksa 0)
+    """
+    en_buyuk = 0
+    for kod in kodlar:
+        if not kod:
+            continue
+        if onek is not None:
+            if not kod.startswith(onek):
+                continue
+            parca = kod[len(onek):]
+        else:
+            parca = kod.split(ayirici)[-1]
+        try:
+            en_buyuk = max(en_buyuk, int(parca))
+        except ValueError:
+            continue
+    return en_buyuk
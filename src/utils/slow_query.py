@@ -0,0 +1,215 @@
+"""
+Yavaş sorgu günlüğü
+Eşiği (SLOW_QUERY_MS) aşan her SQL cümlesi ayrı, dönen bir log dosyasına
+yazılır: süre, SQL, gizlenmiş parametreler, endpoint (istek dışında '-'),
+çağrı yeri (projedeki ilk çerçeve) ve SQLite'ta EXPLAIN QUERY PLAN çıktısı.
+
+Aynı zamanda bellekte normalize edilmiş cümleye göre (sayı/metin sabitleri
+ve IN (?, ?, ...) listeleri tek biçime indirilir) toplanır; /_perf/slow
+bunları toplam süreye göre döner. Planda "SCAN" satırı varsa (indeks
+kullanılmadan tablo taraması) kayıt tarama=True olarak işaretlenir.
+
+Parametrelerde metinler gizlenir (<str:uzunluk>); sayılar, tarihler ve
+None olduğu gibi yazılır.
+"""
+
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from datetime import date, datetime
+from logging.handlers import RotatingFileHandler
+
+from flask import has_request_context, request
+from sqlalchemy import event
+
+
+VARSAYILAN_KAPASITE = 200
+PROJE_KOKU = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_BU_DOSYA = os.path.abspath(__file__)
+PLAN_ISLEMLERI = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+
+_METIN = re.compile(r"'(?:[^']|'')*'")
+_SAYI = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LISTESI = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_BOSLUK = re.compile(r'\s+')
+
+
+def normalize_sql(statement):
+    """Aynı biçimdeki cümleleri tek anahtarda toplamak için sabitleri ve IN listelerini sadeleştirir"""
+    sql = _METIN.sub('?', statement)
+    sql = _SAYI.sub('?', sql)
+    sql = _IN_LISTESI.sub('(?, ...)', sql)
+    return _BOSLUK.sub(' ', sql).strip()
+
+
+def redact_parameters(parameters):
+    """Metin/binary değerleri tür ve uzunlukla değiştirir"""
+    def gizle(deger):
+        if deger is None or isinstance(deger, (bool, int, float, date, datetime)):
+            return deger
+        if isinstance(deger, (str, bytes)):
+            return f'<{type(deger).__name__}:{len(deger)}>'
+        return f'<{type(deger).__name__}>'
+
+    if isinstance(parameters, dict):
+        return {anahtar: gizle(deger) for anahtar, deger in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [gizle(deger) for deger in parameters]
+    return gizle(parameters)
+
+
+def _cagri_yeri():
+    """Projedeki (site-packages ve bu modül dışındaki) en yakın çerçeve: 'app.py:123 is_red'"""
+    cerceve = sys._getframe(2)
+    while cerceve is not None:
+        dosya = cerceve.f_code.co_filename
+        if dosya.startswith(PROJE_KOKU) and dosya != _BU_DOSYA and 'site-packages' not in dosya:
+            return f'{os.path.relpath(dosya, PROJE_KOKU)}:{cerceve.f_lineno} {cerceve.f_code.co_name}'
+        cerceve = cerceve.f_back
+    return '-'
+
+
+class SlowQueryLog:
+    """Eşiği aşan SQL cümlelerinin log dosyası ve normalize cümle toplamları"""
+
+    def __init__(self):
+        self.etkin = False
+        self.esik_ms = 200.0
+        self.logger = None
+        self._kapasite = VARSAYILAN_KAPASITE
+        self._cumleler = {}
+        self._kilit = threading.Lock()
+
+    def configure(self, engine, etkin=False, esik_ms=200, log_dosyasi='logs/slow_queries.log',
+                  kapasite=None):
+        """
+        Günlüğü açar ve engine dinleyicilerini bağlar (etkin değilse hiçbir şey bağlanmaz)
+
+        Args:
+            engine: SQLAlchemy engine (db.engine)
+            esik_ms: Bu süreyi (ms) aşan cümleler kaydedilir
+            log_dosyasi: Dönen log dosyası (10 MB x 5)
+            kapasite: Bellekte tutulacak en fazla farklı cümle sayısı
+        """
+        self.etkin = etkin
+        self.esik_ms = float(esik_ms)
+        if kapasite:
+            self._kapasite = kapasite
+        if not etkin:
+            return
+
+        if self.logger is None:
+            klasor = os.path.dirname(log_dosyasi)
+            if klasor:
+                os.makedirs(klasor, exist_ok=True)
+            handler = RotatingFileHandler(log_dosyasi, maxBytes=10485760, backupCount=5, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('[%(asctime)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+            self.logger = logging.getLogger('ajans.slow_query')
+            self.logger.setLevel(logging.WARNING)
+            self.logger.propagate = False
+            self.logger.addHandler(handler)
+
+        self.dialect = engine.dialect.name
+        if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    def explain(self, cursor, statement, parameters):
+        """SQLite sorgu planı satırları (desteklenmiyorsa veya hata olursa boş liste)"""
+        if self.dialect != 'sqlite' or not statement.lstrip()[:6].upper().startswith(PLAN_ISLEMLERI):
+            return []
+        try:
+            # Ayrı imleç: asıl cümlenin sonuçları henüz okunmadı
+            plan_imleci = cursor.connection.cursor()
+            try:
+                plan_imleci.execute('EXPLAIN QUERY PLAN ' + statement, parameters)
+                return [satir[-1] for satir in plan_imleci.fetchall()]
+            finally:
+                plan_imleci.close()
+        except Exception as e:
+            return [f'(plan alınamadı: {e})']
+
+    def kaydet(self, sure_ms, statement, parameters, plan, endpoint, cagri_yeri):
+        """Log dosyasına yazar ve normalize cümle toplamına ekler"""
+        parametreler = redact_parameters(parameters)
+        tarama = any(satir.startswith('SCAN ') and satir != 'SCAN CONSTANT ROW' for satir in plan)
+        self.logger.warning(
+            '%.1f ms | endpoint=%s | %s%s\n  SQL: %s\n  Parametreler: %s%s',
+            sure_ms, endpoint, cagri_yeri, ' | TARAMA' if tarama else '',
+            _BOSLUK.sub(' ', statement).strip(), parametreler,
+            ''.join(f'\n  Plan: {satir}' for satir in plan)
+        )
+
+        anahtar = normalize_sql(statement)
+        with self._kilit:
+            toplam = self._cumleler.get(anahtar)
+            if toplam is None:
+                if len(self._cumleler) >= self._kapasite:
+                    # Toplam süresi en düşük cümle yer açar
+                    del self._cumleler[min(self._cumleler, key=lambda k: self._cumleler[k]['toplam_ms'])]
+                toplam = self._cumleler[anahtar] = {
+                    'sayi': 0, 'toplam_ms': 0.0, 'en_uzun_ms': 0.0,
+                    'endpointler': {}, 'cagri_yerleri': {},
+                }
+            toplam['sayi'] += 1
+            toplam['toplam_ms'] += sure_ms
+            toplam['en_uzun_ms'] = max(toplam['en_uzun_ms'], sure_ms)
+            toplam['endpointler'][endpoint] = toplam['endpointler'].get(endpoint, 0) + 1
+            toplam['cagri_yerleri'][cagri_yeri] = toplam['cagri_yerleri'].get(cagri_yeri, 0) + 1
+            toplam['plan'] = plan
+            toplam['tarama'] = tarama
+            toplam['son_parametreler'] = parametreler
+            toplam['son_zaman'] = datetime.now().isoformat(timespec='seconds')
+
+    def snapshot(self):
+        """Normalize cümleler toplam süreye göre azalan"""
+        with self._kilit:
+            kopyalar = [(anahtar, {**toplam, 'endpointler': dict(toplam['endpointler']),
+                                   'cagri_yerleri': dict(toplam['cagri_yerleri'])})
+                        for anahtar, toplam in self._cumleler.items()]
+
+        cumleler = []
+        for anahtar, toplam in sorted(kopyalar, key=lambda x: x[1]['toplam_ms'], reverse=True):
+            cumleler.append({
+                'sql': anahtar,
+                'sayi': toplam['sayi'],
+                'toplam_ms': round(toplam['toplam_ms'], 2),
+                'ort_ms': round(toplam['toplam_ms'] / toplam['sayi'], 2),
+                'en_uzun_ms': round(toplam['en_uzun_ms'], 2),
+                'tarama': toplam['tarama'],
+                'plan': toplam['plan'],
+                'endpointler': toplam['endpointler'],
+                'cagri_yerleri': toplam['cagri_yerleri'],
+                'son_parametreler': toplam['son_parametreler'],
+                'son_zaman': toplam['son_zaman'],
+            })
+        return {'etkin': self.etkin, 'esik_ms': self.esik_ms, 'cumleler': cumleler}
+
+    def clear(self):
+        with self._kilit:
+            self._cumleler.clear()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_yavas_baslangic', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    baslangiclar = conn.info.get('_yavas_baslangic')
+    if not baslangiclar:
+        return
+    sure_ms = (time.perf_counter() - baslangiclar.pop()) * 1000
+    if sure_ms < slow_query_log.esik_ms:
+        return
+    if executemany:
+        # Plan ve log için ilk parametre takımı yeterli
+        parameters = parameters[0] if parameters else ()
+    plan = slow_query_log.explain(cursor, statement, parameters)
+    endpoint = (request.endpoint or '<eşleşmedi>') if has_request_context() else '-'
+    slow_query_log.kaydet(sure_ms, statement, parameters, plan, endpoint, _cagri_yeri())
+
+
+slow_query_log = SlowQueryLog()
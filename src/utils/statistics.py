@@ -4,14 +4,21 @@ Dashboard ve raporlama için kullanılır
 """
 
 from datetime import datetime, timedelta
-from sqlalchemy import func, extract
+from sqlalchemy import func, extract, case, exists, select
 from flask import current_app
+from src.utils.query_cache import cached_query
 
 
+@cached_query('musteri', 'is_gunlugu', 'teslimat', 'sosyal_medya', gune_bagli=True)
 def get_dashboard_metrics(db):
     """
     Dashboard için temel metrikleri hesaplar
     
+    Tüm KPI'lar iki sorguda hesaplanır: iş günlüğü üzerinde tek geçişte
+    koşullu toplamlar (SUM(CASE ...)) ve teslimat tablosu üzerinde tek geçiş.
+    Teslimatı olmayan işler NOT EXISTS anti-join ile veritabanında sayılır;
+    ID listeleri Python'a çekilmez.
+    
     Returns:
         dict: Metrikler dictionary'si
     """
@@ -20,70 +27,45 @@ def get_dashboard_metrics(db):
     
     # Bugünün tarihi
     today = datetime.now()
-    current_month_start = datetime(today.year, today.month, 1)
-    
-    # Toplam müşteri sayısı
-    toplam_musteri = db.session.query(Musteri).count()
-    
-    # Bu ayki iş sayısı
-    bu_ay_is = db.session.query(IsGunlugu).filter(
-        IsGunlugu.tarih >= current_month_start.date()
-    ).count()
-    
-    # Onaylanan teslimatlar
-    onaylanan_teslimat = db.session.query(Teslimat).filter(
-        Teslimat.durum == 'Onaylandı'
-    ).count()
-    
-    # Toplam çalışma saati (dakikadan saate)
-    toplam_dakika = db.session.query(func.sum(IsGunlugu.sure_dakika)).scalar() or 0
-    toplam_saat = round(toplam_dakika / 60, 1)
-    
-    # Reels sayısı
-    reels_sayisi = db.session.query(SosyalMedya).filter(
-        SosyalMedya.gonderi_turu == 'Reels'
-    ).count()
-    
-    # Bekleyen teslimatlar
-    bekleyen_teslimat = db.session.query(Teslimat).filter(
-        Teslimat.durum.in_(['Hazırlanıyor', 'Bekliyor', 'Revizede'])
-    ).count()
+    current_month_start = datetime(today.year, today.month, 1).date()
+    bu_ay = IsGunlugu.tarih >= current_month_start
     
     # Bekleyen işler = Teslimatı olmayan işler
-    # Tüm işleri al
-    tum_is_idleri = db.session.query(IsGunlugu.id).all()
-    tum_is_id_set = {is_id[0] for is_id in tum_is_idleri}
-    
-    # Teslimatı olan işleri al
-    teslimatli_is_idleri = db.session.query(Teslimat.is_gunlugu_id).filter(
-        Teslimat.is_gunlugu_id.isnot(None)
-    ).distinct().all()
-    teslimatli_is_id_set = {is_id[0] for is_id in teslimatli_is_idleri}
-    
-    # Bekleyen işler = Tüm işler - Teslimatı olan işler
-    bekleyen_isler = len(tum_is_id_set - teslimatli_is_id_set)
-    
-    # Bu ayki toplam çalışma saati
-    bu_ay_dakika = db.session.query(func.sum(IsGunlugu.sure_dakika)).filter(
-        IsGunlugu.tarih >= current_month_start.date()
-    ).scalar() or 0
-    bu_ay_saat = round(bu_ay_dakika / 60, 1)
+    teslimati_yok = ~exists().where(Teslimat.is_gunlugu_id == IsGunlugu.id)
+    
+    # 1. İş günlüğü üzerinde tek geçiş (+ müşteri ve reels sayıları)
+    is_metrikleri = db.session.query(
+        select(func.count(Musteri.id)).scalar_subquery(),
+        func.sum(case((bu_ay, 1), else_=0)),
+        func.sum(IsGunlugu.sure_dakika),
+        func.sum(case((bu_ay, IsGunlugu.sure_dakika), else_=0)),
+        func.sum(case((teslimati_yok, 1), else_=0)),
+        select(func.count(SosyalMedya.id)).where(SosyalMedya.gonderi_turu == 'Reels').scalar_subquery(),
+    ).select_from(IsGunlugu).one()
+    toplam_musteri, bu_ay_is, toplam_dakika, bu_ay_dakika, bekleyen_isler, reels_sayisi = is_metrikleri
+    
+    # 2. Teslimat tablosu üzerinde tek geçiş
+    onaylanan_teslimat, bekleyen_teslimat = db.session.query(
+        func.sum(case((Teslimat.durum == 'Onaylandı', 1), else_=0)),
+        func.sum(case((Teslimat.durum.in_(['Hazırlanıyor', 'Bekliyor', 'Revizede']), 1), else_=0)),
+    ).one()
     
     return {
-        'toplam_musteri': toplam_musteri,
-        'bu_ay_is': bu_ay_is,
-        'onaylanan_teslimat': onaylanan_teslimat,
-        'toplam_saat': toplam_saat,
-        'reels_sayisi': reels_sayisi,
-        'bekleyen_teslimat': bekleyen_teslimat,
-        'bekleyen_isler': bekleyen_isler,
-        'bu_ay_saat': bu_ay_saat
+        'toplam_musteri': toplam_musteri or 0,
+        'bu_ay_is': bu_ay_is or 0,
+        'onaylanan_teslimat': onaylanan_teslimat or 0,
+        'toplam_saat': round((toplam_dakika or 0) / 60, 1),
+        'reels_sayisi': reels_sayisi or 0,
+        'bekleyen_teslimat': bekleyen_teslimat or 0,
+        'bekleyen_isler': bekleyen_isler or 0,
+        'bu_ay_saat': round((bu_ay_dakika or 0) / 60, 1)
     }
 
 
+@cached_query('gunluk_is_ozeti')
 def get_is_tipi_dagilimi(db, start_date=None, end_date=None):
     """
-    İş tipi dağılımını hesaplar
+    İş tipi dağılımını hesaplar (gunluk_is_ozeti rollup tablosundan)
     
     Args:
         db: Database session
@@ -93,19 +75,19 @@ def get_is_tipi_dagilimi(db, start_date=None, end_date=None):
     Returns:
         dict: İş tipi ve adetleri
     """
-    from app import IsGunlugu
+    from app import GunlukIsOzeti
     
     query = db.session.query(
-        IsGunlugu.aktivite_turu,
-        func.count(IsGunlugu.id).label('adet')
+        GunlukIsOzeti.aktivite_turu,
+        func.sum(GunlukIsOzeti.is_sayisi).label('adet')
     )
     
     if start_date:
-        query = query.filter(IsGunlugu.tarih >= start_date)
+        query = query.filter(GunlukIsOzeti.tarih >= start_date)
     if end_date:
-        query = query.filter(IsGunlugu.tarih <= end_date)
+        query = query.filter(GunlukIsOzeti.tarih <= end_date)
     
-    query = query.group_by(IsGunlugu.aktivite_turu).all()
+    query = query.group_by(GunlukIsOzeti.aktivite_turu).all()
     
     result = {}
     for aktivite, adet in query:
@@ -115,9 +97,10 @@ def get_is_tipi_dagilimi(db, start_date=None, end_date=None):
     return result
 
 
+@cached_query('gunluk_is_ozeti', gune_bagli=True)
 def get_gunluk_is_adedi(db, days=30):
     """
-    Son N günün günlük iş adedini hesaplar
+    Son N günün günlük iş adedini hesaplar (gunluk_is_ozeti rollup tablosundan)
     
     Args:
         db: Database session
@@ -126,18 +109,18 @@ def get_gunluk_is_adedi(db, days=30):
     Returns:
         dict: Tarih ve iş adedi
     """
-    from app import IsGunlugu
+    from app import GunlukIsOzeti
     
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
     
     query = db.session.query(
-        IsGunlugu.tarih,
-        func.count(IsGunlugu.id).label('adet')
+        GunlukIsOzeti.tarih,
+        func.sum(GunlukIsOzeti.is_sayisi).label('adet')
     ).filter(
-        IsGunlugu.tarih >= start_date,
-        IsGunlugu.tarih <= end_date
-    ).group_by(IsGunlugu.tarih).order_by(IsGunlugu.tarih).all()
+        GunlukIsOzeti.tarih >= start_date,
+        GunlukIsOzeti.tarih <= end_date
+    ).group_by(GunlukIsOzeti.tarih).order_by(GunlukIsOzeti.tarih).all()
     
     result = {}
     for tarih, adet in query:
@@ -146,9 +129,10 @@ def get_gunluk_is_adedi(db, days=30):
     return result
 
 
+@cached_query('gunluk_is_ozeti')
 def get_kisi_basi_is_sayisi(db, limit=10):
     """
-    Kişi başı iş sayısını hesaplar (Top N)
+    Kişi başı iş sayısını hesaplar (Top N, gunluk_is_ozeti rollup tablosundan)
     
     Args:
         db: Database session
@@ -157,19 +141,21 @@ def get_kisi_basi_is_sayisi(db, limit=10):
     Returns:
         list: [(kişi_adı, iş_sayısı), ...]
     """
-    from app import IsGunlugu
+    from app import GunlukIsOzeti
     
+    # Sorumlu kişisi olmayan işler rollup'ta '' olarak tutulur
+    adet = func.sum(GunlukIsOzeti.is_sayisi)
     query = db.session.query(
-        IsGunlugu.sorumlu_kisi,
-        func.count(IsGunlugu.id).label('adet')
+        GunlukIsOzeti.sorumlu_kisi,
+        adet.label('adet')
     ).filter(
-        IsGunlugu.sorumlu_kisi.isnot(None),
-        IsGunlugu.sorumlu_kisi != ''
-    ).group_by(IsGunlugu.sorumlu_kisi).order_by(func.count(IsGunlugu.id).desc()).limit(limit).all()
+        GunlukIsOzeti.sorumlu_kisi != ''
+    ).group_by(GunlukIsOzeti.sorumlu_kisi).order_by(adet.desc()).limit(limit).all()
     
     return [(kisi, adet) for kisi, adet in query]
 
 
+@cached_query('musteri', 'is_gunlugu')
 def get_musteri_bazi_metrikler(db, musteri_id=None, start_date=None, end_date=None):
     """
     Müşteri bazlı metrikleri hesaplar
@@ -208,6 +194,7 @@ def get_musteri_bazi_metrikler(db, musteri_id=None, start_date=None, end_date=No
     return result
 
 
+@cached_query('is_gunlugu', 'teslimat', gune_bagli=True)
 def get_aylik_ozet(db, year=None, month=None):
     """
     Aylık özet raporu
@@ -264,6 +251,7 @@ def get_aylik_ozet(db, year=None, month=None):
     }
 
 
+@cached_query('teslimat')
 def get_teslimat_durum_dagilimi(db):
     """
     Teslimat durum dağılımını hesaplar
@@ -286,6 +274,7 @@ def get_teslimat_durum_dagilimi(db):
     return result
 
 
+@cached_query('is_gunlugu', 'teslimat', 'sosyal_medya')
 def get_musteri_metrikleri(db, musteri_id, start_date=None, end_date=None):
     """
     Belirli bir müşteri için metrikleri hesaplar
@@ -0,0 +1,34 @@
+"""
+Test ortamı
+Uygulama geçici bir SQLite veritabanıyla içe aktarılır; ortam değişkenleri
+app modülü yüklenmeden önce ayarlanmalıdır.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+PROJE_KOKU = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST_KLASORU = tempfile.mkdtemp(prefix='ajans_test_')
+
+os.environ['DATABASE_URI'] = f"sqlite:///{os.path.join(TEST_KLASORU, 'test.db')}"
+os.environ['UPLOAD_FOLDER'] = os.path.join(TEST_KLASORU, 'uploads')
+os.environ['QUERY_CACHE_ENABLED'] = 'False'
+sys.path.insert(0, PROJE_KOKU)
+
+
+@pytest.fixture
+def db():
+    """Şeması güncel, boş veritabanı (uygulama bağlamı içinde)"""
+    from app import app, db as veritabani
+    from src.utils.migrations import run_migrations
+    from src.utils.seed_data import clear_data
+
+    with app.app_context():
+        veritabani.create_all()
+        run_migrations(veritabani)
+        clear_data(veritabani)
+        yield veritabani
+        veritabani.session.remove()
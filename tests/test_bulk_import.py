@@ -0,0 +1,37 @@
+"""Toplu Excel içe aktarma testleri"""
+
+import io
+from datetime import date
+
+from src.utils.bulk_import import read_workbook, plan_import, apply_import
+from src.utils.export import export_stream
+
+
+def _disa_aktar(db):
+    govde, _, _ = export_stream(db, 'xlsx')
+    return io.BytesIO(b''.join(govde))
+
+
+def test_disa_aktarilan_dosya_degismeden_geri_yuklenir(db):
+    from app import Musteri, IsGunlugu
+
+    musteri = Musteri(musteri_kodu='MST001', ad='Anadolu Gıda', telefon='05457368886', aylik_ucret=15000.5,
+                      sozlesme_baslangic=date(2024, 1, 5))
+    db.session.add(musteri)
+    db.session.flush()
+    db.session.add(IsGunlugu(is_kodu='MST001-IS001', musteri_id=musteri.id, tarih=date(2024, 2, 1),
+                             aktivite_turu='Tasarım', etiketler='0123', sure_dakika=90))
+    db.session.commit()
+
+    kitap = read_workbook(_disa_aktar(db))
+    assert kitap['Müşteriler'].loc[0, 'telefon'] == '05457368886'
+
+    plan = plan_import(db, kitap)
+    assert plan['hatalar'] == []
+    for adim in plan['varliklar'].values():
+        assert adim['eklenecek'] == 0
+        assert adim['guncellenecek'] == 0
+
+    sonuc = apply_import(db, plan)
+    assert sonuc['musteri'] == {'eklenen': 0, 'guncellenen': 0, 'degismeyen': 1}
+    assert db.session.get(Musteri, musteri.id).telefon == '05457368886'
@@ -0,0 +1,21 @@
+"""Migration testleri"""
+
+from src.utils import search
+from src.utils.migrations import run_migrations, get_pending_versions
+
+
+def test_fts5_yoksa_metin_indeksi_surumu_kaydedilmez(db, monkeypatch):
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql(f'DROP TABLE {search.INDEKS_TABLOSU}')
+        conn.exec_driver_sql('DELETE FROM schema_version WHERE version IN (7, 9)')
+
+    monkeypatch.setattr(search, 'create_search_index', lambda conn: False)
+    run_migrations(db)
+    assert get_pending_versions(db) == [7]
+    assert not search.search_index_available(db)
+
+    # FTS5 destekli SQLite kurulunca sonraki çalıştırma indeksi oluşturur
+    monkeypatch.undo()
+    assert run_migrations(db) == [7]
+    assert get_pending_versions(db) == []
+    assert search.search_index_available(db)
@@ -0,0 +1,53 @@
+"""Keyset sayfalama testleri"""
+
+from datetime import date
+
+import pytest
+
+from src.utils.pagination import keyset_paginate
+
+
+@pytest.fixture
+def teslimatlar(db):
+    """Aynı ve boş teslim tarihleri karışık teslimatlar (id sırasıyla)"""
+    from app import Musteri, IsGunlugu, Teslimat
+
+    musteri = Musteri(musteri_kodu='MST001', ad='Anadolu Gıda')
+    db.session.add(musteri)
+    db.session.flush()
+    is_ = IsGunlugu(is_kodu='MST001-IS001', musteri_id=musteri.id, tarih=date(2024, 1, 1))
+    db.session.add(is_)
+    db.session.flush()
+
+    tarihler = [date(2024, 3, 1), None, date(2024, 3, 1), date(2024, 1, 15), None,
+                date(2024, 3, 1), None, date(2024, 2, 10), None]
+    kayitlar = [Teslimat(teslimat_kodu=f'TSLMST001{sira:03d}', musteri_id=musteri.id, is_gunlugu_id=is_.id,
+                         teslim_tarihi=tarih) for sira, tarih in enumerate(tarihler, 1)]
+    db.session.add_all(kayitlar)
+    db.session.commit()
+    return kayitlar
+
+
+def _tum_sayfalar(db, per_page):
+    from app import Teslimat
+
+    sayfalar, cursor = [], None
+    while True:
+        sayfa = keyset_paginate(db.session.query(Teslimat), Teslimat.id, Teslimat.teslim_tarihi,
+                                cursor=cursor, per_page=per_page)
+        sayfalar.append([teslimat.id for teslimat in sayfa.items])
+        if not sayfa.has_next:
+            return sayfalar
+        cursor = sayfa.next_cursor
+
+
+@pytest.mark.parametrize('per_page', [1, 2, 3, 4, 9, 50])
+def test_bos_tarihli_kayitlarla_sayfalar_eksiksiz_ve_tekrarsiz(db, teslimatlar, per_page):
+    beklenen = [teslimat.id for teslimat in sorted(
+        teslimatlar, key=lambda t: (t.teslim_tarihi is not None, t.teslim_tarihi or date.min, t.id), reverse=True)]
+
+    sayfalar = _tum_sayfalar(db, per_page)
+
+    assert [kayit_id for sayfa in sayfalar for kayit_id in sayfa] == beklenen
+    assert all(len(sayfa) == per_page for sayfa in sayfalar[:-1])
+    assert sayfalar[-1]
@@ -0,0 +1,109 @@
+"""Sorgu önbelleği geçersizleştirme testleri (önbellek açıkken)"""
+
+import io
+from datetime import date
+
+import pytest
+from sqlalchemy import insert
+
+from src.utils.bulk_import import read_workbook, plan_import, apply_import
+from src.utils.export import export_stream
+from src.utils.query_cache import query_cache, get_table_versions
+from src.utils.rollups import rebuild_gunluk_ozet
+from src.utils.seed_data import generate_seed_data, clear_data
+from src.utils.statistics import get_dashboard_metrics, get_is_tipi_dagilimi, get_musteri_bazi_metrikler
+
+
+@pytest.fixture
+def onbellek(db, monkeypatch):
+    monkeypatch.setattr(query_cache, 'etkin', True)
+    query_cache.clear()
+    yield query_cache
+    query_cache.clear()
+
+
+@pytest.fixture
+def musteri(db):
+    from app import Musteri
+
+    musteri = Musteri(musteri_kodu='MST001', ad='Anadolu Gıda')
+    db.session.add(musteri)
+    db.session.commit()
+    return musteri
+
+
+def _disa_aktar(db):
+    govde, _, _ = export_stream(db, 'xlsx')
+    return io.BytesIO(b''.join(govde))
+
+
+def _is(musteri, sira, **alanlar):
+    from app import IsGunlugu
+
+    return IsGunlugu(is_kodu=f'{musteri.musteri_kodu}-IS{sira:03d}', musteri_id=musteri.id,
+                     tarih=alanlar.pop('tarih', date(2024, 2, 1)), sure_dakika=60, **alanlar)
+
+
+def test_flush_yazilan_tablolarin_surumunu_artirir(db, onbellek, musteri):
+    once = get_table_versions(db, ['musteri', 'is_gunlugu'])
+    assert get_musteri_bazi_metrikler(db) == []
+
+    db.session.add(_is(musteri, 1))
+    db.session.commit()
+
+    sonra = get_table_versions(db, ['musteri', 'is_gunlugu'])
+    assert sonra[0] == once[0]
+    assert sonra[1] > once[1]
+    assert get_musteri_bazi_metrikler(db) == [('Anadolu Gıda', 1, 1.0)]
+
+
+def test_toplu_ice_aktarma_surumu_artirir(db, onbellek, musteri):
+    db.session.add(_is(musteri, 1))
+    db.session.commit()
+    assert get_musteri_bazi_metrikler(db) == [('Anadolu Gıda', 1, 1.0)]
+
+    kitap = read_workbook(_disa_aktar(db))
+    kitap['Müşteriler'].loc[0, 'ad'] = 'Anadolu Gıda A.Ş.'
+    once = get_table_versions(db, ['musteri'])
+
+    sonuc = apply_import(db, plan_import(db, kitap))
+    assert sonuc['musteri']['guncellenen'] == 1
+    assert get_table_versions(db, ['musteri'])[0] > once[0]
+    assert get_musteri_bazi_metrikler(db) == [('Anadolu Gıda A.Ş.', 1, 1.0)]
+
+
+def test_rollup_yeniden_olusturulunca_grafikler_yenilenir(db, onbellek, musteri):
+    from app import IsGunlugu
+
+    db.session.add(_is(musteri, 1, aktivite_turu='Tasarım'))
+    db.session.commit()
+    assert get_is_tipi_dagilimi(db) == {'Tasarım': 1}
+
+    # Core INSERT ne flush'tan ne de rollup dinleyicisinden geçer
+    db.session.execute(insert(IsGunlugu).values(is_kodu='MST001-IS002', musteri_id=musteri.id,
+                                                tarih=date(2024, 2, 2), aktivite_turu='Video'))
+    db.session.commit()
+    assert get_is_tipi_dagilimi(db) == {'Tasarım': 1}
+
+    once = get_table_versions(db, ['gunluk_is_ozeti'])
+    rebuild_gunluk_ozet(db)
+    assert get_table_versions(db, ['gunluk_is_ozeti'])[0] > once[0]
+    assert get_is_tipi_dagilimi(db) == {'Tasarım': 1, 'Video': 1}
+
+
+def test_ornek_veri_uretimi_ve_temizlik_surumleri_korur_ve_artirir(db, onbellek):
+    tablolar = ['musteri', 'is_gunlugu', 'teslimat', 'sosyal_medya']
+    bos = get_dashboard_metrics(db)
+    once = get_table_versions(db, tablolar)
+
+    sayilar = generate_seed_data(db, musteri_sayisi=3, is_sayisi=30, gun=30)
+    uretilmis = get_table_versions(db, tablolar)
+    assert all(sonra > onceki for onceki, sonra in zip(once, uretilmis))
+    dolu = get_dashboard_metrics(db)
+    assert dolu != bos
+    assert dolu['toplam_musteri'] == sayilar['musteri']
+
+    clear_data(db)
+    temizlenmis = get_table_versions(db, tablolar)
+    assert all(sonra > onceki for onceki, sonra in zip(uretilmis, temizlenmis))
+    assert get_dashboard_metrics(db) == bos
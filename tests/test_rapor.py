@@ -0,0 +1,85 @@
+"""Müşteri raporu indirme testleri"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.utils.jobs import job_queue, BEKLIYOR, CALISIYOR, TAMAMLANDI, HATA
+from src.utils.report_cache import report_cache
+
+
+@pytest.fixture
+def istemci(db, monkeypatch):
+    from app import app
+
+    # İşçi thread'leri başlatılmaz; kuyruğa eklenen işler beklemede kalır
+    monkeypatch.setattr(job_queue, 'start', lambda: None)
+    report_cache.clear()
+    istemci = app.test_client()
+    with istemci.session_transaction() as oturum:
+        oturum['logged_in'] = True
+    return istemci
+
+
+@pytest.fixture
+def musteri(db):
+    from app import Musteri
+
+    musteri = Musteri(musteri_kodu='MST001', ad='Anadolu Gıda')
+    db.session.add(musteri)
+    db.session.commit()
+    return musteri
+
+
+@pytest.mark.parametrize('yol, tur', [
+    ('/musteri_rapor_excel/{id}?filtre=yil', 'excel'),
+    ('/musteri/{id}/rapor?filtre=yil', 'word'),
+])
+def test_onbellekte_olmayan_rapor_kuyruga_eklenir(db, istemci, musteri, yol, tur):
+    from app import RaporIsi
+
+    yanit = istemci.get(yol.format(id=musteri.id))
+    assert yanit.status_code == 202
+    assert b'senkron=1' in yanit.data
+
+    isler = RaporIsi.query.all()
+    assert [(is_.tur, is_.musteri_id, is_.durum) for is_ in isler] == [(tur, musteri.id, BEKLIYOR)]
+
+    # Aynı rapor tekrar istenirse yeni iş açılmaz
+    istemci.get(yol.format(id=musteri.id))
+    assert RaporIsi.query.count() == 1
+
+
+def test_senkron_rapor_istek_icinde_uretilir_ve_onbellekten_doner(db, istemci, musteri):
+    from app import RaporIsi
+
+    yol = f'/musteri_rapor_excel/{musteri.id}?filtre=yil'
+    yanit = istemci.get(yol + '&senkron=1')
+    assert yanit.status_code == 200
+    assert yanit.mimetype.endswith('spreadsheetml.sheet')
+
+    assert istemci.get(yol).status_code == 200
+    assert RaporIsi.query.count() == 0
+
+
+@pytest.mark.parametrize('sorgu', ['filtre=yil&senkron=0', 'filtre=yil&musteri_id=99'])
+def test_sorgu_dizesindeki_senkron_ve_musteri_id_cakismaz(db, istemci, musteri, sorgu):
+    yanit = istemci.get(f'/musteri_rapor_excel/{musteri.id}?{sorgu}')
+    assert yanit.status_code == 202
+    assert f'/musteri_rapor_excel/{musteri.id}?filtre=yil&amp;senkron=1'.encode() in yanit.data
+
+
+def test_eski_bitmis_isler_silinir(db, musteri):
+    from app import RaporIsi
+
+    eski = datetime.now() - timedelta(days=job_queue.saklama_gun + 1)
+    yeni = datetime.now()
+    for durum, tarih in [(TAMAMLANDI, eski), (HATA, eski), (TAMAMLANDI, yeni),
+                         (BEKLIYOR, eski), (CALISIYOR, eski)]:
+        db.session.add(RaporIsi(tur='excel', musteri_id=musteri.id, durum=durum, olusturma_tarihi=tarih,
+                                bitis_tarihi=tarih if durum in (TAMAMLANDI, HATA) else None))
+    db.session.commit()
+
+    assert job_queue.purge() == 2
+    assert sorted(is_.durum for is_ in RaporIsi.query.all()) == sorted([TAMAMLANDI, BEKLIYOR, CALISIYOR])
+    assert job_queue.purge(gun=0) == 0
@@ -0,0 +1,29 @@
+"""Kod sayacı testleri"""
+
+from datetime import date
+
+from src.utils.sequences import max_kod_numarasi
+
+
+def test_max_kod_numarasi_sabit_genislik_varsaymaz():
+    kodlar = ['TSLMST001998', 'TSLMST0011000', 'TSLMST0011001', None, 'TSLMST002005']
+    assert max_kod_numarasi(kodlar, onek='TSLMST001') == 1001
+    assert max_kod_numarasi(['MST001-IS999', 'MST001-IS1000'], ayirici='-IS') == 1000
+
+
+def test_teslimat_sayaci_1000_ustu_koddan_baslar(db):
+    from app import Musteri, IsGunlugu, Teslimat, generate_teslimat_kodu
+
+    musteri = Musteri(musteri_kodu='MST001', ad='Anadolu Gıda')
+    db.session.add(musteri)
+    db.session.flush()
+    is_kaydi = IsGunlugu(is_kodu='MST001-IS001', musteri_id=musteri.id, tarih=date(2024, 1, 1))
+    db.session.add(is_kaydi)
+    db.session.flush()
+    db.session.add_all([
+        Teslimat(teslimat_kodu=kod, musteri_id=musteri.id, is_gunlugu_id=is_kaydi.id)
+        for kod in ('TSLMST001999', 'TSLMST0011000')
+    ])
+    db.session.commit()
+
+    assert generate_teslimat_kodu(musteri) == 'TSLMST0011001'